@@ -0,0 +1,28 @@
+"""Add progress and cancellation columns to ml_training_jobs
+
+Revision ID: 017_add_training_job_progress
+Revises: 1cb3960cc284
+Create Date: 2025-11-03 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '017_add_training_job_progress'
+down_revision = '1cb3960cc284'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('ml_training_jobs', sa.Column('progress', sa.Float(), nullable=False, server_default='0'))
+    op.add_column('ml_training_jobs', sa.Column('progress_stage', sa.String(length=50), nullable=True))
+    op.add_column('ml_training_jobs', sa.Column('cancel_requested', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    op.drop_column('ml_training_jobs', 'cancel_requested')
+    op.drop_column('ml_training_jobs', 'progress_stage')
+    op.drop_column('ml_training_jobs', 'progress')
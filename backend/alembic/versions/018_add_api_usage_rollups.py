@@ -0,0 +1,44 @@
+"""Add hourly api_usage_rollups table
+
+Revision ID: 018_add_api_usage_rollups
+Revises: 017_add_training_job_progress
+Create Date: 2025-11-04 10:00:00.000000
+
+Existing call logs are folded in by scripts/backfill_api_usage_rollups.py;
+latency sketches are built in Python, so the backfill is not done in SQL here.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '018_add_api_usage_rollups'
+down_revision = '017_add_training_job_progress'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'api_usage_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('api_type', sa.String(length=50), nullable=False),
+        sa.Column('call_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('success_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('latency_sum_ms', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('latency_max_ms', sa.Float(), nullable=True),
+        sa.Column('latency_sketch', sa.JSON(), nullable=True),
+        sa.Column('last_call_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('bucket_start', 'api_type', name='uq_api_usage_rollups_bucket_api_type')
+    )
+    op.create_index(op.f('ix_api_usage_rollups_id'), 'api_usage_rollups', ['id'], unique=False)
+    op.create_index('ix_api_usage_rollups_bucket_start', 'api_usage_rollups', ['bucket_start'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_api_usage_rollups_bucket_start', table_name='api_usage_rollups')
+    op.drop_index(op.f('ix_api_usage_rollups_id'), table_name='api_usage_rollups')
+    op.drop_table('api_usage_rollups')
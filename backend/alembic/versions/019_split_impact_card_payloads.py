@@ -0,0 +1,55 @@
+"""Move impact_cards.raw_data to impact_card_payloads
+
+Revision ID: 019_split_impact_card_payloads
+Revises: 018_add_api_usage_rollups
+Create Date: 2025-11-05 10:00:00.000000
+
+raw_data holds the complete You.com responses for a card and is the widest
+column on impact_cards, but nothing on the hot path reads it. It moves to a
+1:1 side table; every existing card gets a payload row in the backfill.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '019_split_impact_card_payloads'
+down_revision = '018_add_api_usage_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'impact_card_payloads',
+        sa.Column('impact_card_id', sa.Integer(), nullable=False),
+        sa.Column('raw_data', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['impact_card_id'], ['impact_cards.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('impact_card_id')
+    )
+
+    op.execute(
+        """
+        INSERT INTO impact_card_payloads (impact_card_id, raw_data)
+        SELECT id, COALESCE(raw_data, '{}')
+        FROM impact_cards
+        """
+    )
+
+    op.drop_column('impact_cards', 'raw_data')
+
+
+def downgrade() -> None:
+    op.add_column('impact_cards', sa.Column('raw_data', sa.JSON(), nullable=True))
+
+    op.execute(
+        """
+        UPDATE impact_cards
+        SET raw_data = impact_card_payloads.raw_data
+        FROM impact_card_payloads
+        WHERE impact_card_payloads.impact_card_id = impact_cards.id
+        """
+    )
+
+    op.drop_table('impact_card_payloads')
@@ -0,0 +1,42 @@
+"""Denormalize comment reply counts and index the thread parent
+
+Revision ID: 020_add_comment_reply_counts
+Revises: 019_split_impact_card_payloads
+Create Date: 2025-11-06 10:00:00.000000
+
+Thread listings read comments.reply_count instead of counting replies per
+comment; the recursive thread loader walks parent_comment_id, so it gets
+an index.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '020_add_comment_reply_counts'
+down_revision = '019_split_impact_card_payloads'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'comments',
+        sa.Column('reply_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index('ix_comments_parent_comment_id', 'comments', ['parent_comment_id'])
+
+    op.execute(
+        """
+        UPDATE comments
+        SET reply_count = (
+            SELECT count(*) FROM comments AS replies
+            WHERE replies.parent_comment_id = comments.id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_parent_comment_id', table_name='comments')
+    op.drop_column('comments', 'reply_count')
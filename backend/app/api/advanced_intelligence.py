@@ -12,12 +12,14 @@ from redis.connection import ConnectionPool
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect, Body
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from dataclasses import dataclass
 
 from app.database import get_db
 from app.services.multi_agent_orchestrator import multi_agent_orchestrator
 from app.services.predictive_intelligence import PredictiveIntelligenceEngine
+from app.services.sync_db_lane import sync_db_lane
 from enum import Enum
 
 class PredictionType(Enum):
@@ -272,8 +274,7 @@ async def initialize_multi_agent_system(
 @router.post("/predictive/analyze", response_model=PredictiveAnalysisResponse)
 async def generate_predictive_analysis(
     request: PredictiveAnalysisRequest,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     """Generate predictive analysis for a company"""
     logger.info(f"🔮 Predictive analysis requested for {request.company} by {current_user.email}")
@@ -292,11 +293,10 @@ async def generate_predictive_analysis(
         company_data = await _gather_company_data(request.company)
         market_data = await _gather_market_data(request.company)
         
-        # Generate predictions using the engine
-        prediction_engine = PredictiveIntelligenceEngine(db)
-        
-        # Generate predictions based on patterns
-        predictions = prediction_engine.generate_predictions(request.company)
+        # Generate predictions based on patterns (sync ORM, off the event loop)
+        predictions = await sync_db_lane.run(
+            lambda db: PredictiveIntelligenceEngine(db).generate_predictions(request.company)
+        )
         
         predictions_result = {
             "company": request.company,
@@ -333,6 +333,12 @@ async def generate_predictive_analysis(
             detail=f"Failed to generate predictive analysis: {str(e)}"
         )
 
+def _predict_from_patterns(db: Session, company: str) -> List[Any]:
+    """Refresh a company's competitor patterns, then predict events from them"""
+    prediction_engine = PredictiveIntelligenceEngine(db)
+    prediction_engine.analyze_competitor_patterns(company)
+    return prediction_engine.generate_predictions(company)
+
 def _get_prediction_description(pred_type: PredictionType) -> str:
     """Get description for prediction type"""
     descriptions = {
@@ -363,8 +369,7 @@ async def get_prediction_types():
 async def predict_funding_round(
     company: str,
     time_horizon: str = "6_months",
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     """Predict funding round for specific company"""
     logger.info(f"💰 Funding prediction requested for {company} by {current_user.email}")
@@ -375,11 +380,8 @@ async def predict_funding_round(
         market_data = await _gather_market_data(company)
         
         # Generate funding prediction using pattern analysis
-        prediction_engine = PredictiveIntelligenceEngine(db)
-        
         # Analyze patterns and generate predictions
-        patterns = prediction_engine.analyze_competitor_patterns(company)
-        predictions = prediction_engine.generate_predictions(company)
+        predictions = await sync_db_lane.run(_predict_from_patterns, company)
         
         # Find funding-related predictions
         funding_predictions = [p for p in predictions if p.event_type == "funding"]
@@ -420,8 +422,7 @@ async def predict_funding_round(
 async def predict_product_launch(
     company: str,
     time_horizon: str = "3_months",
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     """Predict product launch for specific company"""
     logger.info(f"🚀 Product launch prediction requested for {company} by {current_user.email}")
@@ -431,11 +432,8 @@ async def predict_product_launch(
         company_data = await _gather_company_data(company)
         
         # Generate product launch prediction using pattern analysis
-        prediction_engine = PredictiveIntelligenceEngine(db)
-        
         # Analyze patterns and generate predictions
-        patterns = prediction_engine.analyze_competitor_patterns(company)
-        predictions = prediction_engine.generate_predictions(company)
+        predictions = await sync_db_lane.run(_predict_from_patterns, company)
         
         # Find product launch-related predictions
         launch_predictions = [p for p in predictions if p.event_type == "product_launch"]
@@ -637,14 +635,10 @@ async def _add_predictive_analysis(
             "competitive_analysis": intelligence_result.get("competitive_analysis", {})
         }
         
-        # Generate predictions using the engine
-        # Create a proper DB session for background task
-        from app.database import SessionLocal
-        with SessionLocal() as db:
-            prediction_engine = PredictiveIntelligenceEngine(db)
-        
         # Generate predictions based on patterns
-        predictions = prediction_engine.generate_predictions(competitor)
+        predictions = await sync_db_lane.run(
+            lambda db: PredictiveIntelligenceEngine(db).generate_predictions(competitor)
+        )
         
         # In production, would store results in database
         logger.info(f"✅ Predictive analysis completed for {competitor}")
@@ -674,13 +668,9 @@ async def _process_batch_analysis(
                     )
                 else:
                     # Simplified analysis using pattern engine
-                    # Create a proper DB session for background task
-                    from app.database import SessionLocal
-                    with SessionLocal() as db:
-                        prediction_engine = PredictiveIntelligenceEngine(db)
-                        
-                        # Generate predictions based on patterns
-                        predictions = prediction_engine.generate_predictions(company)
+                    predictions = await sync_db_lane.run(
+                        lambda db: PredictiveIntelligenceEngine(db).generate_predictions(company)
+                    )
                     result = {
                         "company": company,
                         "predictions": [
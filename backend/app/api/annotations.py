@@ -6,6 +6,7 @@ from typing import List, Optional
 from datetime import datetime
 
 from app.database import get_db
+from app.services.sync_db_lane import sync_db_endpoint
 from app.models.annotation import Annotation
 from app.models.user import User
 from app.models.impact_card import ImpactCard
@@ -18,6 +19,7 @@ router = APIRouter(prefix="/annotations", tags=["annotations"])
 
 
 # Mock authentication dependency - replace with actual auth
+@sync_db_endpoint
 async def get_current_user(db: Session = Depends(get_db)) -> User:
     """Mock user for development - replace with actual authentication"""
     user = db.query(User).first()
@@ -36,6 +38,7 @@ async def get_current_user(db: Session = Depends(get_db)) -> User:
 
 
 @router.post("/", response_model=AnnotationResponse, status_code=status.HTTP_201_CREATED)
+@sync_db_endpoint
 async def create_annotation(
     impact_card_id: int,
     annotation: AnnotationCreate,
@@ -70,6 +73,7 @@ async def create_annotation(
 
 
 @router.get("/impact-card/{impact_card_id}", response_model=List[AnnotationWithUser])
+@sync_db_endpoint
 async def get_annotations_for_impact_card(
     impact_card_id: int,
     annotation_type: Optional[str] = None,
@@ -105,6 +109,7 @@ async def get_annotations_for_impact_card(
 
 
 @router.get("/{annotation_id}", response_model=AnnotationWithUser)
+@sync_db_endpoint
 async def get_annotation(
     annotation_id: int,
     db: Session = Depends(get_db)
@@ -130,6 +135,7 @@ async def get_annotation(
 
 
 @router.put("/{annotation_id}", response_model=AnnotationResponse)
+@sync_db_endpoint
 async def update_annotation(
     annotation_id: int,
     annotation_update: AnnotationUpdate,
@@ -176,6 +182,7 @@ async def update_annotation(
 
 
 @router.delete("/{annotation_id}", status_code=status.HTTP_204_NO_CONTENT)
+@sync_db_endpoint
 async def delete_annotation(
     annotation_id: int,
     db: Session = Depends(get_db),
@@ -202,6 +209,7 @@ async def delete_annotation(
 
 
 @router.get("/impact-card/{impact_card_id}/stats", response_model=AnnotationStats)
+@sync_db_endpoint
 async def get_annotation_stats(
     impact_card_id: int,
     db: Session = Depends(get_db)
@@ -250,6 +258,7 @@ async def get_annotation_stats(
 
 
 @router.post("/bulk-operation", status_code=status.HTTP_200_OK)
+@sync_db_endpoint
 async def bulk_annotation_operation(
     operation: BulkAnnotationOperation,
     db: Session = Depends(get_db),
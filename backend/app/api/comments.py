@@ -1,12 +1,14 @@
 """Comment API endpoints for threaded discussions"""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func, desc, or_
-from typing import List, Optional, Dict, Any
+from sqlalchemy import and_, func, desc, or_, select
+from typing import Iterable, List, Optional, Dict, Any
+from collections import Counter
 from datetime import datetime
 import re
 
 from app.database import get_db
+from app.services.sync_db_lane import sync_db_endpoint
 from app.models.comment import Comment
 from app.models.comment_notification import CommentNotification, ConflictDetection
 from app.models.user import User
@@ -23,6 +25,7 @@ router = APIRouter(prefix="/comments", tags=["comments"])
 
 
 # Mock authentication dependency - replace with actual auth
+@sync_db_endpoint
 async def get_current_user(db: Session = Depends(get_db)) -> User:
     """Mock user for development - replace with actual authentication"""
     user = db.query(User).first()
@@ -120,6 +123,42 @@ def detect_conflicts(comment: Comment, db: Session) -> List[ConflictDetection]:
     return conflicts
 
 
+def adjust_reply_counts(parent_ids: Iterable[Optional[int]], delta: int, db: Session):
+    """Shift the denormalized reply_count of parent comments in the current transaction"""
+    for parent_id, count in Counter(pid for pid in parent_ids if pid is not None).items():
+        db.query(Comment).filter(Comment.id == parent_id).update(
+            {Comment.reply_count: Comment.reply_count + delta * count},
+            synchronize_session=False
+        )
+
+
+def load_thread_replies(root_ids: List[int], db: Session) -> List[Comment]:
+    """Fetch every reply below the given comments, at any depth, with one recursive CTE"""
+    if not root_ids:
+        return []
+
+    thread = select(Comment.id).where(
+        Comment.parent_comment_id.in_(root_ids)
+    ).cte("thread", recursive=True)
+    thread = thread.union_all(
+        select(Comment.id).where(Comment.parent_comment_id == thread.c.id)
+    )
+
+    return db.query(Comment).options(joinedload(Comment.user)).filter(
+        Comment.id.in_(select(thread.c.id))
+    ).order_by(Comment.created_at, Comment.id).all()
+
+
+def to_comment_thread(comment: Comment) -> CommentThread:
+    return CommentThread(
+        **comment.__dict__,
+        user_name=comment.user.full_name or comment.user.username,
+        user_email=comment.user.email,
+        replies_count=comment.reply_count or 0,
+        replies=[]
+    )
+
+
 async def create_notifications(comment: Comment, mentions: List[MentionUser], db: Session):
     """Create notifications for comment activities"""
     notifications = []
@@ -168,6 +207,7 @@ async def create_notifications(comment: Comment, mentions: List[MentionUser], db
 
 
 @router.post("/", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
+@sync_db_endpoint
 async def create_comment(
     impact_card_id: Optional[int] = None,
     shared_watchlist_id: Optional[int] = None,
@@ -218,6 +258,7 @@ async def create_comment(
     )
     
     db.add(comment)
+    adjust_reply_counts([comment.parent_comment_id], 1, db)
     db.commit()
     db.refresh(comment)
     
@@ -235,6 +276,7 @@ async def create_comment(
 
 
 @router.get("/", response_model=List[CommentWithUser])
+@sync_db_endpoint
 async def list_comments(
     impact_card_id: Optional[int] = None,
     shared_watchlist_id: Optional[int] = None,
@@ -270,15 +312,11 @@ async def list_comments(
     # Build response with user info and reply counts
     result = []
     for comment in comments:
-        replies_count = db.query(func.count(Comment.id)).filter(
-            Comment.parent_comment_id == comment.id
-        ).scalar()
-        
         comment_with_user = CommentWithUser(
             **comment.__dict__,
             user_name=comment.user.full_name or comment.user.username,
             user_email=comment.user.email,
-            replies_count=replies_count
+            replies_count=comment.reply_count or 0
         )
         result.append(comment_with_user)
     
@@ -286,6 +324,7 @@ async def list_comments(
 
 
 @router.get("/threads", response_model=List[CommentThread])
+@sync_db_endpoint
 async def get_comment_threads(
     impact_card_id: Optional[int] = None,
     shared_watchlist_id: Optional[int] = None,
@@ -312,31 +351,28 @@ async def get_comment_threads(
     elif company_research_id:
         query = query.filter(Comment.company_research_id == company_research_id)
     
-    top_level_comments = query.order_by(desc(Comment.created_at)).limit(limit).all()
+    top_level_comments = query.order_by(desc(Comment.created_at), desc(Comment.id)).limit(limit).all()
     
-    # Build threaded structure
-    def build_thread(comment: Comment) -> CommentThread:
-        # Get replies
-        replies = db.query(Comment).options(joinedload(Comment.user)).filter(
-            Comment.parent_comment_id == comment.id
-        ).order_by(Comment.created_at).all()
-        
-        # Recursively build reply threads
-        reply_threads = [build_thread(reply) for reply in replies]
-        
-        return CommentThread(
-            **comment.__dict__,
-            user_name=comment.user.full_name or comment.user.username,
-            user_email=comment.user.email,
-            replies_count=len(replies),
-            replies=reply_threads
-        )
+    # Fetch all replies at once, then attach each to its parent in creation order.
+    # Nodes are built first because a reply can sort before its parent (edited
+    # or imported timestamps), so the parent may not exist yet in a single pass.
+    threads = [to_comment_thread(comment) for comment in top_level_comments]
+    nodes = {thread.id: thread for thread in threads}
+    replies = [
+        (reply.parent_comment_id, to_comment_thread(reply))
+        for reply in load_thread_replies(list(nodes), db)
+    ]
+    nodes.update((node.id, node) for _, node in replies)
+    for parent_id, node in replies:
+        parent = nodes.get(parent_id)
+        if parent is not None:
+            parent.replies.append(node)
     
-    threads = [build_thread(comment) for comment in top_level_comments]
     return threads
 
 
 @router.get("/{comment_id}", response_model=CommentWithUser)
+@sync_db_endpoint
 async def get_comment(
     comment_id: int,
     db: Session = Depends(get_db)
@@ -352,19 +388,16 @@ async def get_comment(
             detail="Comment not found"
         )
     
-    replies_count = db.query(func.count(Comment.id)).filter(
-        Comment.parent_comment_id == comment.id
-    ).scalar()
-    
     return CommentWithUser(
         **comment.__dict__,
         user_name=comment.user.full_name or comment.user.username,
         user_email=comment.user.email,
-        replies_count=replies_count
+        replies_count=comment.reply_count or 0
     )
 
 
 @router.put("/{comment_id}", response_model=CommentResponse)
+@sync_db_endpoint
 async def update_comment(
     comment_id: int,
     comment_update: CommentUpdate,
@@ -402,6 +435,7 @@ async def update_comment(
 
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
+@sync_db_endpoint
 async def delete_comment(
     comment_id: int,
     db: Session = Depends(get_db),
@@ -423,11 +457,13 @@ async def delete_comment(
             detail="Not authorized to delete this comment"
         )
     
+    adjust_reply_counts([comment.parent_comment_id], -1, db)
     db.delete(comment)
     db.commit()
 
 
 @router.get("/stats/summary", response_model=CommentStats)
+@sync_db_endpoint
 async def get_comment_stats(
     impact_card_id: Optional[int] = None,
     shared_watchlist_id: Optional[int] = None,
@@ -497,6 +533,7 @@ async def get_comment_stats(
 
 
 @router.get("/notifications/", response_model=List[CommentNotificationSchema])
+@sync_db_endpoint
 async def get_user_notifications(
     unread_only: bool = Query(False, description="Only show unread notifications"),
     limit: int = Query(20, le=50, description="Maximum number of notifications"),
@@ -532,6 +569,7 @@ async def get_user_notifications(
 
 
 @router.put("/notifications/{notification_id}/read", status_code=status.HTTP_200_OK)
+@sync_db_endpoint
 async def mark_notification_read(
     notification_id: int,
     db: Session = Depends(get_db),
@@ -559,6 +597,7 @@ async def mark_notification_read(
 
 
 @router.get("/conflicts/", response_model=List[Dict[str, Any]])
+@sync_db_endpoint
 async def get_conflicts(
     impact_card_id: Optional[int] = None,
     shared_watchlist_id: Optional[int] = None,
@@ -630,6 +669,7 @@ async def get_conflicts(
 
 
 @router.post("/bulk-operation", status_code=status.HTTP_200_OK)
+@sync_db_endpoint
 async def bulk_comment_operation(
     operation: BulkCommentOperation,
     db: Session = Depends(get_db),
@@ -654,6 +694,11 @@ async def bulk_comment_operation(
     
     # Perform operation
     if operation.operation == "delete":
+        deleted_ids = {comment.id for comment in comments}
+        adjust_reply_counts(
+            [comment.parent_comment_id for comment in comments if comment.parent_comment_id not in deleted_ids],
+            -1, db
+        )
         for comment in comments:
             db.delete(comment)
         db.commit()
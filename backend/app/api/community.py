@@ -5,13 +5,14 @@ API endpoints for community-driven intelligence validation,
 user contributions, reputation system, and expert network.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
 from sqlalchemy.orm import Session
 import logging
 
 from app.database import get_db
+from app.services.sync_db_lane import sync_db_endpoint, sync_db_lane
 from app.models.community import CommunityUser, CommunityContribution, CommunityValidation
 from app.schemas.community import (
     CommunityUserCreate, CommunityUserUpdate, CommunityUserResponse,
@@ -23,28 +24,36 @@ from app.schemas.community import (
     CommunitySearchRequest, CommunitySearchResponse
 )
 from app.services.community_intelligence import CommunityIntelligenceService
-from app.services.you_client import YouComOrchestrator
 from app.services.auth_service import get_current_user
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/community", tags=["community"])
 
 
-def get_community_service(
-    db: Session = Depends(get_db)
-) -> CommunityIntelligenceService:
-    """Get community intelligence service instance"""
-    you_client = YouComOrchestrator()
-    return CommunityIntelligenceService(db, you_client)
+def get_community_service(db: Session) -> CommunityIntelligenceService:
+    """Get community intelligence service instance
+
+    Called inside the sync DB lane, whose worker-thread event loop must not
+    borrow the You.com client pool; the service makes no You.com calls, so it
+    gets no client.
+    """
+    return CommunityIntelligenceService(db, you_client=None)
+
+
+async def validate_contribution_with_ai(db: Session, contribution_id: int) -> None:
+    """Background AI validation; runs in the sync DB lane with its own session"""
+    await get_community_service(db).ai_validate_contribution_async(contribution_id)
 
 
 @router.post("/users", response_model=CommunityUserResponse)
+@sync_db_endpoint
 async def create_community_profile(
     profile_data: CommunityUserCreate,
-    community_service: CommunityIntelligenceService = Depends(get_community_service),
+    db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Create or update community user profile"""
+    community_service = get_community_service(db)
     try:
         community_user = await community_service.create_community_user(
             user_id=current_user.id,
@@ -58,6 +67,7 @@ async def create_community_profile(
 
 
 @router.get("/users/me", response_model=CommunityUserResponse)
+@sync_db_endpoint
 async def get_my_community_profile(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -81,6 +91,7 @@ async def get_my_community_profile(
 
 
 @router.put("/users/me", response_model=CommunityUserResponse)
+@sync_db_endpoint
 async def update_my_community_profile(
     profile_update: CommunityUserUpdate,
     db: Session = Depends(get_db),
@@ -114,13 +125,15 @@ async def update_my_community_profile(
 
 
 @router.post("/contributions", response_model=CommunityContributionResponse)
+@sync_db_endpoint
 async def submit_contribution(
     contribution_data: CommunityContributionCreate,
     background_tasks: BackgroundTasks,
-    community_service: CommunityIntelligenceService = Depends(get_community_service),
+    db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Submit a new community contribution"""
+    community_service = get_community_service(db)
     try:
         contribution = await community_service.submit_contribution(
             user_id=current_user.id,
@@ -129,7 +142,8 @@ async def submit_contribution(
         
         # Add background task for AI validation
         background_tasks.add_task(
-            community_service.ai_validate_contribution_async,
+            sync_db_lane.run,
+            validate_contribution_with_ai,
             contribution.id
         )
         
@@ -141,6 +155,7 @@ async def submit_contribution(
 
 
 @router.get("/contributions", response_model=List[CommunityContributionResponse])
+@sync_db_endpoint
 async def get_contributions(
     contribution_type: Optional[str] = Query(None),
     company: Optional[str] = Query(None),
@@ -188,6 +203,7 @@ async def get_contributions(
 
 
 @router.get("/contributions/{contribution_id}", response_model=CommunityContributionResponse)
+@sync_db_endpoint
 async def get_contribution(
     contribution_id: int,
     db: Session = Depends(get_db)
@@ -215,13 +231,15 @@ async def get_contribution(
 
 
 @router.post("/contributions/{contribution_id}/validate", response_model=CommunityValidationResponse)
+@sync_db_endpoint
 async def validate_contribution(
     contribution_id: int,
     validation_data: CommunityValidationCreate,
-    community_service: CommunityIntelligenceService = Depends(get_community_service),
+    db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Submit validation for a contribution"""
+    community_service = get_community_service(db)
     try:
         # Create new validation data with contribution_id instead of mutating
         validation_data_with_id = validation_data.copy(update={"contribution_id": contribution_id})
@@ -241,6 +259,7 @@ async def validate_contribution(
 
 
 @router.get("/contributions/{contribution_id}/validations", response_model=List[CommunityValidationResponse])
+@sync_db_endpoint
 async def get_contribution_validations(
     contribution_id: int,
     db: Session = Depends(get_db)
@@ -259,12 +278,14 @@ async def get_contribution_validations(
 
 
 @router.post("/insights", response_model=CommunityInsightResponse)
+@sync_db_endpoint
 async def create_community_insight(
     insight_data: CommunityInsightCreate,
-    community_service: CommunityIntelligenceService = Depends(get_community_service),
+    db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Create aggregated community insight"""
+    community_service = get_community_service(db)
     try:
         insight = await community_service.generate_community_insight(
             contribution_ids=insight_data.source_contributions,
@@ -281,6 +302,7 @@ async def create_community_insight(
 
 
 @router.get("/insights", response_model=List[CommunityInsightResponse])
+@sync_db_endpoint
 async def get_community_insights(
     insight_type: Optional[str] = Query(None),
     companies: Optional[List[str]] = Query(None),
@@ -288,9 +310,10 @@ async def get_community_insights(
     min_confidence: Optional[float] = Query(None, ge=0.0, le=1.0),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    community_service: CommunityIntelligenceService = Depends(get_community_service)
+    db: Session = Depends(get_db)
 ):
     """Get community insights with filtering"""
+    community_service = get_community_service(db)
     try:
         filters = {}
         if insight_type:
@@ -316,13 +339,15 @@ async def get_community_insights(
 
 
 @router.get("/leaderboard", response_model=List[Dict[str, Any]])
+@sync_db_endpoint
 async def get_leaderboard(
     leaderboard_type: str = Query("monthly"),
     category: str = Query("contributions"),
     limit: int = Query(50, ge=1, le=100),
-    community_service: CommunityIntelligenceService = Depends(get_community_service)
+    db: Session = Depends(get_db)
 ):
     """Get community leaderboard"""
+    community_service = get_community_service(db)
     try:
         leaderboard = await community_service.get_leaderboard(
             leaderboard_type=leaderboard_type,
@@ -338,11 +363,13 @@ async def get_leaderboard(
 
 
 @router.get("/analytics", response_model=CommunityAnalytics)
+@sync_db_endpoint
 async def get_community_analytics(
-    community_service: CommunityIntelligenceService = Depends(get_community_service),
+    db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get comprehensive community analytics"""
+    community_service = get_community_service(db)
     try:
         analytics = await community_service.get_community_analytics()
         return analytics
@@ -353,6 +380,7 @@ async def get_community_analytics(
 
 
 @router.post("/search", response_model=CommunitySearchResponse)
+@sync_db_endpoint
 async def search_community_content(
     search_request: CommunitySearchRequest,
     db: Session = Depends(get_db)
@@ -453,6 +481,7 @@ async def search_community_content(
 
 
 @router.post("/contributions/{contribution_id}/share")
+@sync_db_endpoint
 async def share_contribution(
     contribution_id: int,
     db: Session = Depends(get_db),
@@ -480,6 +509,7 @@ async def share_contribution(
 
 
 @router.get("/users/{user_id}/contributions", response_model=List[CommunityContributionResponse])
+@sync_db_endpoint
 async def get_user_contributions(
     user_id: str,
     limit: int = Query(20, ge=1, le=100),
@@ -513,6 +543,7 @@ async def get_user_contributions(
 
 
 @router.get("/trending", response_model=List[CommunityContributionResponse])
+@sync_db_endpoint
 async def get_trending_contributions(
     timeframe: str = Query("week"),
     limit: int = Query(10, ge=1, le=50),
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
 from ..database import get_db
+from ..services.sync_db_lane import sync_db_endpoint
 from ..models.impact_card import ImpactCard
 from ..services.insight_timeline_service import InsightTimelineService
 from ..services.evidence_badge_service import EvidenceBadgeService
@@ -49,6 +50,7 @@ router = APIRouter(prefix="/enhancements", tags=["enhancements"])
 # Insight Timeline & Delta Highlights
 
 @router.get("/timeline/{company_name}/latest", response_model=Optional[InsightTimeline])
+@sync_db_endpoint
 async def get_latest_timeline(
     company_name: str,
     db: Session = Depends(get_db)
@@ -58,6 +60,7 @@ async def get_latest_timeline(
     return await service.get_latest_timeline(company_name)
 
 @router.get("/timeline/{company_name}/history", response_model=List[InsightTimeline])
+@sync_db_endpoint
 async def get_timeline_history(
     company_name: str,
     limit: int = Query(default=10, ge=1, le=50),
@@ -68,6 +71,7 @@ async def get_timeline_history(
     return await service.get_timeline_history(company_name, limit)
 
 @router.post("/timeline/{company_name}/analyze-delta", response_model=InsightDeltaResponse)
+@sync_db_endpoint
 async def analyze_delta_since_last_run(
     company_name: str,
     impact_card_id: int,
@@ -80,6 +84,7 @@ async def analyze_delta_since_last_run(
 # Evidence Badges & Confidence
 
 @router.get("/evidence/{entity_type}/{entity_id}", response_model=Optional[EvidenceBadgeResponse])
+@sync_db_endpoint
 async def get_evidence_badge(
     entity_type: str,
     entity_id: int,
@@ -90,6 +95,7 @@ async def get_evidence_badge(
     return await service.get_expanded_evidence(entity_type, entity_id)
 
 @router.get("/evidence/{entity_type}/{entity_id}/metrics", response_model=Optional[ConfidenceMetrics])
+@sync_db_endpoint
 async def get_confidence_metrics(
     entity_type: str,
     entity_id: int,
@@ -100,6 +106,7 @@ async def get_confidence_metrics(
     return await service.get_confidence_metrics(entity_type, entity_id)
 
 @router.post("/evidence/create", response_model=EvidenceBadgeCreateResponse)
+@sync_db_endpoint
 async def create_evidence_badge(
     request: EvidenceBadgeCreateRequest,
     db: Session = Depends(get_db)
@@ -114,6 +121,7 @@ async def create_evidence_badge(
 # Personal Playbooks
 
 @router.get("/playbooks/personas", response_model=List[PersonaPreset])
+@sync_db_endpoint
 async def get_persona_presets(
     category: Optional[str] = Query(None, description="Filter by category: individual, enterprise, research"),
     active_only: bool = Query(True, description="Only return active presets"),
@@ -124,6 +132,7 @@ async def get_persona_presets(
     return await service.get_persona_presets(category, active_only)
 
 @router.post("/playbooks/create", response_model=UserPlaybook)
+@sync_db_endpoint
 async def create_user_playbook(
     user_id: int,
     persona_preset_id: int,
@@ -138,6 +147,7 @@ async def create_user_playbook(
     )
 
 @router.get("/playbooks/user/{user_id}", response_model=List[UserPlaybook])
+@sync_db_endpoint
 async def get_user_playbooks(
     user_id: int,
     favorites_only: bool = Query(False, description="Only return favorite playbooks"),
@@ -148,6 +158,7 @@ async def get_user_playbooks(
     return await service.get_user_playbooks(user_id, favorites_only)
 
 @router.post("/playbooks/recommend", response_model=List[PlaybookRecommendation])
+@sync_db_endpoint
 async def recommend_playbooks(
     user_id: int,
     context: Dict[str, Any],
@@ -158,6 +169,7 @@ async def recommend_playbooks(
     return await service.recommend_playbooks(user_id, context)
 
 @router.get("/playbooks/{playbook_id}/plan", response_model=PlaybookExecutionPlan)
+@sync_db_endpoint
 async def create_execution_plan(
     playbook_id: int,
     target_company: Optional[str] = Query(None, description="Target company for research"),
@@ -168,6 +180,7 @@ async def create_execution_plan(
     return await service.create_execution_plan(playbook_id, target_company)
 
 @router.post("/playbooks/{playbook_id}/execute")
+@sync_db_endpoint
 async def execute_playbook(
     playbook_id: int,
     target_company: Optional[str] = None,
@@ -180,6 +193,7 @@ async def execute_playbook(
     return {"execution_id": execution.id, "status": execution.completion_status}
 
 @router.get("/playbooks/execution/{execution_id}/results", response_model=Optional[PlaybookResults])
+@sync_db_endpoint
 async def get_execution_results(
     execution_id: int,
     db: Session = Depends(get_db)
@@ -191,6 +205,7 @@ async def get_execution_results(
 # Action Tracking
 
 @router.post("/actions/create", response_model=ActionItem)
+@sync_db_endpoint
 async def create_action_item(
     action_data: ActionItemCreate,
     db: Session = Depends(get_db)
@@ -200,6 +215,7 @@ async def create_action_item(
     return await service.create_action_item(action_data)
 
 @router.put("/actions/{action_id}", response_model=Optional[ActionItem])
+@sync_db_endpoint
 async def update_action_item(
     action_id: int,
     update_data: ActionItemUpdate,
@@ -213,6 +229,7 @@ async def update_action_item(
     return action
 
 @router.get("/actions", response_model=List[ActionItem])
+@sync_db_endpoint
 async def get_action_items(
     impact_card_id: Optional[int] = Query(None, description="Filter by impact card"),
     status: Optional[str] = Query(None, description="Filter by status"),
@@ -234,6 +251,7 @@ async def get_action_items(
     return await service.get_action_items(impact_card_id, status_enum, assigned_to, overdue_only)
 
 @router.post("/actions/generate/{impact_card_id}", response_model=List[ActionItem])
+@sync_db_endpoint
 async def generate_actions_from_impact_card(
     impact_card_id: int,
     template_name: Optional[str] = Query(None, description="Template to use for generation"),
@@ -244,6 +262,7 @@ async def generate_actions_from_impact_card(
     return await service.generate_actions_from_impact_card(impact_card_id, template_name)
 
 @router.get("/actions/summary/{impact_card_id}", response_model=ActionSummary)
+@sync_db_endpoint
 async def get_action_summary(
     impact_card_id: int,
     db: Session = Depends(get_db)
@@ -255,6 +274,7 @@ async def get_action_summary(
 # Action Boards
 
 @router.post("/boards/create", response_model=ActionBoard)
+@sync_db_endpoint
 async def create_action_board(
     board_data: ActionBoardCreate,
     db: Session = Depends(get_db)
@@ -264,6 +284,7 @@ async def create_action_board(
     return await service.create_action_board(board_data)
 
 @router.post("/boards/{board_id}/add-action")
+@sync_db_endpoint
 async def add_action_to_board(
     board_id: int,
     action_item_id: int,
@@ -276,6 +297,7 @@ async def add_action_to_board(
     return {"board_item_id": board_item.id, "column_id": board_item.column_id}
 
 @router.put("/boards/items/{board_item_id}/move")
+@sync_db_endpoint
 async def move_action_on_board(
     board_item_id: int,
     new_column_id: str,
@@ -288,6 +310,7 @@ async def move_action_on_board(
     return {"board_item_id": board_item.id, "column_id": board_item.column_id, "position": board_item.position}
 
 @router.get("/boards/{board_id}/view", response_model=Optional[ActionBoardView])
+@sync_db_endpoint
 async def get_board_view(
     board_id: int,
     db: Session = Depends(get_db)
@@ -302,6 +325,7 @@ async def get_board_view(
 # Analytics and Insights
 
 @router.get("/insights/actions", response_model=ActionInsights)
+@sync_db_endpoint
 async def get_action_insights(
     user_id: Optional[int] = Query(None, description="Filter by user"),
     db: Session = Depends(get_db)
@@ -313,6 +337,7 @@ async def get_action_insights(
 # Demo and Testing Endpoints
 
 @router.post("/demo/setup", response_model=DemoSetupResponse)
+@sync_db_endpoint
 async def setup_demo_data(
     user_id: int = 1,
     db: Session = Depends(get_db)
@@ -353,6 +378,7 @@ async def setup_demo_data(
     )
 
 @router.get("/demo/status")
+@sync_db_endpoint
 async def get_demo_status(db: Session = Depends(get_db)):
     """Get status of demo data and enhancement features."""
     
@@ -5,6 +5,7 @@ Explainability Engine API endpoints
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import undefer_group
 from typing import List, Dict, Any
 import logging
 
@@ -33,7 +34,7 @@ async def generate_explainability(
     This creates detailed reasoning chains, source analyses, and uncertainty detections.
     """
     # Verify impact card exists
-    result = await db.execute(select(ImpactCard).where(ImpactCard.id == impact_card_id))
+    result = await db.execute(select(ImpactCard).where(ImpactCard.id == impact_card_id).options(undefer_group("details")))
     impact_card = result.scalar_one_or_none()
     
     if not impact_card:
@@ -122,7 +123,7 @@ async def get_explainability(
 ):
     """Get complete explainability data for an impact card"""
     # Verify impact card exists
-    result = await db.execute(select(ImpactCard).where(ImpactCard.id == impact_card_id))
+    result = await db.execute(select(ImpactCard).where(ImpactCard.id == impact_card_id).options(undefer_group("details")))
     impact_card = result.scalar_one_or_none()
     
     if not impact_card:
@@ -1,15 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List, Dict, Any
+from sqlalchemy.orm import selectinload, undefer_group
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import logging
 from app.database import get_db
 from app.models.impact_card import ImpactCard
 from app.models.watch import WatchItem
+from app.pagination import count_rows, fetch_page, loader_options, parse_fields, project_items
 from app.schemas.impact_card import (
     ImpactCardCreate, 
     ImpactCard as ImpactCardSchema, 
+    ImpactCardDetail,
     ImpactCardList,
     ImpactCardGenerate
 )
@@ -35,6 +39,13 @@ from app.realtime import emit_progress
 router = APIRouter(prefix="/impact", tags=["impact-cards"])
 logger = logging.getLogger(__name__)
 
+# The card schema includes the deferred "details" columns; raw_data is left
+# in impact_card_payloads unless explicitly requested
+CARD_LOAD_OPTIONS = (undefer_group("details"),)
+# Server-generated columns to load after insert (a full refresh would expire
+# the deferred columns just written)
+CARD_REFRESH_ATTRIBUTES = ["id", "created_at", "updated_at"]
+
 # Import shared limiter
 from app.rate_limiter import limiter
 
@@ -67,6 +78,20 @@ async def save_action_recommendations_if_present(impact_data: dict, impact_card_
             # Continue without failing the entire request
 
 
+def _impact_card_page(items, total: int, is_estimate: bool, next_cursor: Optional[str], projection):
+    """Build a list response; projected pages bypass the full card schema"""
+    if projection is None:
+        return ImpactCardList(
+            items=items, total=total, total_is_estimate=is_estimate, next_cursor=next_cursor
+        )
+    return JSONResponse({
+        "items": project_items(items, ImpactCardSchema, projection),
+        "total": total,
+        "total_is_estimate": is_estimate,
+        "next_cursor": next_cursor,
+    })
+
+
 @router.get("/comparison")
 async def compare_impact_cards(
     competitors: str,
@@ -165,7 +190,7 @@ async def generate_impact_card(
         
         db.add(db_impact_card)
         await db.commit()
-        await db.refresh(db_impact_card)
+        await db.refresh(db_impact_card, CARD_REFRESH_ATTRIBUTES)
         
         # Save Decision Engine recommendations to database if they exist
         await save_action_recommendations_if_present(impact_data, db_impact_card.id, db)
@@ -270,7 +295,7 @@ async def generate_impact_card_for_watch(
         
         db.add(db_impact_card)
         await db.commit()
-        await db.refresh(db_impact_card)
+        await db.refresh(db_impact_card, CARD_REFRESH_ATTRIBUTES)
         
         # Save Decision Engine recommendations to database if they exist
         await save_action_recommendations_if_present(impact_data, db_impact_card.id, db)
@@ -311,50 +336,55 @@ async def generate_impact_card_for_watch(
 @router.get("/", response_model=ImpactCardList)
 async def get_impact_cards(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     competitor: str = None,
     risk_level: str = None,
     min_credibility: float = None,
+    fields: Optional[str] = None,
+    estimate_total: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all Impact Cards with optional filtering"""
-    query = select(ImpactCard)
-    
-    if competitor:
-        query = query.where(ImpactCard.competitor_name.ilike(f"%{competitor}%"))
-    
-    if risk_level:
-        query = query.where(ImpactCard.risk_level == risk_level)
+    """Get all Impact Cards with optional filtering
 
-    if min_credibility is not None:
-        query = query.where(ImpactCard.credibility_score >= min_credibility)
-    
-    query = query.offset(skip).limit(limit).order_by(ImpactCard.created_at.desc())
-    
-    result = await db.execute(query)
-    items = result.scalars().all()
-    
-    # Get total count
-    count_query = select(ImpactCard)
+    Pass `next_cursor` from a response as `cursor` to fetch the next page;
+    `skip` is still honoured when no cursor is given. `fields` is a
+    comma-separated list of card fields to return (id and created_at are
+    always included), which skips loading the large JSON columns a list view
+    does not show.
+    """
+    projection = parse_fields(fields, ImpactCardSchema)
+    filters = []
     if competitor:
-        count_query = count_query.where(ImpactCard.competitor_name.ilike(f"%{competitor}%"))
+        filters.append(ImpactCard.competitor_name.ilike(f"%{competitor}%"))
     if risk_level:
-        count_query = count_query.where(ImpactCard.risk_level == risk_level)
+        filters.append(ImpactCard.risk_level == risk_level)
     if min_credibility is not None:
-        count_query = count_query.where(ImpactCard.credibility_score >= min_credibility)
-    
-    count_result = await db.execute(count_query)
-    total = len(count_result.scalars().all())
-    
-    return ImpactCardList(items=items, total=total)
+        filters.append(ImpactCard.credibility_score >= min_credibility)
+
+    query = select(ImpactCard).where(*filters).options(
+        *loader_options(ImpactCard, projection, default=CARD_LOAD_OPTIONS)
+    )
+    items, next_cursor = await fetch_page(db, query, ImpactCard, limit, cursor=cursor, skip=skip)
+    total, is_estimate = await count_rows(db, ImpactCard, filters, estimate=estimate_total)
+
+    return _impact_card_page(items, total, is_estimate, next_cursor, projection)
 
-@router.get("/{card_id}", response_model=ImpactCardSchema)
+@router.get("/{card_id}", response_model=ImpactCardDetail)
 async def get_impact_card(
     card_id: int,
+    include_raw_data: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get a specific Impact Card"""
-    result = await db.execute(select(ImpactCard).where(ImpactCard.id == card_id))
+    """Get a specific Impact Card
+
+    The complete You.com responses behind the card are only loaded and
+    returned with `include_raw_data=true`.
+    """
+    query = select(ImpactCard).where(ImpactCard.id == card_id).options(*CARD_LOAD_OPTIONS)
+    if include_raw_data:
+        query = query.options(selectinload(ImpactCard.payload))
+    result = await db.execute(query)
     impact_card = result.scalar_one_or_none()
     
     if not impact_card:
@@ -363,39 +393,45 @@ async def get_impact_card(
             detail="Impact Card not found"
         )
     
-    return impact_card
+    card = ImpactCardSchema.model_validate(impact_card)
+    return ImpactCardDetail(
+        **card.model_dump(),
+        raw_data=impact_card.raw_data if include_raw_data else None,
+    )
 
 @router.get("/watch/{watch_id}", response_model=ImpactCardList)
 async def get_impact_cards_for_watch(
     watch_id: int,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    estimate_total: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all Impact Cards for a specific watch item"""
+    """Get all Impact Cards for a specific watch item
+
+    Supports the same `cursor` and `fields` parameters as the card list.
+    """
+    projection = parse_fields(fields, ImpactCardSchema)
+
     # Verify watch item exists
-    result = await db.execute(select(WatchItem).where(WatchItem.id == watch_id))
-    watch_item = result.scalar_one_or_none()
-    
-    if not watch_item:
+    watch_exists = await db.scalar(select(WatchItem.id).where(WatchItem.id == watch_id))
+    if watch_exists is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Watch item not found"
         )
     
     # Get impact cards
-    query = select(ImpactCard).where(ImpactCard.watch_item_id == watch_id)
-    query = query.offset(skip).limit(limit).order_by(ImpactCard.created_at.desc())
-    
-    result = await db.execute(query)
-    items = result.scalars().all()
-    
-    # Get total count
-    count_query = select(ImpactCard).where(ImpactCard.watch_item_id == watch_id)
-    count_result = await db.execute(count_query)
-    total = len(count_result.scalars().all())
-    
-    return ImpactCardList(items=items, total=total)
+    filters = [ImpactCard.watch_item_id == watch_id]
+    query = select(ImpactCard).where(*filters).options(
+        *loader_options(ImpactCard, projection, default=CARD_LOAD_OPTIONS)
+    )
+    items, next_cursor = await fetch_page(db, query, ImpactCard, limit, cursor=cursor, skip=skip)
+    total, is_estimate = await count_rows(db, ImpactCard, filters, estimate=estimate_total)
+
+    return _impact_card_page(items, total, is_estimate, next_cursor, projection)
 
 @router.post("/{card_id}/feedback")
 async def submit_ml_feedback(
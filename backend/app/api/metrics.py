@@ -1,21 +1,25 @@
-from collections import defaultdict
-from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Dict, Optional
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func
+from sqlalchemy import Float, cast, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.impact_card import ImpactCard
 from app.models.company_research import CompanyResearch
-from app.models.api_call_log import ApiCallLog
+from app.services.api_usage_rollups import get_usage_summary
+from app.services.request_coalescer import request_coalescer
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 logger = logging.getLogger(__name__)
 
 
+# Leading number of a processing_time string such as "12.34s"
+_PROCESSING_SECONDS_PATTERN = r"[0-9]+(?:\.[0-9]+)?"
+
+
 def _parse_processing_time(value: str | None) -> float | None:
     if not value:
         return None
@@ -27,123 +31,75 @@ def _parse_processing_time(value: str | None) -> float | None:
         return None
 
 
+async def _average_processing_seconds(db: AsyncSession) -> Optional[float]:
+    """Average impact card processing time in seconds.
+
+    PostgreSQL parses the stored strings in SQL; other databases (SQLite in
+    tests) fall back to scanning just the processing_time column.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        seconds = cast(func.substring(ImpactCard.processing_time, _PROCESSING_SECONDS_PATTERN), Float)
+        average = await db.scalar(select(func.avg(seconds)))
+        return float(average) if average is not None else None
+
+    total = 0.0
+    count = 0
+    for value in await db.scalars(
+        select(ImpactCard.processing_time).where(ImpactCard.processing_time.isnot(None))
+    ):
+        processing = _parse_processing_time(value)
+        if processing is not None:
+            total += processing
+            count += 1
+    return total / count if count else None
+
+
 @router.get("/api-usage")
 async def api_usage_metrics(db: AsyncSession = Depends(get_db)) -> Dict[str, object]:
-    """Aggregate live API usage metrics from persisted call logs."""
+    """Aggregate live API usage metrics from the hourly usage rollups.
+
+    Call counts, success rate and average latency cover all history;
+    p95/p99 latency and the hourly timeline cover the last 24 hours.
+    """
     try:
         now = datetime.now(timezone.utc)
-
-        total_calls: int = await db.scalar(select(func.count(ApiCallLog.id))) or 0
-        success_calls: int = await db.scalar(
-            select(func.count()).where(ApiCallLog.success.is_(True))
-        ) or 0
-        average_latency: Optional[float] = await db.scalar(select(func.avg(ApiCallLog.latency_ms)))
-
-        percentile_rows = await db.execute(
-            select(ApiCallLog.latency_ms).where(ApiCallLog.latency_ms.isnot(None))
-        )
-        latency_values = [row[0] for row in percentile_rows if row[0] is not None]
-
-        def percentile(values: List[float], pct: float) -> Optional[float]:
-            if not values:
-                return None
-            sorted_vals = sorted(values)
-            k = (len(sorted_vals) - 1) * pct
-            f = int(k)
-            c = min(f + 1, len(sorted_vals) - 1)
-            if f == c:
-                return sorted_vals[int(k)]
-            d0 = sorted_vals[f] * (c - k)
-            d1 = sorted_vals[c] * (k - f)
-            return d0 + d1
-
-        p95_latency = percentile(latency_values, 0.95)
-        p99_latency = percentile(latency_values, 0.99)
-
-        by_service_rows = await db.execute(
-            select(ApiCallLog.api_type, func.count(ApiCallLog.id)).group_by(ApiCallLog.api_type)
-        )
-        by_service = {service: count for service, count in by_service_rows}
-        for key in ("news", "search", "chat", "ari"):
-            by_service.setdefault(key, 0)
-
-        # Retrieve logs from the last 24 hours for timeline aggregation
-        cutoff = now - timedelta(hours=24)
-        recent_logs_result = await db.execute(
-            select(ApiCallLog).where(ApiCallLog.created_at >= cutoff)
-        )
-        recent_logs: List[ApiCallLog] = recent_logs_result.scalars().all()
-
-        usage_by_hour: Dict[str, Dict[str, int]] = defaultdict(
-            lambda: {"news": 0, "search": 0, "chat": 0, "ari": 0}
-        )
-
-        for log in recent_logs:
-            timestamp = log.created_at or now
-            if timestamp.tzinfo is None:
-                timestamp = timestamp.replace(tzinfo=timezone.utc)
-            bucket = timestamp.astimezone(timezone.utc).strftime("%H:00")
-            if log.api_type not in usage_by_hour[bucket]:
-                usage_by_hour[bucket][log.api_type] = 0
-            usage_by_hour[bucket][log.api_type] += 1
-
-        usage_timeline = [
-            {"time": hour, **totals}
-            for hour, totals in sorted(usage_by_hour.items())
-        ]
-
-        last_call_row = await db.execute(
-            select(ApiCallLog).order_by(ApiCallLog.created_at.desc()).limit(1)
-        )
-        last_call: Optional[ApiCallLog] = last_call_row.scalars().first()
-
-        # Impact card analytics
-        impact_cards_result = await db.execute(select(ImpactCard))
-        impact_cards: List[ImpactCard] = impact_cards_result.scalars().all()
-        processing_times: List[float] = []
-        total_sources = 0
-        last_generated_at: Optional[datetime] = None
-
-        for card in impact_cards:
-            total_sources += card.total_sources or 0
-            processing = _parse_processing_time(card.processing_time)
-            if processing is not None:
-                processing_times.append(processing)
-            if card.created_at:
-                created_at = (
-                    card.created_at
-                    if card.created_at.tzinfo
-                    else card.created_at.replace(tzinfo=timezone.utc)
-                )
-                if last_generated_at is None or created_at > last_generated_at:
-                    last_generated_at = created_at
-
-        avg_processing = (
-            sum(processing_times) / len(processing_times)
-            if processing_times
-            else None
-        )
+        usage = await get_usage_summary(db, now=now, window_hours=24)
+
+        # Impact card analytics, aggregated in SQL (never loads raw_data)
+        card_count, total_sources, last_generated_at = (await db.execute(
+            select(
+                func.count(ImpactCard.id),
+                func.coalesce(func.sum(ImpactCard.total_sources), 0),
+                func.max(ImpactCard.created_at),
+            )
+        )).one()
+        avg_processing = await _average_processing_seconds(db)
+        if last_generated_at is not None and last_generated_at.tzinfo is None:
+            last_generated_at = last_generated_at.replace(tzinfo=timezone.utc)
 
         company_research_count: int = await db.scalar(
             select(func.count(CompanyResearch.id))
         ) or 0
 
-        success_rate = (success_calls / total_calls) if total_calls else None
+        total_calls = usage["total_calls"]
+        success_rate = (usage["success_calls"] / total_calls) if total_calls else None
+        last_call_at: Optional[datetime] = usage["last_call_at"]
 
         return {
-            "impact_cards": len(impact_cards),
+            "impact_cards": card_count or 0,
             "company_research": company_research_count,
             "total_calls": total_calls,
             "success_rate": success_rate,
-            "average_latency_ms": average_latency,
-            "p95_latency_ms": p95_latency,
-            "p99_latency_ms": p99_latency,
-            "by_service": by_service,
-            "usage_last_24h": usage_timeline,
-            "last_call_at": last_call.created_at.isoformat() if last_call and last_call.created_at else None,
-            "total_sources": total_sources,
+            "average_latency_ms": usage["average_latency_ms"],
+            "p95_latency_ms": usage["p95_latency_ms"],
+            "p99_latency_ms": usage["p99_latency_ms"],
+            "by_service": usage["by_service"],
+            "usage_last_24h": usage["usage_last_24h"],
+            "last_call_at": last_call_at.isoformat() if last_call_at else None,
+            "total_sources": int(total_sources or 0),
             "average_processing_seconds": avg_processing,
             "last_generated_at": last_generated_at.isoformat() if last_generated_at else None,
+            "request_coalescing": request_coalescer.get_stats(),
         }
     except Exception as e:
         logger.error(f"Error retrieving API usage metrics: {e}", exc_info=True)
@@ -162,4 +118,5 @@ async def api_usage_metrics(db: AsyncSession = Depends(get_db)) -> Dict[str, obj
             "total_sources": 0,
             "average_processing_seconds": None,
             "last_generated_at": None,
+            "request_coalescing": request_coalescer.get_stats(),
         }
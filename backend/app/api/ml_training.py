@@ -13,23 +13,8 @@ from pydantic import BaseModel, Field
 
 from app.database import get_db
 from app.services.ml_training_service import MLTrainingService, ModelType, TriggerType
-from app.services.ml_prediction_service import MLPredictionService
-from enum import Enum
-
-# Placeholder classes for missing types
-class PredictionType(str, Enum):
-    RISK_SCORING = "risk_scoring"
-    CONFIDENCE_PREDICTION = "confidence_prediction"
-    IMPACT_CLASSIFICATION = "impact_classification"
-    RELEVANCE_CLASSIFICATION = "relevance_classification"
-
-class PredictionRequest:
-    def __init__(self, entity_id: str, entity_type: str, prediction_type: PredictionType, features=None, use_cache: bool = False):
-        self.entity_id = entity_id
-        self.entity_type = entity_type
-        self.prediction_type = prediction_type
-        self.features = features or {}
-        self.use_cache = use_cache
+from app.services.ml_training_pool import training_process_pool
+from app.services.ml_prediction_service import MLPredictionService, PredictionRequest, PredictionType
 from app.services.ml_model_registry import MLModelRegistry, ModelStatus, DeploymentStrategy, ABTestConfig
 
 router = APIRouter(prefix="/api/ml", tags=["ML Training"])
@@ -182,6 +167,28 @@ async def get_training_job_status(job_id: str, db: AsyncSession = Depends(get_db
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get job status: {str(e)}")
 
+@router.post("/training/job/{job_id}/cancel")
+async def cancel_training_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """Cancel a pending or running training job."""
+    try:
+        training_service = MLTrainingService(db)
+        job_status = await training_service.cancel_training_job(job_id)
+        
+        if not job_status:
+            raise HTTPException(status_code=404, detail="Training job not found")
+        
+        return job_status
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to cancel training job: {str(e)}")
+
+@router.get("/training/pool")
+async def get_training_pool_stats():
+    """Get concurrency and throughput of the training process pool."""
+    return training_process_pool.get_stats()
+
 @router.get("/training/performance/{model_type}")
 async def get_model_performance_history(
     model_type: ModelType,
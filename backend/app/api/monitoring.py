@@ -12,6 +12,12 @@ from sqlalchemy import select, func, desc
 from app.database import get_db
 from app.models.api_call_log import ApiCallLog
 from app.services.resilient_you_client import ResilientYouComOrchestrator
+from app.services.you_client_pool import you_client_pool
+from app.services.api_call_log_writer import api_call_log_writer
+from app.services.request_coalescer import request_coalescer
+from app.services.sync_db_lane import loop_lag_monitor, sync_db_lane
+from app.services.pdf_render_pool import pdf_render_pool
+from app.realtime import get_realtime_stats
 from app.resilience_config import get_resilience_config
 
 router = APIRouter(prefix="/monitoring", tags=["monitoring"])
@@ -77,6 +83,7 @@ async def get_monitoring_dashboard(
     
     # Get current circuit breaker status
     async with ResilientYouComOrchestrator() as client:
+        await client.refresh_shared_state()
         resilience_status = client.get_health_status()
     
     # Calculate overall health score
@@ -142,6 +149,7 @@ async def get_active_alerts(db: AsyncSession = Depends(get_db)):
     
     # Check circuit breaker status
     async with ResilientYouComOrchestrator() as client:
+        await client.refresh_shared_state()
         health_status = client.get_health_status()
         
         for api, status in health_status["circuit_breakers"].items():
@@ -236,6 +244,55 @@ async def get_api_performance(
         "insights": _generate_api_insights(api_type, hourly_data, error_distribution)
     }
 
+@router.get("/connection-pools")
+async def get_connection_pool_stats():
+    """Get utilisation of the shared You.com HTTP and Redis connection pools"""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "you_client_pool": you_client_pool.get_stats()
+    }
+
+@router.get("/api-log-writer")
+async def get_api_log_writer_stats():
+    """Get queue depth, throughput and drop counters of the batched API call log writer"""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "api_call_log_writer": api_call_log_writer.get_stats()
+    }
+
+@router.get("/request-coalescing")
+async def get_request_coalescing_stats():
+    """Get upstream You.com calls made versus calls saved by single-flight coalescing"""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "request_coalescing": request_coalescer.get_stats()
+    }
+
+@router.get("/sync-db")
+async def get_sync_db_lane_stats():
+    """Get sync-ORM thread pool saturation and time the event loop spent blocked"""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "sync_db_lane": sync_db_lane.get_stats(),
+        "event_loop_lag": loop_lag_monitor.get_stats()
+    }
+
+@router.get("/pdf-render")
+async def get_pdf_render_stats():
+    """Get PDF render pool throughput and report cache hit counters"""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "pdf_render": pdf_render_pool.get_stats()
+    }
+
+@router.get("/realtime")
+async def get_realtime_emit_stats():
+    """Get Socket.IO client manager and per-room emitted/coalesced progress event counters"""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "realtime": get_realtime_stats()
+    }
+
 @router.get("/config")
 async def get_resilience_config_endpoint():
     """Get current resilience configuration"""
@@ -253,10 +310,8 @@ async def reset_circuit_breaker(api_type: str):
         if not circuit_breaker:
             raise HTTPException(status_code=404, detail="Circuit breaker not found")
         
-        # Reset circuit breaker
-        circuit_breaker.state.state = circuit_breaker.state.state.CLOSED
-        circuit_breaker.state.failure_count = 0
-        circuit_breaker.state.success_count = 0
+        # Reset circuit breaker for every worker sharing the state
+        await client.reset_circuit_breaker(api_type)
         
         return {
             "message": f"Circuit breaker for {api_type} API has been reset",
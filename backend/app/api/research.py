@@ -1,19 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, Request
+from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from io import BytesIO
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr
 import logging
 from app.database import get_db
 from app.models.company_research import CompanyResearch
+from app.pagination import fetch_page, loader_options, parse_fields, project_items
 from app.schemas.company_research import (
     CompanyResearchCreate,
     CompanyResearch as CompanyResearchSchema,
     CompanyResearchRequest
 )
 from app.services.you_client import get_you_client, YouComAPIError, YouComOrchestrator
-from app.services.pdf_service import pdf_generator
+from app.services.pdf_render_pool import pdf_render_pool
 from app.services.email_service import get_email_service
 from app.config import settings
 
@@ -84,25 +86,38 @@ async def research_company(
 
 @router.get("/", response_model=List[CompanyResearchSchema])
 async def get_company_research(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     company: str = None,
+    fields: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all company research records"""
+    """Get all company research records
+
+    The body stays a plain list; the cursor for the next page is returned
+    in the X-Next-Cursor header. `fields` limits the columns loaded and
+    returned (e.g. to skip the search results and ARI report).
+    """
+    projection = parse_fields(fields, CompanyResearchSchema)
     try:
-        query = select(CompanyResearch)
+        query = select(CompanyResearch).options(*loader_options(CompanyResearch, projection))
         
         if company:
             query = query.where(CompanyResearch.company_name.ilike(f"%{company}%"))
         
-        query = query.offset(skip).limit(limit).order_by(CompanyResearch.created_at.desc())
-        
-        result = await db.execute(query)
-        items = result.scalars().all()
-        
+        items, next_cursor = await fetch_page(db, query, CompanyResearch, limit, cursor=cursor, skip=skip)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+
+        if projection is not None:
+            return JSONResponse(project_items(items, CompanyResearchSchema, projection), headers=headers)
+
+        response.headers.update(headers)
         # Convert SQLAlchemy models to Pydantic models
         return [CompanyResearchSchema.model_validate(item) for item in items]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Error fetching company research: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -151,7 +166,7 @@ class ShareResearchRequest(BaseModel):
     message: str = None
 
 
-@router.get("/{research_id}/export", response_class=StreamingResponse)
+@router.get("/{research_id}/export", response_class=FileResponse)
 async def export_research_pdf(
     research_id: int,
     db: AsyncSession = Depends(get_db)
@@ -182,14 +197,14 @@ async def export_research_pdf(
             'created_at': research.created_at
         }
 
-        # Generate PDF
-        pdf_buffer = pdf_generator.generate_research_report(research_data)
+        # Render in the PDF pool (or reuse the cached render of the same data)
+        pdf_path = await pdf_render_pool.render("research", research_data)
 
-        # Return as streaming response
+        # Stream the file in chunks
         filename = f"{research.company_name.replace(' ', '_')}_research_report.pdf"
 
-        return StreamingResponse(
-            pdf_buffer,
+        return FileResponse(
+            pdf_path,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -238,8 +253,8 @@ async def share_research_email(
             'created_at': research.created_at
         }
 
-        # Generate PDF
-        pdf_buffer = pdf_generator.generate_research_report(research_data)
+        # Render in the PDF pool (or reuse the cached render of the same data)
+        pdf_buffer = BytesIO(await pdf_render_pool.render_bytes("research", research_data))
 
         # Get email service
         email_service = get_email_service(settings)
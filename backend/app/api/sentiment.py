@@ -7,6 +7,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any, Union
 import logging
 import asyncio
+import json
 
 from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
@@ -22,6 +23,7 @@ from app.services.sentiment_processor import sentiment_processor
 from app.services.sentiment_trend_analyzer import sentiment_trend_analyzer
 from app.services.sentiment_alert_worker import sentiment_alert_worker
 from app.services.sentiment_classifier import get_entity_recognizer, get_sentiment_classifier
+from app.services.websocket_broadcast import BroadcastHub
 
 logger = logging.getLogger(__name__)
 
@@ -102,26 +104,19 @@ class QueueStatusResponse(BaseModel):
 
 
 # WebSocket connection manager
-class SentimentWebSocketManager:
+class SentimentWebSocketManager(BroadcastHub):
+    """Sentiment stream clients; see BroadcastHub for queueing and relay"""
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        super().__init__(channel="sentiment:broadcast")
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
+    async def broadcast(self, message: dict, topic: Optional[str] = None) -> int:
+        return await self.publish(message, topic=topic)
 
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                # Log the exception and remove disconnected clients
-                logging.getLogger(__name__).exception(f"Failed to send WebSocket message: {e}")
-                self.disconnect(connection)
+def entity_topic(entity_name: str) -> str:
+    """Subscription topic for one entity's sentiment updates"""
+    return f"entity:{entity_name.strip().lower()}"
 
 
 websocket_manager = SentimentWebSocketManager()
@@ -462,16 +457,49 @@ async def trigger_sentiment_analysis(
 
 # WebSocket endpoint for real-time sentiment streaming
 @router.websocket("/stream")
-async def sentiment_websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time sentiment updates."""
-    await websocket_manager.connect(websocket)
+async def sentiment_websocket_endpoint(websocket: WebSocket, entities: Optional[str] = None):
+    """WebSocket endpoint for real-time sentiment updates.
+
+    Clients receive every update unless they subscribe to entities, either
+    with `?entities=Acme,Globex` or by sending
+    `{"action": "subscribe" | "unsubscribe", "entities": [...]}`.
+    Any other message is answered with a ping response.
+    """
+    topics = [entity_topic(name) for name in (entities or "").split(",") if name.strip()]
+    await websocket_manager.connect(websocket, topics=topics or None)
     try:
         while True:
             # Keep connection alive and listen for client messages
             data = await websocket.receive_text()
-            
+
+            try:
+                request = json.loads(data)
+            except ValueError:
+                request = None
+
+            if isinstance(request, dict) and request.get("action") in ("subscribe", "unsubscribe"):
+                names = request.get("entities", [])
+                if not isinstance(names, list):
+                    # A bare string would otherwise subscribe to one topic per character
+                    await websocket_manager.send_to(websocket, {
+                        "type": "error",
+                        "error": "entities must be a list of entity names",
+                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                    })
+                    continue
+                requested = [entity_topic(name) for name in names if str(name).strip()]
+                if request["action"] == "subscribe":
+                    subscribed = websocket_manager.subscribe(websocket, requested)
+                else:
+                    subscribed = websocket_manager.unsubscribe(websocket, requested)
+                await websocket_manager.send_to(websocket, {
+                    "type": "subscriptions",
+                    "topics": sorted(subscribed),
+                })
+                continue
+
             # Echo back for connection testing
-            await websocket.send_json({
+            await websocket_manager.send_to(websocket, {
                 "type": "ping_response",
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "message": "Connection active"
@@ -486,12 +514,13 @@ async def sentiment_websocket_endpoint(websocket: WebSocket):
 
 # Utility function to broadcast sentiment updates via WebSocket
 async def broadcast_sentiment_update(update_data: dict):
-    """Broadcast sentiment update to all connected WebSocket clients."""
+    """Broadcast a sentiment update to subscribed WebSocket clients on every worker."""
+    entity_name = update_data.get("entity_name")
     await websocket_manager.broadcast({
         "type": "sentiment_update",
         "timestamp": datetime.utcnow().isoformat(),
         "data": update_data
-    })
+    }, topic=entity_topic(entity_name) if entity_name else None)
 
 
 # Health check endpoint
@@ -505,6 +534,7 @@ async def sentiment_health_check():
             "status": "healthy",
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "worker_status": worker_status,
+            "websocket": websocket_manager.get_stats(),
             "services": {
                 "sentiment_processor": "active",
                 "trend_analyzer": "active",
@@ -1,11 +1,12 @@
 """Shared watchlist API endpoints for collaborative monitoring"""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func, desc
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, exists, func, desc, or_, select
 from typing import List, Optional
 from datetime import datetime
 
 from app.database import get_db
+from app.services.sync_db_lane import sync_db_endpoint
 from app.models.shared_watchlist import SharedWatchlist, watchlist_assignments
 from app.models.user import User
 from app.models.workspace import Workspace, WorkspaceMember, WorkspaceRole
@@ -26,6 +27,7 @@ from app.config import settings
 
 security = HTTPBearer()
 
+@sync_db_endpoint
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -134,9 +136,6 @@ def check_watchlist_permission(
             can_assign_users=False, is_creator=False, workspace_role="none"
         )
 
-    is_creator = watchlist.created_by == user.id
-    is_admin_or_owner = member.role in [WorkspaceRole.ADMIN, WorkspaceRole.OWNER]
-
     # Check if user is assigned to watchlist
     is_assigned = db.query(watchlist_assignments).filter(
         and_(
@@ -145,9 +144,22 @@ def check_watchlist_permission(
         )
     ).first() is not None
 
+    return resolve_watchlist_permissions(watchlist, user, member.role, is_assigned)
+
+
+def resolve_watchlist_permissions(
+    watchlist: SharedWatchlist,
+    user: User,
+    role: WorkspaceRole,
+    is_assigned: bool
+) -> WatchlistPermissionCheck:
+    """Evaluate watchlist permissions from an already-known workspace role and assignment"""
+    is_creator = watchlist.created_by == user.id
+    is_admin_or_owner = role in [WorkspaceRole.ADMIN, WorkspaceRole.OWNER]
+
     can_view = watchlist.is_public or is_creator or is_assigned or is_admin_or_owner
     can_edit = is_creator or is_admin_or_owner
-    can_delete = is_creator or member.role == WorkspaceRole.OWNER
+    can_delete = is_creator or role == WorkspaceRole.OWNER
     can_assign_users = is_creator or is_admin_or_owner
 
     return WatchlistPermissionCheck(
@@ -156,11 +168,75 @@ def check_watchlist_permission(
         can_delete=can_delete,
         can_assign_users=can_assign_users,
         is_creator=is_creator,
-        workspace_role=member.role.value
+        workspace_role=role.value
+    )
+
+
+def assigned_to(user: User):
+    """Correlated EXISTS: the watchlist in the enclosing query is assigned to `user`"""
+    return exists().where(
+        and_(
+            watchlist_assignments.c.shared_watchlist_id == SharedWatchlist.id,
+            watchlist_assignments.c.user_id == user.id
+        )
+    )
+
+
+def watchlist_details_query(db: Session, user: User):
+    """Watchlists with creator, watch item, counts and the user's assignment in one query.
+
+    Rows are (SharedWatchlist, creator User, WatchItem, assigned count,
+    comment count, is assigned to user); counts come from grouped subqueries
+    joined once rather than counted per watchlist.
+    """
+    assignment_counts = select(
+        watchlist_assignments.c.shared_watchlist_id.label("watchlist_id"),
+        func.count(watchlist_assignments.c.user_id).label("assigned_count")
+    ).group_by(watchlist_assignments.c.shared_watchlist_id).subquery()
+
+    comment_counts = select(
+        Comment.shared_watchlist_id.label("watchlist_id"),
+        func.count(Comment.id).label("comments_count")
+    ).where(Comment.shared_watchlist_id.isnot(None)).group_by(Comment.shared_watchlist_id).subquery()
+
+    return db.query(
+        SharedWatchlist,
+        User,
+        WatchItem,
+        func.coalesce(assignment_counts.c.assigned_count, 0),
+        func.coalesce(comment_counts.c.comments_count, 0),
+        assigned_to(user)
+    ).outerjoin(
+        User, User.id == SharedWatchlist.created_by
+    ).outerjoin(
+        WatchItem, WatchItem.id == SharedWatchlist.watch_item_id
+    ).outerjoin(
+        assignment_counts, assignment_counts.c.watchlist_id == SharedWatchlist.id
+    ).outerjoin(
+        comment_counts, comment_counts.c.watchlist_id == SharedWatchlist.id
+    )
+
+
+def build_watchlist_details(
+    watchlist: SharedWatchlist,
+    creator: Optional[User],
+    watch_item: Optional[WatchItem],
+    assigned_count: int,
+    comments_count: int
+) -> SharedWatchlistWithDetails:
+    return SharedWatchlistWithDetails(
+        **watchlist.__dict__,
+        creator_name=creator.full_name or creator.username if creator else "Unknown",
+        creator_email=creator.email if creator else "unknown@example.com",
+        watch_item_name=watch_item.competitor_name if watch_item else "Unknown",
+        watch_item_query=", ".join(watch_item.keywords or []) if watch_item else "",
+        assigned_users_count=assigned_count,
+        comments_count=comments_count
     )
 
 
 @router.post("/", response_model=SharedWatchlistResponse, status_code=status.HTTP_201_CREATED)
+@sync_db_endpoint
 async def create_shared_watchlist(
     workspace_id: int,
     watchlist_data: SharedWatchlistCreate,
@@ -206,6 +282,7 @@ async def create_shared_watchlist(
 
 
 @router.get("/workspace/{workspace_id}", response_model=List[SharedWatchlistWithDetails])
+@sync_db_endpoint
 async def list_workspace_watchlists(
     workspace_id: int,
     include_inactive: bool = Query(False, description="Include inactive watchlists"),
@@ -217,10 +294,9 @@ async def list_workspace_watchlists(
     # Check workspace permission
     member = check_workspace_permission(workspace_id, current_user, db, WorkspaceRole.GUEST)
 
-    query = db.query(SharedWatchlist).options(
-        joinedload(SharedWatchlist.watch_item),
-        joinedload(SharedWatchlist.assigned_users)
-    ).filter(SharedWatchlist.workspace_id == workspace_id)
+    query = watchlist_details_query(db, current_user).filter(
+        SharedWatchlist.workspace_id == workspace_id
+    )
 
     # Filter by active status
     if not include_inactive:
@@ -228,92 +304,65 @@ async def list_workspace_watchlists(
 
     # Filter by assignment
     if only_assigned:
-        query = query.join(watchlist_assignments).filter(
-            watchlist_assignments.c.user_id == current_user.id
+        query = query.filter(assigned_to(current_user))
+
+    # The member's role is the same for every watchlist, so visibility is
+    # applied in SQL: admins and owners see everything, others only what is
+    # public, their own or assigned to them
+    if member.role not in [WorkspaceRole.ADMIN, WorkspaceRole.OWNER]:
+        query = query.filter(
+            or_(
+                SharedWatchlist.is_public == True,
+                SharedWatchlist.created_by == current_user.id,
+                assigned_to(current_user)
+            )
         )
 
-    watchlists = query.order_by(desc(SharedWatchlist.created_at)).all()
+    rows = query.order_by(desc(SharedWatchlist.created_at)).all()
 
     # Build response with details
-    result = []
-    for watchlist in watchlists:
-        # Check if user can view this watchlist
-        permissions = check_watchlist_permission(watchlist, current_user, db)
-        if not permissions.can_view:
-            continue
-
-        # Get creator info
-        creator = db.query(User).filter(User.id == watchlist.created_by).first()
-        
-        # Get assignment and comment counts
-        assigned_count = db.query(func.count(watchlist_assignments.c.user_id)).filter(
-            watchlist_assignments.c.shared_watchlist_id == watchlist.id
-        ).scalar()
-        
-        comments_count = db.query(func.count(Comment.id)).filter(
-            Comment.shared_watchlist_id == watchlist.id
-        ).scalar()
-
-        watchlist_detail = SharedWatchlistWithDetails(
-            **watchlist.__dict__,
-            creator_name=creator.full_name or creator.username if creator else "Unknown",
-            creator_email=creator.email if creator else "unknown@example.com",
-            watch_item_name=watchlist.watch_item.name if watchlist.watch_item else "Unknown",
-            watch_item_query=watchlist.watch_item.query if watchlist.watch_item else "",
-            assigned_users_count=assigned_count,
-            comments_count=comments_count
-        )
-        result.append(watchlist_detail)
-
-    return result
+    return [
+        build_watchlist_details(watchlist, creator, watch_item, assigned_count, comments_count)
+        for watchlist, creator, watch_item, assigned_count, comments_count, _ in rows
+    ]
 
 
 @router.get("/{watchlist_id}", response_model=SharedWatchlistWithDetails)
+@sync_db_endpoint
 async def get_shared_watchlist(
     watchlist_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific shared watchlist"""
-    watchlist = db.query(SharedWatchlist).options(
-        joinedload(SharedWatchlist.watch_item)
-    ).filter(SharedWatchlist.id == watchlist_id).first()
+    row = watchlist_details_query(db, current_user).filter(SharedWatchlist.id == watchlist_id).first()
 
-    if not watchlist:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Shared watchlist not found"
         )
 
+    watchlist, creator, watch_item, assigned_count, comments_count, is_assigned = row
+
     # Check permissions
-    permissions = check_watchlist_permission(watchlist, current_user, db)
-    if not permissions.can_view:
+    member = db.query(WorkspaceMember).filter(
+        and_(
+            WorkspaceMember.workspace_id == watchlist.workspace_id,
+            WorkspaceMember.user_id == current_user.id
+        )
+    ).first()
+    if not member or not resolve_watchlist_permissions(watchlist, current_user, member.role, is_assigned).can_view:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to view this watchlist"
         )
 
-    # Get additional details
-    creator = db.query(User).filter(User.id == watchlist.created_by).first()
-    assigned_count = db.query(func.count(watchlist_assignments.c.user_id)).filter(
-        watchlist_assignments.c.shared_watchlist_id == watchlist.id
-    ).scalar()
-    comments_count = db.query(func.count(Comment.id)).filter(
-        Comment.shared_watchlist_id == watchlist.id
-    ).scalar()
-
-    return SharedWatchlistWithDetails(
-        **watchlist.__dict__,
-        creator_name=creator.full_name or creator.username if creator else "Unknown",
-        creator_email=creator.email if creator else "unknown@example.com",
-        watch_item_name=watchlist.watch_item.name if watchlist.watch_item else "Unknown",
-        watch_item_query=watchlist.watch_item.query if watchlist.watch_item else "",
-        assigned_users_count=assigned_count,
-        comments_count=comments_count
-    )
+    return build_watchlist_details(watchlist, creator, watch_item, assigned_count, comments_count)
 
 
 @router.put("/{watchlist_id}", response_model=SharedWatchlistResponse)
+@sync_db_endpoint
 async def update_shared_watchlist(
     watchlist_id: int,
     watchlist_update: SharedWatchlistUpdate,
@@ -350,6 +399,7 @@ async def update_shared_watchlist(
 
 
 @router.delete("/{watchlist_id}", status_code=status.HTTP_204_NO_CONTENT)
+@sync_db_endpoint
 async def delete_shared_watchlist(
     watchlist_id: int,
     db: Session = Depends(get_db),
@@ -377,6 +427,7 @@ async def delete_shared_watchlist(
 
 
 @router.post("/{watchlist_id}/assign", response_model=List[WatchlistAssignmentResponse])
+@sync_db_endpoint
 async def assign_users_to_watchlist(
     watchlist_id: int,
     assignment: WatchlistAssignment,
@@ -449,6 +500,7 @@ async def assign_users_to_watchlist(
 
 
 @router.delete("/{watchlist_id}/assign/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+@sync_db_endpoint
 async def unassign_user_from_watchlist(
     watchlist_id: int,
     user_id: int,
@@ -492,6 +544,7 @@ async def unassign_user_from_watchlist(
 
 
 @router.get("/{watchlist_id}/assignments", response_model=List[WatchlistAssignmentResponse])
+@sync_db_endpoint
 async def list_watchlist_assignments(
     watchlist_id: int,
     db: Session = Depends(get_db),
@@ -530,6 +583,7 @@ async def list_watchlist_assignments(
 
 
 @router.get("/workspace/{workspace_id}/stats", response_model=SharedWatchlistStats)
+@sync_db_endpoint
 async def get_workspace_watchlist_stats(
     workspace_id: int,
     db: Session = Depends(get_db),
@@ -595,6 +649,7 @@ async def get_workspace_watchlist_stats(
 
 
 @router.post("/bulk-operation", status_code=status.HTTP_200_OK)
+@sync_db_endpoint
 async def bulk_watchlist_operation(
     workspace_id: int,
     operation: BulkWatchlistOperation,
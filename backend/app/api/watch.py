@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
-from typing import List
+from typing import List, Optional
 from app.database import get_db
 from app.models.watch import WatchItem
+from app.pagination import count_rows, fetch_page
 from app.schemas.watch import WatchItemCreate, WatchItemUpdate, WatchItem as WatchItemSchema, WatchItemList
 
 router = APIRouter(prefix="/watch", tags=["watchlist"])
@@ -23,30 +24,26 @@ async def create_watch_item(
 @router.get("/", response_model=WatchItemList)
 async def get_watch_items(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     active_only: bool = True,
+    estimate_total: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all watchlist items"""
-    query = select(WatchItem)
-    
-    if active_only:
-        query = query.where(WatchItem.is_active == True)
-    
-    query = query.offset(skip).limit(limit).order_by(WatchItem.created_at.desc())
-    
-    result = await db.execute(query)
-    items = result.scalars().all()
-    
-    # Get total count
-    count_query = select(WatchItem)
+    """Get all watchlist items
+
+    Pass `next_cursor` from a response as `cursor` to fetch the next page.
+    """
+    filters = []
     if active_only:
-        count_query = count_query.where(WatchItem.is_active == True)
+        filters.append(WatchItem.is_active == True)
     
-    count_result = await db.execute(count_query)
-    total = len(count_result.scalars().all())
+    items, next_cursor = await fetch_page(
+        db, select(WatchItem).where(*filters), WatchItem, limit, cursor=cursor, skip=skip
+    )
+    total, is_estimate = await count_rows(db, WatchItem, filters, estimate=estimate_total)
     
-    return WatchItemList(items=items, total=total)
+    return WatchItemList(items=items, total=total, total_is_estimate=is_estimate, next_cursor=next_cursor)
 
 @router.get("/{watch_id}", response_model=WatchItemSchema)
 async def get_watch_item(
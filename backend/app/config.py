@@ -63,6 +63,98 @@ class Settings(BaseSettings):
     search_cache_ttl: int = 3600  # 1 hour
     ari_cache_ttl: int = 604800  # 7 days
 
+    # Shared You.com HTTP/Redis connection pools (application lifetime)
+    you_http_max_connections: int = int(os.getenv("YOU_HTTP_MAX_CONNECTIONS", "100"))
+    you_http_max_keepalive_connections: int = int(os.getenv("YOU_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    you_http_keepalive_expiry: float = float(os.getenv("YOU_HTTP_KEEPALIVE_EXPIRY", "30"))
+    you_http2_enabled: bool = os.getenv("YOU_HTTP2_ENABLED", "true").lower() == "true"
+    you_news_timeout: float = float(os.getenv("YOU_NEWS_TIMEOUT", "60"))
+    you_search_timeout: float = float(os.getenv("YOU_SEARCH_TIMEOUT", "60"))
+    you_chat_timeout: float = float(os.getenv("YOU_CHAT_TIMEOUT", "60"))
+    you_ari_timeout: float = float(os.getenv("YOU_ARI_TIMEOUT", "60"))
+    redis_max_connections: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+
+    # Batched ApiCallLog writer
+    api_log_batch_size: int = int(os.getenv("API_LOG_BATCH_SIZE", "100"))
+    api_log_flush_interval: float = float(os.getenv("API_LOG_FLUSH_INTERVAL", "2.0"))
+    api_log_queue_size: int = int(os.getenv("API_LOG_QUEUE_SIZE", "10000"))
+    api_usage_rollups_enabled: bool = os.getenv("API_USAGE_ROLLUPS_ENABLED", "true").lower() == "true"
+
+    # List endpoints: planner row estimates above this are returned as-is
+    # instead of running an exact COUNT(*) (when estimate_total=true)
+    list_count_estimate_threshold: int = int(os.getenv("LIST_COUNT_ESTIMATE_THRESHOLD", "10000"))
+
+    # Run independent News/Search/ARI stages of impact card generation concurrently
+    impact_card_concurrent_stages: bool = os.getenv("IMPACT_CARD_CONCURRENT_STAGES", "true").lower() == "true"
+
+    # Single-flight coalescing of identical in-flight You.com queries
+    you_request_coalescing_enabled: bool = os.getenv("YOU_REQUEST_COALESCING_ENABLED", "true").lower() == "true"
+    you_coalesce_lock_ttl: float = float(os.getenv("YOU_COALESCE_LOCK_TTL", "90"))
+    you_coalesce_wait_timeout: float = float(os.getenv("YOU_COALESCE_WAIT_TIMEOUT", "75"))
+
+    # In-process L1 tier of the advanced cache manager (in front of Redis)
+    cache_l1_ttl_seconds: float = float(os.getenv("CACHE_L1_TTL_SECONDS", "300"))
+    cache_l1_budget_fraction: float = float(os.getenv("CACHE_L1_BUDGET_FRACTION", "0.1"))
+    cache_early_refresh_beta: float = float(os.getenv("CACHE_EARLY_REFRESH_BETA", "1.0"))
+
+    # Cache entry codec ("auto" picks msgpack and zstd > lz4 > zlib when installed)
+    cache_codec_serializer: str = os.getenv("CACHE_CODEC_SERIALIZER", "auto")
+    cache_codec_compressor: str = os.getenv("CACHE_CODEC_COMPRESSOR", "auto")
+    cache_compression_threshold: int = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024"))
+    cache_zstd_level: int = int(os.getenv("CACHE_ZSTD_LEVEL", "3"))
+    cache_zlib_level: int = int(os.getenv("CACHE_ZLIB_LEVEL", "1"))
+
+    # ML training process pool
+    ml_training_max_concurrent_jobs: int = int(os.getenv("ML_TRAINING_MAX_CONCURRENT_JOBS", "2"))
+    ml_training_start_method: str = os.getenv("ML_TRAINING_START_METHOD", "spawn")
+    ml_training_progress_interval: float = float(os.getenv("ML_TRAINING_PROGRESS_INTERVAL", "1.0"))
+
+    # Vectorized batch inference (resident models keyed by version)
+    ml_batch_max_resident_models: int = int(os.getenv("ML_BATCH_MAX_RESIDENT_MODELS", "8"))
+    ml_batch_version_ttl: float = float(os.getenv("ML_BATCH_VERSION_TTL", "30"))
+
+    # Performance monitor metric storage: mergeable sketches per window plus
+    # raw samples in one sorted set per metric, written by a pipelined flush
+    metrics_sketch_window_seconds: int = int(os.getenv("METRICS_SKETCH_WINDOW_SECONDS", "60"))
+    metrics_sketch_retention_minutes: int = int(os.getenv("METRICS_SKETCH_RETENTION_MINUTES", "120"))
+    metrics_flush_interval: float = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+    metrics_series_retention_minutes: int = int(os.getenv("METRICS_SERIES_RETENTION_MINUTES", "60"))
+    metrics_series_max_samples: int = int(os.getenv("METRICS_SERIES_MAX_SAMPLES", "10000"))
+
+    # WebSocket broadcast fan-out: per-connection send queues, slow-consumer
+    # policy ("drop_oldest" or "disconnect") and cross-worker Redis relay
+    websocket_send_queue_size: int = int(os.getenv("WEBSOCKET_SEND_QUEUE_SIZE", "256"))
+    websocket_slow_consumer_policy: str = os.getenv("WEBSOCKET_SLOW_CONSUMER_POLICY", "drop_oldest")
+    websocket_max_dropped_frames: int = int(os.getenv("WEBSOCKET_MAX_DROPPED_FRAMES", "1000"))
+    websocket_send_timeout: float = float(os.getenv("WEBSOCKET_SEND_TIMEOUT", "10.0"))
+    websocket_relay_enabled: bool = os.getenv("WEBSOCKET_RELAY_ENABLED", "true").lower() == "true"
+
+    # Socket.IO: Redis message queue URL for multi-worker delivery (empty keeps
+    # the in-process manager), frame logging, and progress event coalescing
+    socketio_message_queue: str = os.getenv("SOCKETIO_MESSAGE_QUEUE", "")
+    socketio_logging: bool = os.getenv("SOCKETIO_LOGGING", "false").lower() == "true"
+    socketio_coalesce_window_ms: int = int(os.getenv("SOCKETIO_COALESCE_WINDOW_MS", "250"))
+
+    # Authenticated principal cache (per process, 0 disables) and write-behind
+    # "last seen" timestamps flushed in batches
+    principal_cache_ttl_seconds: float = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+    principal_cache_max_entries: int = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+    last_seen_flush_interval: float = float(os.getenv("LAST_SEEN_FLUSH_INTERVAL", "30"))
+
+    # Sync-ORM lane: services on the synchronous Session API run in a bounded
+    # thread pool with their own engine (empty URL derives it from DATABASE_URL),
+    # plus the event loop lag sampler that shows what still blocks the loop
+    sync_db_max_workers: int = int(os.getenv("SYNC_DB_MAX_WORKERS", "8"))
+    sync_database_url: str = os.getenv("SYNC_DATABASE_URL", "")
+    loop_lag_interval: float = float(os.getenv("LOOP_LAG_INTERVAL", "0.1"))
+    loop_lag_threshold_ms: float = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "20"))
+
+    # PDF rendering: ReportLab runs in worker processes and rendered reports
+    # are cached on disk by content hash (empty dir uses the system temp dir)
+    pdf_render_workers: int = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+    pdf_cache_dir: str = os.getenv("PDF_CACHE_DIR", "")
+    pdf_cache_max_bytes: int = int(os.getenv("PDF_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
     # Email Configuration for sharing reports
     smtp_host: str = os.getenv("SMTP_HOST", "smtp.gmail.com")
     smtp_port: int = int(os.getenv("SMTP_PORT", "587"))
@@ -99,7 +191,14 @@ class Settings(BaseSettings):
     # HubSpot Integration Configuration
     hubspot_client_id: str = os.getenv("HUBSPOT_CLIENT_ID", "")
     hubspot_client_secret: SecretStr = SecretStr(os.getenv("HUBSPOT_CLIENT_SECRET", ""))
-    
+    # Override to point the client at a local mock HubSpot server
+    hubspot_api_base_url: str = os.getenv("HUBSPOT_API_BASE_URL", "https://api.hubapi.com")
+
+    # HubSpot batch sync: records per batch call (HubSpot caps batches at 100)
+    # and batch requests in flight within the client's rate budget
+    hubspot_sync_batch_size: int = int(os.getenv("HUBSPOT_SYNC_BATCH_SIZE", "100"))
+    hubspot_sync_concurrency: int = int(os.getenv("HUBSPOT_SYNC_CONCURRENCY", "4"))
+
     # Data directory for ML models and storage
     data_dir: str = os.getenv("DATA_DIR") or str(Path(__file__).resolve().parent.parent.parent / "data")
 
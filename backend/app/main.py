@@ -21,8 +21,15 @@ from app.database import engine, Base, get_db
 from app.api import watch, impact, research
 from app.api import metrics, notifications, feedback
 from app.api import auth, workspaces, analytics
-from app.realtime import sio
+from app.realtime import flush_progress, sio
 from app.services.scheduler import alert_scheduler
+from app.services.you_client_pool import you_client_pool
+from app.services.api_call_log_writer import api_call_log_writer
+from app.services.principal_cache import last_seen_tracker
+from app.services.ml_training_pool import training_process_pool
+from app.services.ml_performance_optimizer import ml_batch_processor
+from app.services.sync_db_lane import loop_lag_monitor, sync_db_lane
+from app.services.pdf_render_pool import pdf_render_pool
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.impact_card import ImpactCard
@@ -58,6 +65,13 @@ async def lifespan(app: FastAPI):
         logger.warning(f"Database table creation skipped: {e}")
         logger.info("✅ Database connection established")
     
+    # Open shared You.com HTTP/Redis connection pools
+    await you_client_pool.start()
+    await api_call_log_writer.start()
+    await last_seen_tracker.start()
+    await loop_lag_monitor.start()
+    await ml_batch_processor.start()
+
     # Start automated alert scheduler
     await alert_scheduler.start()
     logger.info("🔔 Automated alert scheduler started")
@@ -79,37 +93,24 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Performance monitoring failed to start: {e}")
     
+    # Relay sentiment WebSocket broadcasts across workers
+    try:
+        from app.api.sentiment import websocket_manager
+        await websocket_manager.start()
+    except Exception as e:
+        logger.warning(f"⚠️ Sentiment WebSocket relay failed to start: {e}")
+    
     # Initialize enhancement features
     try:
         from app.services.personal_playbook_service import PersonalPlaybookService
         from app.services.action_tracker_service import ActionTrackerService
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import sessionmaker
-        
-        # Create sync engine from async database URL (convert asyncpg to psycopg2)
-        sync_db_url = settings.database_url.replace("+asyncpg", "").replace("postgresql+asyncpg://", "postgresql://")
-        sync_engine = create_engine(sync_db_url, pool_pre_ping=True)
-        SyncSessionLocal = sessionmaker(bind=sync_engine, autocommit=False, autoflush=False)
-        
-        # Create sync session for initialization (services use sync SQLAlchemy)
-        db = SyncSessionLocal()
-        try:
-            # Initialize built-in personas (async call but service uses sync DB)
-            playbook_service = PersonalPlaybookService(db)
-            # Run the async method - it uses sync DB operations, so it will work
-            await playbook_service.initialize_builtin_personas()
-            logger.info("✅ Built-in persona presets initialized")
-            
-            # Initialize built-in action templates (async call but service uses sync DB)
-            action_service = ActionTrackerService(db)
-            await action_service.initialize_builtin_templates()
-            logger.info("✅ Built-in action templates initialized")
-        except Exception as e:
-            db.rollback()
-            raise
-        finally:
-            db.close()
-            sync_engine.dispose()
+
+        # These services use sync SQLAlchemy, so they run in the sync DB lane
+        await sync_db_lane.run(lambda db: PersonalPlaybookService(db).initialize_builtin_personas())
+        logger.info("✅ Built-in persona presets initialized")
+
+        await sync_db_lane.run(lambda db: ActionTrackerService(db).initialize_builtin_templates())
+        logger.info("✅ Built-in action templates initialized")
     except Exception as e:
         logger.warning(f"⚠️ Enhancement features initialization failed: {e}")
     
@@ -126,6 +127,22 @@ async def lifespan(app: FastAPI):
         logger.info("⏹️ Advanced orchestration monitoring stopped")
     except Exception as e:
         logger.warning(f"⚠️ Performance monitoring failed to stop: {e}")
+
+    try:
+        from app.api.sentiment import websocket_manager
+        await websocket_manager.stop()
+    except Exception as e:
+        logger.warning(f"⚠️ Sentiment WebSocket relay failed to stop: {e}")
+
+    await flush_progress()
+    await api_call_log_writer.stop()
+    await last_seen_tracker.stop()
+    await ml_batch_processor.stop()
+    await training_process_pool.shutdown()
+    await sync_db_lane.shutdown()
+    await pdf_render_pool.shutdown()
+    await loop_lag_monitor.stop()
+    await you_client_pool.close()
     logger.info("🛑 Shutting down Enterprise CIA Backend")
 
 # Create FastAPI app
@@ -178,6 +195,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],  # Explicit methods instead of "*"
     allow_headers=["Content-Type", "Authorization", "X-Request-ID"],  # Explicit headers
+    expose_headers=["X-Next-Cursor"],  # Cursor for list endpoints that return bare arrays
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
@@ -389,6 +407,7 @@ async def check_resilience_status():
     from app.services.resilient_you_client import ResilientYouComOrchestrator
     
     async with ResilientYouComOrchestrator() as client:
+        await client.refresh_shared_state()
         health_status = client.get_health_status()
         
         # Add summary metrics
@@ -6,262 +6,201 @@ Provides middleware for:
 - Request/response logging
 - Performance tracking
 - Error handling with structured responses
+- Security headers
 """
 
 import time
 import logging
-from typing import Callable
-from fastapi import Request, Response
+from typing import Optional
+
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.logging_config import set_request_id, get_logger
 from app.exceptions import EnterpriseBaseException, format_exception_for_api
+from app.security_headers import apply_headers, build_security_headers
 
 
 logger = get_logger(__name__)
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestContextMiddleware:
     """
-    Middleware to add request ID to all requests
-
-    Generates or extracts request ID and makes it available throughout
-    the request lifecycle via context variables.
-
-    Request ID can be provided by client via X-Request-ID header,
-    or will be auto-generated.
+    Single pure-ASGI middleware for request ID, logging, error handling,
+    performance tracking and security headers.
+
+    These used to be five BaseHTTPMiddleware layers; each one ran the rest of
+    the stack in a separate task and re-wrapped the response body stream,
+    which added overhead to every request and buffered StreamingResponse
+    chunks through an extra queue per layer. Here the response messages pass
+    straight through and only the `http.response.start` headers are edited.
+
+    Per request:
+    - Request ID is taken from the X-Request-ID header (or generated), set in
+      the logging context and request.state, and returned in X-Request-ID
+    - X-Response-Time carries the time until the response headers were sent
+    - Unhandled exceptions become structured JSON errors
+      (EnterpriseBaseException keeps its status code, anything else is a 500)
+    - Method, path, status and total duration are logged once the response
+      is complete; slow requests (>2s warning, >5s critical) are flagged
+    - Security headers are added to every response
     """
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable
-    ) -> Response:
-        # Get or generate request ID
-        request_id = request.headers.get("X-Request-ID")
-        request_id = set_request_id(request_id)
-
-        # Add to request state for easy access
-        request.state.request_id = request_id
-
-        # Call next middleware/endpoint
-        response = await call_next(request)
-
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
-
-        return response
+    SLOW_REQUEST_WARNING_MS = 2000
+    SLOW_REQUEST_CRITICAL_MS = 5000
 
+    def __init__(self, app: ASGIApp, environment: str = "development"):
+        self.app = app
+        self.security_headers = build_security_headers(environment)
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to log all requests and responses with performance metrics
-
-    Logs:
-    - Request method, path, query params
-    - Response status code
-    - Request duration
-    - Client IP
-    - User agent
-    """
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable
-    ) -> Response:
         start_time = time.perf_counter()
-
-        # Extract request info
-        method = request.method
-        path = request.url.path
-        query_params = str(request.query_params) if request.query_params else None
-        client_ip = request.client.host if request.client else None
-        user_agent = request.headers.get("User-Agent")
+        request_headers = Headers(scope=scope)
+
+        # Get or generate request ID and add it to request state
+        request_id = set_request_id(request_headers.get("x-request-id"))
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        status_code: Optional[int] = None
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                apply_headers(message, [
+                    ("X-Request-ID", request_id),
+                    ("X-Response-Time", f"{duration_ms:.2f}ms"),
+                    *self.security_headers,
+                ])
+            await send(message)
 
         try:
-            # Process request
-            response = await call_next(request)
-
-            # Calculate duration
-            duration_ms = (time.perf_counter() - start_time) * 1000
-
-            # Log successful request
-            logger.info(
-                f"{method} {path} - {response.status_code}",
-                extra={
-                    "method": method,
-                    "path": path,
-                    "query_params": query_params,
-                    "status_code": response.status_code,
-                    "duration_ms": round(duration_ms, 2),
-                    "client_ip": client_ip,
-                    "user_agent": user_agent,
-                }
-            )
-
-            return response
-
+            await self.app(scope, receive, send_with_headers)
         except Exception as exc:
-            # Calculate duration for failed requests
-            duration_ms = (time.perf_counter() - start_time) * 1000
-
-            # Log failed request
-            logger.error(
-                f"{method} {path} - ERROR",
-                exc_info=True,
-                extra={
-                    "method": method,
-                    "path": path,
-                    "query_params": query_params,
-                    "duration_ms": round(duration_ms, 2),
-                    "client_ip": client_ip,
-                    "user_agent": user_agent,
-                    "error": str(exc),
-                }
-            )
-
-            # Re-raise to let error handler deal with it
-            raise
-
-
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to handle exceptions and return structured error responses
-
-    Converts custom exceptions to structured JSON responses with:
-    - Error code
-    - User-friendly message
-    - Request ID
-    - Timestamp
-    - Details (when appropriate)
-    """
-
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable
-    ) -> Response:
-        try:
-            return await call_next(request)
-
-        except EnterpriseBaseException as exc:
+            if status_code is not None:
+                # Headers are already on the wire; nothing left to convert
+                self._log_request(scope, request_headers, start_time, status_code, exc)
+                raise
+            response = self._error_response(scope, request_id, exc)
+            await response(scope, receive, send_with_headers)
+
+        self._log_request(scope, request_headers, start_time, status_code)
+
+    def _error_response(self, scope: Scope, request_id: str, exc: Exception) -> JSONResponse:
+        """Convert an exception to a structured JSON error response"""
+        if isinstance(exc, EnterpriseBaseException):
             # Handle our custom exceptions
             logger.error(
                 f"Enterprise exception: {exc.message}",
-                exc_info=True,
-                extra=exc.to_dict()
+                exc_info=exc,
+                extra={
+                    "error_code": exc.error_code,
+                    "status_code": exc.status_code,
+                    "details": exc.details,
+                }
             )
 
             response_data = format_exception_for_api(exc)
-            response_data["request_id"] = getattr(request.state, "request_id", None)
+            response_data["request_id"] = request_id
 
             return JSONResponse(
                 status_code=exc.status_code,
                 content=response_data
             )
 
-        except Exception as exc:
-            # Handle unexpected exceptions
-            logger.exception(
-                "Unexpected exception",
-                extra={
-                    "path": request.url.path,
-                    "method": request.method,
-                }
-            )
-
-            return JSONResponse(
-                status_code=500,
-                content={
-                    "error": "InternalServerError",
-                    "message": "An unexpected error occurred",
-                    "request_id": getattr(request.state, "request_id", None),
-                    "details": {
-                        "type": type(exc).__name__,
-                        # Don't expose full error message in production
-                        "message": str(exc) if logger.level == logging.DEBUG else "Internal error"
-                    }
+        # Handle unexpected exceptions
+        logger.error(
+            "Unexpected exception",
+            exc_info=exc,
+            extra={
+                "path": scope["path"],
+                "method": scope["method"],
+            }
+        )
+
+        return JSONResponse(
+            status_code=500,
+            content={
+                "error": "InternalServerError",
+                "message": "An unexpected error occurred",
+                "request_id": request_id,
+                "details": {
+                    "type": type(exc).__name__,
+                    # Don't expose full error message in production
+                    "message": str(exc) if logger.level == logging.DEBUG else "Internal error"
                 }
-            )
+            }
+        )
 
-
-class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to track performance metrics
-
-    Tracks:
-    - Slow requests (>2s warning, >5s critical)
-    - Request distribution by endpoint
-    - Average response times
-    """
-
-    SLOW_REQUEST_WARNING_MS = 2000
-    SLOW_REQUEST_CRITICAL_MS = 5000
-
-    async def dispatch(
+    def _log_request(
         self,
-        request: Request,
-        call_next: Callable
-    ) -> Response:
-        start_time = time.perf_counter()
-
-        response = await call_next(request)
-
+        scope: Scope,
+        request_headers: Headers,
+        start_time: float,
+        status_code: Optional[int],
+        exc: Optional[Exception] = None
+    ) -> None:
         duration_ms = (time.perf_counter() - start_time) * 1000
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        query_string = scope.get("query_string", b"").decode("latin-1")
+
+        extra = {
+            "method": method,
+            "path": path,
+            "query_params": query_string or None,
+            "status_code": status_code,
+            "duration_ms": round(duration_ms, 2),
+            "client_ip": client[0] if client else None,
+            "user_agent": request_headers.get("user-agent"),
+        }
+        if exc is None:
+            logger.info(f"{method} {path} - {status_code}", extra=extra)
+        else:
+            # Failed mid-stream, after the status line was sent
+            logger.error(f"{method} {path} - ERROR", exc_info=exc, extra={**extra, "error": str(exc)})
 
         # Log slow requests
         if duration_ms >= self.SLOW_REQUEST_CRITICAL_MS:
             logger.critical(
-                f"CRITICAL: Slow request {request.method} {request.url.path}",
+                f"CRITICAL: Slow request {method} {path}",
                 extra={
                     "duration_ms": round(duration_ms, 2),
                     "threshold": "critical",
-                    "path": request.url.path,
+                    "path": path,
                 }
             )
         elif duration_ms >= self.SLOW_REQUEST_WARNING_MS:
             logger.warning(
-                f"WARNING: Slow request {request.method} {request.url.path}",
+                f"WARNING: Slow request {method} {path}",
                 extra={
                     "duration_ms": round(duration_ms, 2),
                     "threshold": "warning",
-                    "path": request.url.path,
+                    "path": path,
                 }
             )
 
-        # Add performance header
-        response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
-
-        return response
-
 
 def setup_middleware(app):
     """
-    Add all middleware to FastAPI app in correct order
-
-    Order matters! Middleware is applied in reverse order (last added = first executed)
+    Add the request middleware to the FastAPI app
 
-    Execution order:
-    1. SecurityHeadersMiddleware (outermost - adds security headers)
-    2. PerformanceMonitoringMiddleware (tracks total time)
-    3. RequestLoggingMiddleware (logs requests/responses)
-    4. ErrorHandlingMiddleware (catches errors)
-    5. RequestIDMiddleware (innermost - sets up request ID)
+    RequestContextMiddleware handles request IDs, logging, error handling,
+    performance headers and security headers in one pure-ASGI layer.
 
     Usage:
         from app.middleware import setup_middleware
         setup_middleware(app)
     """
-    from app.security_headers import SecurityHeadersMiddleware
     from app.config import settings
 
-    # Add in reverse order (LIFO)
-    app.add_middleware(RequestIDMiddleware)
-    app.add_middleware(ErrorHandlingMiddleware)
-    app.add_middleware(RequestLoggingMiddleware)
-    app.add_middleware(PerformanceMonitoringMiddleware)
-    app.add_middleware(SecurityHeadersMiddleware, environment=settings.environment)
+    app.add_middleware(RequestContextMiddleware, environment=settings.environment)
 
-    logger.info("✅ Middleware configured: SecurityHeaders, RequestID, Logging, ErrorHandling, Performance")
+    logger.info("✅ Middleware configured: RequestContext (request ID, logging, errors, performance, security headers)")
@@ -2,9 +2,10 @@
 
 # Core models
 from .watch import WatchItem  # noqa: F401
-from .impact_card import ImpactCard  # noqa: F401
+from .impact_card import ImpactCard, ImpactCardPayload  # noqa: F401
 from .company_research import CompanyResearch  # noqa: F401
 from .api_call_log import ApiCallLog  # noqa: F401
+from .api_usage_rollup import ApiUsageRollup  # noqa: F401
 from .notification import NotificationRule, NotificationLog  # noqa: F401
 from .feedback import InsightFeedback  # noqa: F401
 
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class ApiUsageRollup(Base):
+    """Hourly per-api_type aggregate of `ApiCallLog` rows.
+
+    Maintained incrementally by the API call log writer so usage metrics never
+    have to scan the raw call log. `latency_sketch` is a serialized
+    `LatencySketch`, mergeable across hours for percentile queries.
+    """
+
+    __tablename__ = "api_usage_rollups"
+    __table_args__ = (
+        UniqueConstraint("bucket_start", "api_type", name="uq_api_usage_rollups_bucket_api_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    bucket_start = Column(DateTime(timezone=True), nullable=False, index=True)
+    api_type = Column(String(50), nullable=False)
+    call_count = Column(Integer, nullable=False, default=0)
+    success_count = Column(Integer, nullable=False, default=0)
+    latency_sum_ms = Column(Float, nullable=False, default=0.0)
+    latency_max_ms = Column(Float, nullable=True)
+    latency_sketch = Column(JSON, nullable=True)
+    last_call_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self) -> str:
+        return f"<ApiUsageRollup(bucket_start={self.bucket_start}, api_type={self.api_type}, calls={self.call_count})>"
@@ -22,7 +22,8 @@ class Comment(Base):
     annotations = Column(JSON, nullable=True)  # For highlighting specific sections
 
     # Threading support
-    parent_comment_id = Column(Integer, ForeignKey("comments.id"), nullable=True)
+    parent_comment_id = Column(Integer, ForeignKey("comments.id"), nullable=True, index=True)
+    reply_count = Column(Integer, default=0, server_default="0", nullable=False)  # Direct replies, kept in sync by the API
 
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, ForeignKey, Float, Boolean
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.ext.associationproxy import association_proxy
 from app.database import Base
 
 class ImpactCard(Base):
@@ -22,20 +23,19 @@ class ImpactCard(Base):
     key_insights = Column(JSON, default=list)  # List of insights
     recommended_actions = Column(JSON, default=list)  # List of action objects
     next_steps_plan = Column(JSON, default=list)  # Ranked action plan with enrichment
-    explainability = Column(JSON, default=dict)
+    # Detail-only JSON columns are deferred so queries over impact_cards fetch
+    # narrow rows; load them with undefer_group("details") where needed
+    explainability = deferred(Column(JSON, default=dict), group="details", raiseload=True)
 
     # Source information
     total_sources = Column(Integer, default=0)
     source_breakdown = Column(JSON, default=dict)  # Breakdown by API type
-    source_quality = Column(JSON, default=dict)
+    source_quality = deferred(Column(JSON, default=dict), group="details", raiseload=True)
 
     # API usage tracking
-    api_usage = Column(JSON, default=dict)  # Track You.com API calls
+    api_usage = deferred(Column(JSON, default=dict), group="details", raiseload=True)  # Track You.com API calls
     processing_time = Column(String(100), nullable=True)
     
-    # Raw data from You.com APIs
-    raw_data = Column(JSON, default=dict)  # Complete API responses
-    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -48,6 +48,40 @@ class ImpactCard(Base):
     reasoning_steps = relationship("ReasoningStep", back_populates="impact_card", cascade="all, delete-orphan")
     source_analyses = relationship("SourceCredibilityAnalysis", back_populates="impact_card", cascade="all, delete-orphan")
     uncertainty_detections = relationship("UncertaintyDetection", back_populates="impact_card", cascade="all, delete-orphan")
+
+    # Raw data from You.com APIs (complete responses) lives in impact_card_payloads;
+    # load it explicitly with selectinload(ImpactCard.payload)
+    payload = relationship(
+        "ImpactCardPayload",
+        back_populates="impact_card",
+        uselist=False,
+        lazy="raise",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    raw_data = association_proxy(
+        "payload", "raw_data", creator=lambda raw_data: ImpactCardPayload(raw_data=raw_data)
+    )
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("raw_data", {})
+        super().__init__(**kwargs)
     
     def __repr__(self):
         return f"<ImpactCard(id={self.id}, competitor='{self.competitor_name}', risk_score={self.risk_score})>"
+
+
+
+class ImpactCardPayload(Base):
+    """Large, rarely read payloads of an impact card, kept off the main row"""
+    __tablename__ = "impact_card_payloads"
+
+    impact_card_id = Column(Integer, ForeignKey("impact_cards.id", ondelete="CASCADE"), primary_key=True)
+    raw_data = Column(JSON, default=dict)  # Complete API responses
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    impact_card = relationship("ImpactCard", back_populates="payload")
+
+    def __repr__(self):
+        return f"<ImpactCardPayload(impact_card_id={self.impact_card_id})>"
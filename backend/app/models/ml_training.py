@@ -68,7 +68,10 @@ class TrainingJob(Base):
     trigger_type = Column(String(50), nullable=False, index=True)  # scheduled, performance_drop, feedback_threshold
     
     # Job status
-    status = Column(String(20), nullable=False, default="pending", index=True)  # pending, running, completed, failed
+    status = Column(String(20), nullable=False, default="pending", index=True)  # pending, running, completed, failed, cancelled
+    progress = Column(Float, nullable=False, default=0.0)  # 0.0-1.0, reported by the training worker
+    progress_stage = Column(String(50), nullable=True)  # preparing_data, queued, fitting, evaluating, saving...
+    cancel_requested = Column(Boolean, nullable=False, default=False)
     
     # Model versioning
     previous_model_version = Column(String(100), nullable=True)
@@ -0,0 +1,177 @@
+"""
+Keyset pagination, counting and field projection for list endpoints.
+
+List endpoints used to page with OFFSET and compute `total` by loading
+every matching row and calling len() on it. Pages are now addressed by an
+opaque cursor over (created_at, id), so the database seeks straight to the
+page through the created_at index however deep it is. Totals come from
+SELECT count(*), or from the planner's row estimate when the caller accepts
+an approximate total on a large table.
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql import ClauseElement, Executable, Select
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Columns every projection needs to build the next cursor
+CURSOR_FIELDS = ("id", "created_at")
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just past the row (created_at, row_id)"""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        ) from e
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """Validate a comma-separated `fields=` parameter against a response schema"""
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(schema.model_fields))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return list(dict.fromkeys([*CURSOR_FIELDS, *requested]))
+
+
+def loader_options(model, fields: Optional[Sequence[str]], default: Sequence[Any] = ()) -> list:
+    """Column loading options: only the projected fields, else `default`"""
+    if fields:
+        columns = [getattr(model, name) for name in fields if name in model.__table__.columns]
+        return [load_only(*columns)]
+    return list(default)
+
+
+def project_items(items: Iterable[Any], schema: Type[BaseModel], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """Validate and serialize only the projected fields of each row.
+
+    Unprojected columns were never loaded, so fields are read one by one
+    instead of validating the whole row (which would lazy-load the rest).
+    """
+    adapters = {name: TypeAdapter(schema.model_fields[name].annotation) for name in fields}
+    projected = []
+    for item in items:
+        row = {}
+        for name, adapter in adapters.items():
+            value = adapter.validate_python(getattr(item, name))
+            row[name] = adapter.dump_python(value, mode="json")
+        projected.append(row)
+    return projected
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    model,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """Newest-first page of `query` and the cursor for the page after it.
+
+    `skip` keeps OFFSET paging working for existing clients; it is ignored
+    when a cursor is given.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id),
+        ))
+    elif skip:
+        query = query.offset(skip)
+
+    # One extra row tells us whether another page exists without counting
+    query = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+    result = await db.execute(query)
+    items = list(result.scalars().all())
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return items, next_cursor
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapped around a SELECT, keeping its bound parameters"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def _estimated_rows(db: AsyncSession, query: Select) -> Optional[int]:
+    """Planner row estimate for `query` (PostgreSQL only)"""
+    if db.bind.dialect.name != "postgresql":
+        return None
+    # Filter values (user search terms included) stay bound parameters; they
+    # are never rendered into SQL text where a ':name' would be re-parsed
+    # A savepoint keeps a failed EXPLAIN from aborting the caller's transaction
+    async with db.begin_nested():
+        result = await db.execute(_Explain(query))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    db: AsyncSession,
+    model,
+    filters: Sequence[Any] = (),
+    estimate: bool = False,
+) -> Tuple[int, bool]:
+    """Number of rows matching `filters` and whether it is an estimate.
+
+    With `estimate`, the planner's row estimate is used when it is above
+    LIST_COUNT_ESTIMATE_THRESHOLD; smaller results get an exact count, which
+    is cheap at that size and keeps totals exact where users notice them.
+    """
+    if estimate:
+        try:
+            estimated = await _estimated_rows(db, select(model.id).where(*filters))
+        except Exception as e:
+            logger.warning(f"⚠️ Row estimate failed, falling back to COUNT(*): {str(e)}")
+            estimated = None
+        if estimated is not None and estimated >= settings.list_count_estimate_threshold:
+            return estimated, True
+
+    total = await db.scalar(select(func.count()).select_from(model).where(*filters))
+    return int(total or 0), False
@@ -1,25 +1,172 @@
-"""Socket.IO configuration and helpers for real-time updates."""
+"""Socket.IO configuration and helpers for real-time updates.
 
-from typing import Any, Dict, Optional
+With SOCKETIO_MESSAGE_QUEUE set to a Redis URL, emits go through a Redis
+client manager so clients connected to any worker receive them. Bursts of
+the same progress event for a room are coalesced: the first is sent
+immediately, later ones within SOCKETIO_COALESCE_WINDOW_MS are merged and
+sent once at the end of the window.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 import socketio
 
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Events that report intermediate state, where only the latest matters
+COALESCED_EVENTS = {"impact_generation_step", "system_health"}
+
+# Payload fields that keep concurrent streams in the same room apart
+COALESCE_KEY_FIELDS = ("competitor",)
+
+BROADCAST_ROOM = "*"
+
+
+def _build_client_manager() -> Optional[socketio.AsyncManager]:
+    if not settings.socketio_message_queue:
+        return None
+    try:
+        return socketio.AsyncRedisManager(settings.socketio_message_queue)
+    except Exception as e:
+        logger.warning(f"⚠️ Socket.IO Redis manager unavailable, emitting to local clients only: {e}")
+        return None
+
+
 # Shared Socket.IO server instance used across the backend
 sio = socketio.AsyncServer(
     async_mode="asgi",
     cors_allowed_origins="*",
-    logger=True,
-    engineio_logger=True,
+    client_manager=_build_client_manager(),
+    logger=settings.socketio_logging,
+    engineio_logger=settings.socketio_logging,
 )
 
+CoalesceKey = Tuple[Optional[str], str, Tuple[Any, ...]]
+
+
+class ProgressCoalescer:
+    """Merges rapid successive events per (room, event, stream) within a window"""
+
+    def __init__(
+        self,
+        emit: Callable[[str, Dict[str, Any], Optional[str]], Awaitable[None]],
+        window_seconds: float,
+    ):
+        self._emit = emit
+        self.window_seconds = window_seconds
+        self._pending: Dict[CoalesceKey, Dict[str, Any]] = {}
+        self._windows: Dict[CoalesceKey, asyncio.Task] = {}
+        self.room_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"emitted": 0, "coalesced": 0})
+
+    def _key(self, event: str, payload: Dict[str, Any], room: Optional[str]) -> CoalesceKey:
+        return room, event, tuple(payload.get(field) for field in COALESCE_KEY_FIELDS)
+
+    async def emit(self, event: str, payload: Dict[str, Any], room: Optional[str]) -> None:
+        """Send now (and flush the room's merged events first, to keep order)"""
+        await self.flush_room(room)
+        await self._send(event, payload, room)
+
+    async def submit(self, event: str, payload: Dict[str, Any], room: Optional[str]) -> None:
+        """Send now if the window is idle, otherwise merge into the pending event"""
+        key = self._key(event, payload, room)
+        if key not in self._windows:
+            self._windows[key] = asyncio.create_task(self._run_window(key))
+            await self._send(event, payload, room)
+            return
+
+        self.room_stats[room or BROADCAST_ROOM]["coalesced"] += 1
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = {"event": event, "payload": dict(payload), "room": room, "merged": 1}
+        else:
+            pending["payload"].update(payload)
+            pending["merged"] += 1
+
+    async def flush_room(self, room: Optional[str]) -> None:
+        for key in [key for key in self._pending if key[0] == room]:
+            await self._send_pending(self._pending.pop(key))
+
+    async def flush_all(self) -> None:
+        for task in self._windows.values():
+            task.cancel()
+        self._windows.clear()
+        while self._pending:
+            _, pending = self._pending.popitem()
+            await self._send_pending(pending)
+
+    async def _run_window(self, key: CoalesceKey) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.window_seconds)
+                pending = self._pending.pop(key, None)
+                if pending is None:
+                    break
+                await self._send_pending(pending)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to emit coalesced {key[1]} event: {e}")
+        finally:
+            if self._windows.get(key) is asyncio.current_task():
+                del self._windows[key]
+
+    async def _send_pending(self, pending: Dict[str, Any]) -> None:
+        payload = pending["payload"]
+        if pending["merged"] > 1:
+            payload["coalesced_events"] = pending["merged"]
+        await self._send(pending["event"], payload, pending["room"])
+
+    async def _send(self, event: str, payload: Dict[str, Any], room: Optional[str]) -> None:
+        self.room_stats[room or BROADCAST_ROOM]["emitted"] += 1
+        await self._emit(event, payload, room)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": int(self.window_seconds * 1000),
+            "open_windows": len(self._windows),
+            "pending_events": len(self._pending),
+            "rooms": {room: dict(counts) for room, counts in self.room_stats.items()},
+        }
+
+
+async def _sio_emit(event: str, payload: Dict[str, Any], room: Optional[str]) -> None:
+    await sio.emit(event, payload, room=room)
+
+
+progress_coalescer = ProgressCoalescer(_sio_emit, settings.socketio_coalesce_window_ms / 1000)
+
 
 async def emit_progress(
     event: str,
     payload: Dict[str, Any],
     *,
     room: Optional[str] = "impact_cards",
+    coalesce: Optional[bool] = None,
 ) -> None:
-    """Emit a structured progress event to the specified room."""
+    """Emit a structured progress event to the specified room.
+
+    Events in COALESCED_EVENTS (or any event with `coalesce=True`) are
+    merged with others of the same kind sent to the room in quick succession.
+    """
+    if coalesce is None:
+        coalesce = event in COALESCED_EVENTS
+    if coalesce and progress_coalescer.window_seconds > 0:
+        await progress_coalescer.submit(event, payload, room)
+    else:
+        await progress_coalescer.emit(event, payload, room)
+
+
+async def flush_progress() -> None:
+    """Send any merged events still waiting for their window to close"""
+    await progress_coalescer.flush_all()
 
-    await sio.emit(event, payload, room=room)
 
+def get_realtime_stats() -> Dict[str, Any]:
+    # The manager actually in use: a configured queue falls back to memory when Redis is unavailable
+    return {
+        "client_manager": "redis" if isinstance(sio.manager, socketio.AsyncRedisManager) else "memory",
+        "coalescing": progress_coalescer.get_stats(),
+    }
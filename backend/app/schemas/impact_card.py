@@ -81,9 +81,14 @@ class ImpactCard(ImpactCardBase):
     class Config:
         from_attributes = True
 
+class ImpactCardDetail(ImpactCard):
+    raw_data: Optional[Dict[str, Any]] = None
+
 class ImpactCardList(BaseModel):
     items: List[ImpactCard]
     total: int
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
 
 class ImpactCardGenerate(BaseModel):
     competitor_name: str = Field(..., min_length=2, max_length=100, description="Competitor company name")
@@ -32,4 +32,6 @@ class WatchItem(WatchItemBase):
 
 class WatchItemList(BaseModel):
     items: List[WatchItem]
-    total: int
\ No newline at end of file
+    total: int
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -3,17 +3,18 @@ Security Headers Middleware
 Adds essential security headers to all HTTP responses
 """
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from typing import List, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+def build_security_headers(environment: str = "development") -> List[Tuple[str, str]]:
     """
-    Middleware to add security headers to all responses.
+    Security headers for every response, computed once per environment.
 
     Headers added:
     - X-Content-Type-Options: Prevent MIME type sniffing
@@ -24,31 +25,18 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Referrer-Policy: Control referrer information
     - Permissions-Policy: Disable unnecessary browser features
     """
-
-    def __init__(self, app, environment: str = "development"):
-        super().__init__(app)
-        self.environment = environment
-        logger.info(f"🔒 Security headers middleware initialized for {environment} environment")
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """Add security headers to response"""
-        response = await call_next(request)
-
+    headers = [
         # X-Content-Type-Options: Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
+        ("X-Content-Type-Options", "nosniff"),
         # X-Frame-Options: Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-
+        ("X-Frame-Options", "DENY"),
         # X-XSS-Protection: Enable browser XSS filter (legacy but still useful)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
+        ("X-XSS-Protection", "1; mode=block"),
         # Referrer-Policy: Control referrer information
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
+        ("Referrer-Policy", "strict-origin-when-cross-origin"),
         # Permissions-Policy: Disable unnecessary browser features
         # This restricts access to sensitive APIs like camera, microphone, etc.
-        response.headers["Permissions-Policy"] = (
+        ("Permissions-Policy", (
             "geolocation=(), "
             "microphone=(), "
             "camera=(), "
@@ -57,37 +45,73 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "magnetometer=(), "
             "gyroscope=(), "
             "accelerometer=()"
-        )
-
-        # Content-Security-Policy: Restrict resource loading
-        # Relaxed for development, strict for production
-        if self.environment == "production":
-            response.headers["Content-Security-Policy"] = (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "  # Allow inline scripts for Next.js
-                "style-src 'self' 'unsafe-inline'; "  # Allow inline styles for Tailwind
-                "img-src 'self' data: https:; "
-                "font-src 'self' data:; "
-                "connect-src 'self' wss: https:; "  # Allow WebSocket and API connections
-                "frame-ancestors 'none'; "
-                "base-uri 'self'; "
-                "form-action 'self'"
-            )
-        else:
-            # More permissive CSP for development
-            response.headers["Content-Security-Policy"] = (
-                "default-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-                "img-src 'self' data: https:; "
-                "connect-src 'self' ws: wss: http: https:"
-            )
-
-        # Strict-Transport-Security (HSTS): Enforce HTTPS in production
-        # Only add in production to avoid issues with local development
-        if self.environment == "production":
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; "  # 1 year
-                "includeSubDomains; "
-                "preload"
-            )
-
-        return response
+        )),
+    ]
+
+    # Content-Security-Policy: Restrict resource loading
+    # Relaxed for development, strict for production
+    if environment == "production":
+        headers.append(("Content-Security-Policy", (
+            "default-src 'self'; "
+            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "  # Allow inline scripts for Next.js
+            "style-src 'self' 'unsafe-inline'; "  # Allow inline styles for Tailwind
+            "img-src 'self' data: https:; "
+            "font-src 'self' data:; "
+            "connect-src 'self' wss: https:; "  # Allow WebSocket and API connections
+            "frame-ancestors 'none'; "
+            "base-uri 'self'; "
+            "form-action 'self'"
+        )))
+    else:
+        # More permissive CSP for development
+        headers.append(("Content-Security-Policy", (
+            "default-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+            "img-src 'self' data: https:; "
+            "connect-src 'self' ws: wss: http: https:"
+        )))
+
+    # Strict-Transport-Security (HSTS): Enforce HTTPS in production
+    # Only add in production to avoid issues with local development
+    if environment == "production":
+        headers.append(("Strict-Transport-Security", (
+            "max-age=31536000; "  # 1 year
+            "includeSubDomains; "
+            "preload"
+        )))
+
+    return headers
+
+
+class SecurityHeadersMiddleware:
+    """
+    Pure ASGI middleware that adds the security headers to all responses.
+
+    The application stack uses `RequestContextMiddleware` from app.middleware,
+    which applies the same headers; this class is for apps that only need
+    the headers.
+    """
+
+    def __init__(self, app: ASGIApp, environment: str = "development"):
+        self.app = app
+        self.environment = environment
+        self.headers = build_security_headers(environment)
+        logger.info(f"🔒 Security headers middleware initialized for {environment} environment")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                apply_headers(message, self.headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+def apply_headers(message: Message, headers: List[Tuple[str, str]]) -> None:
+    """Set headers on an `http.response.start` message, replacing existing values"""
+    response_headers = MutableHeaders(scope=message)
+    for name, value in headers:
+        response_headers[name] = value
@@ -6,15 +6,13 @@ templates, industry data, and benchmark calculations with appropriate TTL values
 """
 
 import asyncio
-import json
 import logging
 import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Union, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
-import pickle
-import gzip
 
 import redis.asyncio as redis
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -24,6 +22,8 @@ from app.models.sentiment_analysis import SentimentAnalysis, SentimentTrend
 from app.models.industry_template import IndustryTemplate, TemplateApplication
 from app.models.benchmarking import BenchmarkResult, MetricsSnapshot
 from app.config import settings
+from app.services.cache_codec import CacheCodec, CodecError, cache_codec
+from app.services.local_cache import LocalCacheTier, should_refresh_early
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +67,36 @@ class CacheStats:
     entry_count: int
     avg_ttl_seconds: float
     last_refresh: datetime
+    l1_hit_count: int = 0
+    l2_hit_count: int = 0
+    l1_hit_rate: float = 0.0
+    l2_hit_rate: float = 0.0
+    early_refresh_count: int = 0
+
+# Managers are created per request, so the L1 tiers and the tier counters are
+# process-wide; per-instance state would start cold on every request.
+PROCESS_L1_TIERS: Dict[CacheType, LocalCacheTier] = {}
+PROCESS_TIER_COUNTERS: Dict[CacheType, Dict[str, int]] = {}
+# Moving average of how long a recompute takes, which scales early refresh
+PROCESS_RECOMPUTE_SECONDS: Dict[CacheType, float] = {}
+
+def _l1_tier_for(config: CacheConfig) -> LocalCacheTier:
+    """Get (creating if needed) the process-wide L1 tier for a cache type."""
+    tier = PROCESS_L1_TIERS.get(config.cache_type)
+    if tier is None:
+        tier = LocalCacheTier(
+            max_bytes=int(config.max_size_mb * 1024 * 1024 * settings.cache_l1_budget_fraction),
+            ttl_seconds=min(config.ttl_seconds, settings.cache_l1_ttl_seconds),
+            name=config.cache_type.value
+        )
+        PROCESS_L1_TIERS[config.cache_type] = tier
+    return tier
+
+def _tier_counters(cache_type: CacheType) -> Dict[str, int]:
+    return PROCESS_TIER_COUNTERS.setdefault(
+        cache_type,
+        {"l1_hits": 0, "l2_hits": 0, "misses": 0, "early_refreshes": 0}
+    )
 
 class AdvancedCacheManager:
     """Advanced caching service for Intelligence Suite components."""
@@ -142,10 +172,14 @@ class AdvancedCacheManager:
         self.refresh_tasks: Dict[CacheType, asyncio.Task] = {}
         self.refresh_running = False
         
-        # Local cache for frequently accessed small items
-        self.local_cache: Dict[str, Tuple[Any, datetime]] = {}
-        self.local_cache_ttl = timedelta(minutes=5)
-        self.max_local_cache_size = 1000
+        # Binary codec for values stored in Redis
+        self.codec: CacheCodec = cache_codec
+
+        # In-process L1 tier per cache type, in front of Redis (L2)
+        self.l1_tiers: Dict[CacheType, LocalCacheTier] = {
+            cache_type: _l1_tier_for(config)
+            for cache_type, config in self.cache_configs.items()
+        }
     
     async def initialize(self) -> None:
         """Initialize the cache manager."""
@@ -171,25 +205,28 @@ class AdvancedCacheManager:
             raise
     
     async def get_sentiment_analysis(
-        self, 
-        entity_name: str, 
+        self,
+        entity_name: str,
         entity_type: str,
         timeframe_hours: int = 24
     ) -> Optional[List[Dict[str, Any]]]:
         """Get cached sentiment analysis results."""
         cache_key = f"sentiment:{entity_type}:{entity_name}:{timeframe_hours}"
-        
-        # Try cache first
-        cached_data = await self._get_from_cache(CacheType.SENTIMENT_ANALYSIS, cache_key)
-        if cached_data:
-            await self._record_cache_hit(CacheType.SENTIMENT_ANALYSIS)
-            return cached_data
-        
-        await self._record_cache_miss(CacheType.SENTIMENT_ANALYSIS)
-        
-        # Load from database
+        return await self._get_or_load(
+            CacheType.SENTIMENT_ANALYSIS,
+            cache_key,
+            lambda: self._load_sentiment_analysis(entity_name, entity_type, timeframe_hours)
+        )
+
+    async def _load_sentiment_analysis(
+        self,
+        entity_name: str,
+        entity_type: str,
+        timeframe_hours: int
+    ) -> List[Dict[str, Any]]:
+        """Load sentiment analysis results from the database."""
         cutoff_time = datetime.utcnow() - timedelta(hours=timeframe_hours)
-        
+
         result = await self.db.execute(
             select(SentimentAnalysis)
             .where(SentimentAnalysis.entity_name == entity_name)
@@ -197,11 +234,11 @@ class AdvancedCacheManager:
             .where(SentimentAnalysis.processing_timestamp >= cutoff_time)
             .order_by(desc(SentimentAnalysis.processing_timestamp))
         )
-        
+
         sentiment_records = result.scalars().all()
-        
+
         # Convert to serializable format
-        sentiment_data = [
+        return [
             {
                 "id": record.id,
                 "content_id": record.content_id,
@@ -215,33 +252,32 @@ class AdvancedCacheManager:
             }
             for record in sentiment_records
         ]
-        
-        # Cache the results
-        await self._set_in_cache(CacheType.SENTIMENT_ANALYSIS, cache_key, sentiment_data)
-        
-        return sentiment_data
-    
+
     async def get_sentiment_trends(
-        self, 
-        entity_name: str, 
+        self,
+        entity_name: str,
         entity_type: str,
         timeframe: str = "daily",
         days: int = 30
     ) -> Optional[List[Dict[str, Any]]]:
         """Get cached sentiment trend data."""
         cache_key = f"sentiment_trends:{entity_type}:{entity_name}:{timeframe}:{days}"
-        
-        # Try cache first
-        cached_data = await self._get_from_cache(CacheType.SENTIMENT_TRENDS, cache_key)
-        if cached_data:
-            await self._record_cache_hit(CacheType.SENTIMENT_TRENDS)
-            return cached_data
-        
-        await self._record_cache_miss(CacheType.SENTIMENT_TRENDS)
-        
-        # Load from database
+        return await self._get_or_load(
+            CacheType.SENTIMENT_TRENDS,
+            cache_key,
+            lambda: self._load_sentiment_trends(entity_name, entity_type, timeframe, days)
+        )
+
+    async def _load_sentiment_trends(
+        self,
+        entity_name: str,
+        entity_type: str,
+        timeframe: str,
+        days: int
+    ) -> List[Dict[str, Any]]:
+        """Load sentiment trend data from the database."""
         cutoff_time = datetime.utcnow() - timedelta(days=days)
-        
+
         result = await self.db.execute(
             select(SentimentTrend)
             .where(SentimentTrend.entity_name == entity_name)
@@ -250,11 +286,11 @@ class AdvancedCacheManager:
             .where(SentimentTrend.period_start >= cutoff_time)
             .order_by(SentimentTrend.period_start)
         )
-        
+
         trend_records = result.scalars().all()
-        
+
         # Convert to serializable format
-        trend_data = [
+        return [
             {
                 "id": record.id,
                 "timeframe": record.timeframe,
@@ -267,43 +303,33 @@ class AdvancedCacheManager:
             }
             for record in trend_records
         ]
-        
-        # Cache the results
-        await self._set_in_cache(CacheType.SENTIMENT_TRENDS, cache_key, trend_data)
-        
-        return trend_data
-    
-    async def get_industry_template(self, template_id: int) -> Optional[Dict[str, Any]]:
+
+    async def get_industry_template(
+        self,
+        template_id: int,
+        force_refresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
         """Get cached industry template."""
         cache_key = f"template:{template_id}"
-        
-        # Try local cache first for templates (they're small and frequently accessed)
-        local_data = self._get_from_local_cache(cache_key)
-        if local_data:
-            await self._record_cache_hit(CacheType.INDUSTRY_TEMPLATES)
-            return local_data
-        
-        # Try Redis cache
-        cached_data = await self._get_from_cache(CacheType.INDUSTRY_TEMPLATES, cache_key)
-        if cached_data:
-            # Store in local cache too
-            self._set_in_local_cache(cache_key, cached_data)
-            await self._record_cache_hit(CacheType.INDUSTRY_TEMPLATES)
-            return cached_data
-        
-        await self._record_cache_miss(CacheType.INDUSTRY_TEMPLATES)
-        
-        # Load from database
+        return await self._get_or_load(
+            CacheType.INDUSTRY_TEMPLATES,
+            cache_key,
+            lambda: self._load_industry_template(template_id),
+            force_refresh=force_refresh
+        )
+
+    async def _load_industry_template(self, template_id: int) -> Optional[Dict[str, Any]]:
+        """Load an industry template from the database."""
         result = await self.db.execute(
             select(IndustryTemplate).where(IndustryTemplate.id == template_id)
         )
-        
+
         template = result.scalar_one_or_none()
         if not template:
             return None
-        
+
         # Convert to serializable format
-        template_data = {
+        return {
             "id": template.id,
             "name": template.name,
             "industry_sector": template.industry_sector,
@@ -318,36 +344,33 @@ class AdvancedCacheManager:
             "usage_count": template.usage_count,
             "rating": template.rating
         }
-        
-        # Cache the results
-        await self._set_in_cache(CacheType.INDUSTRY_TEMPLATES, cache_key, template_data)
-        self._set_in_local_cache(cache_key, template_data)
-        
-        return template_data
-    
-    async def get_industry_templates_by_sector(self, sector: str) -> List[Dict[str, Any]]:
+
+    async def get_industry_templates_by_sector(
+        self,
+        sector: str,
+        force_refresh: bool = False
+    ) -> List[Dict[str, Any]]:
         """Get cached industry templates by sector."""
         cache_key = f"templates_by_sector:{sector}"
-        
-        # Try cache first
-        cached_data = await self._get_from_cache(CacheType.TEMPLATE_DATA, cache_key)
-        if cached_data:
-            await self._record_cache_hit(CacheType.TEMPLATE_DATA)
-            return cached_data
-        
-        await self._record_cache_miss(CacheType.TEMPLATE_DATA)
-        
-        # Load from database
+        return await self._get_or_load(
+            CacheType.TEMPLATE_DATA,
+            cache_key,
+            lambda: self._load_industry_templates_by_sector(sector),
+            force_refresh=force_refresh
+        )
+
+    async def _load_industry_templates_by_sector(self, sector: str) -> List[Dict[str, Any]]:
+        """Load industry templates for a sector from the database."""
         result = await self.db.execute(
             select(IndustryTemplate)
             .where(IndustryTemplate.industry_sector == sector)
             .order_by(desc(IndustryTemplate.rating), desc(IndustryTemplate.usage_count))
         )
-        
+
         templates = result.scalars().all()
-        
+
         # Convert to serializable format
-        templates_data = [
+        return [
             {
                 "id": template.id,
                 "name": template.name,
@@ -359,49 +382,47 @@ class AdvancedCacheManager:
             }
             for template in templates
         ]
-        
-        # Cache the results
-        await self._set_in_cache(CacheType.TEMPLATE_DATA, cache_key, templates_data)
-        
-        return templates_data
-    
+
     async def get_benchmark_results(
-        self, 
+        self,
         metric_type: str,
         timeframe_hours: int = 24,
         entity_filter: Optional[str] = None
     ) -> Optional[List[Dict[str, Any]]]:
         """Get cached benchmark results."""
         cache_key = f"benchmark:{metric_type}:{timeframe_hours}:{entity_filter or 'all'}"
-        
-        # Try cache first
-        cached_data = await self._get_from_cache(CacheType.BENCHMARK_RESULTS, cache_key)
-        if cached_data:
-            await self._record_cache_hit(CacheType.BENCHMARK_RESULTS)
-            return cached_data
-        
-        await self._record_cache_miss(CacheType.BENCHMARK_RESULTS)
-        
-        # Load from database (assuming BenchmarkResult model exists)
+        return await self._get_or_load(
+            CacheType.BENCHMARK_RESULTS,
+            cache_key,
+            lambda: self._load_benchmark_results(metric_type, timeframe_hours, entity_filter)
+        )
+
+    async def _load_benchmark_results(
+        self,
+        metric_type: str,
+        timeframe_hours: int,
+        entity_filter: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Load benchmark results from the database."""
         cutoff_time = datetime.utcnow() - timedelta(hours=timeframe_hours)
-        
+
         query = select(BenchmarkResult).where(
             and_(
                 BenchmarkResult.metric_type == metric_type,
                 BenchmarkResult.calculated_at >= cutoff_time
             )
         )
-        
+
         if entity_filter:
             query = query.where(BenchmarkResult.entity_name == entity_filter)
-        
+
         query = query.order_by(desc(BenchmarkResult.calculated_at))
-        
+
         result = await self.db.execute(query)
         benchmark_records = result.scalars().all()
-        
+
         # Convert to serializable format
-        benchmark_data = [
+        return [
             {
                 "id": record.id,
                 "metric_type": record.metric_type,
@@ -414,32 +435,31 @@ class AdvancedCacheManager:
             }
             for record in benchmark_records
         ]
-        
-        # Cache the results
-        await self._set_in_cache(CacheType.BENCHMARK_RESULTS, cache_key, benchmark_data)
-        
-        return benchmark_data
-    
+
     async def get_trend_analysis(
-        self, 
+        self,
         analysis_type: str,
         entity_name: str,
         days: int = 30
     ) -> Optional[Dict[str, Any]]:
         """Get cached trend analysis results."""
         cache_key = f"trend_analysis:{analysis_type}:{entity_name}:{days}"
-        
-        # Try cache first
-        cached_data = await self._get_from_cache(CacheType.TREND_ANALYSIS, cache_key)
-        if cached_data:
-            await self._record_cache_hit(CacheType.TREND_ANALYSIS)
-            return cached_data
-        
-        await self._record_cache_miss(CacheType.TREND_ANALYSIS)
-        
+        return await self._get_or_load(
+            CacheType.TREND_ANALYSIS,
+            cache_key,
+            lambda: self._calculate_trend_analysis(analysis_type, entity_name, days)
+        )
+
+    async def _calculate_trend_analysis(
+        self,
+        analysis_type: str,
+        entity_name: str,
+        days: int
+    ) -> Dict[str, Any]:
+        """Calculate trend analysis results."""
         # This would typically involve complex calculations
         # For now, return a placeholder structure
-        trend_data = {
+        return {
             "analysis_type": analysis_type,
             "entity_name": entity_name,
             "timeframe_days": days,
@@ -448,18 +468,65 @@ class AdvancedCacheManager:
             "key_metrics": {},
             "calculated_at": datetime.utcnow().isoformat()
         }
-        
-        # Cache the results
-        await self._set_in_cache(CacheType.TREND_ANALYSIS, cache_key, trend_data)
-        
-        return trend_data
+
+    async def _get_or_load(
+        self,
+        cache_type: CacheType,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        force_refresh: bool = False
+    ) -> Any:
+        """Read through L1 then L2, loading and caching on a miss.
+
+        A hit may still trigger a probabilistic early refresh, so a hot key
+        is recomputed by one caller shortly before it expires rather than by
+        every caller right after. If that refresh fails, the cached value is
+        served.
+        """
+        cached_data = None
+        if not force_refresh:
+            hit = await self._get_cached_entry(cache_type, key)
+            if hit is not None:
+                cached_data, tier, l2_expires_at = hit
+                if not should_refresh_early(
+                    l2_expires_at,
+                    PROCESS_RECOMPUTE_SECONDS.get(cache_type, 0.0),
+                    settings.cache_early_refresh_beta
+                ):
+                    await self._record_cache_hit(cache_type, tier)
+                    return cached_data
+                await self._record_early_refresh(cache_type)
+            else:
+                await self._record_cache_miss(cache_type)
+
+        started = time.perf_counter()
+        try:
+            data = await loader()
+        except Exception:
+            if cached_data is None:
+                raise
+            logger.warning(f"Early refresh failed for {cache_type.value}:{key}, serving cached value")
+            return cached_data
+        self._record_recompute_time(cache_type, time.perf_counter() - started)
+
+        if data is not None:
+            await self._set_in_cache(cache_type, key, data)
+        return data
     
     async def invalidate_cache(
         self, 
         cache_type: CacheType,
         pattern: Optional[str] = None
     ) -> int:
-        """Invalidate cache entries."""
+        """Invalidate cache entries.
+
+        L1 copies are dropped in this process only; other workers keep theirs
+        for at most the L1 TTL.
+        """
+        l1 = self.l1_tiers.get(cache_type)
+        if l1 is not None:
+            l1.clear(pattern)
+
         if not self.redis_client:
             return 0
         
@@ -495,110 +562,122 @@ class AdvancedCacheManager:
             logger.error(f"Failed to invalidate cache: {e}")
             return 0
     
-    async def _get_from_cache(self, cache_type: CacheType, key: str) -> Optional[Any]:
-        """Get data from Redis cache."""
+    async def _get_cached_entry(
+        self,
+        cache_type: CacheType,
+        key: str
+    ) -> Optional[Tuple[Any, str, Optional[float]]]:
+        """Look a key up in L1, then L2, promoting L2 hits into L1.
+
+        Returns (data, tier, monotonic expiry of the L2 entry) or None.
+        L1 holds encoded payloads, so an L1 hit decodes a private copy just
+        like an L2 hit and callers can never mutate another reader's value.
+        """
+        l1 = self.l1_tiers.get(cache_type)
+        if l1 is not None:
+            entry = l1.get(key)
+            if entry is not None:
+                data, _ = self._decode(cache_type, entry.value)
+                return data, "l1", entry.l2_expires_at
+
+        found = await self._get_from_cache(cache_type, key)
+        if found is None:
+            return None
+
+        data, payload, size_bytes, ttl_seconds = found
+        l2_expires_at = time.monotonic() + ttl_seconds if ttl_seconds is not None else None
+        if l1 is not None:
+            l1.set(key, payload, size_bytes, ttl_seconds=ttl_seconds, l2_expires_at=l2_expires_at)
+        return data, "l2", l2_expires_at
+
+    def _encode(self, cache_type: CacheType, data: Any) -> Tuple[bytes, int]:
+        """Serialize (and, above the size threshold, compress) a value; returns (payload, raw size)."""
+        config = self.cache_configs[cache_type]
+        payload = self.codec.encode(data, compress=config.compression_enabled)
+        return payload, self.codec.raw_size(payload)
+
+    def _decode(self, cache_type: CacheType, cached_data: bytes) -> Tuple[Any, int]:
+        """Decode a stored value; the codec header says how it was written."""
+        return self.codec.decode(cached_data), self.codec.raw_size(cached_data)
+
+    async def _get_from_cache(
+        self,
+        cache_type: CacheType,
+        key: str
+    ) -> Optional[Tuple[Any, bytes, int, Optional[float]]]:
+        """Get data from Redis cache as (data, payload, raw size, remaining TTL in seconds)."""
         if not self.redis_client:
             return None
-        
+
         try:
             cache_key = f"cache:{cache_type.value}:{key}"
-            cached_data = await self.redis_client.get(cache_key)
-            
+
+            # Value and remaining TTL in one round trip; the TTL drives L1 expiry and early refresh
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(cache_key)
+                pipe.pttl(cache_key)
+                cached_data, ttl_ms = await pipe.execute()
+
             if not cached_data:
                 return None
-            
-            config = self.cache_configs[cache_type]
-            
-            # Decompress if needed
-            if config.compression_enabled:
-                try:
-                    cached_data = gzip.decompress(cached_data)
-                except (OSError, EOFError, gzip.BadGzipFile) as e:
-                    # Fallback for non-compressed data
-                    logger.debug(f"Failed to decompress cache data, using as-is: {e}")
-                    pass
-            
-            # Deserialize
-            try:
-                return pickle.loads(cached_data)
-            except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError) as e:
-                # Fallback to JSON
-                logger.debug(f"Failed to unpickle cache data, trying JSON: {e}")
-                if isinstance(cached_data, bytes):
-                    return json.loads(cached_data.decode('utf-8'))
-                else:
-                    return json.loads(cached_data)
-            
+
+            data, size_bytes = self._decode(cache_type, cached_data)
+            ttl_seconds = ttl_ms / 1000 if ttl_ms and ttl_ms > 0 else None
+            return data, cached_data, size_bytes, ttl_seconds
+
+        except CodecError as e:
+            # Entries in the old pickle format are never unpickled; treat them as misses
+            logger.debug(f"Ignoring undecodable cache entry {cache_type.value}:{key}: {e}")
+            return None
         except Exception as e:
             logger.warning(f"Failed to get from cache {cache_type.value}:{key}: {e}")
             return None
-    
+
     async def _set_in_cache(
-        self, 
-        cache_type: CacheType, 
-        key: str, 
+        self,
+        cache_type: CacheType,
+        key: str,
         data: Any
     ) -> bool:
-        """Set data in Redis cache."""
+        """Set data in Redis cache and the local L1 tier."""
+        try:
+            config = self.cache_configs[cache_type]
+            serialized_data, raw_size = self._encode(cache_type, data)
+        except Exception as e:
+            logger.warning(f"Failed to serialize cache entry {cache_type.value}:{key}: {e}")
+            return False
+
+        l1 = self.l1_tiers.get(cache_type)
+        if l1 is not None:
+            l1.set(
+                key,
+                serialized_data,
+                raw_size,
+                ttl_seconds=config.ttl_seconds,
+                l2_expires_at=time.monotonic() + config.ttl_seconds
+            )
+
         if not self.redis_client:
             return False
-        
+
         try:
-            config = self.cache_configs[cache_type]
             cache_key = f"cache:{cache_type.value}:{key}"
-            
-            # Serialize data
-            try:
-                serialized_data = pickle.dumps(data)
-            except (pickle.PicklingError, TypeError) as e:
-                # Fallback to JSON
-                logger.debug(f"Failed to pickle data, using JSON: {e}")
-                serialized_data = json.dumps(data, default=str).encode('utf-8')
-            
-            # Compress if enabled
-            if config.compression_enabled:
-                serialized_data = gzip.compress(serialized_data)
-            
+
             # Set with TTL
             await self.redis_client.setex(
                 cache_key,
                 config.ttl_seconds,
                 serialized_data
             )
-            
+
             return True
-            
+
         except Exception as e:
             logger.warning(f"Failed to set cache {cache_type.value}:{key}: {e}")
             return False
-    
-    def _get_from_local_cache(self, key: str) -> Optional[Any]:
-        """Get data from local cache."""
-        if key not in self.local_cache:
-            return None
-        
-        data, timestamp = self.local_cache[key]
-        
-        # Check if expired
-        if datetime.utcnow() - timestamp > self.local_cache_ttl:
-            del self.local_cache[key]
-            return None
-        
-        return data
-    
-    def _set_in_local_cache(self, key: str, data: Any) -> None:
-        """Set data in local cache."""
-        # Evict old entries if cache is full
-        if len(self.local_cache) >= self.max_local_cache_size:
-            # Remove oldest entry
-            oldest_key = min(self.local_cache.keys(), 
-                           key=lambda k: self.local_cache[k][1])
-            del self.local_cache[oldest_key]
-        
-        self.local_cache[key] = (data, datetime.utcnow())
-    
-    async def _record_cache_hit(self, cache_type: CacheType) -> None:
-        """Record a cache hit for statistics."""
+
+    def _get_cache_stats(self, cache_type: CacheType) -> CacheStats:
+        """Get (creating if needed) the statistics record for a cache type."""
         if cache_type not in self.cache_stats:
             self.cache_stats[cache_type] = CacheStats(
                 cache_type=cache_type,
@@ -610,28 +689,46 @@ class AdvancedCacheManager:
                 avg_ttl_seconds=0.0,
                 last_refresh=datetime.utcnow()
             )
-        
-        stats = self.cache_stats[cache_type]
+        return self.cache_stats[cache_type]
+
+    @staticmethod
+    def _update_hit_rates(stats: CacheStats) -> None:
+        lookups = stats.hit_count + stats.miss_count
+        stats.hit_rate = stats.hit_count / lookups if lookups else 0.0
+        stats.l1_hit_rate = stats.l1_hit_count / lookups if lookups else 0.0
+        stats.l2_hit_rate = stats.l2_hit_count / lookups if lookups else 0.0
+
+    async def _record_cache_hit(self, cache_type: CacheType, tier: str = "l2") -> None:
+        """Record a cache hit for statistics."""
+        stats = self._get_cache_stats(cache_type)
         stats.hit_count += 1
-        stats.hit_rate = stats.hit_count / (stats.hit_count + stats.miss_count)
-    
+        if tier == "l1":
+            stats.l1_hit_count += 1
+        else:
+            stats.l2_hit_count += 1
+        self._update_hit_rates(stats)
+        _tier_counters(cache_type)[f"{tier}_hits"] += 1
+
     async def _record_cache_miss(self, cache_type: CacheType) -> None:
         """Record a cache miss for statistics."""
-        if cache_type not in self.cache_stats:
-            self.cache_stats[cache_type] = CacheStats(
-                cache_type=cache_type,
-                hit_count=0,
-                miss_count=0,
-                hit_rate=0.0,
-                total_size_mb=0.0,
-                entry_count=0,
-                avg_ttl_seconds=0.0,
-                last_refresh=datetime.utcnow()
-            )
-        
-        stats = self.cache_stats[cache_type]
+        stats = self._get_cache_stats(cache_type)
         stats.miss_count += 1
-        stats.hit_rate = stats.hit_count / (stats.hit_count + stats.miss_count)
+        self._update_hit_rates(stats)
+        _tier_counters(cache_type)["misses"] += 1
+
+    async def _record_early_refresh(self, cache_type: CacheType) -> None:
+        """Record a hit that was recomputed early to avoid a stampede at expiry."""
+        stats = self._get_cache_stats(cache_type)
+        stats.early_refresh_count += 1
+        _tier_counters(cache_type)["early_refreshes"] += 1
+
+    @staticmethod
+    def _record_recompute_time(cache_type: CacheType, seconds: float) -> None:
+        """Track a moving average of how long loading a value takes."""
+        previous = PROCESS_RECOMPUTE_SECONDS.get(cache_type)
+        PROCESS_RECOMPUTE_SECONDS[cache_type] = (
+            seconds if previous is None else 0.8 * previous + 0.2 * seconds
+        )
     
     async def _initialize_cache_stats(self) -> None:
         """Initialize cache statistics."""
@@ -726,12 +823,12 @@ class AdvancedCacheManager:
             if cache_type == CacheType.INDUSTRY_TEMPLATES:
                 if original_key.startswith("template:"):
                     template_id = int(original_key.split(":")[1])
-                    await self.get_industry_template(template_id)
+                    await self.get_industry_template(template_id, force_refresh=True)
             
             elif cache_type == CacheType.TEMPLATE_DATA:
                 if original_key.startswith("templates_by_sector:"):
                     sector = original_key.split(":", 1)[1]
-                    await self.get_industry_templates_by_sector(sector)
+                    await self.get_industry_templates_by_sector(sector, force_refresh=True)
             
             # Add more refresh logic for other cache types as needed
             
@@ -750,10 +847,27 @@ class AdvancedCacheManager:
         
         return {
             "cache_stats": stats_dict,
-            "local_cache_size": len(self.local_cache),
+            "local_cache_size": sum(len(tier) for tier in self.l1_tiers.values()),
+            "tiers": self._get_tier_statistics(),
             "refresh_tasks_running": len(self.refresh_tasks),
             "redis_connected": self.redis_client is not None
         }
+
+    def _get_tier_statistics(self) -> Dict[str, Any]:
+        """Process-wide L1/L2 hit ratios and L1 occupancy per cache type."""
+        tiers = {}
+        for cache_type, l1 in self.l1_tiers.items():
+            counters = _tier_counters(cache_type)
+            lookups = counters["l1_hits"] + counters["l2_hits"] + counters["misses"]
+            tiers[cache_type.value] = {
+                **counters,
+                "l1_hit_ratio": round(counters["l1_hits"] / lookups, 4) if lookups else 0.0,
+                "l2_hit_ratio": round(counters["l2_hits"] / lookups, 4) if lookups else 0.0,
+                "hit_ratio": round((counters["l1_hits"] + counters["l2_hits"]) / lookups, 4) if lookups else 0.0,
+                "avg_recompute_ms": round(PROCESS_RECOMPUTE_SECONDS.get(cache_type, 0.0) * 1000, 2),
+                "l1": l1.get_stats()
+            }
+        return tiers
     
     async def _update_cache_statistics(self) -> None:
         """Update cache statistics from Redis."""
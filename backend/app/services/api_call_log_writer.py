@@ -0,0 +1,206 @@
+"""Background, batched writer for `ApiCallLog` rows.
+
+You.com requests used to open a session, insert one row and commit inline,
+so every API call paid a database round trip. Records are now pushed onto a
+bounded in-memory queue and written in bulk multi-row inserts, either when a
+batch fills up or when the flush interval elapses. The queue is drained on
+shutdown.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.api_call_log import ApiCallLog
+from app.services.api_usage_rollups import apply_rollup_deltas, summarize_records
+
+logger = logging.getLogger(__name__)
+
+# Queued by stop() to tell the writer loop to flush and exit
+_STOP = object()
+
+
+class ApiCallLogWriter:
+    """Queues API call records and flushes them to the database in batches"""
+
+    def __init__(
+        self,
+        session_factory: Optional[async_sessionmaker] = None,
+        *,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_queue_size: Optional[int] = None,
+        rollups_enabled: Optional[bool] = None,
+    ):
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.batch_size = batch_size or settings.api_log_batch_size
+        self.flush_interval = flush_interval or settings.api_log_flush_interval
+        self.max_queue_size = max_queue_size or settings.api_log_queue_size
+        self.rollups_enabled = settings.api_usage_rollups_enabled if rollups_enabled is None else rollups_enabled
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.running = False
+
+        self.stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "flushes": 0,
+            "max_queue_depth": 0,
+            "last_flush_ms": 0.0,
+            "rollup_updates": 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self.running and self.task is not None and not self.task.done()
+
+    async def start(self) -> None:
+        """Start the background flush loop"""
+        if self.is_running:
+            return
+
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.running = True
+        self.task = asyncio.create_task(self._writer_loop())
+        logger.info(
+            "📝 API call log writer started (batch_size=%s, flush_interval=%ss)",
+            self.batch_size,
+            self.flush_interval,
+        )
+
+    async def stop(self) -> None:
+        """Stop accepting records and drain everything still queued"""
+        if not self.running:
+            return
+
+        self.running = False
+        if self.task:
+            # The sentinel queues up behind pending records, so they are all flushed first
+            await self.queue.put(_STOP)
+            await self.task
+            self.task = None
+        logger.info("📝 API call log writer stopped (written=%s, dropped=%s)", self.stats["written"], self.stats["dropped"])
+
+    def enqueue(
+        self,
+        api_type: str,
+        endpoint: str,
+        *,
+        status_code: Optional[int],
+        success: bool,
+        latency_ms: float,
+        error_message: Optional[str] = None,
+    ) -> bool:
+        """Queue a record without blocking; returns False when it was dropped"""
+        if not self.is_running:
+            return False
+
+        record = {
+            "api_type": api_type,
+            "endpoint": endpoint[:255],
+            "status_code": status_code,
+            "success": success,
+            "latency_ms": latency_ms,
+            "error_message": error_message,
+            # Stamp at enqueue time; the row may be written seconds later
+            "created_at": datetime.now(timezone.utc),
+        }
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            # Back-pressure: shed log records rather than slow down API calls
+            self.stats["dropped"] += 1
+            if self.stats["dropped"] % 100 == 1:
+                logger.warning("API call log queue full - dropped %s records so far", self.stats["dropped"])
+            return False
+
+        self.stats["enqueued"] += 1
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self.queue.qsize())
+        return True
+
+    async def _writer_loop(self) -> None:
+        """Flush when a batch is full or the interval elapses, whichever is first"""
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            try:
+                record = await self.queue.get()
+                deadline = time.monotonic() + self.flush_interval
+                while record is not _STOP:
+                    batch.append(record)
+                    remaining = deadline - time.monotonic()
+                    if len(batch) >= self.batch_size or remaining <= 0:
+                        break
+                    try:
+                        record = await asyncio.wait_for(self.queue.get(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        break
+                stopping = record is _STOP
+                await self._flush(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"API call log writer loop error: {e}")
+
+    async def _flush(self, batch: List[Dict[str, Any]], attempts: int = 3) -> None:
+        """Write a batch with a single multi-row INSERT.
+
+        The rows and their hourly rollup deltas commit in one transaction, so
+        `api_usage_rollups` never misses calls that were logged.
+        """
+        if not batch:
+            return
+
+        started = time.perf_counter()
+        deltas = summarize_records(batch) if self.rollups_enabled else None
+        for attempt in range(attempts):
+            async with self.session_factory() as session:
+                try:
+                    await session.execute(insert(ApiCallLog), batch)
+                    if deltas:
+                        await apply_rollup_deltas(session, deltas)
+                    await session.commit()
+                    self.stats["written"] += len(batch)
+                    if deltas:
+                        self.stats["rollup_updates"] += 1
+                    break
+                except IntegrityError:
+                    # Another worker created one of the hour rows first; retry and merge into it
+                    await session.rollback()
+                except Exception as exc:  # pragma: no cover - logging should not break workflows
+                    logger.warning("Failed to persist %s API call logs: %s", len(batch), exc)
+                    self.stats["failed"] += len(batch)
+                    await session.rollback()
+                    break
+        else:
+            logger.warning("Failed to persist %s API call logs: rollup rows kept conflicting", len(batch))
+            self.stats["failed"] += len(batch)
+
+        self.stats["flushes"] += 1
+        self.stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Writer throughput and back-pressure counters"""
+        return {
+            **self.stats,
+            "running": self.is_running,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_queue_size": self.max_queue_size,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+        }
+
+
+# Global instance
+api_call_log_writer = ApiCallLogWriter()
@@ -0,0 +1,232 @@
+"""
+Hourly API usage rollups.
+
+`/api/v1/metrics/api-usage` used to pull every `ApiCallLog.latency_ms` into
+Python to sort for p95/p99, plus every log from the last 24 hours to bucket
+by hour. Call logs are now folded into one `ApiUsageRollup` row per
+(hour, api_type) as they are written. Each row holds counts, latency totals
+and a mergeable `LatencySketch`, so the endpoint reads a few dozen small
+rows no matter how many calls have been logged.
+
+`rebuild_rollups` recomputes rollups from the raw logs; it is used to
+backfill history recorded before rollups existed.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.api_call_log import ApiCallLog
+from app.models.api_usage_rollup import ApiUsageRollup
+from app.services.latency_sketch import LatencySketch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_TYPES = ("news", "search", "chat", "ari")
+
+RollupKey = Tuple[datetime, str]
+
+
+def _as_utc(timestamp: datetime) -> datetime:
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+
+def hour_bucket(timestamp: datetime) -> datetime:
+    """Start of the UTC hour containing `timestamp`"""
+    return _as_utc(timestamp).replace(minute=0, second=0, microsecond=0)
+
+
+@dataclass
+class RollupDelta:
+    """Aggregate of new call logs for one (hour, api_type)"""
+    call_count: int = 0
+    success_count: int = 0
+    latency_sum_ms: float = 0.0
+    latency_max_ms: Optional[float] = None
+    last_call_at: Optional[datetime] = None
+    sketch: LatencySketch = field(default_factory=LatencySketch)
+
+    def add(self, success: bool, latency_ms: Optional[float], created_at: datetime) -> None:
+        self.call_count += 1
+        if success:
+            self.success_count += 1
+        if latency_ms is not None:
+            self.latency_sum_ms += latency_ms
+            self.latency_max_ms = latency_ms if self.latency_max_ms is None else max(self.latency_max_ms, latency_ms)
+            self.sketch.add(latency_ms)
+        if self.last_call_at is None or created_at > self.last_call_at:
+            self.last_call_at = created_at
+
+
+def summarize_records(records: Iterable[Dict[str, Any]]) -> Dict[RollupKey, RollupDelta]:
+    """Group call log records (as queued by the log writer) by hour and api_type"""
+    deltas: Dict[RollupKey, RollupDelta] = {}
+    now = datetime.now(timezone.utc)
+    for record in records:
+        created_at = _as_utc(record.get("created_at") or now)
+        key = (hour_bucket(created_at), record["api_type"])
+        delta = deltas.get(key)
+        if delta is None:
+            delta = deltas[key] = RollupDelta()
+        delta.add(bool(record.get("success")), record.get("latency_ms"), created_at)
+    return deltas
+
+
+async def apply_rollup_deltas(session: AsyncSession, deltas: Dict[RollupKey, RollupDelta]) -> None:
+    """Merge deltas into their rollup rows (the caller commits).
+
+    Existing rows are locked with SELECT ... FOR UPDATE so concurrent workers
+    merging into the same hour cannot lose each other's counts. Two workers
+    creating the same new row surface as an IntegrityError for the caller
+    to retry.
+    """
+    if not deltas:
+        return
+
+    result = await session.execute(
+        select(ApiUsageRollup)
+        .where(tuple_(ApiUsageRollup.bucket_start, ApiUsageRollup.api_type).in_(list(deltas.keys())))
+        .with_for_update()
+    )
+    existing = {(hour_bucket(row.bucket_start), row.api_type): row for row in result.scalars()}
+
+    for key, delta in deltas.items():
+        row = existing.get(key)
+        if row is None:
+            session.add(ApiUsageRollup(
+                bucket_start=key[0],
+                api_type=key[1],
+                call_count=delta.call_count,
+                success_count=delta.success_count,
+                latency_sum_ms=delta.latency_sum_ms,
+                latency_max_ms=delta.latency_max_ms,
+                latency_sketch=delta.sketch.to_dict(),
+                last_call_at=delta.last_call_at,
+            ))
+            continue
+
+        row.call_count += delta.call_count
+        row.success_count += delta.success_count
+        row.latency_sum_ms += delta.latency_sum_ms
+        if delta.latency_max_ms is not None:
+            row.latency_max_ms = max(row.latency_max_ms or 0.0, delta.latency_max_ms)
+        row.latency_sketch = LatencySketch.from_dict(row.latency_sketch).merge(delta.sketch).to_dict()
+        if delta.last_call_at is not None and (
+            row.last_call_at is None or delta.last_call_at > _as_utc(row.last_call_at)
+        ):
+            row.last_call_at = delta.last_call_at
+
+
+async def rebuild_rollups(
+    session: AsyncSession,
+    since: Optional[datetime] = None,
+    chunk_size: int = 5000,
+) -> int:
+    """Recompute rollups from `ApiCallLog` (all history, or from `since`).
+
+    Streams the raw logs, so memory is bounded by the number of
+    (hour, api_type) pairs rather than the number of calls. Returns the number
+    of call logs folded in. The caller commits.
+    """
+    start = hour_bucket(since) if since else None
+
+    clear = delete(ApiUsageRollup)
+    query = select(
+        ApiCallLog.api_type, ApiCallLog.success, ApiCallLog.latency_ms, ApiCallLog.created_at
+    ).execution_options(yield_per=chunk_size)
+    if start is not None:
+        clear = clear.where(ApiUsageRollup.bucket_start >= start)
+        query = query.where(ApiCallLog.created_at >= start)
+    await session.execute(clear)
+
+    deltas: Dict[RollupKey, RollupDelta] = {}
+    processed = 0
+    now = datetime.now(timezone.utc)
+    stream = await session.stream(query)
+    async for api_type, success, latency_ms, created_at in stream:
+        created_at = _as_utc(created_at or now)
+        key = (hour_bucket(created_at), api_type)
+        delta = deltas.get(key)
+        if delta is None:
+            delta = deltas[key] = RollupDelta()
+        delta.add(bool(success), latency_ms, created_at)
+        processed += 1
+
+    await apply_rollup_deltas(session, deltas)
+    logger.info(f"📊 Rebuilt {len(deltas)} API usage rollups from {processed} call logs")
+    return processed
+
+
+async def get_usage_summary(
+    session: AsyncSession,
+    now: Optional[datetime] = None,
+    window_hours: int = 24,
+) -> Dict[str, Any]:
+    """Usage totals (all time) and hourly timeline plus percentiles (last `window_hours`)"""
+    now = _as_utc(now or datetime.now(timezone.utc))
+
+    totals = await session.execute(
+        select(
+            ApiUsageRollup.api_type,
+            func.sum(ApiUsageRollup.call_count),
+            func.sum(ApiUsageRollup.success_count),
+            func.sum(ApiUsageRollup.latency_sum_ms),
+            func.max(ApiUsageRollup.last_call_at),
+        ).group_by(ApiUsageRollup.api_type)
+    )
+
+    by_service: Dict[str, int] = {api_type: 0 for api_type in DEFAULT_API_TYPES}
+    total_calls = success_calls = 0
+    latency_sum = 0.0
+    last_call_at: Optional[datetime] = None
+    for api_type, calls, successes, latency_total, last_call in totals:
+        by_service[api_type] = int(calls or 0)
+        total_calls += int(calls or 0)
+        success_calls += int(successes or 0)
+        latency_sum += float(latency_total or 0.0)
+        if last_call is not None:
+            last_call = _as_utc(last_call)
+            if last_call_at is None or last_call > last_call_at:
+                last_call_at = last_call
+
+    # The current hour plus the previous window_hours - 1 complete hours
+    first_bucket = hour_bucket(now) - timedelta(hours=window_hours - 1)
+    window = await session.execute(
+        select(
+            ApiUsageRollup.bucket_start,
+            ApiUsageRollup.api_type,
+            ApiUsageRollup.call_count,
+            ApiUsageRollup.latency_sketch,
+        )
+        .where(ApiUsageRollup.bucket_start >= first_bucket)
+        .order_by(ApiUsageRollup.bucket_start)
+    )
+
+    timeline: Dict[datetime, Dict[str, int]] = {}
+    window_sketch = LatencySketch()
+    for bucket_start, api_type, calls, sketch in window:
+        hour = timeline.setdefault(hour_bucket(bucket_start), {key: 0 for key in DEFAULT_API_TYPES})
+        hour[api_type] = hour.get(api_type, 0) + int(calls or 0)
+        if sketch:
+            window_sketch.merge(LatencySketch.from_dict(sketch))
+
+    usage_timeline: List[Dict[str, Any]] = [
+        {"time": bucket.strftime("%H:00"), **counts} for bucket, counts in sorted(timeline.items())
+    ]
+
+    return {
+        "total_calls": total_calls,
+        "success_calls": success_calls,
+        "average_latency_ms": latency_sum / total_calls if total_calls else None,
+        "p95_latency_ms": window_sketch.quantile(0.95),
+        "p99_latency_ms": window_sketch.quantile(0.99),
+        "by_service": by_service,
+        "usage_last_24h": usage_timeline,
+        "last_call_at": last_call_at,
+    }
@@ -6,12 +6,12 @@ from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 import logging
 
 from app.config import settings
 from app.models.user import User, UserRole
 from app.database import get_db
+from app.services.principal_cache import principal_cache, last_seen_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -100,9 +100,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Fetch user from database
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # Fetch user (from the principal cache when fresh)
+    user = await principal_cache.get_user(user_id, db)
 
     if user is None:
         raise HTTPException(
@@ -117,9 +116,8 @@ async def get_current_user(
             detail="Inactive user"
         )
 
-    # Update last login
-    user.last_login_at = datetime.utcnow()
-    await db.commit()
+    # Record activity; written to last_login_at in periodic batches
+    last_seen_tracker.touch(user.id)
 
     return user
 
@@ -0,0 +1,250 @@
+"""
+Binary codec for cache entries.
+
+Cache values used to be pickled and gzipped, which was slow for large
+sentiment/benchmark payloads and meant unpickling bytes from a shared Redis.
+Values are now serialized with a schema-free binary format (msgpack, or
+compact JSON when msgpack is not installed) and compressed with the fastest
+available compressor (zstd, then lz4, then zlib), but only when the
+serialized value is larger than a threshold.
+
+Every payload starts with a fixed header, so readers never guess the format:
+
+    magic (2 bytes) | version (1) | serializer id (1) | compressor id (1) | raw length (4)
+
+Serializers and compressors are looked up by id on decode, so new ones can be
+registered without breaking values already in Redis.
+"""
+
+import json
+import logging
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"YC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("!2sBBBI")
+
+
+class CodecError(ValueError):
+    """Raised when a payload cannot be encoded or decoded"""
+
+
+@dataclass(frozen=True)
+class Serializer:
+    id: int
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+@dataclass(frozen=True)
+class Compressor:
+    id: int
+    name: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes, int], bytes]
+
+
+SERIALIZERS: Dict[int, Serializer] = {}
+COMPRESSORS: Dict[int, Compressor] = {}
+
+
+def register_serializer(serializer: Serializer) -> None:
+    SERIALIZERS[serializer.id] = serializer
+
+
+def register_compressor(compressor: Compressor) -> None:
+    COMPRESSORS[compressor.id] = compressor
+
+
+def _fallback_default(value: Any) -> Any:
+    # Same coercion the JSON fallback used to apply: dates as ISO strings, the rest via str()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+register_serializer(Serializer(
+    id=1,
+    name="json",
+    dumps=lambda value: json.dumps(value, default=_fallback_default, separators=(",", ":")).encode("utf-8"),
+    loads=lambda data: json.loads(data.decode("utf-8")),
+))
+
+if msgpack is not None:
+    register_serializer(Serializer(
+        id=2,
+        name="msgpack",
+        dumps=lambda value: msgpack.packb(value, default=_fallback_default, use_bin_type=True),
+        loads=lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+    ))
+
+register_compressor(Compressor(
+    id=0,
+    name="none",
+    compress=lambda data: data,
+    decompress=lambda data, raw_length: data,
+))
+
+register_compressor(Compressor(
+    id=1,
+    name="zlib",
+    compress=lambda data: zlib.compress(data, settings.cache_zlib_level),
+    decompress=lambda data, raw_length: zlib.decompress(data),
+))
+
+if lz4_frame is not None:
+    register_compressor(Compressor(
+        id=2,
+        name="lz4",
+        compress=lambda data: lz4_frame.compress(data),
+        decompress=lambda data, raw_length: lz4_frame.decompress(data),
+    ))
+
+if zstandard is not None:
+    _zstd_compressor = zstandard.ZstdCompressor(level=settings.cache_zstd_level)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+    register_compressor(Compressor(
+        id=3,
+        name="zstd",
+        compress=_zstd_compressor.compress,
+        decompress=lambda data, raw_length: _zstd_decompressor.decompress(data, max_output_size=raw_length),
+    ))
+
+
+def _by_name(registry: Dict[int, Any], name: str) -> Optional[Any]:
+    return next((entry for entry in registry.values() if entry.name == name), None)
+
+
+def _preferred(registry: Dict[int, Any], name: str, order) -> Any:
+    """Resolve a configured name, or the first available of `order` for "auto"."""
+    if name != "auto":
+        entry = _by_name(registry, name)
+        if entry is not None:
+            return entry
+        logger.warning("Cache codec component %r is not available, choosing automatically", name)
+    for candidate in order:
+        entry = _by_name(registry, candidate)
+        if entry is not None:
+            return entry
+    raise CodecError("No cache codec component available")
+
+
+class CacheCodec:
+    """Encodes values to self-describing bytes and back"""
+
+    def __init__(
+        self,
+        serializer: Optional[str] = None,
+        compressor: Optional[str] = None,
+        compression_threshold: Optional[int] = None,
+    ):
+        self.serializer = _preferred(
+            SERIALIZERS, serializer or settings.cache_codec_serializer, ("msgpack", "json")
+        )
+        self.compressor = _preferred(
+            COMPRESSORS, compressor or settings.cache_codec_compressor, ("zstd", "lz4", "zlib")
+        )
+        self.compression_threshold = (
+            settings.cache_compression_threshold
+            if compression_threshold is None
+            else compression_threshold
+        )
+
+    def encode(self, value: Any, compress: bool = True) -> bytes:
+        """Serialize a value, compressing it only when it is large enough to pay off"""
+        try:
+            body = self.serializer.dumps(value)
+        except (TypeError, ValueError, OverflowError) as exc:
+            raise CodecError(f"Cannot serialize value with {self.serializer.name}: {exc}") from exc
+
+        raw_length = len(body)
+        compressor = COMPRESSORS[0]
+        if compress and raw_length >= self.compression_threshold:
+            compressed = self.compressor.compress(body)
+            # Incompressible data is stored as-is
+            if len(compressed) < raw_length:
+                body = compressed
+                compressor = self.compressor
+
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, self.serializer.id, compressor.id, raw_length)
+        return header + body
+
+    def decode(self, payload: bytes) -> Any:
+        """Decode a payload written by any registered serializer/compressor pair"""
+        serializer, compressor, raw_length = self._parse_header(payload)
+        body = memoryview(payload)[HEADER.size:]
+        try:
+            data = compressor.decompress(bytes(body), raw_length) if compressor.id else bytes(body)
+            return serializer.loads(data)
+        except Exception as exc:
+            raise CodecError(f"Corrupt {serializer.name}/{compressor.name} cache payload: {exc}") from exc
+
+    def raw_size(self, payload: bytes) -> int:
+        """Uncompressed size of the serialized value, read from the header"""
+        return self._parse_header(payload)[2]
+
+    def describe(self, payload: bytes) -> Dict[str, Any]:
+        serializer, compressor, raw_length = self._parse_header(payload)
+        return {
+            "version": payload[2],
+            "serializer": serializer.name,
+            "compressor": compressor.name,
+            "raw_size": raw_length,
+            "stored_size": len(payload),
+        }
+
+    @staticmethod
+    def _parse_header(payload: bytes):
+        if len(payload) < HEADER.size:
+            raise CodecError("Cache payload is shorter than the codec header")
+        magic, version, serializer_id, compressor_id, raw_length = HEADER.unpack_from(payload)
+        if magic != MAGIC:
+            raise CodecError("Cache payload has no codec header (written by an older format)")
+        if version != FORMAT_VERSION:
+            raise CodecError(f"Unsupported cache format version {version}")
+        serializer = SERIALIZERS.get(serializer_id)
+        compressor = COMPRESSORS.get(compressor_id)
+        if serializer is None or compressor is None:
+            raise CodecError(
+                f"Cache payload needs serializer {serializer_id} / compressor {compressor_id}, "
+                "which are not installed"
+            )
+        return serializer, compressor, raw_length
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format_version": FORMAT_VERSION,
+            "serializer": self.serializer.name,
+            "compressor": self.compressor.name,
+            "compression_threshold": self.compression_threshold,
+        }
+
+
+# Global instance
+cache_codec = CacheCodec()
@@ -30,7 +30,7 @@ logger = logging.getLogger(__name__)
 class CommunityIntelligenceService:
     """Service for community-driven intelligence and validation"""
     
-    def __init__(self, db: Session, you_client: YouComOrchestrator):
+    def __init__(self, db: Session, you_client: Optional[YouComOrchestrator] = None):
         self.db = db
         self.you_client = you_client
         self.multi_agent = MultiAgentOrchestrator()
@@ -17,6 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
 from app.database import AsyncSessionLocal
 from app.models.user import User
+from app.services.principal_cache import principal_cache
 from app.models.impact_card import ImpactCard
 from app.models.company_research import CompanyResearch
 from app.models.integration import IntegrationInstallation, IntegrationUsageLog
@@ -215,6 +216,7 @@ class GDPRService:
                     )
                 )
                 await session.commit()
+                principal_cache.invalidate(user_id)
                 
                 return {
                     "status": "updated",
@@ -445,6 +447,7 @@ class GDPRService:
                     )
                 
                 await session.commit()
+                principal_cache.invalidate(user_id)
             
             request.status = "completed"
             request.completed_at = datetime.utcnow()
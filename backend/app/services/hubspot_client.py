@@ -40,9 +40,14 @@ class HubSpotClient:
     MAX_REQUESTS_PER_WINDOW = 100
     RATE_LIMIT_WINDOW = 10  # seconds
     
-    def __init__(self, access_token: str, refresh_token: Optional[str] = None):
+    # Batch endpoints accept at most 100 inputs per request
+    MAX_BATCH_SIZE = 100
+    
+    def __init__(self, access_token: str, refresh_token: Optional[str] = None,
+                 base_url: Optional[str] = None):
         self.access_token = access_token
         self.refresh_token = refresh_token
+        self.base_url = (base_url or settings.hubspot_api_base_url or self.BASE_URL).rstrip("/")
         self.client = httpx.AsyncClient(timeout=30.0)
         
         # Rate limiting
@@ -167,7 +172,7 @@ class HubSpotClient:
         """Make authenticated request to HubSpot API with rate limiting and retries"""
         await self._wait_for_rate_limit()
         
-        url = f"{self.BASE_URL}{endpoint}"
+        url = f"{self.base_url}{endpoint}"
         headers = kwargs.pop("headers", {})
         headers["Authorization"] = f"Bearer {self.access_token}"
         headers["Content-Type"] = "application/json"
@@ -259,6 +264,29 @@ class HubSpotClient:
         response = await self._make_request("PATCH", f"/crm/v3/objects/companies/{company_id}", json=data)
         return response.json()
     
+    # Company batch API methods
+    async def batch_create_companies(self, inputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create up to 100 companies in one request; inputs are {"properties": {...}}"""
+        response = await self._make_request("POST", "/crm/v3/objects/companies/batch/create",
+                                            json={"inputs": inputs})
+        return response.json()
+    
+    async def batch_update_companies(self, inputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Update up to 100 companies in one request; inputs are {"id": ..., "properties": {...}}"""
+        response = await self._make_request("POST", "/crm/v3/objects/companies/batch/update",
+                                            json={"inputs": inputs})
+        return response.json()
+    
+    async def batch_upsert_companies(self, inputs: List[Dict[str, Any]], id_property: str) -> Dict[str, Any]:
+        """Create or update up to 100 companies keyed by a unique-value property
+        
+        Inputs are {"id": <value of id_property>, "properties": {...}}. HubSpot
+        answers 207 with an "errors" list when only some inputs were applied.
+        """
+        data = {"inputs": [{**item, "idProperty": id_property} for item in inputs]}
+        response = await self._make_request("POST", "/crm/v3/objects/companies/batch/upsert", json=data)
+        return response.json()
+    
     # Custom Properties API methods
     async def get_contact_properties(self) -> Dict[str, Any]:
         """Get all contact properties"""
@@ -5,13 +5,15 @@ Handles bidirectional sync between CIA and HubSpot CRM
 
 import asyncio
 import logging
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Deque, Dict, List, Optional, Any, Tuple
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
 
+from app.config import settings
 from app.database import get_db
 from app.models.hubspot_integration import (
     HubSpotIntegration, HubSpotSyncLog, HubSpotCustomProperty
@@ -72,7 +74,18 @@ class HubSpotSyncService:
         }
     ]
     
+    # Unique-value company property that batch upserts are keyed on
+    COMPANY_ID_PROPERTY = "cia_watch_item_id"
+    
     DEFAULT_COMPANY_PROPERTIES = [
+        {
+            "name": "cia_watch_item_id",
+            "label": "CIA Watch Item ID",
+            "description": "CIA watch item this company is synced from",
+            "type": "string",
+            "fieldType": "text",
+            "hasUniqueValue": True
+        },
         {
             "name": "cia_competitive_risk_score",
             "label": "CIA Competitive Risk Score",
@@ -189,62 +202,56 @@ class HubSpotSyncService:
             raise
     
     async def sync_to_hubspot(self, sync_type: str = "incremental") -> HubSpotSyncLog:
-        """Sync CIA data to HubSpot"""
+        """Sync CIA data to HubSpot
+        
+        Watch items are upserted as companies, carrying the risk score of their
+        latest impact card, in batch calls of up to `hubspot_sync_batch_size`
+        records with `hubspot_sync_concurrency` batches in flight. The sync log
+        is checkpointed after each batch, so a full sync that fails resumes
+        after the last watch item HubSpot acknowledged.
+        """
+        checkpoint = await self._get_full_sync_checkpoint() if sync_type == "full_sync" else None
+        after_id = checkpoint["last_watch_item_id"] if checkpoint else 0
+        
         sync_log = HubSpotSyncLog(
             integration_id=self.integration.id,
             sync_type=sync_type,
             direction="to_hubspot",
             status="running",
-            started_at=datetime.utcnow()
+            started_at=datetime.utcnow(),
+            sync_metadata={
+                "checkpoint": {"last_watch_item_id": after_id},
+                "resumed_from_log_id": checkpoint["log_id"] if checkpoint else None,
+            }
         )
         self.db.add(sync_log)
         await self.db.commit()
         
+        if checkpoint:
+            logger.info(f"🔁 Resuming HubSpot full sync after watch item {after_id}")
+        
+        totals = {"processed": 0, "successful": 0, "failed": 0}
         try:
-            records_processed = 0
-            records_successful = 0
-            records_failed = 0
-            
             # Determine sync window
             if sync_type == "full_sync":
                 since_date = None
             else:
                 since_date = self.integration.last_successful_sync_at or (datetime.utcnow() - timedelta(days=7))
             
-            # Sync companies from watch items
-            watch_items = await self._get_watch_items_to_sync(since_date)
-            for watch_item in watch_items:
-                try:
-                    await self._sync_watch_item_to_hubspot(watch_item)
-                    records_successful += 1
-                except Exception as e:
-                    logger.error(f"Failed to sync watch item {watch_item.id}: {e}")
-                    records_failed += 1
-                records_processed += 1
-            
-            # Sync impact cards as activities/notes
-            impact_cards = await self._get_impact_cards_to_sync(since_date)
-            for impact_card in impact_cards:
-                try:
-                    await self._sync_impact_card_to_hubspot(impact_card)
-                    records_successful += 1
-                except Exception as e:
-                    logger.error(f"Failed to sync impact card {impact_card.id}: {e}")
-                    records_failed += 1
-                records_processed += 1
+            await self._upsert_companies_in_batches(sync_log, since_date, after_id, totals)
             
             # Update sync log
-            sync_log.status = "success" if records_failed == 0 else "partial_success"
-            sync_log.records_processed = records_processed
-            sync_log.records_successful = records_successful
-            sync_log.records_failed = records_failed
+            sync_log.status = "success" if totals["failed"] == 0 else "partial_success"
+            sync_log.records_processed = totals["processed"]
+            sync_log.records_successful = totals["successful"]
+            sync_log.records_failed = totals["failed"]
             sync_log.completed_at = datetime.utcnow()
             sync_log.duration_seconds = int((sync_log.completed_at - sync_log.started_at).total_seconds())
             
             # Update integration
-            if records_successful > 0:
+            if totals["successful"] > 0:
                 self.integration.last_successful_sync_at = datetime.utcnow()
-                self.integration.total_companies_synced += len(watch_items)
+                self.integration.total_companies_synced += totals["successful"]
                 self.integration.consecutive_failures = 0
             
             self.integration.last_sync_at = datetime.utcnow()
@@ -254,6 +261,9 @@ class HubSpotSyncService:
             
         except Exception as e:
             sync_log.status = "failure"
+            sync_log.records_processed = totals["processed"]
+            sync_log.records_successful = totals["successful"]
+            sync_log.records_failed = totals["failed"]
             sync_log.error_message = str(e)
             sync_log.completed_at = datetime.utcnow()
             sync_log.duration_seconds = int((sync_log.completed_at - sync_log.started_at).total_seconds())
@@ -348,81 +358,196 @@ class HubSpotSyncService:
             raise HubSpotSyncConflictError(f"Manual conflict resolution required for {conflict_resolution}")
     
     # Private helper methods
-    async def _get_watch_items_to_sync(self, since_date: Optional[datetime]) -> List[WatchItem]:
-        """Get watch items that need to be synced to HubSpot"""
-        query = select(WatchItem).where(WatchItem.workspace_id == self.integration.workspace_id)
-        
-        if since_date:
-            query = query.where(
-                or_(
-                    WatchItem.created_at >= since_date,
-                    WatchItem.updated_at >= since_date
+    async def _get_full_sync_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Checkpoint of the latest full sync to HubSpot, if that sync failed"""
+        query = (
+            select(HubSpotSyncLog)
+            .where(
+                and_(
+                    HubSpotSyncLog.integration_id == self.integration.id,
+                    HubSpotSyncLog.direction == "to_hubspot",
+                    HubSpotSyncLog.sync_type == "full_sync"
                 )
             )
-        
+            .order_by(HubSpotSyncLog.started_at.desc())
+            .limit(1)
+        )
         result = await self.db.execute(query)
-        return result.scalars().all()
+        last_sync = result.scalar_one_or_none()
+        
+        if not last_sync or last_sync.status != "failure":
+            return None
+        last_watch_item_id = (last_sync.sync_metadata or {}).get("checkpoint", {}).get("last_watch_item_id")
+        if not last_watch_item_id:
+            return None
+        return {"log_id": str(last_sync.id), "last_watch_item_id": last_watch_item_id}
     
-    async def _get_impact_cards_to_sync(self, since_date: Optional[datetime]) -> List[ImpactCard]:
-        """Get impact cards that need to be synced to HubSpot"""
-        query = select(ImpactCard).where(ImpactCard.workspace_id == self.integration.workspace_id)
+    async def _upsert_companies_in_batches(self, sync_log: HubSpotSyncLog, since_date: Optional[datetime],
+                                           after_id: int, totals: Dict[str, int]):
+        """Page through watch items by id and upsert them with bounded concurrency
+        
+        Batches can finish out of order, so the checkpoint only advances past a
+        batch once every batch before it has finished. A whole batch rejected by
+        HubSpot counts as failed records; any other error (auth, network, rate
+        limit retries exhausted) cancels the batches in flight and aborts the
+        sync at the current checkpoint.
+        """
+        batch_size = max(1, min(settings.hubspot_sync_batch_size, HubSpotClient.MAX_BATCH_SIZE))
+        slots = asyncio.Semaphore(max(1, settings.hubspot_sync_concurrency))
+        inflight: Deque[Tuple[int, int, asyncio.Task]] = deque()  # (last id, size, task) in id order
+        
+        async def checkpoint():
+            advanced = False
+            while inflight and inflight[0][2].done():
+                last_id, size, task = inflight.popleft()
+                successful = task.result()
+                totals["processed"] += size
+                totals["successful"] += successful
+                totals["failed"] += size - successful
+                advanced = True
+            if advanced:
+                sync_log.sync_metadata = {
+                    **(sync_log.sync_metadata or {}),
+                    "checkpoint": {"last_watch_item_id": last_id},
+                }
+                await self.db.commit()
+        
+        try:
+            cursor = after_id
+            while True:
+                records = await self._get_company_records(since_date, cursor, batch_size)
+                if not records:
+                    break
+                cursor = records[-1][0]
+                
+                await slots.acquire()
+                task = asyncio.create_task(self._upsert_company_batch([inputs for _, inputs in records]))
+                task.add_done_callback(lambda _: slots.release())
+                inflight.append((cursor, len(records), task))
+                await checkpoint()
+            
+            while inflight:
+                await asyncio.wait([inflight[0][2]])
+                await checkpoint()
+        finally:
+            for _, _, task in inflight:
+                task.cancel()
+            await asyncio.gather(*(task for _, _, task in inflight), return_exceptions=True)
+    
+    async def _upsert_company_batch(self, inputs: List[Dict[str, Any]]) -> int:
+        """Upsert one batch of companies and return how many HubSpot applied
+        
+        Companies synced before upserts were keyed on COMPANY_ID_PROPERTY were
+        matched by name and don't carry the key yet. Those are looked up by name
+        and updated in place, which backfills the key, so the upsert doesn't
+        create a duplicate of them.
+        """
+        try:
+            unkeyed = await self._find_unkeyed_companies([item["properties"]["name"] for item in inputs])
+            updates, upserts = [], []
+            for item in inputs:
+                company_id = unkeyed.pop(item["properties"]["name"].lower(), None)
+                if company_id:
+                    properties = {**item["properties"], self.COMPANY_ID_PROPERTY: item["id"]}
+                    updates.append({"id": company_id, "properties": properties})
+                else:
+                    upserts.append(item)
+            
+            results = []
+            if updates:
+                results.append(await self.client.batch_update_companies(updates))
+            if upserts:
+                results.append(await self.client.batch_upsert_companies(upserts, self.COMPANY_ID_PROPERTY))
+        except HubSpotAPIError as e:
+            logger.error(f"❌ HubSpot rejected a batch of {len(inputs)} companies: {e}")
+            return 0
+        
+        for result in results:
+            for error in result.get("errors", []):
+                logger.error(f"Failed to sync company to HubSpot: {error.get('message')}")
+        return sum(len(result.get("results", [])) for result in results)
+    
+    async def _find_unkeyed_companies(self, names: List[str]) -> Dict[str, str]:
+        """HubSpot ids of companies with these names that lack COMPANY_ID_PROPERTY, by lowercased name"""
+        filters = [
+            {"propertyName": "name", "operator": "IN", "values": sorted({name.lower() for name in names})},
+            {"propertyName": self.COMPANY_ID_PROPERTY, "operator": "NOT_HAS_PROPERTY"}
+        ]
+        companies: Dict[str, str] = {}
+        after = None
+        while True:
+            page = await self.client.search_companies(filters, properties=["name"],
+                                                      limit=HubSpotClient.MAX_BATCH_SIZE, after=after)
+            for company in page.get("results", []):
+                companies.setdefault(company["properties"]["name"].lower(), company["id"])
+            after = page.get("paging", {}).get("next", {}).get("after")
+            if not after:
+                return companies
+    
+    async def _get_company_records(self, since_date: Optional[datetime], after_id: int,
+                                   limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Next page of watch items after `after_id` as (id, batch upsert input)"""
+        query = (
+            select(WatchItem.id, WatchItem.competitor_name, WatchItem.is_active)
+            .where(WatchItem.id > after_id)
+            .order_by(WatchItem.id)
+            .limit(limit)
+        )
         
         if since_date:
+            changed_cards = or_(ImpactCard.created_at >= since_date, ImpactCard.updated_at >= since_date)
             query = query.where(
                 or_(
-                    ImpactCard.created_at >= since_date,
-                    ImpactCard.updated_at >= since_date
+                    WatchItem.created_at >= since_date,
+                    WatchItem.updated_at >= since_date,
+                    WatchItem.id.in_(select(ImpactCard.watch_item_id).where(changed_cards)),
+                    WatchItem.competitor_name.in_(select(ImpactCard.competitor_name).where(changed_cards))
                 )
             )
         
         result = await self.db.execute(query)
-        return result.scalars().all()
-    
-    async def _sync_watch_item_to_hubspot(self, watch_item: WatchItem):
-        """Sync a watch item to HubSpot as a company"""
-        # Search for existing company
-        search_filters = [
-            {"propertyName": "name", "operator": "EQ", "value": watch_item.company_name}
-        ]
-        
-        search_result = await self.client.search_companies(search_filters)
-        
-        # Prepare company properties
-        properties = {
-            "name": watch_item.company_name,
-            "cia_competitor_status": "direct" if watch_item.is_competitor else "prospect",
-            "cia_industry_category": watch_item.industry or "Unknown",
-            "cia_last_intelligence_update": datetime.utcnow().isoformat()
-        }
-        
-        if search_result.get("results"):
-            # Update existing company
-            company_id = search_result["results"][0]["id"]
-            await self.client.update_company(company_id, properties)
-        else:
-            # Create new company
-            await self.client.create_company(properties)
-    
-    async def _sync_impact_card_to_hubspot(self, impact_card: ImpactCard):
-        """Sync an impact card to HubSpot as a note or activity"""
-        # Find related company in HubSpot
-        search_filters = [
-            {"propertyName": "name", "operator": "EQ", "value": impact_card.company_name}
-        ]
+        watch_items = result.all()
+        if not watch_items:
+            return []
         
-        search_result = await self.client.search_companies(search_filters)
+        risk_scores = await self._get_latest_risk_scores(watch_items)
+        updated_at = datetime.utcnow().isoformat()
         
-        if search_result.get("results"):
-            company_id = search_result["results"][0]["id"]
-            
-            # Update company with latest risk score
+        records = []
+        for watch_item in watch_items:
             properties = {
-                "cia_competitive_risk_score": impact_card.risk_score,
-                "cia_last_intelligence_update": datetime.utcnow().isoformat(),
-                "cia_competitive_alerts": 1  # Increment alert count
+                "name": watch_item.competitor_name,
+                "cia_competitor_status": "direct" if watch_item.is_active else "not_monitored",
+                "cia_last_intelligence_update": updated_at
             }
-            
-            await self.client.update_company(company_id, properties)
+            if watch_item.id in risk_scores:
+                properties["cia_competitive_risk_score"] = risk_scores[watch_item.id]
+            records.append((watch_item.id, {"id": str(watch_item.id), "properties": properties}))
+        return records
+    
+    async def _get_latest_risk_scores(self, watch_items) -> Dict[int, int]:
+        """Risk score of the newest impact card per watch item, matched by id or else by name"""
+        ids_by_name = {watch_item.competitor_name: watch_item.id for watch_item in watch_items}
+        query = (
+            select(ImpactCard.watch_item_id, ImpactCard.competitor_name, ImpactCard.risk_score)
+            .where(
+                or_(
+                    ImpactCard.watch_item_id.in_([watch_item.id for watch_item in watch_items]),
+                    and_(
+                        ImpactCard.watch_item_id.is_(None),
+                        ImpactCard.competitor_name.in_(list(ids_by_name))
+                    )
+                )
+            )
+            .order_by(ImpactCard.id)
+        )
+        result = await self.db.execute(query)
+        
+        risk_scores = {}
+        for card in result:
+            watch_item_id = card.watch_item_id if card.watch_item_id is not None else ids_by_name[card.competitor_name]
+            risk_scores[watch_item_id] = card.risk_score
+        return risk_scores
     
     async def _get_hubspot_companies_to_sync(self) -> List[Dict[str, Any]]:
         """Get companies from HubSpot that should be synced to CIA"""
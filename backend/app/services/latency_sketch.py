@@ -0,0 +1,147 @@
+"""
+Mergeable streaming quantile sketch (DDSketch-style) for latency metrics.
+
+Values are counted in logarithmically sized bins, so any quantile is
+returned within `relative_accuracy` of the true value (1% by default). This
+holds regardless of how many samples were added. Two sketches with the
+same accuracy merge by adding bin counts. That makes them safe to
+pre-aggregate per hour, per window or per worker and combine later,
+without ever keeping the raw samples.
+"""
+
+import json
+import math
+from typing import Any, Dict, Iterable, Optional
+
+# Values at or below this are counted in the zero bin (latencies are >= 0)
+MIN_TRACKED_VALUE = 1e-9
+
+
+class LatencySketch:
+    """Relative-error quantile sketch over non-negative values"""
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        # Midpoint (in relative terms) of the bin (gamma^(i-1), gamma^i]
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value is None or count <= 0 or math.isnan(value):
+            return
+        value = max(0.0, float(value))
+
+        if value <= MIN_TRACKED_VALUE:
+            self.zero_count += count
+        else:
+            index = self._index(value)
+            self.bins[index] = self.bins.get(index, 0) + count
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+
+        self.count += count
+        self.sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def _collapse(self) -> None:
+        """Fold the lowest bins together so the highest quantiles stay accurate"""
+        indexes = sorted(self.bins)
+        excess = len(indexes) - self.max_bins
+        target = indexes[excess]
+        for index in indexes[:excess]:
+            self.bins[target] += self.bins.pop(index)
+
+    def merge(self, other: "LatencySketch") -> "LatencySketch":
+        """Add another sketch's counts into this one (in place)"""
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if other.count == 0:
+            return self
+
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile `q` (0..1), or None when empty"""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "zero_count": self.zero_count,
+            # JSON object keys must be strings
+            "bins": {str(index): count for index, count in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]], max_bins: int = 2048) -> "LatencySketch":
+        if not data:
+            return cls(max_bins=max_bins)
+        sketch = cls(relative_accuracy=data.get("relative_accuracy", 0.01), max_bins=max_bins)
+        sketch.count = int(data.get("count", 0))
+        sketch.sum = float(data.get("sum", 0.0))
+        sketch.min = data.get("min")
+        sketch.max = data.get("max")
+        sketch.zero_count = int(data.get("zero_count", 0))
+        sketch.bins = {int(index): int(count) for index, count in (data.get("bins") or {}).items()}
+        return sketch
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, payload: str | bytes) -> "LatencySketch":
+        return cls.from_dict(json.loads(payload))
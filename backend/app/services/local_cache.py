@@ -0,0 +1,169 @@
+"""
+In-process L1 cache tier.
+
+Sits in front of Redis (L2) in the advanced cache manager. Entries live in an
+OrderedDict kept in LRU order, so lookups, inserts and evictions are O(1), and
+the tier is bounded by a byte budget rather than an entry count. A min-heap
+of expiry times lets expired entries be dropped without scanning, whatever
+mix of TTLs they were written with.
+"""
+
+import fnmatch
+import heapq
+import math
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class L1Entry:
+    """A cached value and the bookkeeping needed to expire and evict it"""
+    value: Any
+    size_bytes: int
+    expires_at: float  # monotonic expiry of this L1 copy
+    l2_expires_at: Optional[float] = None  # monotonic expiry of the backing L2 entry
+
+
+def should_refresh_early(
+    expires_at: Optional[float],
+    recompute_seconds: float,
+    beta: float = 1.0,
+    now: Optional[float] = None,
+) -> bool:
+    """Probabilistic early expiration (XFetch).
+
+    Each reader independently decides to recompute with a probability that
+    rises as expiry approaches, scaled by how long a recompute takes, so a hot
+    key is usually refreshed by a single caller before it expires instead of
+    by every caller right after.
+    """
+    if expires_at is None or recompute_seconds <= 0 or beta <= 0:
+        return False
+    now = time.monotonic() if now is None else now
+    # 1 - random() is in (0, 1], so the log is always defined
+    return now - recompute_seconds * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+class LocalCacheTier:
+    """LRU + TTL cache bounded by a byte budget"""
+
+    def __init__(self, max_bytes: int, ttl_seconds: float, name: str = "l1"):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.current_bytes = 0
+
+        self._entries: "OrderedDict[str, L1Entry]" = OrderedDict()  # LRU order
+        # (expires_at, key), possibly stale: replaced and removed keys are skipped when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
+
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "rejected": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[L1Entry]:
+        """Return the live entry for `key` and mark it most recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        size_bytes: int,
+        *,
+        ttl_seconds: Optional[float] = None,
+        l2_expires_at: Optional[float] = None,
+    ) -> bool:
+        """Insert or replace an entry; returns False if it can never fit"""
+        if size_bytes > self.max_bytes:
+            self.stats["rejected"] += 1
+            self.delete(key)
+            return False
+
+        now = time.monotonic()
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            self.delete(key)
+            return False
+
+        self._remove(key)
+        self._purge_expired(now)
+
+        entry = L1Entry(value=value, size_bytes=size_bytes, expires_at=now + ttl, l2_expires_at=l2_expires_at)
+        self._entries[key] = entry
+        heapq.heappush(self._expiry_heap, (entry.expires_at, key))
+        self.current_bytes += size_bytes
+        if len(self._expiry_heap) > 2 * len(self._entries) + 64:
+            # Drop stale heap items left behind by replaced and evicted keys
+            self._expiry_heap = [(entry.expires_at, key) for key, entry in self._entries.items()]
+            heapq.heapify(self._expiry_heap)
+
+        while self.current_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.stats["evictions"] += 1
+        return True
+
+    def delete(self, key: str) -> bool:
+        return self._remove(key)
+
+    def clear(self, pattern: Optional[str] = None) -> int:
+        """Drop every entry, or only those whose key matches a glob pattern"""
+        if pattern is None or pattern == "*":
+            count = len(self._entries)
+            self._entries.clear()
+            self._expiry_heap.clear()
+            self.current_bytes = 0
+            return count
+
+        matching = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+        for key in matching:
+            self._remove(key)
+        return len(matching)
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.current_bytes -= entry.size_bytes
+        return True
+
+    def _purge_expired(self, now: float) -> None:
+        # Amortised O(log n): entries are checked from the earliest expiry onwards
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                self.stats["expirations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "size_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "utilization": round(self.current_bytes / self.max_bytes, 4) if self.max_bytes else 0.0,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,337 @@
+"""
+Vectorized batch inference for the ML performance optimizer.
+
+Requests collected in a batching window are stacked into one NumPy feature
+matrix per model version, and a single `scaler.transform` +
+`model.predict_proba` call runs over it in a worker thread. Models and scalers
+stay resident keyed by version, so a batch costs one inference call instead of
+one database lookup, one `joblib.load` and one predict per request. Results
+are fanned back out to the per-request futures.
+
+Categorical features are encoded with the label encoders training saved
+beside the scaler. Training's encoders have no bucket for unknown values, so
+a request whose features the bundle cannot encode (an unseen category, or any
+non-numeric value for a model saved before encoders were persisted) fails with
+NoModelAvailable instead of being predicted from a made-up code.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.services.ml_training_service import feature_encoders_path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelBundle:
+    """A model and its scaler, loaded once and shared by every batch"""
+    version: str
+    model: Any
+    scaler: Any
+    feature_names: List[str]
+    loaded_at: float
+    # Category -> code per categorical column; None for models saved before
+    # the encoders were persisted
+    encoders: Optional[Dict[str, Dict[str, int]]] = None
+
+    @property
+    def has_probabilities(self) -> bool:
+        return hasattr(self.model, "predict_proba")
+
+
+@dataclass
+class BatchPrediction:
+    """Result delivered to one request's future"""
+    entity_id: Optional[str]
+    prediction_type: str
+    predicted_value: Any
+    confidence_score: Optional[float]
+    model_version: str
+    batch_size: int
+    processing_time_ms: float
+
+
+@dataclass
+class InferenceItem:
+    """A queued request and the future its result is delivered to"""
+    request: Any
+    future: asyncio.Future
+
+
+def load_model_bundle(version: str, model_path: str, scaler_path: str) -> ModelBundle:
+    """Load a model and scaler from disk (blocking; run in a thread)"""
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+
+    feature_names = getattr(scaler, "feature_names_in_", None)
+    if feature_names is None:
+        feature_names = [f"f{i}" for i in range(int(getattr(scaler, "n_features_in_", 0)))]
+
+    encoders = None
+    encoders_path = feature_encoders_path(scaler_path)
+    if os.path.exists(encoders_path):
+        encoders = {
+            str(name): {str(category): code for code, category in enumerate(encoder.classes_)}
+            for name, encoder in joblib.load(encoders_path).items()
+        }
+
+    return ModelBundle(
+        version=version,
+        model=model,
+        scaler=scaler,
+        feature_names=[str(name) for name in feature_names],
+        loaded_at=time.time(),
+        encoders=encoders,
+    )
+
+
+class UnencodableFeature(ValueError):
+    """A feature value the model's persisted encoders cannot reproduce"""
+
+
+class NoModelAvailable(Exception):
+    """No resident model can serve a request: none is trained for its
+    prediction type, or the model cannot encode the request's features"""
+
+
+def encode_value(value: Any, categories: Optional[Dict[str, int]] = None) -> float:
+    """Encode one feature value the way training did"""
+    if categories is not None:
+        # Training label-encoded the column's values as strings
+        code = categories.get(str(value))
+        if code is None:
+            raise UnencodableFeature(f"unseen category {value!r}")
+        return float(code)
+    if value is None:
+        return 0.0
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise UnencodableFeature(f"non-numeric value {value!r}") from None
+    return 0.0 if math.isnan(number) else number
+
+
+def build_feature_matrix(
+    rows: Sequence[Dict[str, Any]],
+    feature_names: Sequence[str],
+    encoders: Optional[Dict[str, Dict[str, int]]] = None,
+) -> np.ndarray:
+    """Stack per-request feature dicts into one (n_requests, n_features) matrix.
+
+    Columns follow the order the scaler was fitted with. Missing and unknown
+    features are filled with 0, matching `fillna(0)` at training time.
+    Raises UnencodableFeature for values `encoders` cannot reproduce.
+    """
+    encoders = encoders or {}
+    column_index = {name: i for i, name in enumerate(feature_names)}
+    matrix = np.zeros((len(rows), len(feature_names)), dtype=np.float64)
+
+    for row, features in enumerate(rows):
+        for name, value in (features or {}).items():
+            column = column_index.get(name)
+            if column is not None:
+                matrix[row, column] = encode_value(value, encoders.get(name))
+
+    return matrix
+
+
+def partition_encodable(
+    bundle: ModelBundle, items: Sequence[InferenceItem]
+) -> Tuple[List[InferenceItem], List[InferenceItem]]:
+    """Split items into those the bundle can encode and those it cannot"""
+    encodable, rejected = [], []
+    for item in items:
+        try:
+            build_feature_matrix([getattr(item.request, "features", None)], bundle.feature_names, bundle.encoders)
+        except UnencodableFeature as e:
+            logger.debug(f"Skipping vectorized inference for {getattr(item.request, 'entity_id', '?')}: {e}")
+            rejected.append(item)
+        else:
+            encodable.append(item)
+    return encodable, rejected
+
+
+def predict_matrix(bundle: ModelBundle, matrix: np.ndarray) -> Tuple[List[Any], List[Optional[float]]]:
+    """Scale and predict a whole feature matrix in one call (blocking)"""
+    if hasattr(bundle.scaler, "feature_names_in_"):
+        # Keep the column names the scaler was fitted with so sklearn does not
+        # warn about (or misalign) an unnamed matrix.
+        scaled = bundle.scaler.transform(pd.DataFrame(matrix, columns=bundle.feature_names, copy=False))
+    else:
+        scaled = bundle.scaler.transform(matrix)
+
+    if bundle.has_probabilities:
+        probabilities = bundle.model.predict_proba(scaled)
+        best = probabilities.argmax(axis=1)
+        values = bundle.model.classes_[best]
+        confidences = probabilities[np.arange(len(best)), best]
+        return values.tolist(), confidences.astype(float).tolist()
+
+    values = bundle.model.predict(scaled)
+    return values.tolist(), [None] * len(values)
+
+
+class ModelBundleCache:
+    """Resident models and scalers keyed by model version (LRU bounded)"""
+
+    def __init__(self, max_bundles: Optional[int] = None):
+        self.max_bundles = max_bundles or settings.ml_batch_max_resident_models
+        self._bundles: "OrderedDict[str, ModelBundle]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Task] = {}
+        self.stats = {"hits": 0, "loads": 0, "evictions": 0}
+
+    async def get(self, version: str, model_path: str, scaler_path: str) -> ModelBundle:
+        bundle = self._bundles.get(version)
+        if bundle is not None:
+            self._bundles.move_to_end(version)
+            self.stats["hits"] += 1
+            return bundle
+
+        # Concurrent batches for a cold version share one load
+        task = self._loading.get(version)
+        if task is None:
+            task = asyncio.create_task(
+                asyncio.to_thread(load_model_bundle, version, model_path, scaler_path)
+            )
+            self._loading[version] = task
+            task.add_done_callback(lambda _: self._loading.pop(version, None))
+
+        bundle = await asyncio.shield(task)
+        if version not in self._bundles:
+            self._store(bundle)
+        return bundle
+
+    def _store(self, bundle: ModelBundle) -> None:
+        self._bundles[bundle.version] = bundle
+        self.stats["loads"] += 1
+        logger.info(f"🧠 Loaded resident model {bundle.version} ({len(bundle.feature_names)} features)")
+        while len(self._bundles) > self.max_bundles:
+            evicted, _ = self._bundles.popitem(last=False)
+            self.stats["evictions"] += 1
+            logger.debug(f"Evicted resident model {evicted}")
+
+    def evict(self, version: str) -> bool:
+        return self._bundles.pop(version, None) is not None
+
+    def clear(self) -> None:
+        self._bundles.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "resident": list(self._bundles.keys()), "max_bundles": self.max_bundles}
+
+
+class BatchInferenceEngine:
+    """Runs one vectorized inference call per (prediction type, model version) group"""
+
+    def __init__(
+        self,
+        bundle_cache: Optional[ModelBundleCache] = None,
+        version_ttl_seconds: Optional[float] = None,
+    ):
+        self.bundles = bundle_cache or ModelBundleCache()
+        self.version_ttl_seconds = (
+            settings.ml_batch_version_ttl if version_ttl_seconds is None else version_ttl_seconds
+        )
+        self._versions: Dict[str, Tuple[Optional[str], float]] = {}
+        self.stats = {
+            "batches": 0,
+            "rows": 0,
+            "failed_batches": 0,
+            "max_batch_size": 0,
+            "inference_ms_total": 0.0,
+        }
+
+    async def resolve_version(
+        self, model_type: str, lookup: Callable[[], Awaitable[Optional[str]]]
+    ) -> Optional[str]:
+        """Latest model version for a type, re-queried at most once per TTL"""
+        cached = self._versions.get(model_type)
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < self.version_ttl_seconds:
+            return cached[0]
+
+        version = await lookup()
+        self._versions[model_type] = (version, now)
+        return version
+
+    async def run(
+        self,
+        bundle: ModelBundle,
+        prediction_type: str,
+        items: Sequence[InferenceItem],
+        make_result: Optional[Callable[[BatchPrediction], Any]] = None,
+    ) -> Optional[float]:
+        """Predict every pending item with one call and resolve their futures.
+
+        Futures receive a BatchPrediction, or whatever `make_result` converts
+        it to. Returns the inference time in milliseconds, or None if nothing
+        ran.
+        """
+        pending = [item for item in items if not item.future.done()]
+        if not pending:
+            return None
+
+        start = time.perf_counter()
+        try:
+            matrix = build_feature_matrix(
+                [getattr(item.request, "features", None) for item in pending],
+                bundle.feature_names,
+                bundle.encoders,
+            )
+            values, confidences = await asyncio.to_thread(predict_matrix, bundle, matrix)
+        except Exception as e:
+            self.stats["failed_batches"] += 1
+            logger.error(f"Vectorized inference failed for {bundle.version}: {e}")
+            for item in pending:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return None
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.stats["batches"] += 1
+        self.stats["rows"] += len(pending)
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(pending))
+        self.stats["inference_ms_total"] += elapsed_ms
+
+        for item, value, confidence in zip(pending, values, confidences):
+            if item.future.done():
+                continue
+            prediction = BatchPrediction(
+                entity_id=getattr(item.request, "entity_id", None),
+                prediction_type=prediction_type,
+                predicted_value=value,
+                confidence_score=confidence,
+                model_version=bundle.version,
+                batch_size=len(pending),
+                processing_time_ms=elapsed_ms,
+            )
+            item.future.set_result(make_result(prediction) if make_result else prediction)
+
+        return elapsed_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "avg_batch_size": self.stats["rows"] / batches if batches else 0.0,
+            "avg_inference_ms": self.stats["inference_ms_total"] / batches if batches else 0.0,
+            "models": self.bundles.get_stats(),
+        }
+
+
+# Global instance
+batch_inference_engine = BatchInferenceEngine()
@@ -0,0 +1,232 @@
+"""
+Asyncio-native priority batching scheduler.
+
+Replaces the thread-safe `queue.PriorityQueue` that the ML batch processor
+polled with a blocking `get(timeout=...)` from inside a coroutine. Entries wait
+in one FIFO deque per priority level (lower number = more important), and the
+scheduler task sleeps on an `asyncio.Event` until either enough rows are
+pending to fill a batch or the oldest entry reaches its flush deadline.
+
+Batches are filled by weighted round robin across priority levels: the most
+important level takes `fairness_base` entries per round, the next half as
+many, and so on. Every level takes at least one, so low-priority work is
+delayed but never starved.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Entry(Generic[T]):
+    item: T
+    size: int
+    priority: int
+    enqueued_at: float
+
+
+class PriorityBatchScheduler(Generic[T]):
+    """Collects submitted items into batches and hands them to `process_batch`"""
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[T]], Awaitable[None]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 100.0,
+        fairness_base: int = 4,
+        size_of: Optional[Callable[[T], int]] = None,
+        name: str = "batch",
+    ):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.fairness_base = max(1, fairness_base)
+        self.size_of = size_of or (lambda item: 1)
+        self.name = name
+
+        self._queues: Dict[int, Deque[_Entry[T]]] = {}
+        self._pending_rows = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+        self.stats: Dict[str, Any] = {
+            "submitted": 0,
+            "batches": 0,
+            "rows": 0,
+            "flush_full": 0,
+            "flush_deadline": 0,
+            "flush_shutdown": 0,
+            "max_queue_depth": 0,
+            "queue_depth_total": 0,
+            "batch_fill_total": 0.0,
+            "wait_ms_total": {},
+            "flushed_by_priority": {},
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def queue_depth(self) -> int:
+        """Rows waiting to be batched"""
+        return self._pending_rows
+
+    def submit(self, item: T, priority: int = 1) -> None:
+        """Queue an item; it is flushed with the next batch its priority earns"""
+        size = max(1, self.size_of(item))
+        self._queues.setdefault(priority, deque()).append(
+            _Entry(item=item, size=size, priority=priority, enqueued_at=time.monotonic())
+        )
+        self._pending_rows += size
+        self.stats["submitted"] += 1
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self._pending_rows)
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"⚡ Started {self.name} scheduler (max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait_ms})"
+        )
+
+    async def stop(self, drain: bool = True) -> None:
+        """Stop the scheduler, flushing anything still queued when `drain` is set"""
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if drain:
+            while self._pending_rows:
+                await self._flush("shutdown")
+        logger.info(f"Stopped {self.name} scheduler")
+
+    def _oldest_enqueued_at(self) -> Optional[float]:
+        heads = [entries[0].enqueued_at for entries in self._queues.values() if entries]
+        return min(heads) if heads else None
+
+    async def _run(self) -> None:
+        while self._running:
+            try:
+                oldest = self._oldest_enqueued_at()
+                if oldest is None:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                if self._pending_rows >= self.max_batch_size:
+                    await self._flush("full")
+                    continue
+
+                remaining = oldest + self.max_wait_ms / 1000 - time.monotonic()
+                if remaining <= 0:
+                    await self._flush("deadline")
+                    continue
+
+                # Sleep until the deadline or the next submit, whichever comes first
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+            except Exception as e:
+                logger.error(f"{self.name} scheduler error: {e}")
+                await asyncio.sleep(0.1)
+
+    def _take_batch(self) -> List[_Entry[T]]:
+        """Fill one batch by weighted round robin over priority levels"""
+        batch: List[_Entry[T]] = []
+        rows = 0
+
+        while rows < self.max_batch_size:
+            levels = sorted(priority for priority, entries in self._queues.items() if entries)
+            if not levels:
+                break
+            for rank, priority in enumerate(levels):
+                entries = self._queues[priority]
+                quota = max(1, self.fairness_base >> rank)
+                while quota and entries:
+                    # An oversized entry is only taken as the first in a batch
+                    if batch and rows + entries[0].size > self.max_batch_size:
+                        return batch
+                    entry = entries.popleft()
+                    batch.append(entry)
+                    rows += entry.size
+                    quota -= 1
+                    if rows >= self.max_batch_size:
+                        return batch
+
+        return batch
+
+    async def _flush(self, reason: str) -> None:
+        depth = self._pending_rows
+        entries = self._take_batch()
+        if not entries:
+            return
+
+        rows = sum(entry.size for entry in entries)
+        self._pending_rows -= rows
+        now = time.monotonic()
+
+        stats = self.stats
+        stats["batches"] += 1
+        stats["rows"] += rows
+        stats[f"flush_{reason}"] += 1
+        stats["queue_depth_total"] += depth
+        stats["batch_fill_total"] += min(1.0, rows / self.max_batch_size)
+        for entry in entries:
+            stats["wait_ms_total"][entry.priority] = (
+                stats["wait_ms_total"].get(entry.priority, 0.0) + (now - entry.enqueued_at) * 1000
+            )
+            stats["flushed_by_priority"][entry.priority] = (
+                stats["flushed_by_priority"].get(entry.priority, 0) + 1
+            )
+
+        try:
+            await self.process_batch([entry.item for entry in entries])
+        except Exception as e:
+            logger.error(f"{self.name} batch failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats
+        batches = stats["batches"]
+        entries_by_priority = {
+            priority: len(entries) for priority, entries in sorted(self._queues.items()) if entries
+        }
+        return {
+            "running": self._running,
+            "queue_depth": self._pending_rows,
+            "queued_by_priority": entries_by_priority,
+            "max_queue_depth": stats["max_queue_depth"],
+            "avg_queue_depth_at_flush": stats["queue_depth_total"] / batches if batches else 0.0,
+            "submitted": stats["submitted"],
+            "batches": batches,
+            "rows": stats["rows"],
+            "avg_batch_fill": stats["batch_fill_total"] / batches if batches else 0.0,
+            "flush_reasons": {
+                "full": stats["flush_full"],
+                "deadline": stats["flush_deadline"],
+                "shutdown": stats["flush_shutdown"],
+            },
+            "avg_wait_ms_by_priority": {
+                priority: stats["wait_ms_total"][priority] / stats["flushed_by_priority"][priority]
+                for priority in sorted(stats["wait_ms_total"])
+            },
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+        }
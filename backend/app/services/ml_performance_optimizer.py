@@ -9,30 +9,38 @@ import asyncio
 import logging
 import time
 import os
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Any, Tuple, Union
-from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import threading
 from concurrent.futures import ThreadPoolExecutor
-import queue
 
 import numpy as np
 import pandas as pd
 import joblib
 from sklearn.base import BaseEstimator
 from sklearn.preprocessing import StandardScaler
-import onnx
-import onnxruntime as ort
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.ensemble import RandomForestClassifier
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
 
+from app.database import AsyncSessionLocal
 from app.models.ml_training import TrainingJob, ModelPerformanceMetric
-from app.services.ml_prediction_service import PredictionRequest, PredictionResult, PredictionType, ModelInfo
+from app.services.ml_prediction_service import PredictionRequest, PredictionResult, PredictionType
 from app.services.ml_training_service import ModelType
+from app.services.ml_batch_scheduler import PriorityBatchScheduler
+from app.services.ml_batch_inference import (
+    BatchPrediction,
+    InferenceItem,
+    ModelBundle,
+    NoModelAvailable,
+    batch_inference_engine,
+    partition_encodable,
+)
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -80,6 +88,11 @@ class BatchRequest:
     batch_id: str
     priority: int
     submitted_at: datetime
+    futures: List[asyncio.Future] = field(default_factory=list)
+
+    def __await__(self):
+        """Await the per-request results; failed requests come back as exceptions."""
+        return asyncio.gather(*self.futures, return_exceptions=True).__await__()
 
 class MLPerformanceOptimizer:
     """Service for optimizing ML model inference performance."""
@@ -94,15 +107,13 @@ class MLPerformanceOptimizer:
         
         # Performance monitoring
         self.performance_metrics: Dict[str, PerformanceMetrics] = {}
-        self.latency_history: Dict[str, List[float]] = {}
+        # Shared with the batch processor, whose per-batch optimizers record here too
+        self.latency_history: Dict[str, List[float]] = ml_batch_processor.latency_history
         self.max_history_size = 1000
         
-        # Batch processing
-        self.batch_queue: queue.PriorityQueue = queue.PriorityQueue()
-        self.batch_processor_running = False
-        self.batch_size = 32
-        self.batch_timeout_ms = 100
+        # Batch processing runs on the process-wide ml_batch_processor
         self.executor = ThreadPoolExecutor(max_workers=4)
+        self.inference_engine = batch_inference_engine
         
         # Model cache for optimized models
         self.optimized_model_cache: Dict[str, Any] = {}
@@ -110,7 +121,7 @@ class MLPerformanceOptimizer:
         self.cache_timestamps: Dict[str, datetime] = {}
         
         # ONNX runtime sessions
-        self.onnx_sessions: Dict[str, ort.InferenceSession] = {}
+        self.onnx_sessions: Dict[str, Any] = {}
         
         # Default optimization configs
         self.optimization_configs = {
@@ -418,86 +429,93 @@ class MLPerformanceOptimizer:
                 "cache_hit_rate": 0.0
             }
     
-    async def predict_optimized(
-        self, 
-        request: PredictionRequest,
-        use_optimized: bool = True
-    ) -> PredictionResult:
-        """Make prediction using optimized model if available."""
-        start_time = time.time()
+    async def predict_optimized(self, request: PredictionRequest) -> PredictionResult:
+        """Make a prediction with the resident model for the request's type.
+
+        Raises NoModelAvailable if no model is trained for the prediction type
+        or its encoders cannot encode the request's features.
+        """
+        bundle = await self._get_model_bundle(request.prediction_type)
+        if bundle is None:
+            raise self._no_model(request.prediction_type)
         
-        try:
-            # Check for optimized model
-            if use_optimized:
-                optimized_result = await self._try_optimized_prediction(request)
-                if optimized_result:
-                    return optimized_result
-            
-            # Fall back to regular prediction
-            from app.services.ml_prediction_service import MLPredictionService
-            prediction_service = MLPredictionService(self.db)
-            result = await prediction_service.predict(request)
-            
-            # Record latency
-            latency_ms = (time.time() - start_time) * 1000
+        future = asyncio.get_running_loop().create_future()
+        items, rejected = partition_encodable(bundle, [InferenceItem(request, future)])
+        if rejected:
+            raise self._unencodable(bundle, request)
+        
+        latency_ms = await self.inference_engine.run(
+            bundle, request.prediction_type.value, items,
+            make_result=self._to_prediction_result
+        )
+        if latency_ms is not None:
             self._record_latency(request.prediction_type.value, latency_ms)
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Optimized prediction failed: {e}")
-            raise
+        return future.result()
     
-    async def _try_optimized_prediction(self, request: PredictionRequest) -> Optional[PredictionResult]:
-        """Try to make prediction using optimized model."""
-        try:
-            # Look for optimized model
-            model_type = self._get_model_type_for_prediction(request.prediction_type)
-            
-            # Get latest model version
-            result = await self.db.execute(
-                select(TrainingJob.new_model_version)
-                .where(TrainingJob.model_type == model_type.value)
-                .where(TrainingJob.status == "completed")
-                .order_by(desc(TrainingJob.completed_at))
-                .limit(1)
-            )
-            
-            model_version = result.scalar_one_or_none()
-            if not model_version:
-                return None
-            
-            # Check for optimized model file
-            optimized_path = os.path.join(
-                self.optimized_models_path,
-                f"{model_version}_optimized_basic.joblib"
-            )
-            
-            if not os.path.exists(optimized_path):
-                return None
-            
-            # Load optimized model (with caching)
-            cache_key = f"{model_version}_optimized"
-            optimized_model = await self._get_cached_model(cache_key, optimized_path)
-            
-            if not optimized_model:
-                return None
-            
-            # Load scaler
+    @staticmethod
+    def _no_model(prediction_type: PredictionType) -> NoModelAvailable:
+        return NoModelAvailable(f"No trained model is available for {prediction_type.value} predictions")
+    
+    @staticmethod
+    def _unencodable(bundle: ModelBundle, request: PredictionRequest) -> NoModelAvailable:
+        return NoModelAvailable(
+            f"Model {bundle.version} cannot encode the features of "
+            f"{getattr(request, 'entity_id', '?')} (unseen category or non-numeric value)"
+        )
+    
+    @staticmethod
+    def _to_prediction_result(prediction: BatchPrediction) -> PredictionResult:
+        """Convert a vectorized engine result to the PredictionResult callers expect."""
+        return PredictionResult(
+            prediction_type=PredictionType(prediction.prediction_type),
+            predicted_value=prediction.predicted_value,
+            confidence_score=prediction.confidence_score,
+            model_version=prediction.model_version,
+            processing_time_ms=prediction.processing_time_ms,
+            metadata={"batch_size": prediction.batch_size},
+            entity_id=prediction.entity_id
+        )
+    
+    async def _get_latest_model_version(self, model_type: ModelType) -> Optional[str]:
+        """Look up the most recently completed model version for a type."""
+        result = await self.db.execute(
+            select(TrainingJob.new_model_version)
+            .where(TrainingJob.model_type == model_type.value)
+            .where(TrainingJob.status == "completed")
+            .order_by(desc(TrainingJob.completed_at))
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+    
+    def _get_model_paths(self, model_version: str) -> Optional[Tuple[str, str]]:
+        """Model and scaler files for a version, preferring the optimized model."""
+        model_path = os.path.join(self.optimized_models_path, f"{model_version}_optimized_basic.joblib")
+        if not os.path.exists(model_path):
+            model_path = os.path.join(self.model_storage_path, f"{model_version}.joblib")
+        
+        # Training writes scalers to ml_scalers; older models kept them beside the model
+        scaler_path = os.path.join(settings.data_dir, "ml_scalers", f"{model_version}_scaler.joblib")
+        if not os.path.exists(scaler_path):
             scaler_path = os.path.join(self.model_storage_path, f"{model_version}_scaler.joblib")
-            if not os.path.exists(scaler_path):
-                return None
-            
-            scaler = await asyncio.to_thread(joblib.load, scaler_path)
-            
-            # Extract features and make prediction
-            # (This would use the same feature extraction logic as the regular prediction service)
-            # For now, return None to indicate optimized prediction not available
+        
+        if not os.path.exists(model_path) or not os.path.exists(scaler_path):
             return None
-            
-        except Exception as e:
-            logger.warning(f"Optimized prediction attempt failed: {e}")
+        return model_path, scaler_path
+    
+    async def _get_model_bundle(self, prediction_type: PredictionType) -> Optional[ModelBundle]:
+        """Resident model and scaler for the latest version of a prediction type."""
+        model_type = self._get_model_type_for_prediction(prediction_type)
+        model_version = await self.inference_engine.resolve_version(
+            model_type.value, lambda: self._get_latest_model_version(model_type)
+        )
+        if not model_version:
+            return None
+        
+        paths = self._get_model_paths(model_version)
+        if paths is None:
             return None
+        
+        return await self.inference_engine.bundles.get(model_version, *paths)
     
     def _get_model_type_for_prediction(self, prediction_type: PredictionType) -> ModelType:
         """Map prediction type to model type."""
@@ -542,118 +560,93 @@ class MLPerformanceOptimizer:
         if len(history) > self.max_history_size:
             history.pop(0)
     
+    @property
+    def batch_processor_running(self) -> bool:
+        return ml_batch_processor.running
+    
     async def start_batch_processor(self) -> None:
         """Start the batch processing service."""
-        if self.batch_processor_running:
-            return
-        
-        self.batch_processor_running = True
-        asyncio.create_task(self._batch_processor_loop())
-        logger.info("Started batch processor")
+        await ml_batch_processor.start()
     
     async def stop_batch_processor(self) -> None:
-        """Stop the batch processing service."""
-        self.batch_processor_running = False
-        logger.info("Stopped batch processor")
-    
-    async def _batch_processor_loop(self) -> None:
-        """Main loop for batch processing."""
-        while self.batch_processor_running:
-            try:
-                # Collect batch requests
-                batch_requests = []
-                deadline = time.time() + (self.batch_timeout_ms / 1000)
-                
-                while (len(batch_requests) < self.batch_size and 
-                       time.time() < deadline and 
-                       self.batch_processor_running):
-                    
-                    try:
-                        # Get request with timeout
-                        timeout = max(0.01, deadline - time.time())
-                        priority, batch_request = self.batch_queue.get(timeout=timeout)
-                        batch_requests.append(batch_request)
-                    except queue.Empty:
-                        break
-                
-                # Process batch if we have requests
-                if batch_requests:
-                    await self._process_batch(batch_requests)
-                
-                # Small delay to prevent busy waiting
-                await asyncio.sleep(0.001)
-                
-            except Exception as e:
-                logger.error(f"Batch processor error: {e}")
-                await asyncio.sleep(0.1)
+        """Stop the batch processing service, flushing queued requests."""
+        await ml_batch_processor.stop()
     
     async def _process_batch(self, batch_requests: List[BatchRequest]) -> None:
-        """Process a batch of prediction requests."""
+        """Process a batch of prediction requests with one inference call per prediction type."""
         try:
-            # Group requests by prediction type for efficiency
-            grouped_requests = {}
+            # Group requests (and the futures waiting on them) by prediction type
+            grouped_items: Dict[PredictionType, List[InferenceItem]] = {}
             for batch_req in batch_requests:
-                for req in batch_req.requests:
-                    pred_type = req.prediction_type
-                    if pred_type not in grouped_requests:
-                        grouped_requests[pred_type] = []
-                    grouped_requests[pred_type].append((batch_req.batch_id, req))
-            
-            # Process each group
-            results = {}
-            for pred_type, type_requests in grouped_requests.items():
-                # Load model once for all requests of this type
-                model_type = self._get_model_type_for_prediction(pred_type)
-                
-                # Process requests in parallel
-                tasks = []
-                for batch_id, request in type_requests:
-                    task = asyncio.create_task(self.predict_optimized(request))
-                    tasks.append((batch_id, task))
+                for req, future in zip(batch_req.requests, batch_req.futures):
+                    grouped_items.setdefault(req.prediction_type, []).append(InferenceItem(req, future))
+            
+            for pred_type, items in grouped_items.items():
+                try:
+                    bundle = await self._get_model_bundle(pred_type)
+                except Exception as e:
+                    logger.warning(f"Could not load resident model for {pred_type}: {e}")
+                    bundle = None
                 
-                # Wait for all tasks to complete concurrently
-                task_list = [task for batch_id, task in tasks]
-                batch_id_list = [batch_id for batch_id, task in tasks]
+                if bundle is None:
+                    self._fail_items(items, lambda item: self._no_model(pred_type))
+                    continue
                 
-                gathered_results = await asyncio.gather(*task_list, return_exceptions=True)
+                # Requests the model's encoders cannot reproduce fail instead of being guessed at
+                items, rejected = partition_encodable(bundle, items)
+                self._fail_items(rejected, lambda item: self._unencodable(bundle, item.request))
                 
-                # Process results and handle exceptions
-                for batch_id, result in zip(batch_id_list, gathered_results):
-                    try:
-                        if isinstance(result, Exception):
-                            logger.error(f"Task failed for batch_id {batch_id}: {result}")
-                            continue
-                        
-                        if batch_id not in results:
-                            results[batch_id] = []
-                        results[batch_id].append(result)
-                    except Exception as e:
-                        logger.error(f"Batch prediction failed for {batch_id}: {e}")
+                # Stack every request into one matrix; results fan out to the futures
+                latency_ms = await self.inference_engine.run(
+                    bundle, pred_type.value, items, make_result=self._to_prediction_result
+                )
+                if latency_ms is not None:
+                    self._record_latency(pred_type.value, latency_ms)
             
             logger.debug(f"Processed batch with {len(batch_requests)} requests")
             
         except Exception as e:
             logger.error(f"Batch processing failed: {e}")
+            for batch_req in batch_requests:
+                for future in batch_req.futures:
+                    if not future.done():
+                        future.set_exception(e)
+    
+    @staticmethod
+    def _fail_items(
+        items: List[InferenceItem], make_error: Callable[[InferenceItem], Exception]
+    ) -> None:
+        """Resolve each still-pending item's future with its own error."""
+        for item in items:
+            if not item.future.done():
+                item.future.set_exception(make_error(item))
     
     async def submit_batch_request(
         self, 
         requests: List[PredictionRequest],
         priority: int = 1
-    ) -> str:
-        """Submit a batch of requests for processing."""
-        batch_id = f"batch_{int(time.time() * 1000)}"
+    ) -> BatchRequest:
+        """Submit a batch of requests for processing.
+        
+        The returned BatchRequest is awaitable and resolves to one result per
+        request, in order. Lower priority numbers are scheduled first.
+        """
+        loop = asyncio.get_running_loop()
         
         batch_request = BatchRequest(
             requests=requests,
-            batch_id=batch_id,
+            batch_id=f"batch_{uuid.uuid4().hex[:12]}",
             priority=priority,
-            submitted_at=datetime.now(timezone.utc)
+            submitted_at=datetime.now(timezone.utc),
+            futures=[loop.create_future() for _ in requests]
         )
         
-        # Add to queue (lower priority number = higher priority)
-        self.batch_queue.put((priority, batch_request))
+        if not requests:
+            return batch_request
+        
+        ml_batch_processor.submit(batch_request, priority)
         
-        return batch_id
+        return batch_request
     
     async def get_performance_metrics(self, prediction_type: Optional[str] = None) -> Dict[str, Any]:
         """Get performance metrics for monitoring."""
@@ -681,9 +674,11 @@ class MLPerformanceOptimizer:
         return {
             "model_metrics": all_metrics,
             "latency_stats": latency_stats,
-            "batch_queue_size": self.batch_queue.qsize(),
+            "batch_queue_size": ml_batch_processor.scheduler.queue_depth,
             "batch_processor_running": self.batch_processor_running,
-            "cache_size": len(self.optimized_model_cache)
+            "batch_scheduler": ml_batch_processor.scheduler.get_stats(),
+            "cache_size": len(self.optimized_model_cache),
+            "batch_inference": self.inference_engine.get_stats()
         }
     
     async def cleanup_cache(self) -> int:
@@ -702,4 +697,56 @@ class MLPerformanceOptimizer:
                 del self.cache_timestamps[key]
         
         logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
-        return len(expired_keys)
\ No newline at end of file
+        return len(expired_keys)
+
+
+class MLBatchProcessor:
+    """Process-wide batch scheduler for optimized predictions.
+    
+    One scheduler serves every MLPerformanceOptimizer. Each flushed batch runs
+    on its own session from `session_factory`, so no request's session is held
+    by the scheduler task. Started and stopped with the application lifespan.
+    """
+    
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 100
+    ):
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.scheduler: PriorityBatchScheduler[BatchRequest] = PriorityBatchScheduler(
+            self._process_batch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            size_of=lambda batch_request: len(batch_request.requests),
+            name="ML batch"
+        )
+        self.latency_history: Dict[str, List[float]] = {}
+    
+    @property
+    def running(self) -> bool:
+        return self.scheduler.running
+    
+    async def start(self) -> None:
+        self.scheduler.start()
+    
+    async def stop(self) -> None:
+        """Stop the scheduler, flushing queued requests."""
+        await self.scheduler.stop()
+    
+    def submit(self, batch_request: BatchRequest, priority: int = 1) -> None:
+        self.scheduler.submit(batch_request, priority)
+        # Normally already running from the lifespan; scripts and tests start it here
+        self.scheduler.start()
+    
+    async def _process_batch(self, batch_requests: List[BatchRequest]) -> None:
+        async with self.session_factory() as db:
+            await MLPerformanceOptimizer(db)._process_batch(batch_requests)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return self.scheduler.get_stats()
+
+
+# Global instance
+ml_batch_processor = MLBatchProcessor()
@@ -13,6 +13,8 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, mean_absolute_error
 import joblib
 import os
+from dataclasses import dataclass, field
+from enum import Enum
 
 from app.models.predictive_intelligence import CompetitorPattern, PredictedEvent, PatternEvent
 from app.models.impact_card import ImpactCard
@@ -20,6 +22,48 @@ from app.models.impact_card import ImpactCard
 logger = logging.getLogger(__name__)
 
 
+class PredictionType(str, Enum):
+    """Types of predictions served by the trained ML models."""
+    RISK_SCORING = "risk_scoring"
+    CONFIDENCE_PREDICTION = "confidence_prediction"
+    IMPACT_CLASSIFICATION = "impact_classification"
+    RELEVANCE_CLASSIFICATION = "relevance_classification"
+
+
+@dataclass
+class PredictionRequest:
+    """A single prediction request for one entity."""
+    entity_id: str
+    entity_type: str
+    prediction_type: PredictionType
+    features: Dict[str, Any] = field(default_factory=dict)
+    use_cache: bool = False
+
+
+@dataclass
+class PredictionResult:
+    """Result of a prediction request."""
+    prediction_type: PredictionType
+    predicted_value: Any
+    confidence_score: Optional[float]
+    model_version: str
+    fallback_used: bool = False
+    processing_time_ms: float = 0.0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    entity_id: Optional[str] = None
+
+
+@dataclass
+class ModelInfo:
+    """A loaded model with its scaler and metadata."""
+    model: Any
+    scaler: Any
+    version: str
+    model_type: Any
+    performance_metrics: Dict[str, float]
+    loaded_at: datetime
+
+
 class MLPredictionService:
     """Machine Learning service for advanced competitor behavior prediction."""
     
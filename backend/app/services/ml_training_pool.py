@@ -0,0 +1,203 @@
+"""
+Process pool for CPU-bound model training.
+
+scikit-learn fits used to run inside `async def` methods, freezing the event
+loop (websocket progress, health checks, every other request) for the length
+of a fit. Training now runs in a dedicated `ProcessPoolExecutor`, with an
+asyncio semaphore capping how many jobs train at once. Waiting jobs queue
+in the event loop, where they are cheap to cancel.
+
+Workers report progress through a manager queue, and the parent polls for
+cancellation. Cancellation is cooperative: a worker stops at its next
+checkpoint (between preprocessing, fitting, evaluating and saving).
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TrainingCancelled(Exception):
+    """Raised inside a worker (and re-raised in the caller) when a job is cancelled"""
+
+
+class TrainingJobContext:
+    """Handle passed to the worker function for progress and cancellation checks"""
+
+    def __init__(self, job_id: str, progress_queue, cancel_event):
+        self.job_id = job_id
+        self.progress_queue = progress_queue
+        self.cancel_event = cancel_event
+
+    def report(self, progress: float, stage: str) -> None:
+        try:
+            self.progress_queue.put_nowait((progress, stage))
+        except Exception:  # pragma: no cover - progress is best effort
+            pass
+
+    def check_cancelled(self) -> None:
+        if self.cancel_event.is_set():
+            raise TrainingCancelled(f"Training job {self.job_id} was cancelled")
+
+
+ProgressCallback = Callable[[float, str], Awaitable[None]]
+CancelCheck = Callable[[], Awaitable[bool]]
+
+
+class TrainingProcessPool:
+    """Runs training functions in worker processes with bounded concurrency"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        start_method: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.max_workers = max_workers or settings.ml_training_max_concurrent_jobs
+        self.start_method = start_method or settings.ml_training_start_method
+        self.poll_interval = poll_interval or settings.ml_training_progress_interval
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._active: Dict[str, TrainingJobContext] = {}
+        self._queued = 0
+
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0}
+
+    def _ensure_started(self) -> None:
+        if self._executor is not None:
+            return
+        context = multiprocessing.get_context(self.start_method)
+        self._manager = context.Manager()
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+        logger.info(
+            "🧠 Training process pool started (max_workers=%s, start_method=%s)",
+            self.max_workers,
+            self.start_method,
+        )
+
+    async def run(
+        self,
+        job_id: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_progress: Optional[ProgressCallback] = None,
+        should_cancel: Optional[CancelCheck] = None,
+    ) -> Any:
+        """Run `fn(context, *args)` in a worker process and return its result.
+
+        While the job runs, progress reported by the worker is forwarded to
+        `on_progress`, and `should_cancel` is polled. A cancelled job raises
+        TrainingCancelled. If the awaiting task itself is cancelled, the worker
+        is told to stop and keeps its slot until it does.
+        """
+        self._ensure_started()
+        self.stats["submitted"] += 1
+        self._queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._queued -= 1
+
+        future: Optional[asyncio.Future] = None
+        try:
+            if should_cancel is not None and await should_cancel():
+                raise TrainingCancelled(f"Training job {job_id} was cancelled before it started")
+
+            context = TrainingJobContext(job_id, self._manager.Queue(), self._manager.Event())
+            self._active[job_id] = context
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, fn, context, *args)
+
+            while True:
+                done, _ = await asyncio.wait({future}, timeout=self.poll_interval)
+                await self._forward_progress(context, on_progress)
+                if done:
+                    break
+                if should_cancel is not None and not context.cancel_event.is_set() and await should_cancel():
+                    logger.info("🛑 Cancelling training job %s", job_id)
+                    context.cancel_event.set()
+
+            result = future.result()
+            self.stats["completed"] += 1
+            return result
+        except asyncio.CancelledError:
+            # The caller went away; stop the worker too rather than leave it training
+            if future is not None:
+                logger.info("🛑 Cancelling training job %s, its caller was cancelled", job_id)
+                context.cancel_event.set()
+            self.stats["cancelled"] += 1
+            raise
+        except TrainingCancelled:
+            self.stats["cancelled"] += 1
+            raise
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            if future is not None and not future.done():
+                # Keep the slot (and the job reachable) until the worker stops
+                future.add_done_callback(lambda _: self._release(job_id))
+            else:
+                self._release(job_id)
+
+    def _release(self, job_id: str) -> None:
+        self._active.pop(job_id, None)
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    async def _forward_progress(
+        self, context: TrainingJobContext, on_progress: Optional[ProgressCallback]
+    ) -> None:
+        latest = None
+        while True:
+            try:
+                latest = context.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            except Exception:  # pragma: no cover - manager gone during shutdown
+                break
+        if latest is not None and on_progress is not None:
+            await on_progress(*latest)
+
+    def cancel(self, job_id: str) -> bool:
+        """Signal a job running in this process; returns False if it is not here"""
+        context = self._active.get(job_id)
+        if context is None:
+            return False
+        context.cancel_event.set()
+        return True
+
+    async def shutdown(self) -> None:
+        """Stop the worker processes, cancelling queued calls"""
+        for context in list(self._active.values()):
+            context.cancel_event.set()
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown, wait=True, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+        self._semaphore = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "max_workers": self.max_workers,
+            "running": len(self._active),
+            "queued": self._queued,
+            "started": self._executor is not None,
+        }
+
+
+# Global instance
+training_process_pool = TrainingProcessPool()
@@ -31,6 +31,7 @@ from app.models.ml_training import TrainingJob, ModelPerformanceMetric, Feedback
 from app.models.impact_card import ImpactCard
 from app.services.feature_extractor import FeatureExtractor, FeatureSet
 from app.services.feature_store import FeatureStore
+from app.services.ml_training_pool import TrainingCancelled, TrainingJobContext, training_process_pool
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -69,6 +70,135 @@ class TrainingResult:
     performance_metrics: Dict[str, float]
     training_time: float
     error_message: Optional[str] = None
+    cancelled: bool = False
+
+def feature_encoders_path(scaler_path: str) -> str:
+    """Path of a model's categorical feature encoders, saved beside its scaler."""
+    return scaler_path.replace("_scaler.joblib", "_encoders.joblib")
+
+def preprocess_features(X: pd.DataFrame, encoders: Optional[Dict[str, LabelEncoder]] = None) -> pd.DataFrame:
+    """Preprocess features for training.
+    
+    When `encoders` is given, the fitted label encoder of each categorical
+    column is stored in it so inference can reproduce the encoding.
+    """
+    X_processed = X.copy()
+    
+    # Handle categorical variables
+    categorical_columns = X_processed.select_dtypes(include=['object']).columns
+    
+    for col in categorical_columns:
+        le = LabelEncoder()
+        X_processed[col] = le.fit_transform(X_processed[col].astype(str))
+        if encoders is not None:
+            encoders[col] = le
+    
+    # Fill missing values
+    X_processed = X_processed.fillna(0)
+    
+    return X_processed
+
+def create_model(model_type: ModelType, hyperparameters: Dict[str, Any]):
+    """Create a model instance based on type."""
+    if model_type in [ModelType.IMPACT_CLASSIFIER, ModelType.RELEVANCE_CLASSIFIER]:
+        return RandomForestClassifier(**hyperparameters)
+    elif model_type == ModelType.RISK_SCORER:
+        return GradientBoostingRegressor(**hyperparameters)
+    elif model_type == ModelType.CONFIDENCE_PREDICTOR:
+        return LogisticRegression(**hyperparameters)
+    else:
+        raise ValueError(f"Unknown model type: {model_type}")
+
+def calculate_metrics(model_type: ModelType, y_true, y_pred) -> Dict[str, float]:
+    """Calculate performance metrics based on model type."""
+    metrics = {}
+    
+    if model_type in [ModelType.IMPACT_CLASSIFIER, ModelType.RELEVANCE_CLASSIFIER]:
+        # Classification metrics
+        metrics["accuracy"] = accuracy_score(y_true, y_pred)
+        metrics["precision"] = precision_score(y_true, y_pred, average='weighted', zero_division=0)
+        metrics["recall"] = recall_score(y_true, y_pred, average='weighted', zero_division=0)
+        metrics["f1_score"] = f1_score(y_true, y_pred, average='weighted', zero_division=0)
+    
+    elif model_type in [ModelType.RISK_SCORER, ModelType.CONFIDENCE_PREDICTOR]:
+        # Regression metrics
+        metrics["mse"] = mean_squared_error(y_true, y_pred)
+        metrics["rmse"] = np.sqrt(metrics["mse"])
+        
+        # R-squared
+        ss_res = np.sum((y_true - y_pred) ** 2)
+        ss_tot = np.sum((y_true - np.mean(y_true)) ** 2)
+        metrics["r2_score"] = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
+        
+        # For compatibility, use R² as f1_score equivalent
+        metrics["f1_score"] = max(0, metrics["r2_score"])
+    
+    return metrics
+
+def fit_and_save_model(
+    context: TrainingJobContext,
+    model_type: ModelType,
+    hyperparameters: Dict[str, Any],
+    training_data: pd.DataFrame,
+    model_path: str,
+    scaler_path: str
+) -> Dict[str, Any]:
+    """Split, scale, fit, evaluate and persist a model.
+
+    Runs in a training worker process; everything here is CPU-bound and must
+    stay off the event loop.
+    """
+    context.report(0.2, "preprocessing")
+    
+    # Prepare features and target
+    feature_columns = [col for col in training_data.columns if col != "target"]
+    X = training_data[feature_columns]
+    y = training_data["target"]
+    
+    # Handle categorical variables
+    encoders: Dict[str, LabelEncoder] = {}
+    X_processed = preprocess_features(X, encoders)
+    
+    # Split data
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_processed, y, test_size=0.2, random_state=42, stratify=y if model_type != ModelType.RISK_SCORER else None
+    )
+    
+    # Scale features
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+    
+    context.check_cancelled()
+    context.report(0.4, "fitting")
+    
+    # Train model
+    model = create_model(model_type, hyperparameters)
+    model.fit(X_train_scaled, y_train)
+    
+    context.check_cancelled()
+    context.report(0.8, "evaluating")
+    
+    # Evaluate model
+    y_pred = model.predict(X_test_scaled)
+    performance_metrics = {
+        name: float(value)
+        for name, value in calculate_metrics(model_type, y_test, y_pred).items()
+    }
+    
+    context.check_cancelled()
+    context.report(0.9, "saving")
+    
+    # Save model, scaler and categorical encoders
+    joblib.dump(model, model_path)
+    joblib.dump(scaler, scaler_path)
+    joblib.dump(encoders, feature_encoders_path(scaler_path))
+    
+    return {
+        "performance_metrics": performance_metrics,
+        "training_samples": len(X_train),
+        "validation_samples": len(X_test)
+    }
 
 class MLTrainingService:
     """Service for automated ML model training and management."""
@@ -295,17 +425,26 @@ class MLTrainingService:
             model_type = ModelType(job.model_type)
             
             # Prepare training data
+            await self._update_job_progress(job_id, 0.05, "preparing_data")
             training_data = await self._prepare_training_data(model_type)
             
-            if not training_data:
+            if training_data is None or training_data.empty:
                 raise ValueError(f"Insufficient training data for {model_type.value}")
             
-            # Train model
-            training_result = await self._train_model(model_type, training_data, job.new_model_version)
+            # Train model in the worker pool; waits here while the pool is busy
+            await self._update_job_progress(job_id, 0.1, "queued")
+            training_result = await self._train_model(
+                model_type, training_data, job.new_model_version, job_id=job_id
+            )
+            training_result.job_id = job_id
             
             # Update job with results
             await self._update_job_with_results(job_id, training_result)
             
+            if training_result.cancelled:
+                logger.info(f"Training job {job_id} was cancelled")
+                return
+            
             # Mark feedback as processed
             await self._mark_feedback_processed(model_type)
             
@@ -398,44 +537,35 @@ class MLTrainingService:
         self, 
         model_type: ModelType, 
         training_data: pd.DataFrame,
-        model_version: str
+        model_version: str,
+        job_id: Optional[str] = None
     ) -> TrainingResult:
-        """Train a model with the prepared data."""
+        """Train a model with the prepared data in the training process pool."""
         start_time = datetime.utcnow()
+        config = self.training_configs[model_type]
+        model_path = os.path.join(self.model_storage_path, f"{model_version}.joblib")
+        scaler_path = os.path.join(self.scalers_storage_path, f"{model_version}_scaler.joblib")
+        
+        async def on_progress(progress: float, stage: str) -> None:
+            if job_id:
+                await self._update_job_progress(job_id, progress, stage)
+        
+        async def should_cancel() -> bool:
+            return bool(job_id) and await self._is_cancel_requested(job_id)
         
         try:
-            # Prepare features and target
-            feature_columns = [col for col in training_data.columns if col != "target"]
-            X = training_data[feature_columns]
-            y = training_data["target"]
-            
-            # Handle categorical variables
-            X_processed = self._preprocess_features(X)
-            
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(
-                X_processed, y, test_size=0.2, random_state=42, stratify=y if model_type != ModelType.RISK_SCORER else None
+            outcome = await training_process_pool.run(
+                job_id or model_version,
+                fit_and_save_model,
+                model_type,
+                config.hyperparameters,
+                training_data,
+                model_path,
+                scaler_path,
+                on_progress=on_progress,
+                should_cancel=should_cancel
             )
-            
-            # Scale features
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_test_scaled = scaler.transform(X_test)
-            
-            # Train model
-            model = self._create_model(model_type)
-            model.fit(X_train_scaled, y_train)
-            
-            # Evaluate model
-            y_pred = model.predict(X_test_scaled)
-            performance_metrics = self._calculate_metrics(model_type, y_test, y_pred)
-            
-            # Save model and scaler
-            model_path = os.path.join(self.model_storage_path, f"{model_version}.joblib")
-            scaler_path = os.path.join(self.scalers_storage_path, f"{model_version}_scaler.joblib")
-            
-            joblib.dump(model, model_path)
-            joblib.dump(scaler, scaler_path)
+            performance_metrics = outcome["performance_metrics"]
             
             # Store performance metrics
             await self._store_performance_metrics(model_version, model_type, performance_metrics)
@@ -451,6 +581,19 @@ class MLTrainingService:
                 training_time=training_time
             )
             
+        except TrainingCancelled as e:
+            training_time = (datetime.utcnow() - start_time).total_seconds()
+            return TrainingResult(
+                job_id="",
+                model_type=model_type,
+                success=False,
+                model_version=model_version,
+                performance_metrics={},
+                training_time=training_time,
+                error_message=str(e),
+                cancelled=True
+            )
+            
         except Exception as e:
             training_time = (datetime.utcnow() - start_time).total_seconds()
             return TrainingResult(
@@ -465,58 +608,15 @@ class MLTrainingService:
     
     def _preprocess_features(self, X: pd.DataFrame) -> pd.DataFrame:
         """Preprocess features for training."""
-        X_processed = X.copy()
-        
-        # Handle categorical variables
-        categorical_columns = X_processed.select_dtypes(include=['object']).columns
-        
-        for col in categorical_columns:
-            le = LabelEncoder()
-            X_processed[col] = le.fit_transform(X_processed[col].astype(str))
-        
-        # Fill missing values
-        X_processed = X_processed.fillna(0)
-        
-        return X_processed
+        return preprocess_features(X)
     
     def _create_model(self, model_type: ModelType):
         """Create a model instance based on type."""
-        config = self.training_configs[model_type]
-        
-        if model_type in [ModelType.IMPACT_CLASSIFIER, ModelType.RELEVANCE_CLASSIFIER]:
-            return RandomForestClassifier(**config.hyperparameters)
-        elif model_type == ModelType.RISK_SCORER:
-            return GradientBoostingRegressor(**config.hyperparameters)
-        elif model_type == ModelType.CONFIDENCE_PREDICTOR:
-            return LogisticRegression(**config.hyperparameters)
-        else:
-            raise ValueError(f"Unknown model type: {model_type}")
+        return create_model(model_type, self.training_configs[model_type].hyperparameters)
     
     def _calculate_metrics(self, model_type: ModelType, y_true, y_pred) -> Dict[str, float]:
         """Calculate performance metrics based on model type."""
-        metrics = {}
-        
-        if model_type in [ModelType.IMPACT_CLASSIFIER, ModelType.RELEVANCE_CLASSIFIER]:
-            # Classification metrics
-            metrics["accuracy"] = accuracy_score(y_true, y_pred)
-            metrics["precision"] = precision_score(y_true, y_pred, average='weighted', zero_division=0)
-            metrics["recall"] = recall_score(y_true, y_pred, average='weighted', zero_division=0)
-            metrics["f1_score"] = f1_score(y_true, y_pred, average='weighted', zero_division=0)
-        
-        elif model_type in [ModelType.RISK_SCORER, ModelType.CONFIDENCE_PREDICTOR]:
-            # Regression metrics
-            metrics["mse"] = mean_squared_error(y_true, y_pred)
-            metrics["rmse"] = np.sqrt(metrics["mse"])
-            
-            # R-squared
-            ss_res = np.sum((y_true - y_pred) ** 2)
-            ss_tot = np.sum((y_true - np.mean(y_true)) ** 2)
-            metrics["r2_score"] = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
-            
-            # For compatibility, use R² as f1_score equivalent
-            metrics["f1_score"] = max(0, metrics["r2_score"])
-        
-        return metrics
+        return calculate_metrics(model_type, y_true, y_pred)
     
     async def _store_performance_metrics(
         self, 
@@ -573,6 +673,45 @@ class MLTrainingService:
         
         await self.db.commit()
     
+    async def _update_job_progress(self, job_id: str, progress: float, stage: str) -> None:
+        """Record training progress on the job row."""
+        result = await self.db.execute(
+            select(TrainingJob).where(TrainingJob.job_id == job_id)
+        )
+        job = result.scalar_one_or_none()
+        if not job:
+            return
+        
+        job.progress = progress
+        job.progress_stage = stage
+        await self.db.commit()
+    
+    async def _is_cancel_requested(self, job_id: str) -> bool:
+        """Check the job row, so a cancel issued on any worker is seen here."""
+        result = await self.db.execute(
+            select(TrainingJob.cancel_requested).where(TrainingJob.job_id == job_id)
+        )
+        return bool(result.scalar_one_or_none())
+    
+    async def cancel_training_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Request cancellation of a pending or running training job."""
+        result = await self.db.execute(
+            select(TrainingJob).where(TrainingJob.job_id == job_id)
+        )
+        job = result.scalar_one_or_none()
+        if not job:
+            return None
+        
+        if job.status in ("pending", "running"):
+            job.cancel_requested = True
+            await self.db.commit()
+            # Signal immediately if the job runs in this process; otherwise its
+            # owner sees the flag on its next progress poll
+            training_process_pool.cancel(job_id)
+            logger.info(f"Cancellation requested for training job {job_id}")
+        
+        return await self.get_training_job_status(job_id)
+    
     async def _update_job_with_results(self, job_id: str, result: TrainingResult) -> None:
         """Update training job with results."""
         job_result = await self.db.execute(
@@ -580,7 +719,13 @@ class MLTrainingService:
         )
         job = job_result.scalar_one()
         
-        job.status = "completed" if result.success else "failed"
+        if result.cancelled:
+            job.status = "cancelled"
+        else:
+            job.status = "completed" if result.success else "failed"
+        if result.success:
+            job.progress = 1.0
+            job.progress_stage = "completed"
         job.completed_at = datetime.utcnow()
         job.performance_improvement = result.performance_metrics.get("f1_score", 0.0)
         job.new_metric_value = result.performance_metrics.get("f1_score", 0.0)
@@ -630,6 +775,9 @@ class MLTrainingService:
             "job_id": job.job_id,
             "model_type": job.model_type,
             "status": job.status,
+            "progress": job.progress,
+            "progress_stage": job.progress_stage,
+            "cancel_requested": job.cancel_requested,
             "trigger_type": job.trigger_type,
             "created_at": job.created_at.isoformat() if job.created_at else None,
             "started_at": job.started_at.isoformat() if job.started_at else None,
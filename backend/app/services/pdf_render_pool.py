@@ -0,0 +1,205 @@
+"""
+Process pool for PDF rendering with a content-addressed report cache.
+
+ReportLab layout is CPU-bound, and the export and share endpoints used to
+run it on the event loop, stalling every other request for the length of a
+render. Rendering now happens in a `ProcessPoolExecutor`; the worker writes
+the PDF straight to the cache directory, so the document never crosses the
+process boundary or sits in a `BytesIO` in the API process.
+
+Files are named by a SHA-256 of the report kind, the generator's
+TEMPLATE_VERSION and the canonical JSON of the payload, so exporting the same
+research twice is served from disk, and any change to the data or layout
+produces a new file. Concurrent requests for the same report share one
+render. The cache directory is trimmed to `pdf_cache_max_bytes`,
+least-recently-served first.
+
+Endpoints stream the cached file in chunks (`FileResponse`) rather than
+holding it in memory.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.services.pdf_service import PDFReportGenerator
+
+logger = logging.getLogger(__name__)
+
+# Report kind -> PDFReportGenerator method
+RENDERERS = {
+    "research": "generate_research_report",
+    "impact_card": "generate_impact_card_report",
+    "scheduled_report": "generate_scheduled_report",
+}
+
+_worker_generator = None
+
+
+def _render_to_file(kind: str, payload: Dict[str, Any], path: str) -> int:
+    """Worker process: render one report into `path` and return its size"""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = PDFReportGenerator()
+
+    buffer = getattr(_worker_generator, RENDERERS[kind])(payload)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(buffer.getbuffer())
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def report_cache_key(kind: str, payload: Dict[str, Any], template_version: str) -> str:
+    """SHA-256 of the report kind, template version and canonical payload"""
+    canonical = json.dumps(
+        {"kind": kind, "template_version": template_version, "payload": payload},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class PDFRenderPool:
+    """Renders PDFs in worker processes and caches them on disk by content hash"""
+
+    # Files served or rendered this recently are never evicted: a path handed
+    # to a caller must still exist when its FileResponse opens it
+    EVICTION_GRACE_SECONDS = 30
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        max_cache_bytes: Optional[int] = None,
+        start_method: str = "spawn",
+    ):
+        self.max_workers = max_workers or settings.pdf_render_workers
+        self.cache_dir = Path(
+            cache_dir or settings.pdf_cache_dir or os.path.join(tempfile.gettempdir(), "enterprise-cia-pdf-cache")
+        )
+        self.max_cache_bytes = max_cache_bytes or settings.pdf_cache_max_bytes
+        # spawn by default: the API process runs threads (DB lane, executors)
+        # whose state fork would copy mid-operation
+        self.start_method = start_method
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self.stats = {"hits": 0, "renders": 0, "coalesced": 0, "failed": 0, "evicted": 0, "render_seconds": 0.0}
+
+    def _ensure_started(self) -> None:
+        if self._executor is not None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context(self.start_method)
+        )
+        logger.info(f"📄 PDF render pool started (max_workers={self.max_workers}, cache_dir={self.cache_dir})")
+
+    async def render(self, kind: str, payload: Dict[str, Any]) -> Path:
+        """Return the path of the cached PDF for `payload`, rendering it if needed"""
+        if kind not in RENDERERS:
+            raise ValueError(f"Unknown report kind: {kind}")
+
+        key = report_cache_key(kind, payload, PDFReportGenerator.TEMPLATE_VERSION)
+        path = self.cache_dir / f"{key}.pdf"
+        try:
+            os.utime(path)  # marks it recently served for eviction
+            self.stats["hits"] += 1
+            return path
+        except FileNotFoundError:
+            pass
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            task = asyncio.create_task(self._render(kind, payload, path))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller disconnecting does not cancel the shared render
+        return await asyncio.shield(task)
+
+    async def _render(self, kind: str, payload: Dict[str, Any], path: Path) -> Path:
+        self._ensure_started()
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, _render_to_file, kind, payload, str(path))
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        self.stats["renders"] += 1
+        self.stats["render_seconds"] += time.perf_counter() - started
+        await asyncio.to_thread(self._evict, keep=path)
+        return path
+
+    async def render_bytes(self, kind: str, payload: Dict[str, Any]) -> bytes:
+        """Rendered PDF as bytes, for callers that need it whole (email attachments)"""
+        path = await self.render(kind, payload)
+        return await asyncio.to_thread(path.read_bytes)
+
+    def _evict(self, keep: Optional[Path] = None) -> None:
+        """Delete least-recently-served PDFs until the cache fits its budget
+
+        Files within EVICTION_GRACE_SECONDS of being served are skipped, so the
+        cache can briefly exceed its budget rather than pull a file out from
+        under a response that is about to stream it.
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".pdf"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= self.max_cache_bytes:
+            return
+        recently_served = time.time() - self.EVICTION_GRACE_SECONDS
+        for mtime, size, entry_path in sorted(entries):
+            if mtime >= recently_served:
+                break
+            if keep is not None and entry_path == str(keep):
+                continue
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+            self.stats["evicted"] += 1
+            total -= size
+            if total <= self.max_cache_bytes:
+                break
+
+    async def shutdown(self) -> None:
+        """Stop the worker processes, cancelling queued renders"""
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown, wait=True, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "avg_render_ms": self.stats["render_seconds"] / self.stats["renders"] * 1000 if self.stats["renders"] else 0.0,
+            "max_workers": self.max_workers,
+            "rendering": len(self._inflight),
+            "cache_dir": str(self.cache_dir),
+            "max_cache_bytes": self.max_cache_bytes,
+            "started": self._executor is not None,
+        }
+
+
+# Global instance
+pdf_render_pool = PDFRenderPool()
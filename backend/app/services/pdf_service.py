@@ -17,6 +17,10 @@ logger = logging.getLogger(__name__)
 class PDFReportGenerator:
     """Generate professional PDF reports for company research"""
 
+    # Part of the rendered-PDF cache key: bump when a layout changes so
+    # cached reports are re-rendered
+    TEMPLATE_VERSION = "1"
+
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
@@ -298,6 +302,88 @@ class PDFReportGenerator:
             logger.error(f"❌ Failed to generate impact card PDF: {str(e)}")
             raise
 
+    def generate_scheduled_report(self, report_data: Dict[str, Any]) -> BytesIO:
+        """
+        Generate PDF for a scheduled workspace report
+
+        Args:
+            report_data: Dictionary from ScheduledReportsService._generate_report_data
+
+        Returns:
+            BytesIO: PDF file buffer
+        """
+        try:
+            logger.info(f"📄 Generating PDF for scheduled report {report_data.get('type')}")
+
+            buffer = BytesIO()
+            doc = SimpleDocTemplate(
+                buffer,
+                pagesize=letter,
+                rightMargin=72,
+                leftMargin=72,
+                topMargin=72,
+                bottomMargin=18
+            )
+
+            elements = []
+
+            report_type = str(report_data.get('type', 'report')).replace('_', ' ').title()
+            title = Paragraph(
+                f"{report_type}: {report_data.get('workspace', 'Workspace')}",
+                self.styles['CustomTitle']
+            )
+            elements.append(title)
+            elements.append(Spacer(1, 0.2 * inch))
+
+            # Add metadata (everything that is not a list)
+            metadata = "".join(
+                f"<b>{key.replace('_', ' ').title()}:</b> {value}<br/>"
+                for key, value in report_data.items()
+                if key not in ('type', 'workspace') and not isinstance(value, (list, dict))
+            )
+            if metadata:
+                elements.append(Paragraph(metadata, self.styles['CustomBody']))
+                elements.append(Spacer(1, 0.3 * inch))
+
+            # Add impact card table
+            impact_cards = report_data.get('impact_cards', [])
+            if impact_cards:
+                elements.append(Paragraph("Top Impact Cards", self.styles['CustomHeading']))
+
+                card_data = [['Competitor', 'Risk Score', 'Risk Level']]
+                for card in impact_cards:
+                    card_data.append([
+                        str(card.get('competitor', '')),
+                        str(card.get('risk_score', '')),
+                        str(card.get('risk_level', '')),
+                    ])
+
+                card_table = Table(card_data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch])
+                card_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+                ]))
+                elements.append(card_table)
+
+            # Add footer
+            elements.append(Spacer(1, 0.5 * inch))
+            footer_text = "Generated by Enterprise CIA - Powered by You.com APIs"
+            elements.append(Paragraph(footer_text, self.styles['Footer']))
+
+            doc.build(elements)
+            buffer.seek(0)
+
+            logger.info("✅ Scheduled report PDF generated successfully")
+            return buffer
+
+        except Exception as e:
+            logger.error(f"❌ Failed to generate scheduled report PDF: {str(e)}")
+            raise
+
 
 # Singleton instance
 pdf_generator = PDFReportGenerator()
@@ -6,9 +6,11 @@ Real-time metrics, optimization tracking, and performance analytics.
 import asyncio
 import json
 import logging
+import os
+import socket
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict, deque
 import statistics
@@ -22,6 +24,7 @@ from app.config import settings
 from app.database import AsyncSessionLocal
 from app.models.api_call_log import ApiCallLog
 from app.models.ml_training import ModelPerformanceMetric, TrainingJob
+from app.services.latency_sketch import LatencySketch
 # Removed circular import - will import dynamically when needed
 from app.realtime import emit_progress
 
@@ -45,12 +48,40 @@ class SystemHealth:
     last_updated: datetime
 
 class MetricsCollector:
-    """Collects and aggregates performance metrics"""
+    """Collects and aggregates performance metrics
+    
+    Besides the raw sample buffer, every metric keeps one mergeable
+    LatencySketch per time window. Sketches are flushed to Redis as a single
+    hash per window (one field per worker), so aggregates merge O(windows)
+    sketches across all workers instead of re-sorting every sample.
+    
+    Raw samples are buffered and written once per flush interval to one
+    sorted set per metric (scored by timestamp) in the same pipeline, so
+    range reads are a single ZRANGEBYSCORE instead of a keyspace SCAN.
+    """
     
     def __init__(self):
         self.metrics_buffer = defaultdict(lambda: deque(maxlen=1000))
         self.redis_client: Optional[Redis] = None
         self._initialize_redis()
+        
+        # Streaming quantile sketches: metric name -> window start -> sketch
+        self.sketch_window_seconds = settings.metrics_sketch_window_seconds
+        self.sketch_retention_seconds = settings.metrics_sketch_retention_minutes * 60
+        self.flush_interval = settings.metrics_flush_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.sketches: Dict[str, Dict[int, LatencySketch]] = defaultdict(dict)
+        self._dirty_windows: Set[Tuple[str, int]] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # Raw samples waiting for the next pipelined flush: name -> (score, member)
+        self.series_retention_seconds = settings.metrics_series_retention_minutes * 60
+        self.series_max_samples = settings.metrics_series_max_samples
+        self._pending_samples: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=self.series_max_samples)
+        )
+        self._sample_sequence = 0
+        self.flush_stats = {"flushes": 0, "samples_written": 0, "redis_commands": 0, "failures": 0}
     
     def _initialize_redis(self):
         """Initialize Redis connection for metrics storage"""
@@ -79,20 +110,21 @@ class MetricsCollector:
         )
         
         # Store in memory buffer
+        now = time.time()
         self.metrics_buffer[name].append(metric)
+        self._add_to_sketch(name, value, now)
         
-        # Store in Redis for persistence
+        # Buffer for the next pipelined flush to Redis
         if self.redis_client:
-            try:
-                key = f"metrics:{name}:{int(time.time())}"
-                data = {
-                    "value": value,
-                    "timestamp": metric.timestamp.isoformat(),
-                    "metadata": metadata or {}
-                }
-                await self.redis_client.set(key, json.dumps(data), ex=3600)  # 1 hour TTL
-            except RedisError as e:
-                logger.warning(f"Failed to store metric in Redis: {e}")
+            self._sample_sequence += 1
+            member = json.dumps({
+                "value": value,
+                "timestamp": metric.timestamp.isoformat(),
+                "metadata": metadata or {},
+                # Keeps members unique when two samples carry identical data
+                "id": f"{self.worker_id}:{self._sample_sequence}"
+            })
+            self._pending_samples[name].append((now, member))
     
     async def get_metrics(
         self,
@@ -111,48 +143,171 @@ class MetricsCollector:
         if memory_metrics:
             return memory_metrics
         
-        # Fallback to Redis if available
+        # Fallback to Redis if available: one bounded range read
         if self.redis_client:
             try:
-                pattern = f"metrics:{name}:*"
-                keys = []
-                cursor = 0
-                while True:
-                    cursor, batch_keys = await self.redis_client.scan(cursor=cursor, match=pattern, count=100)
-                    keys.extend(batch_keys)
-                    if cursor == 0:
-                        break
+                since = time.time() - duration_minutes * 60
+                members = await self.redis_client.zrangebyscore(self._series_key(name), since, "+inf")
                 
                 metrics = []
-                for key in keys:
-                    data = await self.redis_client.get(key)
-                    if data:
-                        parsed = json.loads(data)
-                        timestamp = datetime.fromisoformat(parsed["timestamp"])
-                        if timestamp >= cutoff_time:
-                            metrics.append(PerformanceMetric(
-                                name=name,
-                                value=parsed["value"],
-                                timestamp=timestamp,
-                                metadata=parsed.get("metadata", {})
-                            ))
-                
-                return sorted(metrics, key=lambda m: m.timestamp)
+                for member in members:
+                    parsed = json.loads(member)
+                    metrics.append(PerformanceMetric(
+                        name=name,
+                        value=parsed["value"],
+                        timestamp=datetime.fromisoformat(parsed["timestamp"]),
+                        metadata=parsed.get("metadata", {})
+                    ))
+                
+                return metrics
             
             except RedisError as e:
                 logger.warning(f"Failed to retrieve metrics from Redis: {e}")
         
         return []
     
+    def _window_start(self, epoch: float) -> int:
+        return int(epoch // self.sketch_window_seconds) * self.sketch_window_seconds
+    
+    def _sketch_key(self, name: str, window_start: int) -> str:
+        return f"metrics:sketch:{name}:{window_start}"
+    
+    def _series_key(self, name: str) -> str:
+        return f"metrics:series:{name}"
+    
+    def _add_to_sketch(self, name: str, value: float, epoch: float) -> None:
+        """Fold a sample into the sketch for its window"""
+        window_start = self._window_start(epoch)
+        windows = self.sketches[name]
+        sketch = windows.get(window_start)
+        if sketch is None:
+            sketch = windows[window_start] = LatencySketch()
+            # A new window opened; drop windows past retention
+            cutoff = epoch - self.sketch_retention_seconds
+            for expired in [start for start in windows if start + self.sketch_window_seconds < cutoff]:
+                del windows[expired]
+                self._dirty_windows.discard((name, expired))
+        sketch.add(value)
+        self._dirty_windows.add((name, window_start))
+    
+    async def start(self) -> None:
+        """Start the background flush loop"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self) -> None:
+        """Stop the flush loop and write out pending samples and sketches"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+    
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Metrics flush failed: {e}")
+    
+    async def flush(self) -> int:
+        """Write buffered samples and changed sketch windows in one pipeline
+        
+        Returns the number of Redis commands sent.
+        """
+        if not self.redis_client or (not self._pending_samples and not self._dirty_windows):
+            return 0
+        
+        samples, self._pending_samples = self._pending_samples, defaultdict(
+            lambda: deque(maxlen=self.series_max_samples)
+        )
+        dirty, self._dirty_windows = self._dirty_windows, set()
+        now = time.time()
+        commands = 0
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for name, entries in samples.items():
+                if not entries:
+                    continue
+                key = self._series_key(name)
+                pipe.zadd(key, {member: score for score, member in entries})
+                # Trim by age and by size so each series stays bounded
+                pipe.zremrangebyscore(key, "-inf", now - self.series_retention_seconds)
+                pipe.zremrangebyrank(key, 0, -(self.series_max_samples + 1))
+                pipe.expire(key, self.series_retention_seconds)
+                commands += 4
+            for name, window_start in dirty:
+                sketch = self.sketches.get(name, {}).get(window_start)
+                if sketch is None:
+                    continue
+                key = self._sketch_key(name, window_start)
+                # Each worker overwrites only its own field, so re-flushing is idempotent
+                pipe.hset(key, self.worker_id, sketch.to_json())
+                pipe.expire(key, self.sketch_retention_seconds)
+                commands += 2
+            await pipe.execute()
+        except RedisError as e:
+            # Keep the data for the next attempt (the per-metric deques stay bounded)
+            for name, entries in samples.items():
+                self._pending_samples[name] = deque(
+                    [*entries, *self._pending_samples[name]], maxlen=self.series_max_samples
+                )
+            self._dirty_windows |= dirty
+            self.flush_stats["failures"] += 1
+            logger.warning(f"Failed to flush metrics to Redis: {e}")
+            return 0
+        
+        self.flush_stats["flushes"] += 1
+        self.flush_stats["samples_written"] += sum(len(entries) for entries in samples.values())
+        self.flush_stats["redis_commands"] += commands
+        return commands
+    
+    async def get_sketch(self, name: str, duration_minutes: int = 60) -> LatencySketch:
+        """Merged sketch of every worker's samples for the last `duration_minutes`"""
+        now = time.time()
+        windows = list(range(
+            self._window_start(now - duration_minutes * 60),
+            self._window_start(now) + 1,
+            self.sketch_window_seconds
+        ))
+        local = self.sketches.get(name, {})
+        
+        remote: Dict[int, Dict[str, str]] = {}
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for window_start in windows:
+                    pipe.hgetall(self._sketch_key(name, window_start))
+                remote = dict(zip(windows, await pipe.execute()))
+            except RedisError as e:
+                logger.warning(f"Failed to read metric sketches from Redis: {e}")
+        
+        merged = LatencySketch()
+        for window_start in windows:
+            for worker_id, payload in (remote.get(window_start) or {}).items():
+                if isinstance(worker_id, bytes):
+                    worker_id = worker_id.decode()
+                # This worker's in-memory sketch is at least as fresh as its flushed copy
+                if worker_id != self.worker_id:
+                    merged.merge(LatencySketch.from_json(payload))
+            if window_start in local:
+                merged.merge(local[window_start])
+        return merged
+    
     async def get_aggregated_metrics(
         self,
         name: str,
         duration_minutes: int = 60
     ) -> Dict[str, float]:
-        """Get aggregated metrics (avg, min, max, p95, p99)"""
-        metrics = await self.get_metrics(name, duration_minutes)
+        """Get aggregated metrics (avg, min, max, p95, p99) from merged sketches"""
+        sketch = await self.get_sketch(name, duration_minutes)
         
-        if not metrics:
+        if sketch.count == 0:
             return {
                 "count": 0,
                 "avg": 0.0,
@@ -162,15 +317,13 @@ class MetricsCollector:
                 "p99": 0.0
             }
         
-        values = [m.value for m in metrics]
-        
         return {
-            "count": len(values),
-            "avg": statistics.mean(values),
-            "min": min(values),
-            "max": max(values),
-            "p95": statistics.quantiles(values, n=20)[18] if len(values) >= 20 else max(values),
-            "p99": statistics.quantiles(values, n=100)[98] if len(values) >= 100 else max(values)
+            "count": sketch.count,
+            "avg": sketch.mean,
+            "min": sketch.min,
+            "max": sketch.max,
+            "p95": sketch.quantile(0.95),
+            "p99": sketch.quantile(0.99)
         }
 
 class PerformanceAnalyzer:
@@ -736,6 +889,7 @@ performance_optimizer = PerformanceOptimizer(metrics_collector)
 # Startup function
 async def start_performance_monitoring():
     """Start the performance monitoring system"""
+    await metrics_collector.start()
     await real_time_monitor.start_monitoring()
     logger.info("🚀 Performance monitoring system started")
 
@@ -743,4 +897,5 @@ async def start_performance_monitoring():
 async def stop_performance_monitoring():
     """Stop the performance monitoring system"""
     await real_time_monitor.stop_monitoring()
+    await metrics_collector.stop()
     logger.info("⏹️ Performance monitoring system stopped")
\ No newline at end of file
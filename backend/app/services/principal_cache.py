@@ -0,0 +1,206 @@
+"""Authenticated principal cache and write-behind "last seen" tracking.
+
+`get_current_user` used to load the user row and commit an update to
+`last_login_at` on every authenticated request, turning each read-only GET
+into a write transaction on the `users` row.
+
+`PrincipalCache` keeps a detached snapshot of each user for a short TTL,
+keyed by the token `sub`; a hit is attached to the request's session with
+`merge(load=False)`, which costs no database round trip. Entries are dropped
+when a transaction that updated or deleted a user row through the ORM
+(deactivation, role changes, profile edits) commits or rolls back; dropping
+them at flush would let a concurrent request re-cache the old row before the
+change is committed. Code that changes users with Core statements calls
+`invalidate()` itself. The cache is per process, so other workers see such
+changes once their entry expires.
+
+`LastSeenTracker` collects the latest timestamp per user in memory and
+writes them periodically with one executemany UPDATE.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import bindparam, event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class PrincipalCache:
+    """Short-TTL, size-bounded cache of detached User snapshots"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = settings.principal_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.max_entries = max_entries or settings.principal_cache_max_entries
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        # Bumped by every invalidation, so a row read before one is never stored after it
+        self._epoch = 0
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    async def get_user(self, user_id: Any, db: AsyncSession) -> Optional[User]:
+        """Return the user attached to `db`, from the cache when possible"""
+        key = str(user_id)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.stats["hits"] += 1
+            self._entries.move_to_end(key)
+            return await db.merge(entry[1], load=False)
+
+        self.stats["misses"] += 1
+        epoch = self._epoch
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is not None and self.enabled and epoch == self._epoch:
+            self._store(key, user)
+        return user
+
+    def _store(self, key: str, user: User) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, self._snapshot(user))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _snapshot(user: User) -> User:
+        """Copy the loaded columns into a detached instance shared by no session"""
+        state = inspect(user)
+        snapshot = User(**{
+            attr.key: state.dict[attr.key]
+            for attr in inspect(User).column_attrs
+            if attr.key in state.dict
+        })
+        make_transient_to_detached(snapshot)
+        return snapshot
+
+    def invalidate(self, user_id: Any) -> None:
+        self._epoch += 1
+        if self._entries.pop(str(user_id), None) is not None:
+            self.stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._entries), "ttl_seconds": self.ttl_seconds}
+
+
+class LastSeenTracker:
+    """Coalesces "last seen" timestamps in memory and flushes them periodically"""
+
+    def __init__(
+        self,
+        session_factory: Optional[async_sessionmaker] = None,
+        *,
+        flush_interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.flush_interval = flush_interval or settings.last_seen_flush_interval
+        self._pending: Dict[int, datetime] = {}
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {"touched": 0, "written": 0, "failed": 0, "flushes": 0}
+
+    def touch(self, user_id: int, seen_at: Optional[datetime] = None) -> None:
+        """Record activity without touching the database"""
+        self._pending[user_id] = seen_at or datetime.now(timezone.utc)
+        self.stats["touched"] += 1
+
+    async def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._flush_loop())
+            logger.info(f"👣 Last-seen tracker started (flush_interval={self.flush_interval}s)")
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still pending"""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Last-seen flush loop error: {e}")
+
+    async def flush(self) -> int:
+        """Write the latest timestamp per user with a single executemany UPDATE"""
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        users = User.__table__
+        statement = users.update().where(users.c.id == bindparam("user_id")).values(
+            last_login_at=bindparam("seen_at")
+        )
+        params = [{"user_id": user_id, "seen_at": seen_at} for user_id, seen_at in pending.items()]
+
+        async with self.session_factory() as session:
+            try:
+                await session.execute(statement, params)
+                await session.commit()
+            except Exception as exc:
+                await session.rollback()
+                self.stats["failed"] += len(params)
+                # Keep the timestamps for the next attempt unless newer ones arrived
+                for user_id, seen_at in pending.items():
+                    self._pending.setdefault(user_id, seen_at)
+                logger.warning(f"⚠️ Failed to write last-seen for {len(params)} users: {exc}")
+                return 0
+
+        self.stats["written"] += len(params)
+        self.stats["flushes"] += 1
+        return len(params)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "pending": len(self._pending),
+            "running": self.task is not None and not self.task.done(),
+            "flush_interval": self.flush_interval,
+        }
+
+
+# Global instances
+principal_cache = PrincipalCache()
+last_seen_tracker = LastSeenTracker()
+
+
+# Ids of users changed in a session's current transaction
+_CHANGED_USERS_KEY = "principal_cache_changed_users"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_principal(mapper, connection, target: User) -> None:
+    session = Session.object_session(target)
+    if session is None:
+        principal_cache.invalidate(target.id)
+        return
+    session.info.setdefault(_CHANGED_USERS_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_changed_principals(session: Session) -> None:
+    for user_id in session.info.pop(_CHANGED_USERS_KEY, ()):
+        principal_cache.invalidate(user_id)
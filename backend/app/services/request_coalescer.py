@@ -0,0 +1,214 @@
+"""Single-flight coalescing of identical in-flight You.com queries.
+
+When several users open the same competitor at once, every request used to
+miss the cache and call the upstream API with the same query. Callers are now
+grouped by cache key: within a worker, concurrent callers await one shared
+task; across workers, the first caller takes a short Redis lock and the rest
+wait for its completion notification and then read the cached result.
+
+If Redis is unavailable, or the lock holder fails or times out, waiters fall
+back to calling upstream themselves, so coalescing never turns into an outage.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = "youcom:inflight"
+
+# KEYS: lock key; ARGV: owner token, channel, outcome
+# Release the lock only if we still own it, then wake the waiters
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+end
+return redis.call('PUBLISH', ARGV[2], ARGV[3])
+"""
+
+Fetch = Callable[[], Awaitable[Dict[str, Any]]]
+Load = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class RequestCoalescer:
+    """Deduplicates concurrent upstream calls that share a cache key"""
+
+    def __init__(
+        self,
+        *,
+        lock_ttl: Optional[float] = None,
+        wait_timeout: Optional[float] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.lock_ttl = lock_ttl or settings.you_coalesce_lock_ttl
+        self.wait_timeout = wait_timeout or settings.you_coalesce_wait_timeout
+        self.enabled = settings.you_request_coalescing_enabled if enabled is None else enabled
+
+        # cache key -> task shared by every local caller of that key
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # api type -> counters
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def lock_key(cache_key: str) -> str:
+        return f"{LOCK_PREFIX}:{cache_key}"
+
+    @staticmethod
+    def channel(cache_key: str) -> str:
+        return f"{LOCK_PREFIX}:done:{cache_key}"
+
+    def _count(self, api_type: str, counter: str) -> None:
+        counters = self.stats.setdefault(
+            api_type,
+            {"upstream": 0, "coalesced_local": 0, "coalesced_remote": 0, "fallbacks": 0},
+        )
+        counters[counter] += 1
+
+    async def run(
+        self,
+        cache_key: str,
+        api_type: str,
+        fetch: Fetch,
+        *,
+        load: Optional[Load] = None,
+        redis: Optional[Redis] = None,
+    ) -> Dict[str, Any]:
+        """Return `fetch()`'s result, sharing one upstream call per key.
+
+        `load` re-reads the cached result written by another worker's fetch;
+        without it (or without `redis`) coalescing is limited to this process.
+        """
+        if not self.enabled:
+            self._count(api_type, "upstream")
+            return await fetch()
+
+        task = self._inflight.get(cache_key)
+        if task is not None:
+            self._count(api_type, "coalesced_local")
+            logger.info("🔗 Joined in-flight request for %s", cache_key)
+            return await asyncio.shield(task)
+
+        task = asyncio.create_task(self._run_once(cache_key, api_type, fetch, load, redis))
+        self._inflight[cache_key] = task
+        task.add_done_callback(lambda done: self._finish(cache_key, done))
+        # Shielded so a cancelled caller does not cancel the call for the others
+        return await asyncio.shield(task)
+
+    def _finish(self, cache_key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            task.exception()
+
+    async def _run_once(
+        self,
+        cache_key: str,
+        api_type: str,
+        fetch: Fetch,
+        load: Optional[Load],
+        redis: Optional[Redis],
+    ) -> Dict[str, Any]:
+        if redis is None or load is None:
+            self._count(api_type, "upstream")
+            return await fetch()
+
+        token = uuid.uuid4().hex
+        lock_key = self.lock_key(cache_key)
+        try:
+            acquired = await redis.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+        except RedisError as exc:
+            logger.warning("Request coalescing lock unavailable for %s: %s", cache_key, exc)
+            self._count(api_type, "upstream")
+            return await fetch()
+
+        if not acquired:
+            result = await self._wait_for_holder(redis, cache_key, load)
+            if result is not None:
+                self._count(api_type, "coalesced_remote")
+                logger.info("🔗 Reused result of another worker's request for %s", cache_key)
+                return result
+            self._count(api_type, "fallbacks")
+            return await fetch()
+
+        self._count(api_type, "upstream")
+        outcome = "failed"
+        try:
+            result = await fetch()
+            outcome = "done"
+            return result
+        finally:
+            try:
+                await redis.register_script(RELEASE_SCRIPT)(
+                    keys=[lock_key], args=[token, self.channel(cache_key), outcome]
+                )
+            except RedisError as exc:
+                # Waiters notice the lock expiring and fall back on their own
+                logger.warning("Failed to release coalescing lock for %s: %s", cache_key, exc)
+
+    async def _wait_for_holder(
+        self, redis: Redis, cache_key: str, load: Load
+    ) -> Optional[Dict[str, Any]]:
+        """Wait for the lock holder in another worker, then read its cached result"""
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(self.channel(cache_key))
+            # The holder may have finished before we subscribed
+            cached = await load()
+            if cached is not None:
+                return cached
+
+            deadline = time.monotonic() + self.wait_timeout
+            while (remaining := deadline - time.monotonic()) > 0:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=min(remaining, 1.0)
+                )
+                if message is not None:
+                    outcome = message.get("data")
+                    if isinstance(outcome, bytes):
+                        outcome = outcome.decode()
+                    if outcome != "done":
+                        return None
+                    break
+                # Holder crashed without notifying: its lock expires
+                if not await redis.exists(self.lock_key(cache_key)):
+                    break
+            return await load()
+        except RedisError as exc:
+            logger.warning("Request coalescing wait failed for %s: %s", cache_key, exc)
+            return None
+        finally:
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.close()
+            except RedisError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Upstream calls made versus calls saved by coalescing, per API"""
+        totals = {"upstream": 0, "coalesced_local": 0, "coalesced_remote": 0, "fallbacks": 0}
+        for counters in self.stats.values():
+            for name, value in counters.items():
+                totals[name] += value
+        saved = totals["coalesced_local"] + totals["coalesced_remote"]
+        requests = saved + totals["upstream"] + totals["fallbacks"]
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._inflight),
+            **totals,
+            "upstream_calls_saved": saved,
+            "coalesced_ratio": round(saved / requests, 4) if requests else 0.0,
+            "by_api": {api_type: dict(counters) for api_type, counters in self.stats.items()},
+        }
+
+
+# Global instance
+request_coalescer = RequestCoalescer()
@@ -0,0 +1,245 @@
+"""
+Cluster-wide circuit breaker and rate-limit state for You.com API calls.
+
+Circuit breakers and token buckets live in Redis so every request and every
+uvicorn worker sees the same outage and shares one rate budget. Admission
+(breaker check + token reservation) is a single server-side script call, and
+recording an outcome is one more. When Redis is unreachable the caller falls
+back to the process-wide in-memory state in `resilient_you_client`.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "resilience"
+STATE_TTL_SECONDS = 86400
+# After a Redis error, use the in-process fallback for this long before retrying
+REDIS_RETRY_SECONDS = 5.0
+
+# KEYS: breaker hash, bucket hash
+# ARGV: now, recovery_timeout, refill_rate (tokens/s), burst, ttl
+ADMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local recovery = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+local burst = tonumber(ARGV[4])
+local ttl = tonumber(ARGV[5])
+
+local b = redis.call('HMGET', KEYS[1], 'state', 'failure_count', 'success_count', 'last_failure', 'last_success')
+local state = b[1] or 'closed'
+local successes = b[3] or '0'
+
+if state == 'open' then
+    local last_failure = tonumber(b[4]) or 0
+    if now - last_failure < recovery then
+        return {0, state, b[2] or '0', successes, b[4] or '', b[5] or '', '0'}
+    end
+    state = 'half_open'
+    successes = '0'
+    redis.call('HSET', KEYS[1], 'state', state, 'success_count', 0)
+    redis.call('EXPIRE', KEYS[1], ttl)
+end
+
+local t = redis.call('HMGET', KEYS[2], 'tokens', 'ts')
+local tokens = tonumber(t[1]) or burst
+local ts = tonumber(t[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+end
+-- Reserve the token even when the caller has to wait for it
+tokens = tokens - 1
+redis.call('HSET', KEYS[2], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[2], ttl)
+
+return {1, state, b[2] or '0', successes, b[4] or '', b[5] or '', tostring(wait)}
+"""
+
+# KEYS: breaker hash
+# ARGV: now, outcome, failure_threshold, success_threshold, ttl
+RECORD_SCRIPT = """
+local b = redis.call('HMGET', KEYS[1], 'state', 'failure_count', 'success_count')
+local state = b[1] or 'closed'
+local failures = tonumber(b[2]) or 0
+local successes = tonumber(b[3]) or 0
+
+if ARGV[2] == 'success' then
+    redis.call('HSET', KEYS[1], 'last_success', ARGV[1])
+    if state == 'half_open' then
+        successes = successes + 1
+        if successes >= tonumber(ARGV[4]) then
+            state = 'closed'
+            failures = 0
+        end
+    else
+        failures = 0
+    end
+else
+    redis.call('HSET', KEYS[1], 'last_failure', ARGV[1])
+    failures = failures + 1
+    if failures >= tonumber(ARGV[3]) then
+        state = 'open'
+    end
+end
+
+redis.call('HSET', KEYS[1], 'state', state, 'failure_count', failures, 'success_count', successes)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[5]))
+local times = redis.call('HMGET', KEYS[1], 'last_failure', 'last_success')
+return {state, tostring(failures), tostring(successes), times[1] or '', times[2] or ''}
+"""
+
+
+@dataclass
+class BreakerSnapshot:
+    """Circuit breaker state as stored in the shared backend"""
+    state: str = "closed"
+    failure_count: int = 0
+    success_count: int = 0
+    last_failure: Optional[float] = None
+    last_success: Optional[float] = None
+
+    @classmethod
+    def from_fields(cls, state, failures, successes, last_failure, last_success) -> "BreakerSnapshot":
+        return cls(
+            state=state or "closed",
+            failure_count=int(failures or 0),
+            success_count=int(successes or 0),
+            last_failure=float(last_failure) if last_failure else None,
+            last_success=float(last_success) if last_success else None,
+        )
+
+
+@dataclass
+class AdmissionDecision:
+    """Result of the combined breaker check and token reservation"""
+    allowed: bool
+    wait_seconds: float
+    breaker: BreakerSnapshot
+
+
+class RedisResilienceState:
+    """Redis-backed circuit breakers and token buckets shared by all workers"""
+
+    # Process-wide, since orchestrators (and their state handles) are per request
+    _retry_at = 0.0
+
+    def __init__(self, redis: Optional[Redis]):
+        self.redis = redis
+        self._admit = redis.register_script(ADMIT_SCRIPT) if redis is not None else None
+        self._record = redis.register_script(RECORD_SCRIPT) if redis is not None else None
+
+    @property
+    def available(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._retry_at
+
+    def _mark_unavailable(self, operation: str, exc: Exception) -> None:
+        # Back off so a Redis outage does not add a failed connect to every API call
+        RedisResilienceState._retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+        logger.warning("Shared resilience state unavailable (%s): %s - using in-process state", operation, exc)
+
+    @staticmethod
+    def breaker_key(api_type: str) -> str:
+        return f"{KEY_PREFIX}:breaker:{api_type}"
+
+    @staticmethod
+    def bucket_key(api_type: str) -> str:
+        return f"{KEY_PREFIX}:bucket:{api_type}"
+
+    async def admit(
+        self,
+        api_type: str,
+        *,
+        recovery_timeout: float,
+        min_interval: float,
+        burst: int = 1,
+    ) -> Optional[AdmissionDecision]:
+        """Check the breaker and reserve a rate-limit token in one round trip.
+
+        Returns None when Redis is unavailable so the caller can fall back.
+        """
+        if not self.available:
+            return None
+        try:
+            result = await self._admit(
+                keys=[self.breaker_key(api_type), self.bucket_key(api_type)],
+                args=[time.time(), recovery_timeout, 1.0 / min_interval, burst, STATE_TTL_SECONDS],
+            )
+        except RedisError as exc:
+            self._mark_unavailable("admit", exc)
+            return None
+
+        allowed, state, failures, successes, last_failure, last_success, wait = result
+        return AdmissionDecision(
+            allowed=bool(int(allowed)),
+            wait_seconds=float(wait),
+            breaker=BreakerSnapshot.from_fields(state, failures, successes, last_failure, last_success),
+        )
+
+    async def record(
+        self,
+        api_type: str,
+        success: bool,
+        *,
+        failure_threshold: int,
+        success_threshold: int,
+    ) -> Optional[BreakerSnapshot]:
+        """Record a call outcome; returns the updated breaker or None on Redis failure"""
+        if not self.available:
+            return None
+        try:
+            result = await self._record(
+                keys=[self.breaker_key(api_type)],
+                args=[
+                    time.time(),
+                    "success" if success else "failure",
+                    failure_threshold,
+                    success_threshold,
+                    STATE_TTL_SECONDS,
+                ],
+            )
+        except RedisError as exc:
+            self._mark_unavailable("record", exc)
+            return None
+        return BreakerSnapshot.from_fields(*result)
+
+    async def snapshot(self, api_types: List[str]) -> Optional[Dict[str, BreakerSnapshot]]:
+        """Read all breakers in one pipelined round trip"""
+        if not self.available:
+            return None
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for api_type in api_types:
+                    pipe.hmget(
+                        self.breaker_key(api_type),
+                        "state", "failure_count", "success_count", "last_failure", "last_success",
+                    )
+                rows = await pipe.execute()
+        except RedisError as exc:
+            self._mark_unavailable("snapshot", exc)
+            return None
+        return {
+            api_type: BreakerSnapshot.from_fields(*row)
+            for api_type, row in zip(api_types, rows)
+        }
+
+    async def reset(self, api_type: str) -> bool:
+        """Close a breaker cluster-wide"""
+        if not self.available:
+            return False
+        try:
+            await self.redis.delete(self.breaker_key(api_type))
+            return True
+        except RedisError as exc:
+            self._mark_unavailable("reset", exc)
+            return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"backend": "redis" if self.available else "local"}
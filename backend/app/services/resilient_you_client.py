@@ -18,6 +18,7 @@ from redis.asyncio import Redis
 from redis.exceptions import RedisError
 
 from app.config import settings
+from app.services.resilience_state import BreakerSnapshot, RedisResilienceState
 from app.services.you_client import YouComOrchestrator, YouComAPIError
 
 logger = logging.getLogger(__name__)
@@ -87,6 +88,26 @@ class APICircuitBreaker:
             self.state.state = CircuitState.OPEN
             logger.warning(f"🚨 Circuit breaker {self.name} OPEN - service degraded")
     
+    def apply_snapshot(self, snapshot: BreakerSnapshot):
+        """Mirror the cluster-wide breaker state kept in the shared backend"""
+        previous = self.state.state
+        self.state.state = CircuitState(snapshot.state)
+        self.state.failure_count = snapshot.failure_count
+        self.state.success_count = snapshot.success_count
+        if snapshot.last_failure:
+            self.state.last_failure_time = datetime.fromtimestamp(snapshot.last_failure, tz=timezone.utc)
+        if snapshot.last_success:
+            self.state.last_success_time = datetime.fromtimestamp(snapshot.last_success, tz=timezone.utc)
+
+        if previous != self.state.state:
+            logger.info(f"🔄 Circuit breaker {self.name} is now {self.state.state.value.upper()} (shared state)")
+
+    def reset(self):
+        """Close the breaker and clear its counters"""
+        self.state.state = CircuitState.CLOSED
+        self.state.failure_count = 0
+        self.state.success_count = 0
+
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt reset"""
         if not self.state.last_failure_time:
@@ -140,36 +161,48 @@ class QueryOptimizer:
         
         return query
 
+def _build_circuit_breakers() -> Dict[str, APICircuitBreaker]:
+    return {
+        "news": APICircuitBreaker("news", CircuitBreakerConfig(
+            failure_threshold=3,  # News API is more sensitive
+            recovery_timeout=30
+        )),
+        "search": APICircuitBreaker("search", CircuitBreakerConfig(
+            failure_threshold=5,
+            recovery_timeout=60
+        )),
+        "chat": APICircuitBreaker("chat", CircuitBreakerConfig(
+            failure_threshold=2,  # Custom agents hang frequently
+            recovery_timeout=120  # Longer recovery for agent issues
+        )),
+        "ari": APICircuitBreaker("ari", CircuitBreakerConfig(
+            failure_threshold=3,
+            recovery_timeout=180  # ARI needs more time
+        ))
+    }
+
+# Process-wide breakers and rate-limit slots. They mirror the Redis-backed
+# cluster state and are the fallback when Redis is unreachable, so clients
+# created per request never start from a blank slate.
+PROCESS_CIRCUIT_BREAKERS = _build_circuit_breakers()
+PROCESS_LAST_REQUEST_TIME: Dict[str, float] = {}
+
 class ResilientYouComOrchestrator(YouComOrchestrator):
     """Enhanced You.com client with resilience patterns"""
     
     def __init__(self, api_key: str = None):
         super().__init__(api_key)
         
-        # Initialize circuit breakers for each API
-        self.circuit_breakers = {
-            "news": APICircuitBreaker("news", CircuitBreakerConfig(
-                failure_threshold=3,  # News API is more sensitive
-                recovery_timeout=30
-            )),
-            "search": APICircuitBreaker("search", CircuitBreakerConfig(
-                failure_threshold=5,
-                recovery_timeout=60
-            )),
-            "chat": APICircuitBreaker("chat", CircuitBreakerConfig(
-                failure_threshold=2,  # Custom agents hang frequently
-                recovery_timeout=120  # Longer recovery for agent issues
-            )),
-            "ari": APICircuitBreaker("ari", CircuitBreakerConfig(
-                failure_threshold=3,
-                recovery_timeout=180  # ARI needs more time
-            ))
-        }
+        # Circuit breakers for each API, shared by every client in the process
+        self.circuit_breakers = PROCESS_CIRCUIT_BREAKERS
+
+        # Cluster-wide breaker and token bucket state (Redis), if available
+        self.shared_state = RedisResilienceState(self.cache)
         
         self.query_optimizer = QueryOptimizer()
         
         # Rate limiting state
-        self.last_request_time = {}
+        self.last_request_time = PROCESS_LAST_REQUEST_TIME
         self.min_request_interval = {
             "news": 2.0,    # 2 seconds between news requests
             "search": 1.5,  # 1.5 seconds between search requests
@@ -178,18 +211,73 @@ class ResilientYouComOrchestrator(YouComOrchestrator):
         }
     
     async def _wait_for_rate_limit(self, api_type: str):
-        """Implement aggressive rate limiting based on Discord insights"""
-        last_time = self.last_request_time.get(api_type, 0)
+        """Implement aggressive rate limiting based on Discord insights
+
+        In-process fallback: reserve the next free slot before sleeping so
+        concurrent callers queue up behind each other instead of all passing.
+        """
+        now = time.time()
         min_interval = self.min_request_interval.get(api_type, 1.0)
-        
-        elapsed = time.time() - last_time
-        if elapsed < min_interval:
-            wait_time = min_interval - elapsed
+        slot = max(now, self.last_request_time.get(api_type, 0) + min_interval)
+        self.last_request_time[api_type] = slot
+
+        wait_time = slot - now
+        if wait_time > 0:
             logger.info(f"⏱️ Rate limiting {api_type}: waiting {wait_time:.1f}s")
             await asyncio.sleep(wait_time)
-        
-        self.last_request_time[api_type] = time.time()
     
+    async def _admit(self, api_type: str) -> bool:
+        """Breaker check plus rate limiting; one Redis round trip when shared state is up"""
+        circuit_breaker = self.circuit_breakers[api_type]
+        min_interval = self.min_request_interval.get(api_type, 1.0)
+
+        decision = await self.shared_state.admit(
+            api_type,
+            recovery_timeout=circuit_breaker.config.recovery_timeout,
+            min_interval=min_interval,
+        )
+        if decision is None:
+            if not circuit_breaker.can_execute():
+                return False
+            await self._wait_for_rate_limit(api_type)
+            return True
+
+        circuit_breaker.apply_snapshot(decision.breaker)
+        if not decision.allowed:
+            return False
+
+        if decision.wait_seconds > 0:
+            logger.info(f"⏱️ Rate limiting {api_type}: waiting {decision.wait_seconds:.1f}s (shared bucket)")
+            await asyncio.sleep(decision.wait_seconds)
+        self.last_request_time[api_type] = time.time()
+        return True
+
+    async def _record_outcome(self, api_type: str, success: bool):
+        circuit_breaker = self.circuit_breakers[api_type]
+        snapshot = await self.shared_state.record(
+            api_type,
+            success,
+            failure_threshold=circuit_breaker.config.failure_threshold,
+            success_threshold=circuit_breaker.config.success_threshold,
+        )
+        if snapshot is not None:
+            circuit_breaker.apply_snapshot(snapshot)
+        elif success:
+            circuit_breaker.record_success()
+        else:
+            circuit_breaker.record_failure()
+
+    async def refresh_shared_state(self):
+        """Pull the latest cluster-wide breaker state into the local mirrors"""
+        snapshots = await self.shared_state.snapshot(list(self.circuit_breakers))
+        for api_type, snapshot in (snapshots or {}).items():
+            self.circuit_breakers[api_type].apply_snapshot(snapshot)
+
+    async def reset_circuit_breaker(self, api_type: str):
+        """Close a breaker locally and, when shared state is available, cluster-wide"""
+        self.circuit_breakers[api_type].reset()
+        await self.shared_state.reset(api_type)
+
     async def _execute_with_circuit_breaker(
         self,
         api_type: str,
@@ -198,22 +286,17 @@ class ResilientYouComOrchestrator(YouComOrchestrator):
         **kwargs
     ):
         """Execute API call with circuit breaker protection"""
-        circuit_breaker = self.circuit_breakers[api_type]
-        
-        if not circuit_breaker.can_execute():
+        if not await self._admit(api_type):
             logger.warning(f"🚫 Circuit breaker {api_type} is OPEN - using fallback")
             return await self._get_fallback_data(api_type, *args, **kwargs)
         
-        # Apply rate limiting
-        await self._wait_for_rate_limit(api_type)
-        
         try:
             result = await operation(*args, **kwargs)
-            circuit_breaker.record_success()
+            await self._record_outcome(api_type, True)
             return result
             
         except Exception as e:
-            circuit_breaker.record_failure()
+            await self._record_outcome(api_type, False)
             logger.error(f"❌ {api_type} API failed: {str(e)}")
             
             # Return fallback data instead of failing completely
@@ -342,12 +425,22 @@ class ResilientYouComOrchestrator(YouComOrchestrator):
         *,
         progress_room: Optional[str] = None,
         db_session=None,
+        concurrent_stages: Optional[bool] = None,
     ) -> Dict[str, Any]:
-        """Enhanced impact card generation with comprehensive error handling"""
+        """Enhanced impact card generation with comprehensive error handling
+
+        Stages are scheduled like the base orchestrator's: with ``concurrent_stages``
+        (default: ``settings.impact_card_concurrent_stages``) News, Search and ARI
+        run concurrently and Chat starts as soon as News and Search are in.
+        """
         
         logger.info(f"🚀 Starting resilient Impact Card generation for {competitor}")
         start_time = time.perf_counter()
         
+        if concurrent_stages is None:
+            concurrent_stages = settings.impact_card_concurrent_stages
+        stage_timings: Dict[str, float] = {}
+
         # Track which APIs succeeded/failed
         api_status = {
             "news": "pending",
@@ -355,8 +448,8 @@ class ResilientYouComOrchestrator(YouComOrchestrator):
             "chat": "pending",
             "ari": "pending"
         }
-        
-        try:
+
+        async def news_stage() -> Dict[str, Any]:
             # Step 1: News API with resilience
             logger.info("📰 Step 1: Fetching news with resilience...")
             news_query = f"{competitor} announcement launch product"
@@ -373,7 +466,9 @@ class ResilientYouComOrchestrator(YouComOrchestrator):
                 articles=len(news_data.get("articles", [])),
                 status=api_status["news"]
             )
-            
+            return news_data
+
+        async def search_stage() -> Dict[str, Any]:
             # Step 2: Search API with resilience
             logger.info("🔍 Step 2: Searching context with resilience...")
             search_query = f"{competitor} business model strategy competitive analysis"
@@ -387,7 +482,9 @@ class ResilientYouComOrchestrator(YouComOrchestrator):
                 results=context_data.get("total_count", 0),
                 status=api_status["search"]
             )
-            
+            return context_data
+
+        async def analysis_stage(news_data: Dict[str, Any], context_data: Dict[str, Any]) -> Dict[str, Any]:
             # Step 3: Chat API with timeout protection
             logger.info("🤖 Step 3: Analyzing impact with timeout protection...")
             analysis_data = await self.analyze_impact(news_data, context_data, competitor)
@@ -400,7 +497,9 @@ class ResilientYouComOrchestrator(YouComOrchestrator):
                 risk_score=analysis_data.get("analysis", {}).get("risk_score"),
                 status=api_status["chat"]
             )
-            
+            return analysis_data
+
+        async def research_stage() -> Dict[str, Any]:
             # Step 4: ARI API with extended timeout
             logger.info("📊 Step 4: Generating research with extended timeout...")
             research_query = f"Competitive analysis of {competitor} strategic positioning market impact"
@@ -414,6 +513,35 @@ class ResilientYouComOrchestrator(YouComOrchestrator):
                 citations=len(research_data.get("citations", [])),
                 status=api_status["ari"]
             )
+            return research_data
+        
+        try:
+            if concurrent_stages:
+                # News, Search and ARI are independent; only Chat needs news + context
+                research_task = asyncio.create_task(
+                    self._timed_stage(stage_timings, "research", research_stage())
+                )
+                try:
+                    news_data, context_data = await asyncio.gather(
+                        self._timed_stage(stage_timings, "news", news_stage()),
+                        self._timed_stage(stage_timings, "search", search_stage()),
+                    )
+                    analysis_data = await self._timed_stage(
+                        stage_timings, "analysis", analysis_stage(news_data, context_data)
+                    )
+                    research_data = await research_task
+                finally:
+                    if not research_task.done():
+                        research_task.cancel()
+                        with suppress(asyncio.CancelledError):
+                            await research_task
+            else:
+                news_data = await self._timed_stage(stage_timings, "news", news_stage())
+                context_data = await self._timed_stage(stage_timings, "search", search_stage())
+                analysis_data = await self._timed_stage(
+                    stage_timings, "analysis", analysis_stage(news_data, context_data)
+                )
+                research_data = await self._timed_stage(stage_timings, "research", research_stage())
             
             # Step 5: Assemble with status information
             logger.info("🎯 Step 5: Assembling resilient Impact Card...")
@@ -428,6 +556,10 @@ class ResilientYouComOrchestrator(YouComOrchestrator):
             # Add resilience metadata
             elapsed = time.perf_counter() - start_time
             impact_card["processing_time"] = f"{elapsed:.2f}s"
+            impact_card["processing_time_breakdown"] = self._build_timing_breakdown(
+                stage_timings, elapsed, concurrent_stages
+            )
+            impact_card["raw_data"]["processing_time_breakdown"] = impact_card["processing_time_breakdown"]
             impact_card["api_status"] = api_status
             impact_card["resilience_score"] = self._calculate_resilience_score(api_status)
             impact_card["circuit_breaker_status"] = {
@@ -495,7 +627,8 @@ class ResilientYouComOrchestrator(YouComOrchestrator):
                     "min_interval": interval
                 }
                 for api, interval in self.min_request_interval.items()
-            }
+            },
+            "shared_state": self.shared_state.to_dict()
         }
 
 async def get_resilient_you_client():
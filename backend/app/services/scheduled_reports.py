@@ -1,6 +1,7 @@
 """Scheduled reports service using Celery or APScheduler"""
 import logging
 from datetime import datetime
+from io import BytesIO
 from typing import List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -8,7 +9,7 @@ from croniter import croniter
 
 from app.models.dashboard import ScheduledReport
 from app.models.workspace import Workspace
-from app.services.pdf_service import pdf_generator
+from app.services.pdf_render_pool import pdf_render_pool
 from app.services.email_service import get_email_service
 from app.services.slack_service import get_slack_service
 from app.config import settings
@@ -186,9 +187,7 @@ class ScheduledReportsService:
         report_data: Dict[str, Any]
     ):
         """Generate PDF from report data"""
-        # Use existing PDF service to generate report
-        # This is a simplified version - expand based on report type
-        return None  # Placeholder
+        return BytesIO(await pdf_render_pool.render_bytes("scheduled_report", report_data))
 
     @staticmethod
     async def _send_email_report(
@@ -11,7 +11,6 @@ import hmac
 import json
 import logging
 import re
-import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, asdict
@@ -36,6 +35,7 @@ from app.models.ml_training import FeedbackRecord
 from app.models.user import User
 from app.models.audit_log import AuditLog
 from app.config import settings
+from app.services.sliding_window_limiter import EndpointRuleTrie, RateLimitWindow, SlidingWindowLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -174,6 +174,13 @@ class SecurityManager:
             )
         }
         
+        # Rules compiled into a prefix trie keyed by their endpoint pattern;
+        # counters are kept in Redis, or in process while Redis is unavailable
+        self._rate_limit_trie = EndpointRuleTrie(
+            (rule.endpoint_pattern, rule) for rule in self.rate_limit_rules.values()
+        )
+        self.rate_limiter = SlidingWindowLimiter()
+        
         # Input validation rules
         self.validation_rules = {
             "user_feedback": [
@@ -246,6 +253,7 @@ class SecurityManager:
                 decode_responses=True
             )
             await self.redis_client.ping()
+            self.rate_limiter.redis_client = self.redis_client
             
             # Load blocked IPs and users from database
             await self._load_security_blacklists()
@@ -306,54 +314,21 @@ class SecurityManager:
             else:
                 key_suffix = "global"
             
-            # Check rate limits for different time windows
-            current_time = int(time.time())
-            
-            # Check minute limit
-            minute_key = f"rate_limit:minute:{endpoint}:{key_suffix}:{current_time // 60}"
-            minute_count = await self._get_rate_limit_count(minute_key, 60)
-            
-            if minute_count >= rule.requests_per_minute:
-                await self._log_security_event(
-                    "rate_limit_exceeded",
-                    SecurityLevel.MEDIUM,
-                    request,
-                    user_id,
-                    f"Minute rate limit exceeded: {minute_count}/{rule.requests_per_minute}"
-                )
-                return False
-            
-            # Check hour limit
-            hour_key = f"rate_limit:hour:{endpoint}:{key_suffix}:{current_time // 3600}"
-            hour_count = await self._get_rate_limit_count(hour_key, 3600)
-            
-            if hour_count >= rule.requests_per_hour:
-                await self._log_security_event(
-                    "rate_limit_exceeded",
-                    SecurityLevel.MEDIUM,
-                    request,
-                    user_id,
-                    f"Hour rate limit exceeded: {hour_count}/{rule.requests_per_hour}"
-                )
-                return False
-            
-            # Check day limit
-            day_key = f"rate_limit:day:{endpoint}:{key_suffix}:{current_time // 86400}"
-            day_count = await self._get_rate_limit_count(day_key, 86400)
+            # Check and count all windows in one atomic call
+            decision = await self.rate_limiter.hit(f"{endpoint}:{key_suffix}", self._rate_limit_windows(rule))
             
-            if day_count >= rule.requests_per_day:
+            if not decision.allowed:
+                window = decision.window
                 await self._log_security_event(
                     "rate_limit_exceeded",
-                    SecurityLevel.HIGH,
+                    SecurityLevel.HIGH if window.name == "day" else SecurityLevel.MEDIUM,
                     request,
                     user_id,
-                    f"Day rate limit exceeded: {day_count}/{rule.requests_per_day}"
+                    f"{window.name.title()} rate limit exceeded: {decision.count}/{window.limit}",
+                    {"window": window.name, "retry_after": decision.retry_after, "backend": decision.backend}
                 )
                 return False
             
-            # Increment counters
-            await self._increment_rate_limit_counters([minute_key, hour_key, day_key])
-            
             return True
             
         except Exception as e:
@@ -361,50 +336,16 @@ class SecurityManager:
             return True  # Allow request on error to avoid blocking legitimate traffic
     
     def _find_rate_limit_rule(self, endpoint: str) -> Optional[RateLimitRule]:
-        """Find matching rate limit rule for endpoint."""
-        for pattern, rule in self.rate_limit_rules.items():
-            if self._match_endpoint_pattern(endpoint, pattern):
-                return rule
-        return None
-    
-    def _match_endpoint_pattern(self, endpoint: str, pattern: str) -> bool:
-        """Check if endpoint matches pattern (supports wildcards)."""
-        if pattern.endswith("*"):
-            return endpoint.startswith(pattern[:-1])
-        return endpoint == pattern
+        """Find the most specific rate limit rule for endpoint."""
+        return self._rate_limit_trie.match(endpoint)
     
-    async def _get_rate_limit_count(self, key: str, ttl: int) -> int:
-        """Get current rate limit count for key."""
-        if not self.redis_client:
-            return 0
-        
-        try:
-            count = await self.redis_client.get(key)
-            return int(count) if count else 0
-        except Exception:
-            return 0
-    
-    async def _increment_rate_limit_counters(self, keys: List[str]) -> None:
-        """Increment rate limit counters."""
-        if not self.redis_client:
-            return
-        
-        try:
-            pipe = self.redis_client.pipeline()
-            for key in keys:
-                pipe.incr(key)
-                # Set TTL based on key type
-                if "minute" in key:
-                    pipe.expire(key, 120)  # 2 minutes
-                elif "hour" in key:
-                    pipe.expire(key, 7200)  # 2 hours
-                elif "day" in key:
-                    pipe.expire(key, 172800)  # 2 days
-            
-            await pipe.execute()
-            
-        except Exception as e:
-            logger.warning(f"Failed to increment rate limit counters: {e}")
+    def _rate_limit_windows(self, rule: RateLimitRule) -> Tuple[RateLimitWindow, ...]:
+        """Minute, hour and day windows for a rule."""
+        return (
+            RateLimitWindow("minute", 60, rule.requests_per_minute),
+            RateLimitWindow("hour", 3600, rule.requests_per_hour),
+            RateLimitWindow("day", 86400, rule.requests_per_day),
+        )
     
     def _get_client_ip(self, request: Request) -> str:
         """Get client IP address from request."""
@@ -929,7 +870,7 @@ class SecurityManager:
                 severity_stats[event.severity.value] = severity_stats.get(event.severity.value, 0) + 1
             
             # Rate limiting statistics
-            rate_limit_stats = {}
+            rate_limit_stats = {"limiter": self.rate_limiter.get_stats()}
             if self.redis_client:
                 try:
                     # Use SCAN to avoid blocking Redis
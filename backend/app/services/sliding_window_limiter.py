@@ -0,0 +1,257 @@
+"""
+Atomic sliding-window rate limiting for SecurityManager.
+
+The previous limiter read the minute, hour and day counters with three GETs
+and then incremented them in a separate pipeline: four round trips per
+request, and concurrent requests that all read the same count could all be
+admitted past the limit.
+
+`SlidingWindowLimiter.hit()` checks and increments every window in a single
+EVALSHA. The script estimates each window with the sliding-window counter
+algorithm (the current fixed bucket plus the overlapping share of the
+previous one), rejects the request if any window is full, and only then
+increments all of them, so a request is counted only when it is admitted.
+Each window is one small hash of bucket -> count under a shared hash tag, so
+the keys of a request live in the same Redis Cluster slot.
+
+When Redis is not configured or a call fails, the same algorithm runs in
+process (`LocalSlidingWindow`), so limits still hold per worker.
+
+`EndpointRuleTrie` precompiles endpoint patterns ("/api/ml/predict",
+"/api/sentiment/*") into a character trie, so finding the rule for a path
+costs one walk over the path instead of testing every pattern.
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "rate_limit"
+
+SLIDING_WINDOW_SCRIPT = """
+-- KEYS[i]: hash of bucket -> count for window i
+-- ARGV[1]: now (ms); ARGV[2i], ARGV[2i+1]: window length (ms) and limit of window i
+-- Returns {allowed, rejected window index, count, retry after (ms)}
+local now = tonumber(ARGV[1])
+local buckets = {}
+local counts = {}
+
+for i = 1, #KEYS do
+    local window = tonumber(ARGV[2 * i])
+    local limit = tonumber(ARGV[2 * i + 1])
+    local offset = now % window
+    local bucket = math.floor(now / window)
+    local current = tonumber(redis.call('HGET', KEYS[i], bucket) or '0')
+    local previous = tonumber(redis.call('HGET', KEYS[i], bucket - 1) or '0')
+    local estimated = math.floor(previous * (1 - offset / window)) + current
+
+    if estimated >= limit then
+        local retry_after
+        if current >= limit then
+            retry_after = window - offset
+        else
+            retry_after = math.ceil((1 - (limit - current) / previous) * window - offset)
+        end
+        return {0, i, estimated, math.max(retry_after, 1)}
+    end
+    buckets[i] = bucket
+    counts[i] = estimated
+end
+
+for i = 1, #KEYS do
+    local window = tonumber(ARGV[2 * i])
+    redis.call('HINCRBY', KEYS[i], buckets[i], 1)
+    if redis.call('HLEN', KEYS[i]) > 2 then
+        for _, field in ipairs(redis.call('HKEYS', KEYS[i])) do
+            if tonumber(field) < buckets[i] - 1 then
+                redis.call('HDEL', KEYS[i], field)
+            end
+        end
+    end
+    redis.call('PEXPIRE', KEYS[i], window * 2)
+end
+
+return {1, 0, counts[1] + 1, 0}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitWindow:
+    """A named window (e.g. "minute") with its length and request limit"""
+    name: str
+    seconds: int
+    limit: int
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one limiter call; `window` is the window that rejected it"""
+    allowed: bool
+    window: Optional[RateLimitWindow] = None
+    count: int = 0
+    retry_after: float = 0.0
+    backend: str = "redis"
+
+
+RuleT = TypeVar("RuleT")
+
+# Trie node keys for rules; sentinels, so no path character can collide with them
+_EXACT = object()
+_PREFIX = object()
+
+
+class EndpointRuleTrie(Generic[RuleT]):
+    """Character trie of endpoint patterns.
+
+    Patterns ending in "*" match any endpoint starting with the rest of the
+    pattern; other patterns match exactly. An exact match wins over a prefix
+    match, and a longer prefix wins over a shorter one.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, RuleT]] = ()):
+        self._root: Dict[Any, Any] = {}
+        for pattern, rule in patterns:
+            self.add(pattern, rule)
+
+    def add(self, pattern: str, rule: RuleT) -> None:
+        is_prefix = pattern.endswith("*")
+        node = self._root
+        for char in pattern[:-1] if is_prefix else pattern:
+            node = node.setdefault(char, {})
+        node[_PREFIX if is_prefix else _EXACT] = rule
+
+    def match(self, endpoint: str) -> Optional[RuleT]:
+        node = self._root
+        best = node.get(_PREFIX)
+        for char in endpoint:
+            node = node.get(char)
+            if node is None:
+                return best
+            best = node.get(_PREFIX, best)
+        return node.get(_EXACT, best)
+
+
+class LocalSlidingWindow:
+    """In-process sliding-window counters, used when Redis is unavailable"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Dict[int, int]]" = OrderedDict()
+
+    def hit(self, key: str, windows: Sequence[RateLimitWindow], now: Optional[float] = None) -> RateLimitDecision:
+        now_ms = int((time.time() if now is None else now) * 1000)
+        admitted: List[Tuple[Dict[int, int], int]] = []
+        count = 0
+
+        for window in windows:
+            window_ms = window.seconds * 1000
+            offset = now_ms % window_ms
+            bucket = now_ms // window_ms
+            counts = self._counts(f"{key}:{window.name}")
+            current = counts.get(bucket, 0)
+            previous = counts.get(bucket - 1, 0)
+            estimated = math.floor(previous * (1 - offset / window_ms)) + current
+
+            if estimated >= window.limit:
+                if current >= window.limit:
+                    retry_after_ms = window_ms - offset
+                else:
+                    retry_after_ms = math.ceil((1 - (window.limit - current) / previous) * window_ms - offset)
+                return RateLimitDecision(
+                    allowed=False, window=window, count=estimated,
+                    retry_after=max(retry_after_ms, 1) / 1000, backend="local",
+                )
+            if not admitted:
+                count = estimated + 1
+            admitted.append((counts, bucket))
+
+        for counts, bucket in admitted:
+            counts[bucket] = counts.get(bucket, 0) + 1
+            for stale in [b for b in counts if b < bucket - 1]:
+                del counts[stale]
+        return RateLimitDecision(allowed=True, count=count, backend="local")
+
+    def _counts(self, key: str) -> Dict[int, int]:
+        counts = self._buckets.get(key)
+        if counts is None:
+            counts = self._buckets[key] = {}
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return counts
+
+
+class SlidingWindowLimiter:
+    """Checks and increments all windows of a key in one atomic Redis call"""
+
+    # Seconds between repeated "falling back" warnings while Redis is down
+    FALLBACK_LOG_INTERVAL = 60
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None, local: Optional[LocalSlidingWindow] = None):
+        self.local = local or local_sliding_window
+        self._script = None
+        self._last_fallback_log = 0.0
+        self.stats = {"redis_calls": 0, "local_calls": 0, "fallbacks": 0, "rejected": 0}
+        self.redis_client = redis_client
+
+    @property
+    def redis_client(self) -> Optional[redis.Redis]:
+        return self._redis_client
+
+    @redis_client.setter
+    def redis_client(self, client: Optional[redis.Redis]) -> None:
+        self._redis_client = client
+        # register_script sends EVALSHA and reloads the script on NOSCRIPT
+        self._script = client.register_script(SLIDING_WINDOW_SCRIPT) if client is not None else None
+
+    async def hit(self, key: str, windows: Sequence[RateLimitWindow], now: Optional[float] = None) -> RateLimitDecision:
+        """Count one request against every window unless one of them is full"""
+        if self._script is not None:
+            try:
+                decision = await self._hit_redis(key, windows, now)
+                self.stats["redis_calls"] += 1
+                return self._record(decision)
+            except (RedisError, OSError) as e:
+                self.stats["fallbacks"] += 1
+                if time.monotonic() - self._last_fallback_log > self.FALLBACK_LOG_INTERVAL:
+                    self._last_fallback_log = time.monotonic()
+                    logger.warning(f"⚠️ Redis rate limiter unavailable, using in-process limits: {e}")
+
+        self.stats["local_calls"] += 1
+        return self._record(self.local.hit(key, windows, now))
+
+    async def _hit_redis(self, key: str, windows: Sequence[RateLimitWindow], now: Optional[float]) -> RateLimitDecision:
+        now_ms = int((time.time() if now is None else now) * 1000)
+        keys = [f"{KEY_PREFIX}:{window.name}:{{{key}}}" for window in windows]
+        args: List[int] = [now_ms]
+        for window in windows:
+            args.extend((window.seconds * 1000, window.limit))
+
+        allowed, index, count, retry_after_ms = await self._script(keys=keys, args=args)
+        if allowed:
+            return RateLimitDecision(allowed=True, count=int(count))
+        return RateLimitDecision(
+            allowed=False, window=windows[int(index) - 1], count=int(count),
+            retry_after=int(retry_after_ms) / 1000,
+        )
+
+    def _record(self, decision: RateLimitDecision) -> RateLimitDecision:
+        if not decision.allowed:
+            self.stats["rejected"] += 1
+        return decision
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "backend": "redis" if self._script is not None else "local"}
+
+
+# Global instance: in-process counters shared by every limiter in this worker
+local_sliding_window = LocalSlidingWindow()
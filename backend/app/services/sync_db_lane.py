@@ -0,0 +1,269 @@
+"""
+Thread-pool lane for services that still use the synchronous ORM.
+
+Many endpoints and services are `async def` but query through the sync
+`Session` API (`db.query(...)`, `db.commit()`). Run on the event loop, each of
+those queries blocks every other request for its full round trip, and with
+`get_db` handing them an AsyncSession they could not run at all.
+
+`SyncDBLane` gives that code its own execution lane: a bounded
+`ThreadPoolExecutor` with a sync engine sized to it (one connection per
+worker). `run(fn, *args)` opens a session in a worker thread, calls
+`fn(session, *args)` and closes the session; when `fn` returns a coroutine
+(an `async def` service method with sync queries inside) it is driven to
+completion on the worker thread's own event loop. Callers beyond
+`max_workers` wait on an asyncio semaphore, where they are cheap to cancel.
+
+`sync_db_endpoint` applies the lane to an endpoint or dependency that takes a
+`db: Session` parameter. Sessions are created with `expire_on_commit=False`,
+so loaded attributes of returned objects stay readable once the session is
+closed.
+
+`LoopLagMonitor` measures how late the event loop wakes from short sleeps;
+its blocked time is the saturation signal the lane is meant to drive to zero.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Async drivers and the sync drivers that speak the same URL
+SYNC_DRIVERS = {
+    "+asyncpg": "+psycopg2",
+    "+aiosqlite": "",
+    "+aiomysql": "+pymysql",
+}
+
+
+def to_sync_database_url(url: str) -> str:
+    """Map an async database URL to the equivalent sync driver URL"""
+    for async_driver, sync_driver in SYNC_DRIVERS.items():
+        if async_driver in url:
+            return url.replace(async_driver, sync_driver, 1)
+    return url
+
+
+class SyncDBLane:
+    """Runs sync-ORM work in a bounded thread pool with its own engine"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+        database_url: Optional[str] = None,
+    ):
+        self.max_workers = max_workers or settings.sync_db_max_workers
+        self.database_url = database_url or settings.sync_database_url or to_sync_database_url(settings.database_url)
+        self.session_factory = session_factory
+
+        self._engine = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._thread_state = threading.local()
+        self._running = 0
+        self._queued = 0
+
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "max_queued": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "run_seconds": 0.0,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._executor is not None:
+            return
+        if self.session_factory is None:
+            self._engine = create_engine(
+                self.database_url,
+                pool_size=self.max_workers,
+                max_overflow=0,
+                pool_pre_ping=True,
+                pool_recycle=3600,
+            )
+            self.session_factory = sessionmaker(bind=self._engine, expire_on_commit=False)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sync-db")
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+        logger.info(f"🧵 Sync DB lane started (max_workers={self.max_workers})")
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `fn(session, *args, **kwargs)` in a worker thread and return its result"""
+        self._ensure_started()
+        self.stats["submitted"] += 1
+        self._queued += 1
+        self.stats["max_queued"] = max(self.stats["max_queued"], self._queued)
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._queued -= 1
+
+        started = time.perf_counter()
+        wait = started - queued_at
+        self.stats["wait_seconds"] += wait
+        self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], wait)
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._executor, functools.partial(self._call, fn, *args, **kwargs)
+            )
+            self.stats["completed"] += 1
+            return result
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            self._running -= 1
+            self.stats["run_seconds"] += time.perf_counter() - started
+            self._semaphore.release()
+
+    def _call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Worker-thread side of `run`: one session per call"""
+        session = self.session_factory()
+        try:
+            result = fn(session, *args, **kwargs)
+            if inspect.isawaitable(result):
+                result = self._thread_loop().run_until_complete(result)
+            return result
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _thread_loop(self) -> asyncio.AbstractEventLoop:
+        loop = getattr(self._thread_state, "loop", None)
+        if loop is None or loop.is_closed():
+            loop = self._thread_state.loop = asyncio.new_event_loop()
+        return loop
+
+    async def shutdown(self) -> None:
+        """Wait for running calls, then stop the workers and close the engine"""
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown, wait=True, cancel_futures=True)
+            self._executor = None
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+            self.session_factory = None
+        self._semaphore = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        completed = self.stats["completed"] + self.stats["failed"]
+        pool = self._engine.pool if self._engine is not None else None
+        return {
+            **self.stats,
+            "max_workers": self.max_workers,
+            "running": self._running,
+            "queued": self._queued,
+            "utilization": self._running / self.max_workers,
+            "avg_wait_ms": self.stats["wait_seconds"] / completed * 1000 if completed else 0.0,
+            "avg_run_ms": self.stats["run_seconds"] / completed * 1000 if completed else 0.0,
+            "connections_checked_out": pool.checkedout() if pool is not None else None,
+            "started": self._executor is not None,
+        }
+
+
+def sync_db_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Run an endpoint or dependency that takes `db: Session` in the sync DB lane.
+
+    The `db` parameter is removed from the signature FastAPI sees, and the
+    lane supplies a worker-thread session instead. Callers that already hold
+    a sync session (tests, code running in the lane) can pass `db=` and the
+    endpoint runs directly with it.
+
+    The endpoint's coroutine runs on the worker thread's own event loop, so it
+    must not await clients bound to the application loop: the You.com client
+    pool (`you_client_pool`, or a `YouComOrchestrator` borrowing it),
+    `redis.asyncio` clients, or `sio.emit`. Do that work in an async endpoint
+    outside the lane, or give the service no such client.
+    """
+    signature = inspect.signature(endpoint)
+    hints = typing.get_type_hints(endpoint)
+    parameters = [
+        parameter.replace(annotation=hints.get(name, parameter.annotation))
+        for name, parameter in signature.parameters.items()
+        if name != "db"
+    ]
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, db: Optional[Session] = None, **kwargs: Any) -> Any:
+        if db is not None:
+            result = endpoint(*args, db=db, **kwargs)
+            return await result if inspect.isawaitable(result) else result
+        return await sync_db_lane.run(lambda session: endpoint(*args, db=session, **kwargs))
+
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    return wrapper
+
+
+class LoopLagMonitor:
+    """Measures event loop stalls by how late short sleeps wake up"""
+
+    def __init__(self, interval: Optional[float] = None, threshold_ms: Optional[float] = None):
+        self.interval = interval or settings.loop_lag_interval
+        self.threshold = (threshold_ms if threshold_ms is not None else settings.loop_lag_threshold_ms) / 1000
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {"samples": 0, "stalls": 0, "blocked_seconds": 0.0, "max_lag_ms": 0.0, "last_lag_ms": 0.0}
+
+    async def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._sample_loop())
+            logger.info(f"⏱️ Event loop lag monitor started (interval={self.interval}s)")
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _sample_loop(self) -> None:
+        while True:
+            scheduled = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.record(time.perf_counter() - scheduled - self.interval)
+
+    def record(self, lag: float) -> None:
+        lag = max(lag, 0.0)
+        self.stats["samples"] += 1
+        self.stats["last_lag_ms"] = lag * 1000
+        self.stats["max_lag_ms"] = max(self.stats["max_lag_ms"], lag * 1000)
+        if lag > self.threshold:
+            self.stats["stalls"] += 1
+            self.stats["blocked_seconds"] += lag
+
+    def reset(self) -> None:
+        self.stats = {"samples": 0, "stalls": 0, "blocked_seconds": 0.0, "max_lag_ms": 0.0, "last_lag_ms": 0.0}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "interval": self.interval,
+            "threshold_ms": self.threshold * 1000,
+            "running": self.task is not None and not self.task.done(),
+        }
+
+
+# Global instances
+sync_db_lane = SyncDBLane()
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,289 @@
+"""
+Fan-out broadcast engine for WebSocket connections.
+
+Broadcasting used to await `send_json` on each connection in turn, so one
+slow client delayed the update for every other client, every message was
+serialized once per connection, and only clients connected to the
+publishing worker received it.
+
+A `BroadcastHub` serializes each message once and puts the frame on a
+bounded queue per connection; a sender task per connection drains its queue
+to the socket. When a queue is full the slow-consumer policy applies:
+`drop_oldest` discards the oldest queued frame (and disconnects the client
+after too many drops), `disconnect` closes the connection immediately.
+Connections subscribe to topics (e.g. one per entity); messages published
+without a topic go to everyone. Published frames are also relayed through a
+Redis pub/sub channel so clients on every worker receive them.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Topic every connection is subscribed to until it picks specific topics
+ALL_TOPICS = "*"
+
+# WebSocket close code 1013: "Try Again Later"
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class SlowConsumerPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    DISCONNECT = "disconnect"
+
+
+@dataclass(eq=False)
+class ClientConnection:
+    """One WebSocket with its send queue and topic subscriptions"""
+    websocket: Any
+    queue: asyncio.Queue
+    topics: Set[str] = field(default_factory=lambda: {ALL_TOPICS})
+    dropped_frames: int = 0
+    sender: Optional[asyncio.Task] = None
+
+    def wants(self, topic: Optional[str]) -> bool:
+        return topic is None or ALL_TOPICS in self.topics or topic in self.topics
+
+
+class BroadcastHub:
+    """Per-process fan-out to WebSocket clients, relayed across workers via Redis"""
+
+    def __init__(
+        self,
+        channel: str,
+        queue_size: Optional[int] = None,
+        policy: Optional[str] = None,
+        max_dropped_frames: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+        relay_enabled: Optional[bool] = None,
+    ):
+        self.channel = channel
+        self.queue_size = queue_size or settings.websocket_send_queue_size
+        self.policy = SlowConsumerPolicy(policy or settings.websocket_slow_consumer_policy)
+        self.max_dropped_frames = (
+            max_dropped_frames if max_dropped_frames is not None else settings.websocket_max_dropped_frames
+        )
+        self.send_timeout = send_timeout or settings.websocket_send_timeout
+        self.relay_enabled = settings.websocket_relay_enabled if relay_enabled is None else relay_enabled
+
+        # Identifies this process's own messages when they come back from Redis
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.connections: Dict[Any, ClientConnection] = {}
+
+        self.redis_client: Optional[Redis] = None
+        self._owns_redis_client = False
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "published": 0,
+            "relayed_in": 0,
+            "relay_failures": 0,
+            "frames_queued": 0,
+            "frames_dropped": 0,
+            "slow_consumer_disconnects": 0,
+            "send_failures": 0,
+        }
+
+    # Connection lifecycle
+
+    async def connect(self, websocket, topics: Optional[Iterable[str]] = None) -> ClientConnection:
+        await websocket.accept()
+        connection = ClientConnection(websocket=websocket, queue=asyncio.Queue(maxsize=self.queue_size))
+        if topics:
+            connection.topics = set(topics)
+        connection.sender = asyncio.create_task(self._send_loop(connection))
+        self.connections[websocket] = connection
+        return connection
+
+    def disconnect(self, websocket) -> None:
+        connection = self.connections.pop(websocket, None)
+        if connection and connection.sender and connection.sender is not asyncio.current_task():
+            connection.sender.cancel()
+
+    def subscribe(self, websocket, topics: Iterable[str]) -> Set[str]:
+        """Add topics; the first explicit subscription replaces the catch-all"""
+        connection = self.connections[websocket]
+        connection.topics.discard(ALL_TOPICS)
+        connection.topics.update(topics)
+        return connection.topics
+
+    def unsubscribe(self, websocket, topics: Iterable[str]) -> Set[str]:
+        connection = self.connections[websocket]
+        connection.topics.difference_update(topics)
+        return connection.topics
+
+    @property
+    def active_connections(self) -> List[Any]:
+        return list(self.connections)
+
+    # Publishing
+
+    async def publish(self, message: Dict[str, Any], topic: Optional[str] = None) -> int:
+        """Send `message` to local subscribers of `topic` and relay it to other workers.
+
+        Returns the number of local connections the frame was queued for.
+        """
+        frame = json.dumps(message, default=str)
+        self.stats["published"] += 1
+        delivered = self.deliver(frame, topic)
+
+        if self.redis_client is not None:
+            envelope = json.dumps({"origin": self.origin, "topic": topic, "frame": frame})
+            try:
+                await self.redis_client.publish(self.channel, envelope)
+            except RedisError as e:
+                self.stats["relay_failures"] += 1
+                logger.warning(f"⚠️ WebSocket relay publish failed on {self.channel}: {e}")
+        return delivered
+
+    def deliver(self, frame: str, topic: Optional[str] = None) -> int:
+        """Queue a pre-serialized frame for every local subscriber without awaiting sockets"""
+        delivered = 0
+        for connection in list(self.connections.values()):
+            if connection.wants(topic) and self._enqueue(connection, frame):
+                delivered += 1
+        return delivered
+
+    async def send_to(self, websocket, message: Dict[str, Any]) -> bool:
+        """Queue a message for a single connection (replies share the send queue)"""
+        connection = self.connections.get(websocket)
+        if connection is None:
+            return False
+        return self._enqueue(connection, json.dumps(message, default=str))
+
+    def _enqueue(self, connection: ClientConnection, frame: str) -> bool:
+        try:
+            connection.queue.put_nowait(frame)
+            self.stats["frames_queued"] += 1
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if self.policy is SlowConsumerPolicy.DISCONNECT:
+            self._drop_slow_consumer(connection)
+            return False
+
+        connection.queue.get_nowait()
+        connection.queue.put_nowait(frame)
+        connection.dropped_frames += 1
+        self.stats["frames_dropped"] += 1
+        if connection.dropped_frames >= self.max_dropped_frames:
+            self._drop_slow_consumer(connection)
+            return False
+        return True
+
+    def _drop_slow_consumer(self, connection: ClientConnection) -> None:
+        self.stats["slow_consumer_disconnects"] += 1
+        logger.warning(
+            f"🐢 Disconnecting slow WebSocket consumer on {self.channel} "
+            f"({connection.queue.qsize()} queued, {connection.dropped_frames} dropped)"
+        )
+        self.disconnect(connection.websocket)
+        asyncio.create_task(self._close(connection.websocket, SLOW_CONSUMER_CLOSE_CODE))
+
+    async def _close(self, websocket, code: int) -> None:
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+
+    async def _send_loop(self, connection: ClientConnection) -> None:
+        try:
+            while True:
+                frame = await connection.queue.get()
+                await asyncio.wait_for(connection.websocket.send_text(frame), self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["send_failures"] += 1
+            logger.info(f"WebSocket send failed on {self.channel}, dropping connection: {e}")
+            self.disconnect(connection.websocket)
+            # Close the socket too, so the endpoint's receive loop ends instead of
+            # serving a client the hub no longer knows about
+            await self._close(connection.websocket, SLOW_CONSUMER_CLOSE_CODE)
+
+    # Cross-worker relay
+
+    async def start(self, redis_client: Optional[Redis] = None) -> None:
+        """Subscribe to the Redis relay channel (no-op when the relay is disabled)"""
+        if not self.relay_enabled or self._listener is not None:
+            return
+        try:
+            self._owns_redis_client = redis_client is None
+            self.redis_client = redis_client or Redis.from_url(settings.redis_url, decode_responses=True)
+            self._pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(self.channel)
+        except Exception as e:
+            logger.warning(f"⚠️ WebSocket relay unavailable, broadcasting to local clients only: {e}")
+            self.redis_client = None
+            self._pubsub = None
+            return
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"📡 WebSocket relay subscribed to {self.channel}")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(self.channel)
+                await self._pubsub.close()
+            except Exception:
+                pass
+            self._pubsub = None
+        for websocket in list(self.connections):
+            self.disconnect(websocket)
+        if self.redis_client is not None and self._owns_redis_client:
+            await self.redis_client.close()
+        self.redis_client = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+                if message and message.get("type") == "message":
+                    self._handle_relay(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ WebSocket relay error on {self.channel}: {e}")
+                await asyncio.sleep(1.0)
+
+    def _handle_relay(self, data: str) -> None:
+        try:
+            envelope = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if envelope.get("origin") == self.origin:
+            return
+        self.stats["relayed_in"] += 1
+        self.deliver(envelope["frame"], envelope.get("topic"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        depths = [connection.queue.qsize() for connection in self.connections.values()]
+        return {
+            **self.stats,
+            "connections": len(self.connections),
+            "max_queue_depth": max(depths, default=0),
+            "relay_active": self._listener is not None,
+            "policy": self.policy.value,
+        }
@@ -1,11 +1,12 @@
 """You.com API client orchestration with caching and progress events."""
 
+import asyncio
 import json
 import logging
 import time
 from contextlib import suppress
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 import httpx
@@ -18,11 +19,19 @@ from app.realtime import emit_progress
 from app.database import AsyncSessionLocal
 from app.models.api_call_log import ApiCallLog
 from app.models.notification import NotificationRule, NotificationLog
+from app.services.api_call_log_writer import api_call_log_writer
+from app.services.api_usage_rollups import apply_rollup_deltas, summarize_records
+from app.services.request_coalescer import request_coalescer
+from app.services.you_client_pool import YouClientPool, you_client_pool
 # Removed circular import - will import dynamically when needed
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 logger = logging.getLogger(__name__)
 
+# Deferred client shutdowns, referenced so they are not garbage collected mid-run
+_DEFERRED_CLOSES: Set[asyncio.Task] = set()
+
 TIER_ONE_DOMAINS = {
     "nytimes.com",
     "wsj.com",
@@ -79,6 +88,28 @@ class YouComOrchestrator:
 
         logger.info("🔑 Using You.com API for live data")
 
+        # API usage tracking for demo
+        self.api_usage = {
+            "news_calls": 0,
+            "search_calls": 0,
+            "chat_calls": 0,
+            "ari_calls": 0,
+            "total_calls": 0
+        }
+
+        # Shared upstream calls this orchestrator leads for coalesced callers
+        self._led_fetches: Set[asyncio.Task] = set()
+
+        # Borrow the application-lifetime pools when the lifespan has started them
+        self._pool: Optional[YouClientPool] = None
+        if you_client_pool.serves(self.api_key):
+            self._pool = you_client_pool
+            you_client_pool.orchestrators_served += 1
+            self.search_client = you_client_pool.search_client
+            self.agent_client = you_client_pool.agent_client
+            self.cache: Optional[Redis] = you_client_pool.cache
+            return
+
         # Create separate clients for different authentication methods
         # Search and News APIs use X-API-Key header
         self.search_client = httpx.AsyncClient(
@@ -98,15 +129,6 @@ class YouComOrchestrator:
             }
         )
 
-        # API usage tracking for demo
-        self.api_usage = {
-            "news_calls": 0,
-            "search_calls": 0,
-            "chat_calls": 0,
-            "ari_calls": 0,
-            "total_calls": 0
-        }
-
         self.cache: Optional[Redis] = None
         if not settings.demo_mode:
             try:
@@ -123,6 +145,25 @@ class YouComOrchestrator:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # Shared pools outlive the request; they are closed in the app lifespan
+        if self._pool is not None:
+            return
+        current = asyncio.current_task()
+        pending = {task for task in self._led_fetches if task is not current}
+        if pending:
+            # Callers that joined a shared upstream call we lead still need our
+            # clients, so close them once that call is done
+            task = asyncio.create_task(self._close_after(pending))
+            _DEFERRED_CLOSES.add(task)
+            task.add_done_callback(_DEFERRED_CLOSES.discard)
+            return
+        await self._close_clients()
+
+    async def _close_after(self, pending: Set[asyncio.Task]) -> None:
+        await asyncio.wait(pending)
+        await self._close_clients()
+
+    async def _close_clients(self) -> None:
         await self.search_client.aclose()
         await self.agent_client.aclose()
         if self.cache:
@@ -162,6 +203,26 @@ class YouComOrchestrator:
         except RedisError as exc:
             logger.warning("Cache write failed for %s: %s", key, exc)
 
+    async def _coalesce(self, cache_key: str, api_type: str, fetch) -> Dict[str, Any]:
+        """Share one upstream call among concurrent callers of the same cache key"""
+
+        async def lead() -> Dict[str, Any]:
+            # Runs in the coalescer's shared task, which may outlive our caller
+            task = asyncio.current_task()
+            self._led_fetches.add(task)
+            try:
+                return await fetch()
+            finally:
+                self._led_fetches.discard(task)
+
+        return await request_coalescer.run(
+            cache_key,
+            api_type,
+            lead,
+            load=lambda: self._cache_get(cache_key),
+            redis=self.cache,
+        )
+
     def _tier_for_domain(self, url: str) -> Tuple[str, float]:
         domain = urlparse(url).netloc.lower()
         if domain.startswith("www."):
@@ -184,21 +245,44 @@ class YouComOrchestrator:
         latency_ms: float,
         error_message: Optional[str] = None,
     ) -> None:
-        async with AsyncSessionLocal() as session:
-            log_entry = ApiCallLog(
-                api_type=api_type,
-                endpoint=endpoint,
+        # Off the critical path: the background writer batches inserts
+        if api_call_log_writer.is_running:
+            api_call_log_writer.enqueue(
+                api_type,
+                endpoint,
                 status_code=status_code,
                 success=success,
                 latency_ms=latency_ms,
                 error_message=error_message,
             )
-            session.add(log_entry)
-            try:
-                await session.commit()
-            except Exception as exc:  # pragma: no cover - logging should not break workflows
-                logger.warning("Failed to persist API call log: %s", exc)
-                await session.rollback()
+            return
+
+        record = {
+            "api_type": api_type,
+            "endpoint": endpoint,
+            "status_code": status_code,
+            "success": success,
+            "latency_ms": latency_ms,
+            "error_message": error_message,
+            "created_at": datetime.now(timezone.utc),
+        }
+        # The row and its rollup delta commit together, as the writer's flushes do
+        for _ in range(3):
+            async with AsyncSessionLocal() as session:
+                session.add(ApiCallLog(**record))
+                try:
+                    if settings.api_usage_rollups_enabled:
+                        await apply_rollup_deltas(session, summarize_records([record]))
+                    await session.commit()
+                    return
+                except IntegrityError:
+                    # Another worker created this hour's rollup row first; merge into it
+                    await session.rollback()
+                except Exception as exc:  # pragma: no cover - logging should not break workflows
+                    logger.warning("Failed to persist API call log: %s", exc)
+                    await session.rollback()
+                    return
+        logger.warning("Failed to persist API call log: rollup row kept conflicting")
 
     async def _perform_request(
         self,
@@ -210,14 +294,14 @@ class YouComOrchestrator:
         params: Optional[Dict[str, Any]] = None,
         json_payload: Optional[Dict[str, Any]] = None,
     ) -> httpx.Response:
+        request_kwargs: Dict[str, Any] = {"params": params, "json": json_payload}
+        if self._pool is not None:
+            request_kwargs["timeout"] = self._pool.timeout_for(api_type)
+            self._pool.request_started(api_type)
+
         start = time.perf_counter()
         try:
-            response = await client.request(
-                method,
-                url,
-                params=params,
-                json=json_payload,
-            )
+            response = await client.request(method, url, **request_kwargs)
             response.raise_for_status()
             latency_ms = (time.perf_counter() - start) * 1000
             await self._log_api_call(
@@ -250,6 +334,9 @@ class YouComOrchestrator:
                 error_message=str(exc),
             )
             raise
+        finally:
+            if self._pool is not None:
+                self._pool.request_finished(api_type)
 
     def _evaluate_source_quality(
         self,
@@ -479,6 +566,31 @@ class YouComOrchestrator:
         payload = {"competitor": competitor, "step": step, **details}
         await emit_progress("impact_generation_step", payload, room=progress_room)
 
+    async def _timed_stage(self, timings: Dict[str, float], stage: str, coroutine) -> Any:
+        """Await a workflow stage and record its wall-clock duration in ms"""
+        started = time.perf_counter()
+        try:
+            return await coroutine
+        finally:
+            timings[stage] = round((time.perf_counter() - started) * 1000, 2)
+
+    def _build_timing_breakdown(
+        self,
+        stage_timings: Dict[str, float],
+        elapsed: float,
+        concurrent: bool,
+    ) -> Dict[str, Any]:
+        total_ms = round(elapsed * 1000, 2)
+        sequential_ms = round(sum(stage_timings.values()), 2)
+        return {
+            "mode": "concurrent" if concurrent else "sequential",
+            "total_ms": total_ms,
+            "stages_ms": dict(stage_timings),
+            # Time the stages would have taken back to back
+            "sequential_estimate_ms": sequential_ms,
+            "saved_ms": round(max(0.0, sequential_ms - total_ms), 2),
+        }
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=10),
@@ -496,6 +608,11 @@ class YouComOrchestrator:
         if cached:
             return cached
 
+        return await self._coalesce(
+            cache_key, "search", lambda: self._search_upstream(query, limit, cache_key)
+        )
+
+    async def _search_upstream(self, query: str, limit: int, cache_key: str) -> Dict[str, Any]:
         self._track_usage("search")
 
         try:
@@ -586,6 +703,11 @@ class YouComOrchestrator:
         if cached:
             return cached
 
+        return await self._coalesce(
+            cache_key, "ari", lambda: self._research_upstream(query, cache_key)
+        )
+
+    async def _research_upstream(self, query: str, cache_key: str) -> Dict[str, Any]:
         self._track_usage("ari")
 
         try:
@@ -679,6 +801,11 @@ Format the response with clear sections and actionable insights."""
         if cached:
             return cached
 
+        return await self._coalesce(
+            cache_key, "news", lambda: self._news_upstream(query, limit, cache_key)
+        )
+
+    async def _news_upstream(self, query: str, limit: int, cache_key: str) -> Dict[str, Any]:
         self._track_usage("news")
 
         try:
@@ -955,24 +1082,33 @@ Format the response with clear sections and actionable insights."""
         *,
         progress_room: Optional[str] = None,
         db_session=None,
+        concurrent_stages: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """
         Complete workflow using all 4 You.com APIs
         This is the main orchestration method that showcases API integration
+
+        With ``concurrent_stages`` (default: ``settings.impact_card_concurrent_stages``)
+        News, Search and ARI run concurrently and Chat starts as soon as News and
+        Search are in; otherwise the stages run one after another.
         """
         logger.info(f"🚀 Starting Impact Card generation for {competitor}")
         start_time = time.perf_counter()
         keywords = keywords or []
         
-        try:
+        if concurrent_stages is None:
+            concurrent_stages = settings.impact_card_concurrent_stages
+        stage_timings: Dict[str, float] = {}
+
+        async def news_stage() -> Dict[str, Any]:
             # Step 1: News API - Get latest competitor news
             logger.info("📰 Step 1: Fetching latest news...")
             news_query = f"{competitor} announcement launch product"
             if keywords:
                 news_query += " " + " ".join(keywords)
-            
+
             news_data = await self.fetch_news(news_query)
-            
+
             # Enhance news with sentiment analysis
             if db_session:
                 # Dynamic import to avoid circular dependency
@@ -981,7 +1117,7 @@ Format the response with clear sections and actionable insights."""
                 news_data = await sentiment_integration.process_news_with_sentiment(
                     news_data, competitor
                 )
-            
+
             await self._notify_progress(
                 competitor,
                 "news",
@@ -989,7 +1125,9 @@ Format the response with clear sections and actionable insights."""
                 articles=len(news_data.get("articles", [])),
                 sentiment_summary=news_data.get("sentiment_summary", {})
             )
-            
+            return news_data
+
+        async def search_stage() -> Dict[str, Any]:
             # Step 2: Search API - Enrich with context
             logger.info("🔍 Step 2: Enriching with search context...")
             search_query = f"{competitor} business model strategy competitive analysis"
@@ -1000,7 +1138,9 @@ Format the response with clear sections and actionable insights."""
                 progress_room=progress_room,
                 results=context_data.get("total_count", 0),
             )
-            
+            return context_data
+
+        async def analysis_stage(news_data: Dict[str, Any], context_data: Dict[str, Any]) -> Dict[str, Any]:
             # Step 3: Custom Agents (Chat API) - Analyze competitive impact
             logger.info("🤖 Step 3: Analyzing competitive impact...")
             analysis_data = await self.analyze_impact(news_data, context_data, competitor)
@@ -1010,7 +1150,9 @@ Format the response with clear sections and actionable insights."""
                 progress_room=progress_room,
                 risk_score=analysis_data.get("analysis", {}).get("risk_score"),
             )
-            
+            return analysis_data
+
+        async def research_stage() -> Dict[str, Any]:
             # Step 4: ARI API - Generate deep research report
             logger.info("📊 Step 4: Generating deep research report...")
             research_query = f"Competitive analysis of {competitor} strategic positioning market impact"
@@ -1021,9 +1163,39 @@ Format the response with clear sections and actionable insights."""
                 progress_room=progress_room,
                 citations=len(research_data.get("citations", [])),
             )
-            
+            return research_data
+
+        try:
+            if concurrent_stages:
+                # News, Search and ARI are independent; only Chat needs news + context
+                research_task = asyncio.create_task(
+                    self._timed_stage(stage_timings, "research", research_stage())
+                )
+                try:
+                    news_data, context_data = await asyncio.gather(
+                        self._timed_stage(stage_timings, "news", news_stage()),
+                        self._timed_stage(stage_timings, "search", search_stage()),
+                    )
+                    analysis_data = await self._timed_stage(
+                        stage_timings, "analysis", analysis_stage(news_data, context_data)
+                    )
+                    research_data = await research_task
+                finally:
+                    if not research_task.done():
+                        research_task.cancel()
+                        with suppress(asyncio.CancelledError):
+                            await research_task
+            else:
+                news_data = await self._timed_stage(stage_timings, "news", news_stage())
+                context_data = await self._timed_stage(stage_timings, "search", search_stage())
+                analysis_data = await self._timed_stage(
+                    stage_timings, "analysis", analysis_stage(news_data, context_data)
+                )
+                research_data = await self._timed_stage(stage_timings, "research", research_stage())
+
             # Step 5: Generate Decision Engine Recommendations
             logger.info("🎯 Step 5: Generating action recommendations...")
+            decision_started = time.perf_counter()
             decision_recommendations = []
             if db_session:
                 try:
@@ -1053,6 +1225,7 @@ Format the response with clear sections and actionable insights."""
                     
                 except Exception as e:
                     logger.warning(f"⚠️ Decision Engine failed, continuing without recommendations: {str(e)}")
+            stage_timings["decision"] = round((time.perf_counter() - decision_started) * 1000, 2)
             
             # Step 6: Assemble Impact Card
             logger.info("🎯 Step 6: Assembling Impact Card...")
@@ -1072,6 +1245,10 @@ Format the response with clear sections and actionable insights."""
             )
             elapsed = time.perf_counter() - start_time
             impact_card["processing_time"] = f"{elapsed:.2f}s"
+            impact_card["processing_time_breakdown"] = self._build_timing_breakdown(
+                stage_timings, elapsed, concurrent_stages
+            )
+            impact_card["raw_data"]["processing_time_breakdown"] = impact_card["processing_time_breakdown"]
             impact_card["source_quality"] = source_quality
             impact_card["credibility_score"] = source_quality.get("score", 0.0)
             impact_card["requires_review"] = (
@@ -0,0 +1,203 @@
+"""Application-lifetime connection pools shared by all You.com clients.
+
+`YouComOrchestrator` instances are created per request (see `get_you_client`).
+Without a shared registry each one would open its own HTTP clients and Redis
+connection, paying TLS handshakes and Redis connects on every impact card.
+The registry is started from the FastAPI lifespan in `main.py` and handed to
+every orchestrator built while it is running.
+"""
+
+import importlib.util
+import logging
+from collections import defaultdict
+from contextlib import suppress
+from typing import Any, Dict, Optional
+
+import httpx
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import RedisError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class YouClientPool:
+    """Registry of keep-alive HTTP clients and a Redis pool for You.com APIs"""
+
+    def __init__(self):
+        self.api_key: Optional[str] = None
+        self.search_client: Optional[httpx.AsyncClient] = None
+        self.agent_client: Optional[httpx.AsyncClient] = None
+        self.redis_pool: Optional[ConnectionPool] = None
+        self.cache: Optional[Redis] = None
+        self.http2 = False
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        self.requests_total: Dict[str, int] = defaultdict(int)
+        self.orchestrators_served = 0
+
+    @property
+    def is_started(self) -> bool:
+        return self.search_client is not None
+
+    def timeout_for(self, api_type: str) -> httpx.Timeout:
+        """Per-API request timeout, configured through settings"""
+        seconds = {
+            "news": settings.you_news_timeout,
+            "search": settings.you_search_timeout,
+            "chat": settings.you_chat_timeout,
+            "ari": settings.you_ari_timeout,
+        }.get(api_type, 60.0)
+        return httpx.Timeout(seconds, connect=min(10.0, seconds))
+
+    def _build_http_client(self, headers: Dict[str, str]) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.you_http_max_connections,
+            max_keepalive_connections=settings.you_http_max_keepalive_connections,
+            keepalive_expiry=settings.you_http_keepalive_expiry,
+        )
+        return httpx.AsyncClient(
+            timeout=60.0,
+            limits=limits,
+            http2=self.http2,
+            headers=headers,
+        )
+
+    async def start(self, api_key: Optional[str] = None) -> None:
+        """Open the shared pools; safe to call more than once"""
+        if self.is_started:
+            return
+
+        raw_key = api_key or settings.you_api_key
+        key = raw_key.get_secret_value() if hasattr(raw_key, "get_secret_value") else raw_key
+        if not key:
+            logger.warning("You.com client pool not started - YOU_API_KEY missing")
+            return
+
+        self.api_key = key
+        self.http2 = settings.you_http2_enabled and HTTP2_AVAILABLE
+        if settings.you_http2_enabled and not HTTP2_AVAILABLE:
+            logger.info("HTTP/2 requested but 'h2' is not installed - using HTTP/1.1 keep-alive")
+
+        # Search and News APIs use X-API-Key header
+        self.search_client = self._build_http_client({
+            "X-API-Key": key,
+            "Content-Type": "application/json",
+        })
+        # Agent APIs (Chat, Express) use Authorization Bearer header
+        self.agent_client = self._build_http_client({
+            "Authorization": f"Bearer {key}",
+            "Content-Type": "application/json",
+        })
+
+        if not settings.demo_mode:
+            try:
+                self.redis_pool = ConnectionPool.from_url(
+                    settings.redis_url,
+                    max_connections=settings.redis_max_connections,
+                    encoding="utf-8",
+                    decode_responses=True,
+                )
+                self.cache = Redis(connection_pool=self.redis_pool)
+            except RedisError as exc:  # pragma: no cover - fallback path
+                logger.warning("Redis unavailable for shared You.com cache: %s", exc)
+                self.redis_pool = None
+                self.cache = None
+
+        logger.info(
+            "🔌 You.com client pool started (http2=%s, max_connections=%s, redis_max_connections=%s)",
+            self.http2,
+            settings.you_http_max_connections,
+            settings.redis_max_connections,
+        )
+
+    async def close(self) -> None:
+        """Close all shared connections (application shutdown)"""
+        if self.search_client:
+            await self.search_client.aclose()
+        if self.agent_client:
+            await self.agent_client.aclose()
+        if self.cache:
+            with suppress(RedisError):
+                await self.cache.close()
+        if self.redis_pool:
+            with suppress(RedisError):
+                await self.redis_pool.disconnect()
+
+        self.search_client = None
+        self.agent_client = None
+        self.cache = None
+        self.redis_pool = None
+        logger.info("🔌 You.com client pool closed")
+
+    def serves(self, api_key: str) -> bool:
+        """Whether an orchestrator using this key can borrow the shared pools"""
+        return self.is_started and api_key == self.api_key
+
+    def request_started(self, api_type: str) -> None:
+        self.in_flight[api_type] += 1
+        self.requests_total[api_type] += 1
+
+    def request_finished(self, api_type: str) -> None:
+        self.in_flight[api_type] = max(0, self.in_flight[api_type] - 1)
+
+    @staticmethod
+    def _http_pool_stats(client: Optional[httpx.AsyncClient]) -> Dict[str, Any]:
+        if client is None:
+            return {"open": False}
+
+        connections = []
+        pool = getattr(client._transport, "_pool", None)
+        if pool is not None:
+            connections = list(getattr(pool, "connections", []))
+
+        idle = sum(1 for conn in connections if conn.is_idle())
+        limit = settings.you_http_max_connections
+        return {
+            "open": not client.is_closed,
+            "connections": len(connections),
+            "active": len(connections) - idle,
+            "idle": idle,
+            "max_connections": limit,
+            "utilization": round((len(connections) - idle) / limit, 3) if limit else 0.0,
+        }
+
+    def _redis_pool_stats(self) -> Dict[str, Any]:
+        if self.redis_pool is None:
+            return {"open": False}
+
+        created = getattr(self.redis_pool, "_created_connections", 0)
+        in_use = len(getattr(self.redis_pool, "_in_use_connections", ()))
+        available = len(getattr(self.redis_pool, "_available_connections", ()))
+        limit = self.redis_pool.max_connections
+        return {
+            "open": True,
+            "created_connections": created,
+            "in_use": in_use,
+            "available": available,
+            "max_connections": limit,
+            "utilization": round(in_use / limit, 3) if limit else 0.0,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool utilisation snapshot for the monitoring API"""
+        return {
+            "started": self.is_started,
+            "http2": self.http2,
+            "orchestrators_served": self.orchestrators_served,
+            "search_client": self._http_pool_stats(self.search_client),
+            "agent_client": self._http_pool_stats(self.agent_client),
+            "redis": self._redis_pool_stats(),
+            "in_flight_requests": dict(self.in_flight),
+            "requests_total": dict(self.requests_total),
+            "timeouts": {
+                api: self.timeout_for(api).read for api in ("news", "search", "chat", "ari")
+            },
+        }
+
+
+# Global instance
+you_client_pool = YouClientPool()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Backfill hourly API usage rollups from the raw api_call_logs table.
+
+Run once after applying migration 018_add_api_usage_rollups. After that the
+API call log writer keeps the rollups current. Re-running is safe: rollups
+in the selected range are deleted and rebuilt.
+
+Usage: python scripts/backfill_api_usage_rollups.py [--days 30]
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import AsyncSessionLocal
+from app.services.api_usage_rollups import rebuild_rollups
+
+
+async def backfill(days: int | None) -> None:
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    async with AsyncSessionLocal() as session:
+        processed = await rebuild_rollups(session, since=since)
+        await session.commit()
+    scope = f"the last {days} days" if days else "all history"
+    print(f"✅ Rebuilt API usage rollups from {processed} call logs ({scope})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=None, help="Only rebuild this many recent days")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.days))
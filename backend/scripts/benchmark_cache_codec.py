@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Cache Codec Micro-benchmark
+Compares encode/decode throughput and stored size of the cache codec against
+the legacy pickle+gzip format, using payloads shaped like each CacheType.
+
+Usage: python scripts/benchmark_cache_codec.py [--records 500] [--iterations 200]
+"""
+
+import argparse
+import gzip
+import pickle
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.advanced_cache_manager import CacheType
+from app.services.cache_codec import COMPRESSORS, SERIALIZERS, CacheCodec
+
+
+def build_payloads(records: int):
+    """Synthetic payloads with the same shape as the cache manager's loaders."""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    entities = ["OpenAI", "Anthropic", "Google", "Mistral", "Cohere"]
+    labels = ["positive", "neutral", "negative"]
+
+    sentiment = [
+        {
+            "id": i,
+            "content_id": f"news-{i}",
+            "content_type": "news",
+            "sentiment_score": round(rng.uniform(-1, 1), 4),
+            "sentiment_label": rng.choice(labels),
+            "confidence": round(rng.random(), 4),
+            "processing_timestamp": (now - timedelta(minutes=i)).isoformat(),
+            "source_url": f"https://news.example.com/{rng.choice(entities).lower()}/{i}",
+            "metadata": {"keywords": rng.sample(["pricing", "launch", "funding", "hiring", "outage"], 3)},
+        }
+        for i in range(records)
+    ]
+    trends = [
+        {
+            "id": i,
+            "timeframe": "daily",
+            "period_start": (now - timedelta(days=i + 1)).isoformat(),
+            "period_end": (now - timedelta(days=i)).isoformat(),
+            "average_sentiment": round(rng.uniform(-1, 1), 4),
+            "sentiment_volatility": round(rng.random(), 4),
+            "total_mentions": rng.randint(0, 500),
+            "trend_direction": rng.choice(["up", "down", "stable"]),
+        }
+        for i in range(max(30, records // 10))
+    ]
+    template = {
+        "id": 1,
+        "name": "SaaS Competitive Landscape",
+        "industry_sector": "saas",
+        "description": "Track pricing, launches and hiring across SaaS competitors. " * 4,
+        "template_config": {"alerts": {"threshold": 0.7, "channels": ["email", "slack"]}},
+        "default_competitors": entities,
+        "default_keywords": ["pricing", "launch", "funding", "integration", "enterprise"],
+        "risk_categories": ["pricing", "product", "regulatory"],
+        "kpi_metrics": ["market_share", "nps", "win_rate"],
+        "created_at": now.isoformat(),
+        "updated_at": None,
+        "usage_count": 1234,
+        "rating": 4.6,
+    }
+    templates_by_sector = [
+        {
+            "id": i,
+            "name": f"Template {i}",
+            "industry_sector": "saas",
+            "description": "Sector template for competitive monitoring.",
+            "usage_count": rng.randint(0, 5000),
+            "rating": round(rng.uniform(1, 5), 2),
+            "created_at": now.isoformat(),
+        }
+        for i in range(25)
+    ]
+    benchmarks = [
+        {
+            "id": i,
+            "metric_type": "response_time",
+            "entity_name": rng.choice(entities),
+            "metric_value": round(rng.uniform(50, 5000), 3),
+            "percentile_rank": round(rng.uniform(0, 100), 2),
+            "industry_average": round(rng.uniform(50, 5000), 3),
+            "calculated_at": (now - timedelta(minutes=i)).isoformat(),
+            "metadata": {"sample_size": rng.randint(10, 1000)},
+        }
+        for i in range(records)
+    ]
+    trend_analysis = {
+        "analysis_type": "sentiment",
+        "entity_name": "Anthropic",
+        "timeframe_days": 30,
+        "trend_direction": "stable",
+        "confidence": 0.75,
+        "key_metrics": {},
+        "calculated_at": now.isoformat(),
+    }
+    metrics = {
+        "window": "1h",
+        "series": {name: [round(rng.random() * 100, 3) for _ in range(records)] for name in ("cpu", "memory", "latency")},
+    }
+    predictions = [
+        {"entity": rng.choice(entities), "probability": rng.random(), "features": [rng.random() for _ in range(16)]}
+        for _ in range(max(10, records // 5))
+    ]
+
+    return {
+        CacheType.SENTIMENT_ANALYSIS: sentiment,
+        CacheType.SENTIMENT_TRENDS: trends,
+        CacheType.INDUSTRY_TEMPLATES: template,
+        CacheType.TEMPLATE_DATA: templates_by_sector,
+        CacheType.BENCHMARK_RESULTS: benchmarks,
+        CacheType.TREND_ANALYSIS: trend_analysis,
+        CacheType.METRICS_AGGREGATION: metrics,
+        CacheType.PREDICTION_RESULTS: predictions,
+    }
+
+
+class LegacyCodec:
+    """The previous format: pickle, then gzip at its default level."""
+
+    def encode(self, value, compress=True):
+        data = pickle.dumps(value)
+        return gzip.compress(data) if compress else data
+
+    def decode(self, payload):
+        return pickle.loads(gzip.decompress(payload))
+
+
+def time_per_op(func, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=500, help="rows in list-shaped payloads")
+    parser.add_argument("--iterations", type=int, default=200, help="encode/decode calls per measurement")
+    args = parser.parse_args()
+
+    codecs = {"pickle+gzip (legacy)": LegacyCodec()}
+    for serializer in SERIALIZERS.values():
+        for compressor in COMPRESSORS.values():
+            if compressor.name == "none":
+                continue
+            codecs[f"{serializer.name}+{compressor.name}"] = CacheCodec(serializer.name, compressor.name)
+    codecs["auto"] = CacheCodec()
+
+    print(f"Default codec: {codecs['auto'].to_dict()}\n")
+    header = f"{'cache type':<22}{'codec':<22}{'raw KB':>9}{'stored KB':>11}{'enc MB/s':>10}{'dec MB/s':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for cache_type, payload in build_payloads(args.records).items():
+        raw_bytes = len(pickle.dumps(payload))
+        for name, codec in codecs.items():
+            encoded = codec.encode(payload)
+            encode_s = time_per_op(lambda: codec.encode(payload), args.iterations)
+            decode_s = time_per_op(lambda: codec.decode(encoded), args.iterations)
+            print(
+                f"{cache_type.value:<22}{name:<22}{raw_bytes / 1024:>9.1f}{len(encoded) / 1024:>11.1f}"
+                f"{raw_bytes / encode_s / 1e6:>10.1f}{raw_bytes / decode_s / 1e6:>10.1f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
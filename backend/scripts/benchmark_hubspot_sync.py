@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+HubSpot Sync Benchmark
+Syncs a workspace of watch items to a local mock HubSpot server, first one
+record at a time (a company search plus a create or update per watch item,
+how sync_to_hubspot used to work) and then through the batched upsert
+engine, and reports requests sent, wall time and the minimum time HubSpot's
+rate budget (100 requests per 10 seconds) would impose on each.
+
+The mock answers every request after --latency-ms. The client's own rate
+limiter is lifted so wall time reflects latency and concurrency; the budget
+column shows what the limiter would add against the real API.
+
+Usage: python scripts/benchmark_hubspot_sync.py [--companies 5000] [--latency-ms 50] [--concurrency 4]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from fastapi import FastAPI, Request
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.models import HubSpotIntegration, HubSpotSyncLog, ImpactCard, ImpactCardPayload, WatchItem, Workspace
+from app.models.action_recommendation import ActionRecommendation  # noqa: F401 (ImpactCard relationship)
+from app.services.hubspot_client import HubSpotClient
+from app.services.hubspot_sync_service import HubSpotSyncService
+
+
+@compiles(UUID, "sqlite")
+def compile_uuid_for_sqlite(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+def mock_hubspot(latency: float) -> FastAPI:
+    """Company search, create, update and batch update/upsert endpoints backed by a dict"""
+    app = FastAPI()
+    companies = {}
+
+    @app.post("/crm/v3/objects/companies/search")
+    async def search(request: Request):
+        await asyncio.sleep(latency)
+        name_filter = (await request.json())["filterGroups"][0]["filters"][0]
+        if name_filter["operator"] == "IN":  # the batched sync's lookup of companies without an id property
+            return {"results": [
+                {"id": name, "properties": {"name": name}}
+                for name, properties in companies.items()
+                if name.lower() in name_filter["values"] and HubSpotSyncService.COMPANY_ID_PROPERTY not in properties
+            ]}
+        name = name_filter["value"]
+        return {"results": [{"id": name}] if name in companies else []}
+
+    @app.post("/crm/v3/objects/companies")
+    async def create(request: Request):
+        await asyncio.sleep(latency)
+        properties = (await request.json())["properties"]
+        companies[properties["name"]] = properties
+        return {"id": properties["name"], "properties": properties}
+
+    @app.patch("/crm/v3/objects/companies/{company_id}")
+    async def update(company_id: str, request: Request):
+        await asyncio.sleep(latency)
+        companies[company_id].update((await request.json())["properties"])
+        return {"id": company_id}
+
+    @app.post("/crm/v3/objects/companies/batch/update")
+    async def batch_update(request: Request):
+        await asyncio.sleep(latency)
+        inputs = (await request.json())["inputs"]
+        for item in inputs:
+            companies[item["id"]].update(item["properties"])
+        return {"status": "COMPLETE", "results": [{"id": item["id"]} for item in inputs]}
+
+    @app.post("/crm/v3/objects/companies/batch/upsert")
+    async def batch_upsert(request: Request):
+        await asyncio.sleep(latency)
+        inputs = (await request.json())["inputs"]
+        for item in inputs:
+            companies[item["properties"]["name"]] = item["properties"]
+        return {"status": "COMPLETE", "results": [{"id": item["id"]} for item in inputs]}
+
+    return app
+
+
+class CountingTransport(httpx.ASGITransport):
+    """ASGI transport that counts requests"""
+
+    requests = 0
+
+    async def handle_async_request(self, request):
+        self.requests += 1
+        return await super().handle_async_request(request)
+
+
+def make_client(app: FastAPI) -> HubSpotClient:
+    client = HubSpotClient("token", base_url="http://hubspot.local")
+    client.MAX_REQUESTS_PER_WINDOW = 10**9
+    client.client = httpx.AsyncClient(transport=CountingTransport(app=app))
+    return client
+
+
+async def per_record_sync(service: HubSpotSyncService) -> None:
+    """The old sync loop: one search and one write per watch item"""
+    result = await service.db.execute(WatchItem.__table__.select().order_by(WatchItem.id))
+    for watch_item in result:
+        filters = [{"propertyName": "name", "operator": "EQ", "value": watch_item.competitor_name}]
+        found = await service.client.search_companies(filters)
+        properties = {"name": watch_item.competitor_name, "cia_competitor_status": "direct"}
+        if found.get("results"):
+            await service.client.update_company(found["results"][0]["id"], properties)
+        else:
+            await service.client.create_company(properties)
+
+
+async def run(args) -> None:
+    settings.hubspot_sync_concurrency = args.concurrency
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        for model in (Workspace, HubSpotIntegration, HubSpotSyncLog, WatchItem, ImpactCard, ImpactCardPayload):
+            await conn.run_sync(model.__table__.create)
+
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as db:
+        integration = HubSpotIntegration(workspace_id=1, hubspot_portal_id="1", access_token_encrypted="x",
+                                         consecutive_failures=0, total_companies_synced=0)
+        db.add(integration)
+        db.add_all([WatchItem(competitor_name=f"Competitor {i}") for i in range(args.companies)])
+        await db.commit()
+
+        print(
+            f"{args.companies} companies, {args.latency_ms:.0f}ms per request, "
+            f"batch size {settings.hubspot_sync_batch_size}, {args.concurrency} concurrent batches\n"
+        )
+        header = f"{'mode':<12}{'requests':>10}{'wall s':>10}{'budget s':>10}{'total s':>10}"
+        print(header)
+        print("-" * len(header))
+
+        modes = [("per-record", per_record_sync), ("batched", lambda s: s.sync_to_hubspot("full_sync"))]
+        for name, sync in modes:
+            service = HubSpotSyncService(integration, db)
+            service.client = make_client(mock_hubspot(args.latency_ms / 1000))
+            started = time.perf_counter()
+            await sync(service)
+            elapsed = time.perf_counter() - started
+
+            requests = service.client.client._transport.requests
+            budget = requests / HubSpotClient.MAX_REQUESTS_PER_WINDOW * HubSpotClient.RATE_LIMIT_WINDOW
+            print(f"{name:<12}{requests:>10}{elapsed:>10.1f}{budget:>10.1f}{max(elapsed, budget):>10.1f}")
+            await service.client.client.aclose()
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=5000, help="watch items to sync")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="mock HubSpot response time")
+    parser.add_argument("--concurrency", type=int, default=4, help="batches in flight")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Request Middleware Micro-benchmark
+Measures per-request overhead of the previous five BaseHTTPMiddleware layers
+against the fused RequestContextMiddleware, for a JSON endpoint and a
+streaming endpoint, by calling the ASGI app directly (no network or client).
+
+Usage: python scripts/benchmark_middleware.py [--requests 2000] [--chunks 64]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.logging_config import set_request_id
+from app.middleware import RequestContextMiddleware
+from app.security_headers import build_security_headers
+
+
+class LegacyRequestID(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        request.state.request_id = set_request_id(request.headers.get("X-Request-ID"))
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request.state.request_id
+        return response
+
+
+class LegacyErrorHandling(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        try:
+            return await call_next(request)
+        except Exception:
+            return JSONResponse({"error": "InternalServerError"}, status_code=500)
+
+
+class LegacyLogging(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        logging.getLogger("benchmark").info(
+            f"{request.method} {request.url.path} - {response.status_code}",
+            extra={"duration_ms": (time.perf_counter() - start_time) * 1000},
+        )
+        return response
+
+
+class LegacyPerformance(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        response.headers["X-Response-Time"] = f"{(time.perf_counter() - start_time) * 1000:.2f}ms"
+        return response
+
+
+class LegacySecurityHeaders(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for name, value in build_security_headers():
+            response.headers[name] = value
+        return response
+
+
+def build_app(stack: str, chunks: int) -> Starlette:
+    async def ok(request):
+        return JSONResponse({"status": "ok"})
+
+    async def stream(request):
+        async def body():
+            for _ in range(chunks):
+                yield b"x" * 1024
+        return StreamingResponse(body(), media_type="application/pdf")
+
+    app = Starlette(routes=[Route("/ok", ok), Route("/stream", stream)])
+    if stack == "legacy (5 x BaseHTTPMiddleware)":
+        for middleware in (LegacyRequestID, LegacyErrorHandling, LegacyLogging,
+                           LegacyPerformance, LegacySecurityHeaders):
+            app.add_middleware(middleware)
+    elif stack == "fused (RequestContextMiddleware)":
+        app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+async def call(app, path: str) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"user-agent", b"bench")],
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+    received = 0
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive():
+        # Like a server: the request body first, a disconnect once the response is done
+        nonlocal request_sent
+        if request_sent:
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal received
+        if message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    await app(scope, receive, send)
+    return received
+
+
+async def time_per_request(app, path: str, requests: int) -> float:
+    for _ in range(50):  # warm-up
+        await call(app, path)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return (time.perf_counter() - started) / requests
+
+
+async def run(requests: int, chunks: int) -> None:
+    stacks = ["none", "legacy (5 x BaseHTTPMiddleware)", "fused (RequestContextMiddleware)"]
+    header = f"{'stack':<36}{'endpoint':<10}{'us/request':>12}{'overhead us':>13}"
+    print(header)
+    print("-" * len(header))
+
+    for path in ("/ok", "/stream"):
+        baseline = None
+        for stack in stacks:
+            per_request = await time_per_request(build_app(stack, chunks), path, requests)
+            baseline = per_request if baseline is None else baseline
+            print(f"{stack:<36}{path:<10}{per_request * 1e6:>12.1f}{(per_request - baseline) * 1e6:>13.1f}")
+        print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per measurement")
+    parser.add_argument("--chunks", type=int, default=64, help="1 KB chunks in the streaming response")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)  # measure middleware work, not log handlers
+    asyncio.run(run(args.requests, args.chunks))
+
+
+if __name__ == "__main__":
+    main()
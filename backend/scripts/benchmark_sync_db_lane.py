@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Sync DB Lane Load Test
+Runs concurrent "requests" that each make a few synchronous ORM queries,
+first inline on the event loop (how the sync-ORM endpoints used to run) and
+then through the bounded SyncDBLane, and reports event loop blocked time,
+the latency of a lightweight coroutine running alongside (a health check),
+and lane saturation.
+
+Queries go to a SQLite file with a simulated per-query round trip
+(--query-ms), since a local SQLite query is far faster than a network
+database call.
+
+Usage: python scripts/benchmark_sync_db_lane.py [--requests 200] [--queries 3] [--query-ms 2] [--workers 8]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.services.sync_db_lane import LoopLagMonitor, SyncDBLane
+
+
+def handler(db: Session, queries: int) -> int:
+    """A sync-ORM endpoint body: a few small queries"""
+    return sum(db.execute(text("SELECT count(*) FROM items")).scalar() for _ in range(queries))
+
+
+async def health_probe(latencies, stop: asyncio.Event) -> None:
+    """Measures how long a trivial coroutine waits for the loop"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        latencies.append((time.perf_counter() - started - 0.001) * 1000)
+
+
+async def run_mode(name: str, call, args) -> None:
+    monitor = LoopLagMonitor(interval=0.005, threshold_ms=10)
+    latencies = []
+    stop = asyncio.Event()
+    await monitor.start()
+    probe = asyncio.create_task(health_probe(latencies, stop))
+    await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[call() for _ in range(args.requests)])
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+    await monitor.stop()
+    stats = monitor.get_stats()
+    p99 = statistics.quantiles(latencies, n=100, method="inclusive")[98] if len(latencies) > 1 else 0.0
+    print(
+        f"{name:<10}{elapsed * 1000:>10.0f}{args.requests / elapsed:>10.0f}"
+        f"{stats['blocked_seconds'] * 1000:>13.0f}{stats['max_lag_ms']:>12.1f}{p99:>14.1f}"
+    )
+
+
+async def run(args) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/bench.db", connect_args={"check_same_thread": False})
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO items (id) VALUES (1), (2), (3)"))
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def network_round_trip(*_):
+            time.sleep(args.query_ms / 1000)
+
+        factory = sessionmaker(bind=engine, expire_on_commit=False)
+        lane = SyncDBLane(max_workers=args.workers, session_factory=factory)
+
+        async def inline():
+            with factory() as db:
+                return handler(db, args.queries)
+
+        async def offloaded():
+            return await lane.run(handler, args.queries)
+
+        print(
+            f"{args.requests} concurrent requests x {args.queries} queries x {args.query_ms}ms, "
+            f"{args.workers} lane workers\n"
+        )
+        header = f"{'mode':<10}{'total ms':>10}{'req/s':>10}{'blocked ms':>13}{'max lag ms':>12}{'probe p99 ms':>14}"
+        print(header)
+        print("-" * len(header))
+        await run_mode("inline", inline, args)
+        await run_mode("lane", offloaded, args)
+
+        stats = lane.get_stats()
+        print(
+            f"\nlane: max_queued={stats['max_queued']} avg_wait_ms={stats['avg_wait_ms']:.1f} "
+            f"avg_run_ms={stats['avg_run_ms']:.1f}"
+        )
+        await lane.shutdown()
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="concurrent requests per mode")
+    parser.add_argument("--queries", type=int, default=3, help="queries per request")
+    parser.add_argument("--query-ms", type=float, default=2.0, help="simulated round trip per query")
+    parser.add_argument("--workers", type=int, default=8, help="lane threads")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
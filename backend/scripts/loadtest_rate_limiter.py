@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter Load Test
+Compares the previous SecurityManager limiter (three GETs, then an INCR/EXPIRE
+pipeline) with the scripted sliding-window limiter and its in-process
+fallback: time and Redis round trips per request with concurrent clients, and
+how many requests each admits against a limit that concurrent requests race
+for.
+
+Runs against REDIS_URL (or --redis-url); use --fake for an in-process
+fakeredis server (needs `fakeredis` and `lupa`), which measures limiter work
+without network latency.
+
+Usage: python scripts/loadtest_rate_limiter.py [--requests 5000] [--concurrency 50] [--limit 100] [--fake]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import redis.asyncio as redis
+
+from app.config import settings
+from app.services.sliding_window_limiter import LocalSlidingWindow, RateLimitWindow, SlidingWindowLimiter
+
+
+def count_round_trips(client) -> dict:
+    """Count commands and pipeline executions sent through `client`"""
+    counter = {"round_trips": 0}
+    execute_command = client.execute_command
+    pipeline = client.pipeline
+
+    async def counted_command(*args, **kwargs):
+        counter["round_trips"] += 1
+        return await execute_command(*args, **kwargs)
+
+    def counted_pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def counted_execute(*a, **kw):
+            counter["round_trips"] += 1
+            return await execute(*a, **kw)
+
+        pipe.execute = counted_execute
+        return pipe
+
+    client.execute_command = counted_command
+    client.pipeline = counted_pipeline
+    return counter
+
+
+class LegacyLimiter:
+    """The previous check: read each window's counter, then increment them all."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def hit(self, key, windows):
+        now = int(time.time())
+        keys = [f"legacy:{window.name}:{key}:{now // window.seconds}" for window in windows]
+        for redis_key, window in zip(keys, windows):
+            count = await self.client.get(redis_key)
+            if count and int(count) >= window.limit:
+                return False
+        pipe = self.client.pipeline()
+        for redis_key, window in zip(keys, windows):
+            pipe.incr(redis_key)
+            pipe.expire(redis_key, window.seconds * 2)
+        await pipe.execute()
+        return True
+
+
+class ScriptedLimiter:
+    def __init__(self, limiter):
+        self.limiter = limiter
+
+    async def hit(self, key, windows):
+        return (await self.limiter.hit(key, windows)).allowed
+
+
+async def run_clients(limiter, key, windows, requests: int, concurrency: int):
+    """Spread `requests` calls over `concurrency` clients; returns (seconds, admitted)"""
+    admitted = 0
+
+    async def client(calls: int):
+        nonlocal admitted
+        for _ in range(calls):
+            if await limiter.hit(key, windows):
+                admitted += 1
+
+    per_client, extra = divmod(requests, concurrency)
+    started = time.perf_counter()
+    await asyncio.gather(*[client(per_client + (1 if n < extra else 0)) for n in range(concurrency)])
+    return time.perf_counter() - started, admitted
+
+
+async def run(args) -> None:
+    if args.fake:
+        import fakeredis
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    else:
+        client = redis.from_url(args.redis_url or settings.redis_url, decode_responses=True)
+        await client.ping()
+    counter = count_round_trips(client)
+
+    limiters = {
+        "legacy (3 GET + pipeline)": LegacyLimiter(client),
+        "scripted (1 EVALSHA)": ScriptedLimiter(SlidingWindowLimiter(client, local=LocalSlidingWindow())),
+        "local fallback": ScriptedLimiter(SlidingWindowLimiter(None, local=LocalSlidingWindow())),
+    }
+    unlimited = (
+        RateLimitWindow("minute", 60, 10**9),
+        RateLimitWindow("hour", 3600, 10**9),
+        RateLimitWindow("day", 86400, 10**9),
+    )
+    limited = (
+        RateLimitWindow("minute", 60, args.limit),
+        RateLimitWindow("hour", 3600, args.limit * 10),
+        RateLimitWindow("day", 86400, args.limit * 100),
+    )
+
+    header = f"{'limiter':<28}{'us/request':>12}{'req/s':>10}{'round trips':>13}{'admitted':>10}{'limit':>8}"
+    print(f"{args.requests} requests, {args.concurrency} concurrent clients\n")
+    print(header)
+    print("-" * len(header))
+    for name, limiter in limiters.items():
+        run_id = uuid.uuid4().hex[:8]
+        await run_clients(limiter, f"warmup:{run_id}", unlimited, 100, 10)
+        counter["round_trips"] = 0
+        seconds, _ = await run_clients(limiter, f"cost:{run_id}", unlimited, args.requests, args.concurrency)
+        round_trips = counter["round_trips"] / args.requests
+        # Race for a small limit: every request above it is an overshoot
+        _, admitted = await run_clients(limiter, f"race:{run_id}", limited, args.limit * 5, args.concurrency)
+        print(
+            f"{name:<28}{seconds / args.requests * 1e6:>12.1f}{args.requests / seconds:>10.0f}"
+            f"{round_trips:>13.1f}{admitted:>10}{args.limit:>8}"
+        )
+
+    await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="requests in the cost measurement")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent clients")
+    parser.add_argument("--limit", type=int, default=100, help="per-minute limit in the race measurement")
+    parser.add_argument("--redis-url", default=None, help="Redis URL (defaults to REDIS_URL)")
+    parser.add_argument("--fake", action="store_true", help="use an in-process fakeredis server")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
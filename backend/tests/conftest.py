@@ -6,7 +6,10 @@ import pytest
 import asyncio
 from typing import AsyncGenerator, Generator
 from httpx import AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.pool import StaticPool
 import os
 import sys
@@ -68,6 +71,57 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     
     app.dependency_overrides.clear()
 
+@compiles(UUID, "sqlite")
+def compile_uuid_for_sqlite(type_, compiler, **kw):
+    """Store Postgres UUID columns as CHAR(32) in SQLite test databases."""
+    return "CHAR(32)"
+
+@pytest.fixture
+async def sqlite_engine():
+    """Factory for in-memory SQLite async engines holding only the given tables.
+
+    `await sqlite_engine(User, Comment)` creates the tables of each model (or
+    Table) on a fresh single-connection database; engines are disposed after
+    the test.
+    """
+    engines = []
+
+    async def make(*models):
+        engine = create_async_engine(
+            TEST_DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        engines.append(engine)
+        async with engine.begin() as conn:
+            for model in models:
+                await conn.run_sync(getattr(model, "__table__", model).create)
+        return engine
+
+    yield make
+    for engine in engines:
+        await engine.dispose()
+
+@pytest.fixture
+def sync_sqlite_engine():
+    """Sync counterpart of `sqlite_engine`, for code on the sync Session API."""
+    engines = []
+
+    def make(*models):
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        engines.append(engine)
+        for model in models:
+            getattr(model, "__table__", model).create(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
 @pytest.fixture
 def mock_you_api_key():
     """Mock You.com API key for testing."""
@@ -0,0 +1,171 @@
+"""
+Tests for the batched, non-blocking ApiCallLog writer
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.api_call_log import ApiCallLog
+from app.models.api_usage_rollup import ApiUsageRollup
+from app.services.api_call_log_writer import ApiCallLogWriter
+from app.services.you_client import YouComOrchestrator
+
+
+@pytest.fixture
+async def log_session_factory(sqlite_engine):
+    """In-memory SQLite database holding the api_call_logs and api_usage_rollups tables."""
+    engine = await sqlite_engine(ApiCallLog, ApiUsageRollup)
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def count_rows(session_factory) -> int:
+    async with session_factory() as session:
+        return (await session.execute(select(func.count(ApiCallLog.id)))).scalar_one()
+
+
+def enqueue_call(writer: ApiCallLogWriter, index: int) -> bool:
+    return writer.enqueue(
+        "news",
+        f"https://example.com/news/{index}",
+        status_code=200,
+        success=True,
+        latency_ms=12.5 + index,
+    )
+
+
+class TestApiCallLogWriter:
+    """Test batching, interval flushing, back-pressure and draining."""
+
+    @pytest.mark.asyncio
+    async def test_flushes_full_batches_in_bulk(self, log_session_factory):
+        writer = ApiCallLogWriter(log_session_factory, batch_size=5, flush_interval=30, max_queue_size=100)
+        await writer.start()
+        try:
+            for index in range(10):
+                assert enqueue_call(writer, index)
+
+            for _ in range(50):
+                if writer.stats["written"] == 10:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert writer.stats["written"] == 10
+            assert writer.stats["flushes"] == 2
+            assert await count_rows(log_session_factory) == 10
+        finally:
+            await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_flushes_partial_batch_after_interval(self, log_session_factory):
+        writer = ApiCallLogWriter(log_session_factory, batch_size=100, flush_interval=0.05, max_queue_size=100)
+        await writer.start()
+        try:
+            enqueue_call(writer, 1)
+            enqueue_call(writer, 2)
+            await asyncio.sleep(0.2)
+
+            assert writer.stats["written"] == 2
+            assert writer.stats["flushes"] == 1
+        finally:
+            await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_flushes_maintain_hourly_rollups(self, log_session_factory):
+        writer = ApiCallLogWriter(log_session_factory, batch_size=3, flush_interval=30, max_queue_size=100)
+        await writer.start()
+        for index in range(7):
+            enqueue_call(writer, index)
+        await writer.stop()
+
+        async with log_session_factory() as session:
+            rollup = (await session.execute(select(ApiUsageRollup))).scalars().one()
+
+        assert writer.stats["rollup_updates"] == 3
+        assert rollup.api_type == "news"
+        assert rollup.call_count == rollup.success_count == 7
+        assert rollup.latency_max_ms == 18.5
+
+    @pytest.mark.asyncio
+    async def test_rows_and_rollups_commit_together(self, log_session_factory):
+        writer = ApiCallLogWriter(log_session_factory, batch_size=10, flush_interval=30, rollups_enabled=True)
+        batch = [
+            {"api_type": "news", "endpoint": "https://example.com/news", "status_code": 200, "success": True,
+             "latency_ms": 10.0, "error_message": None, "created_at": datetime.now(timezone.utc)}
+        ] * 2
+        conflict = IntegrityError("INSERT INTO api_usage_rollups", {}, Exception("duplicate hour row"))
+
+        # A failed rollup update takes the logged rows down with it
+        with patch('app.services.api_call_log_writer.apply_rollup_deltas', new=AsyncMock(side_effect=RuntimeError)):
+            await writer._flush(batch)
+        assert await count_rows(log_session_factory) == 0
+        assert writer.stats["failed"] == 2
+
+        # A conflicting hour row retries the whole unit, so rows are not written twice
+        with patch('app.services.api_call_log_writer.apply_rollup_deltas',
+                   new=AsyncMock(side_effect=[conflict, None])) as apply:
+            await writer._flush(batch)
+        assert apply.await_count == 2
+        assert await count_rows(log_session_factory) == 2
+        assert writer.stats["written"] == 2
+
+    @pytest.mark.asyncio
+    async def test_drops_records_when_queue_is_full_and_drains_on_stop(self, log_session_factory):
+        writer = ApiCallLogWriter(log_session_factory, batch_size=100, flush_interval=30, max_queue_size=3)
+        await writer.start()
+
+        accepted = [enqueue_call(writer, index) for index in range(5)]
+        await writer.stop()
+
+        assert accepted.count(False) == writer.stats["dropped"]
+        assert writer.stats["dropped"] >= 1
+        assert await count_rows(log_session_factory) == writer.stats["enqueued"]
+        assert writer.get_stats()["queue_depth"] == 0
+
+        # Stopped writers refuse new records
+        assert enqueue_call(writer, 99) is False
+
+    @pytest.mark.asyncio
+    async def test_orchestrator_enqueues_instead_of_writing_inline(self, mock_you_api_key):
+        writer = MagicMock(is_running=True)
+        client = YouComOrchestrator(api_key=mock_you_api_key)
+        response = MagicMock(status_code=200)
+
+        with patch('app.services.you_client.api_call_log_writer', writer), \
+                patch('app.services.you_client.AsyncSessionLocal') as session_local, \
+                patch.object(client.search_client, 'request', new=AsyncMock(return_value=response)):
+            await client._perform_request(
+                client=client.search_client,
+                method="GET",
+                url="https://example.com/search",
+                api_type="search",
+            )
+
+        session_local.assert_not_called()
+        writer.enqueue.assert_called_once()
+        assert writer.enqueue.call_args.kwargs["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_inline_fallback_updates_rollups(self, log_session_factory, mock_you_api_key):
+        writer = MagicMock(is_running=False)
+        client = YouComOrchestrator(api_key=mock_you_api_key)
+
+        with patch('app.services.you_client.api_call_log_writer', writer), \
+                patch('app.services.you_client.AsyncSessionLocal', log_session_factory):
+            await client._log_api_call("search", "https://example.com/search", status_code=200,
+                                       success=True, latency_ms=40.0)
+            await client._log_api_call("search", "https://example.com/search", status_code=500,
+                                       success=False, latency_ms=90.0, error_message="boom")
+
+        async with log_session_factory() as session:
+            rollup = (await session.execute(select(ApiUsageRollup))).scalars().one()
+
+        writer.enqueue.assert_not_called()
+        assert await count_rows(log_session_factory) == 2
+        assert (rollup.api_type, rollup.call_count, rollup.success_count) == ("search", 2, 1)
+        assert rollup.latency_max_ms == 90.0
@@ -0,0 +1,177 @@
+"""
+Tests for hourly API usage rollups and the latency sketch behind them
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.metrics import api_usage_metrics
+from app.models.api_call_log import ApiCallLog
+from app.models.api_usage_rollup import ApiUsageRollup
+from app.models.company_research import CompanyResearch
+from app.models.impact_card import ImpactCard, ImpactCardPayload
+from app.services.api_usage_rollups import (
+    apply_rollup_deltas,
+    get_usage_summary,
+    hour_bucket,
+    rebuild_rollups,
+    summarize_records,
+)
+from app.services.latency_sketch import LatencySketch
+
+NOW = datetime(2025, 11, 4, 15, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def session_factory(sqlite_engine):
+    engine = await sqlite_engine(ApiCallLog, ApiUsageRollup, ImpactCard, ImpactCardPayload, CompanyResearch)
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def call(api_type, latency_ms, created_at, success=True):
+    return {
+        "api_type": api_type,
+        "endpoint": f"https://example.com/{api_type}",
+        "status_code": 200 if success else 500,
+        "success": success,
+        "latency_ms": latency_ms,
+        "error_message": None,
+        "created_at": created_at,
+    }
+
+
+class TestLatencySketch:
+    """Test accuracy, merging and serialization."""
+
+    def test_quantiles_are_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(5, 1) for _ in range(20000)]
+        sketch = LatencySketch(relative_accuracy=0.01)
+        sketch.extend(values)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+        assert sketch.count == 20000
+        assert sketch.mean == pytest.approx(sum(values) / len(values))
+
+    def test_merged_sketches_match_a_single_sketch(self):
+        values = [float(v) for v in range(1, 1001)]
+        whole = LatencySketch()
+        whole.extend(values)
+        first, second = LatencySketch(), LatencySketch()
+        first.extend(values[::2])
+        second.extend(values[1::2])
+
+        merged = LatencySketch.from_json(first.to_json()).merge(LatencySketch.from_dict(second.to_dict()))
+
+        assert merged.bins == whole.bins
+        assert merged.quantile(0.95) == whole.quantile(0.95)
+        assert (merged.min, merged.max, merged.count) == (1.0, 1000.0, 1000)
+
+    def test_zero_values_and_empty_sketches(self):
+        sketch = LatencySketch()
+        assert sketch.quantile(0.5) is None
+        sketch.extend([0.0, 0.0, 0.0, 50.0])
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == 50.0
+
+    def test_bins_are_bounded(self):
+        sketch = LatencySketch(max_bins=64)
+        sketch.extend(10 ** (i / 100) for i in range(1000))
+        assert len(sketch.bins) <= 64
+        assert sketch.quantile(0.99) == pytest.approx(10 ** 9.89, rel=0.02)
+
+
+class TestApiUsageRollups:
+    """Test incremental maintenance, rebuilds and the summary query."""
+
+    @pytest.mark.asyncio
+    async def test_deltas_merge_into_existing_hour_rows(self, session_factory):
+        first = [call("news", 100.0, NOW), call("news", 300.0, NOW, success=False)]
+        second = [call("news", 200.0, NOW + timedelta(minutes=5)), call("search", 50.0, NOW - timedelta(hours=2))]
+
+        for batch in (first, second):
+            async with session_factory() as session:
+                await apply_rollup_deltas(session, summarize_records(batch))
+                await session.commit()
+
+        async with session_factory() as session:
+            rows = (await session.execute(select(ApiUsageRollup).order_by(ApiUsageRollup.bucket_start))).scalars().all()
+
+        assert [(row.api_type, row.call_count, row.success_count) for row in rows] == [("search", 1, 1), ("news", 3, 2)]
+        news = rows[1]
+        assert hour_bucket(news.bucket_start) == hour_bucket(NOW)
+        assert news.latency_sum_ms == 600.0
+        assert news.latency_max_ms == 300.0
+        assert LatencySketch.from_dict(news.latency_sketch).count == 3
+
+    @pytest.mark.asyncio
+    async def test_summary_reads_rollups_not_call_logs(self, session_factory):
+        batch = [call("news", float(ms), NOW - timedelta(minutes=ms % 90)) for ms in range(1, 101)]
+        batch.append(call("ari", 5000.0, NOW - timedelta(days=3), success=False))
+        async with session_factory() as session:
+            await apply_rollup_deltas(session, summarize_records(batch))
+            await session.commit()
+
+        async with session_factory() as session:
+            summary = await get_usage_summary(session, now=NOW)
+
+        assert summary["total_calls"] == 101
+        assert summary["success_calls"] == 100
+        assert summary["by_service"] == {"news": 100, "search": 0, "chat": 0, "ari": 1}
+        assert summary["average_latency_ms"] == pytest.approx((5050 + 5000) / 101)
+        # Percentiles cover the last 24 hours only, so the 3-day-old ARI call is excluded
+        assert summary["p95_latency_ms"] == pytest.approx(95, rel=0.02)
+        assert summary["p99_latency_ms"] == pytest.approx(99, rel=0.02)
+        assert [point["time"] for point in summary["usage_last_24h"]] == ["14:00", "15:00"]
+        assert sum(point["news"] for point in summary["usage_last_24h"]) == 100
+        assert summary["last_call_at"] == NOW
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental_rollups(self, session_factory):
+        rng = random.Random(3)
+        batch = [call(rng.choice(["news", "search"]), float(i), NOW - timedelta(minutes=7 * i)) for i in range(200)]
+        async with session_factory() as session:
+            await session.execute(insert(ApiCallLog), batch)
+            await apply_rollup_deltas(session, summarize_records(batch))
+            await session.commit()
+            incremental = await get_usage_summary(session, now=NOW)
+
+        async with session_factory() as session:
+            assert await rebuild_rollups(session, chunk_size=50) == 200
+            await session.commit()
+            rebuilt = await get_usage_summary(session, now=NOW)
+            row_count = await session.scalar(select(func.count(ApiUsageRollup.id)))
+
+        assert rebuilt == incremental
+        assert row_count <= 2 * 25
+
+    @pytest.mark.asyncio
+    async def test_endpoint_uses_rollups_and_sql_card_aggregates(self, session_factory):
+        async with session_factory() as session:
+            await apply_rollup_deltas(session, summarize_records([call("search", 40.0, datetime.now(timezone.utc))]))
+            session.add_all([
+                ImpactCard(competitor_name="Acme", risk_score=50, risk_level="medium", confidence_score=80,
+                           total_sources=4, processing_time="2.50s"),
+                ImpactCard(competitor_name="Globex", risk_score=70, risk_level="high", confidence_score=90,
+                           total_sources=6, processing_time="4.5 seconds"),
+            ])
+            await session.commit()
+
+        async with session_factory() as session:
+            metrics = await api_usage_metrics(db=session)
+
+        assert metrics["total_calls"] == 1
+        assert metrics["success_rate"] == 1.0
+        assert metrics["by_service"]["search"] == 1
+        assert metrics["impact_cards"] == 2
+        assert metrics["total_sources"] == 10
+        assert metrics["average_processing_seconds"] == pytest.approx(3.5)
+        assert metrics["last_generated_at"] is not None
+        assert metrics["last_call_at"] is not None
@@ -0,0 +1,78 @@
+"""
+Tests for the cache entry codec
+"""
+
+import gzip
+import pickle
+from datetime import datetime
+
+import pytest
+
+from app.services.cache_codec import (
+    COMPRESSORS,
+    HEADER,
+    SERIALIZERS,
+    CacheCodec,
+    CodecError,
+)
+
+PAYLOAD = [
+    {"id": i, "sentiment_label": "positive", "sentiment_score": 0.25 * i, "metadata": {"keywords": ["launch"]}}
+    for i in range(200)
+]
+
+
+class TestCacheCodec:
+    """Test round trips, headers and compression decisions."""
+
+    @pytest.mark.parametrize("serializer", sorted(s.name for s in SERIALIZERS.values()))
+    @pytest.mark.parametrize("compressor", sorted(c.name for c in COMPRESSORS.values() if c.name != "none"))
+    def test_round_trip_for_every_registered_pair(self, serializer, compressor):
+        codec = CacheCodec(serializer, compressor, compression_threshold=256)
+        payload = codec.encode(PAYLOAD)
+
+        assert codec.decode(payload) == PAYLOAD
+        described = codec.describe(payload)
+        assert described["serializer"] == serializer
+        assert described["compressor"] == compressor
+        assert described["stored_size"] < described["raw_size"]
+
+    def test_small_values_are_not_compressed(self):
+        codec = CacheCodec(compression_threshold=1024)
+        payload = codec.encode({"trend_direction": "stable"})
+
+        assert codec.describe(payload)["compressor"] == "none"
+        assert codec.raw_size(payload) == len(payload) - HEADER.size
+
+    def test_compression_can_be_disabled_per_call(self):
+        codec = CacheCodec(compression_threshold=0)
+        payload = codec.encode(PAYLOAD, compress=False)
+        assert codec.describe(payload)["compressor"] == "none"
+
+    def test_decodes_values_written_with_another_codec(self):
+        writer = CacheCodec("json", "zlib", compression_threshold=0)
+        reader = CacheCodec()
+        assert reader.decode(writer.encode(PAYLOAD)) == PAYLOAD
+
+    def test_dates_are_stored_as_iso_strings(self):
+        codec = CacheCodec()
+        moment = datetime(2025, 10, 1, 12, 30)
+        assert codec.decode(codec.encode({"at": moment})) == {"at": moment.isoformat()}
+
+    def test_legacy_pickle_payloads_are_rejected_not_unpickled(self):
+        codec = CacheCodec()
+        legacy = gzip.compress(pickle.dumps(PAYLOAD))
+
+        with pytest.raises(CodecError):
+            codec.decode(legacy)
+
+    def test_corrupt_and_unknown_payloads_raise_codec_error(self):
+        codec = CacheCodec(compression_threshold=0)
+        payload = codec.encode(PAYLOAD)
+
+        with pytest.raises(CodecError):
+            codec.decode(payload[:-10])
+        with pytest.raises(CodecError):
+            codec.decode(HEADER.pack(b"YC", 1, 99, 0, 0))
+        with pytest.raises(CodecError):
+            codec.decode(HEADER.pack(b"YC", 9, 1, 0, 0))
@@ -0,0 +1,129 @@
+"""
+Tests for the recursive comment thread loader and denormalized reply counts
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.api.comments import (
+    bulk_comment_operation, create_comment, delete_comment, get_comment_threads, list_comments
+)
+from app.models.comment import Comment
+from app.models.comment_notification import CommentNotification, ConflictDetection
+from app.models.company_research import CompanyResearch
+from app.models.user import User
+from app.schemas.comment import BulkCommentOperation, CommentCreate
+
+
+@pytest.fixture
+def engine(sync_sqlite_engine):
+    return sync_sqlite_engine(User, CompanyResearch, Comment, CommentNotification, ConflictDetection)
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="analyst@example.com", username="analyst", full_name="Analyst", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def research(db):
+    research = CompanyResearch(company_name="Acme")
+    db.add(research)
+    db.commit()
+    return research
+
+
+async def post(db, user, research, content, parent=None):
+    return await create_comment(
+        company_research_id=research.id,
+        comment_data=CommentCreate(content=content, parent_comment_id=parent.id if parent else None),
+        db=db,
+        current_user=user,
+    )
+
+
+class TestCommentThreads:
+    """Test thread assembly, query counts and reply count maintenance."""
+
+    @pytest.mark.asyncio
+    async def test_threads_are_nested_in_creation_order(self, db, user, research):
+        root = await post(db, user, research, "Root")
+        first = await post(db, user, research, "First reply", root)
+        nested = await post(db, user, research, "Nested reply", first)
+        await post(db, user, research, "Second reply", root)
+        await post(db, user, research, "Another thread")
+
+        threads = await get_comment_threads(company_research_id=research.id, limit=20, db=db)
+
+        assert [thread.content for thread in threads] == ["Another thread", "Root"]
+        root_thread = threads[1]
+        assert root_thread.replies_count == 2
+        assert [reply.content for reply in root_thread.replies] == ["First reply", "Second reply"]
+        assert root_thread.replies[0].replies[0].id == nested.id
+        assert root_thread.replies[0].replies_count == 1
+
+    @pytest.mark.asyncio
+    async def test_replies_sorting_before_their_parent_are_kept(self, db, user, research):
+        root = await post(db, user, research, "Root")
+        first = await post(db, user, research, "First reply", root)
+        nested = await post(db, user, research, "Nested reply", first)
+        nested.created_at = first.created_at.replace(year=first.created_at.year - 1)
+        db.commit()
+
+        threads = await get_comment_threads(company_research_id=research.id, limit=20, db=db)
+
+        assert [reply.content for reply in threads[0].replies] == ["First reply"]
+        assert [reply.id for reply in threads[0].replies[0].replies] == [nested.id]
+
+    @pytest.mark.asyncio
+    async def test_thread_listing_uses_constant_number_of_queries(self, engine, db, user, research):
+        parents = [await post(db, user, research, "Root")]
+        for depth in range(30):
+            parents.append(await post(db, user, research, f"Reply {depth}", parents[-1]))
+        for n in range(20):
+            await post(db, user, research, f"Sibling {n}", parents[n % 5])
+        research_id = research.id
+        db.expire_all()
+
+        statements = []
+        event.listen(engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        threads = await get_comment_threads(company_research_id=research_id, limit=20, db=db)
+        await list_comments(company_research_id=research_id, limit=100, offset=0, db=db)
+
+        depth, node = 0, threads[0]
+        while node.replies:
+            node = node.replies[0]
+            depth += 1
+        assert depth == 30
+        assert len(statements) == 3
+
+    @pytest.mark.asyncio
+    async def test_reply_counts_follow_deletes(self, db, user, research):
+        root = await post(db, user, research, "Root")
+        replies = [await post(db, user, research, f"Reply {n}", root) for n in range(3)]
+        nested = await post(db, user, research, "Nested", replies[0])
+
+        await delete_comment(replies[2].id, db=db, current_user=user)
+        db.refresh(root)
+        assert root.reply_count == 2
+
+        # Deleting a parent together with its reply only decrements the surviving ancestor
+        await bulk_comment_operation(
+            BulkCommentOperation(comment_ids=[replies[0].id, nested.id], operation="delete"),
+            db=db,
+            current_user=user,
+        )
+        db.refresh(root)
+        assert root.reply_count == 1
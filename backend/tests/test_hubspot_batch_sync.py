@@ -0,0 +1,223 @@
+"""
+Tests for batched HubSpot sync against a local mock HubSpot server
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.models.hubspot_integration import HubSpotIntegration, HubSpotSyncLog
+from app.models.impact_card import ImpactCard, ImpactCardPayload
+from app.models.watch import WatchItem
+from app.models.workspace import Workspace
+from app.services.hubspot_client import HubSpotAuthError, HubSpotClient
+from app.services.hubspot_sync_service import HubSpotSyncService
+
+
+class MockHubSpot:
+    """In-process stand-in for the HubSpot company search, batch update and batch upsert endpoints"""
+
+    def __init__(self):
+        self.companies = {}  # keyed companies by watch item id
+        self.unkeyed = {}  # companies without the id property (synced by name) by HubSpot id
+        self.requests = []
+        self.searches = 0
+        self.running = 0
+        self.peak = 0
+        self.fail_on_request = None  # 1-based request number answered with 401
+        self.reject_names = set()  # inputs with these names come back in "errors"
+        self.app = FastAPI()
+        self.app.post("/crm/v3/objects/companies/search")(self.search)
+        self.app.post("/crm/v3/objects/companies/batch/update")(self.batch_update)
+        self.app.post("/crm/v3/objects/companies/batch/upsert")(self.batch_upsert)
+
+    async def search(self, request: Request):
+        self.searches += 1
+        name_filter, key_filter = (await request.json())["filterGroups"][0]["filters"]
+        assert (key_filter["propertyName"], key_filter["operator"]) == (
+            HubSpotSyncService.COMPANY_ID_PROPERTY, "NOT_HAS_PROPERTY")
+        results = [
+            {"id": company_id, "properties": {"name": properties["name"]}}
+            for company_id, properties in self.unkeyed.items()
+            if properties["name"].lower() in name_filter["values"]
+        ]
+        return {"total": len(results), "results": results}
+
+    async def batch_update(self, request: Request):
+        results = []
+        for item in (await request.json())["inputs"]:
+            properties = {**self.unkeyed.pop(item["id"]), **item["properties"]}
+            self.companies[properties[HubSpotSyncService.COMPANY_ID_PROPERTY]] = properties
+            results.append({"id": item["id"], "properties": properties})
+        return {"status": "COMPLETE", "results": results}
+
+    async def batch_upsert(self, request: Request):
+        inputs = (await request.json())["inputs"]
+        self.requests.append([item["id"] for item in inputs])
+        if len(self.requests) == self.fail_on_request:
+            return JSONResponse({"message": "expired token"}, status_code=401)
+
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+
+        results, errors = [], []
+        for item in inputs:
+            if item["properties"]["name"] in self.reject_names:
+                errors.append({"status": "error", "message": f"Invalid company {item['id']}"})
+                continue
+            assert item["idProperty"] == HubSpotSyncService.COMPANY_ID_PROPERTY
+            self.companies[item["id"]] = item["properties"]
+            results.append({"id": f"hs-{item['id']}", "properties": item["properties"]})
+        return JSONResponse({"status": "COMPLETE", "results": results, "errors": errors},
+                            status_code=207 if errors else 200)
+
+
+@pytest.fixture
+async def db(sqlite_engine):
+    engine = await sqlite_engine(Workspace, HubSpotIntegration, HubSpotSyncLog, WatchItem, ImpactCard, ImpactCardPayload)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+
+
+@pytest.fixture
+def hubspot(monkeypatch):
+    monkeypatch.setattr(settings, "hubspot_sync_batch_size", 10)
+    monkeypatch.setattr(settings, "hubspot_sync_concurrency", 3)
+    return MockHubSpot()
+
+
+async def make_service(db: AsyncSession, hubspot: MockHubSpot, watch_items: int = 45) -> HubSpotSyncService:
+    integration = HubSpotIntegration(workspace_id=1, hubspot_portal_id="123", access_token_encrypted="x",
+                                     consecutive_failures=0, total_companies_synced=0)
+    created_at = datetime.utcnow() - timedelta(days=30)
+    db.add(integration)
+    db.add_all([
+        WatchItem(competitor_name=f"Competitor {i}", created_at=created_at, is_active=i % 5 != 0)
+        for i in range(1, watch_items + 1)
+    ])
+    await db.commit()
+
+    service = HubSpotSyncService(integration, db)
+    service.client = HubSpotClient("token", base_url="http://hubspot.local")
+    service.client.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=hubspot.app))
+    return service
+
+
+class TestHubSpotBatchSync:
+    """Test batching, bounded concurrency, checkpoint resume and incremental windows."""
+
+    @pytest.mark.asyncio
+    async def test_watch_items_are_upserted_in_concurrent_batches(self, db, hubspot):
+        service = await make_service(db, hubspot)
+        db.add_all([
+            ImpactCard(watch_item_id=1, competitor_name="Competitor 1", risk_score=40, risk_level="medium",
+                       confidence_score=80),
+            ImpactCard(watch_item_id=1, competitor_name="Competitor 1", risk_score=85, risk_level="high",
+                       confidence_score=80),
+            ImpactCard(competitor_name="Competitor 7", risk_score=55, risk_level="medium", confidence_score=70),
+        ])
+        await db.commit()
+
+        sync_log = await service.sync_to_hubspot("full_sync")
+
+        assert [len(ids) for ids in hubspot.requests] == [10, 10, 10, 10, 5]
+        assert 1 < hubspot.peak <= 3
+        assert len(hubspot.companies) == 45
+        assert hubspot.companies["1"]["cia_competitive_risk_score"] == 85
+        assert hubspot.companies["7"]["cia_competitive_risk_score"] == 55
+        assert hubspot.companies["5"]["cia_competitor_status"] == "not_monitored"
+        assert sync_log.status == "success"
+        assert (sync_log.records_processed, sync_log.records_successful) == (45, 45)
+        assert sync_log.sync_metadata["checkpoint"] == {"last_watch_item_id": 45}
+        assert service.integration.total_companies_synced == 45
+
+    @pytest.mark.asyncio
+    async def test_failed_full_sync_resumes_after_checkpoint(self, db, hubspot, monkeypatch):
+        monkeypatch.setattr(settings, "hubspot_sync_concurrency", 1)
+        service = await make_service(db, hubspot)
+        hubspot.fail_on_request = 3
+
+        with pytest.raises(HubSpotAuthError):
+            await service.sync_to_hubspot("full_sync")
+
+        failed_log = (await db.execute(HubSpotSyncLog.__table__.select())).one()
+        assert failed_log.status == "failure"
+        assert failed_log.records_successful == 20
+        assert failed_log.sync_metadata["checkpoint"] == {"last_watch_item_id": 20}
+
+        hubspot.fail_on_request = None
+        hubspot.requests.clear()
+        resumed_log = await service.sync_to_hubspot("full_sync")
+
+        assert hubspot.requests[0][0] == "21"
+        assert sum(len(ids) for ids in hubspot.requests) == 25
+        assert resumed_log.status == "success"
+        assert resumed_log.sync_metadata["resumed_from_log_id"] == str(failed_log.id)
+        assert len(hubspot.companies) == 45
+
+        # The last full sync succeeded, so the next one starts from the beginning
+        hubspot.requests.clear()
+        await service.sync_to_hubspot("full_sync")
+        assert sum(len(ids) for ids in hubspot.requests) == 45
+
+    @pytest.mark.asyncio
+    async def test_records_rejected_within_a_batch_count_as_failed(self, db, hubspot):
+        service = await make_service(db, hubspot, watch_items=12)
+        hubspot.reject_names = {"Competitor 3", "Competitor 11"}
+
+        sync_log = await service.sync_to_hubspot("full_sync")
+
+        assert sync_log.status == "partial_success"
+        assert (sync_log.records_processed, sync_log.records_successful, sync_log.records_failed) == (12, 10, 2)
+        assert "3" not in hubspot.companies and "11" not in hubspot.companies
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync_sends_only_changed_companies(self, db, hubspot):
+        service = await make_service(db, hubspot, watch_items=20)
+        service.integration.last_successful_sync_at = datetime.utcnow() - timedelta(days=1)
+        db.add_all([
+            WatchItem(competitor_name="New Competitor", created_at=datetime.utcnow()),
+            ImpactCard(competitor_name="Competitor 4", risk_score=90, risk_level="critical",
+                       confidence_score=90, created_at=datetime.utcnow()),
+        ])
+        await db.commit()
+
+        sync_log = await service.sync_to_hubspot("incremental")
+
+        assert hubspot.requests == [["4", "21"]]
+        assert hubspot.companies["4"]["cia_competitive_risk_score"] == 90
+        assert sync_log.records_processed == 2
+
+    @pytest.mark.asyncio
+    async def test_companies_synced_by_name_are_backfilled_instead_of_duplicated(self, db, hubspot):
+        service = await make_service(db, hubspot, watch_items=12)
+        hubspot.unkeyed = {
+            "hs-legacy-3": {"name": "competitor 3", "domain": "competitor3.example"},
+            "hs-legacy-11": {"name": "Competitor 11", "domain": "competitor11.example"},
+            "hs-other": {"name": "Unrelated Inc", "domain": "unrelated.example"},
+        }
+
+        sync_log = await service.sync_to_hubspot("full_sync")
+
+        assert hubspot.searches == 2
+        assert hubspot.requests == [[str(i) for i in range(1, 11) if i != 3], ["12"]]
+        assert list(hubspot.unkeyed) == ["hs-other"]
+        assert len(hubspot.companies) == 12
+        assert hubspot.companies["3"]["domain"] == "competitor3.example"
+        assert hubspot.companies["3"][HubSpotSyncService.COMPANY_ID_PROPERTY] == "3"
+        assert hubspot.companies["11"]["domain"] == "competitor11.example"
+        assert (sync_log.records_processed, sync_log.records_successful) == (12, 12)
+
+        # Once backfilled, the next sync upserts every company by key
+        hubspot.requests.clear()
+        await service.sync_to_hubspot("full_sync")
+        assert sum(len(ids) for ids in hubspot.requests) == 12
+        assert len(hubspot.companies) == 12
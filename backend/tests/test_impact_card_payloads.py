@@ -0,0 +1,109 @@
+"""
+Tests for narrow impact card rows: deferred detail columns and side-table payloads
+"""
+
+import pytest
+from sqlalchemy import delete, event, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from app.api.impact import get_impact_card
+from app.models.impact_card import ImpactCard, ImpactCardPayload
+from app.models.watch import WatchItem
+
+
+@pytest.fixture
+async def engine(sqlite_engine):
+    return await sqlite_engine(WatchItem, ImpactCard, ImpactCardPayload)
+
+
+@pytest.fixture
+async def session_factory(engine):
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def create_card(session_factory, **overrides):
+    values = dict(
+        competitor_name="Acme",
+        risk_score=70,
+        risk_level="high",
+        confidence_score=85,
+        explainability={"reasoning": "Pricing pressure"},
+        source_quality={"score": 0.9, "total": 12},
+        api_usage={"news_calls": 1, "total_calls": 4},
+        raw_data={"news": {"articles": ["a"] * 200}},
+    )
+    values.update(overrides)
+    async with session_factory() as session:
+        card = ImpactCard(**values)
+        session.add(card)
+        await session.commit()
+        return card.id
+
+
+class TestImpactCardPayloads:
+    """Test where heavy card data is stored and when it is loaded."""
+
+    @pytest.mark.asyncio
+    async def test_raw_data_is_stored_in_the_side_table(self, session_factory):
+        card_id = await create_card(session_factory)
+
+        async with session_factory() as session:
+            payload = await session.get(ImpactCardPayload, card_id)
+            assert payload.raw_data == {"news": {"articles": ["a"] * 200}}
+
+            # Every card gets a payload row, even without raw_data
+            other_id = await create_card(session_factory, raw_data=None, competitor_name="Globex")
+            other = (await session.execute(
+                select(ImpactCard).where(ImpactCard.id == other_id).options(selectinload(ImpactCard.payload))
+            )).scalar_one()
+            assert other.raw_data is None
+
+            default_card = ImpactCard(competitor_name="Initech", risk_score=1, risk_level="low", confidence_score=1)
+            assert default_card.raw_data == {}
+
+    @pytest.mark.asyncio
+    async def test_plain_selects_fetch_narrow_rows(self, engine, session_factory):
+        card_id = await create_card(session_factory)
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        async with session_factory() as session:
+            card = (await session.execute(select(ImpactCard).where(ImpactCard.id == card_id))).scalar_one()
+
+            assert card.risk_score == 70
+            for column in ("explainability", "source_quality", "api_usage", "raw_data"):
+                assert column not in statements[0]
+            # Unloaded details fail loudly instead of issuing a hidden query
+            with pytest.raises(InvalidRequestError):
+                card.explainability
+            with pytest.raises(InvalidRequestError):
+                card.raw_data
+
+    @pytest.mark.asyncio
+    async def test_detail_endpoint_loads_raw_data_only_on_request(self, session_factory):
+        card_id = await create_card(session_factory)
+
+        async with session_factory() as session:
+            detail = await get_impact_card(card_id, db=session)
+            assert detail.explainability.reasoning == "Pricing pressure"
+            assert detail.api_usage.total_calls == 4
+            assert detail.raw_data is None
+
+            with_raw = await get_impact_card(card_id, include_raw_data=True, db=session)
+            assert with_raw.raw_data["news"]["articles"][0] == "a"
+
+    @pytest.mark.asyncio
+    async def test_deleting_a_card_deletes_its_payload(self, engine, session_factory):
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+        card_id = await create_card(session_factory)
+
+        async with session_factory() as session:
+            # Bulk deletes (retention, GDPR erasure) rely on ON DELETE CASCADE
+            await session.execute(delete(ImpactCard).where(ImpactCard.id == card_id))
+            await session.commit()
+
+            assert await session.get(ImpactCardPayload, card_id) is None
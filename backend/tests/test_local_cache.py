@@ -0,0 +1,198 @@
+"""
+Tests for the L1/L2 cache tiers of the advanced cache manager
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services import advanced_cache_manager as acm
+from app.services.advanced_cache_manager import AdvancedCacheManager, CacheType
+from app.services.local_cache import LocalCacheTier, should_refresh_early
+
+
+@pytest.fixture(autouse=True)
+def reset_process_tiers():
+    """L1 tiers and counters are process-wide, so isolate each test."""
+    acm.PROCESS_L1_TIERS.clear()
+    acm.PROCESS_TIER_COUNTERS.clear()
+    acm.PROCESS_RECOMPUTE_SECONDS.clear()
+    yield
+    acm.PROCESS_L1_TIERS.clear()
+    acm.PROCESS_TIER_COUNTERS.clear()
+    acm.PROCESS_RECOMPUTE_SECONDS.clear()
+
+
+@pytest.fixture
+async def fake_redis():
+    """Binary in-memory Redis; skipped when fakeredis is not installed."""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis(decode_responses=False)
+    yield client
+    await client.flushall()
+    await client.close()
+
+
+class TestLocalCacheTier:
+    """Test LRU, byte budget and TTL behaviour of the L1 tier."""
+
+    def test_evicts_least_recently_used_to_stay_within_budget(self):
+        tier = LocalCacheTier(max_bytes=300, ttl_seconds=60)
+        tier.set("a", 1, 100)
+        tier.set("b", 2, 100)
+        tier.set("c", 3, 100)
+
+        assert tier.get("a").value == 1  # "b" is now least recently used
+        tier.set("d", 4, 100)
+
+        assert "b" not in tier
+        assert "a" in tier and "c" in tier and "d" in tier
+        assert tier.current_bytes == 300
+        assert tier.stats["evictions"] == 1
+
+    def test_rejects_values_larger_than_budget_and_replaces_sizes(self):
+        tier = LocalCacheTier(max_bytes=100, ttl_seconds=60)
+        assert tier.set("big", "x", 101) is False
+
+        tier.set("k", "v1", 40)
+        tier.set("k", "v2", 60)
+        assert tier.get("k").value == "v2"
+        assert tier.current_bytes == 60
+
+    def test_entries_expire(self):
+        tier = LocalCacheTier(max_bytes=1000, ttl_seconds=10)
+        with patch("app.services.local_cache.time.monotonic", return_value=100.0):
+            tier.set("short", 1, 10, ttl_seconds=1)
+            tier.set("long", 2, 10)
+
+        with patch("app.services.local_cache.time.monotonic", return_value=105.0):
+            assert tier.get("short") is None
+            assert tier.get("long").value == 2
+
+        with patch("app.services.local_cache.time.monotonic", return_value=111.0):
+            tier.set("new", 3, 10)
+            # Expired entries are purged on insert
+            assert "long" not in tier
+            assert tier.current_bytes == 10
+
+    def test_short_ttl_entries_written_after_long_ones_are_purged(self):
+        tier = LocalCacheTier(max_bytes=1000, ttl_seconds=60)
+        with patch("app.services.local_cache.time.monotonic", return_value=100.0):
+            tier.set("long", 1, 10)
+            tier.set("short", 2, 10, ttl_seconds=1)
+            tier.set("short", 3, 10, ttl_seconds=30)  # replaced, so its first expiry is stale
+
+        with patch("app.services.local_cache.time.monotonic", return_value=105.0):
+            tier.set("new", 4, 10)
+            assert "short" in tier
+
+        with patch("app.services.local_cache.time.monotonic", return_value=131.0):
+            tier.set("newer", 5, 10)
+            assert "short" not in tier
+            assert "long" in tier and "new" in tier
+            assert tier.stats["expirations"] == 1
+            assert tier.current_bytes == 30
+
+    def test_expiry_heap_stays_bounded_under_overwrites(self):
+        tier = LocalCacheTier(max_bytes=1000, ttl_seconds=60)
+        for n in range(1000):
+            tier.set("hot", n, 10)
+
+        assert len(tier) == 1
+        assert len(tier._expiry_heap) <= 2 * len(tier) + 65
+
+    def test_clear_by_pattern(self):
+        tier = LocalCacheTier(max_bytes=1000, ttl_seconds=60)
+        tier.set("template:1", 1, 10)
+        tier.set("template:2", 2, 10)
+        tier.set("sector:x", 3, 10)
+
+        assert tier.clear("template:*") == 2
+        assert len(tier) == 1
+
+
+class TestEarlyRefresh:
+    """Test the probabilistic early expiration decision."""
+
+    def test_refresh_probability_rises_towards_expiry(self):
+        with patch("app.services.local_cache.random.random", return_value=0.5):
+            # -ln(0.5) * 1s ~= 0.69s of look-ahead
+            assert should_refresh_early(100.0, 1.0, now=90.0) is False
+            assert should_refresh_early(100.0, 1.0, now=99.5) is True
+
+    def test_never_refreshes_without_expiry_or_recompute_cost(self):
+        assert should_refresh_early(None, 1.0) is False
+        assert should_refresh_early(100.0, 0.0, now=99.99) is False
+
+
+class TestAdvancedCacheManagerTiers:
+    """Test read-through behaviour across L1 and L2."""
+
+    @pytest.mark.asyncio
+    async def test_l1_then_l2_hits_feed_statistics(self, fake_redis):
+        loader = AsyncMock(return_value={"trend_direction": "up"})
+
+        worker_a = AdvancedCacheManager(MagicMock())
+        worker_a.redis_client = fake_redis
+        assert await worker_a._get_or_load(CacheType.TREND_ANALYSIS, "k", loader) == {"trend_direction": "up"}
+        assert await worker_a._get_or_load(CacheType.TREND_ANALYSIS, "k", loader) == {"trend_direction": "up"}
+
+        # Another process has a cold L1 but shares Redis
+        acm.PROCESS_L1_TIERS.clear()
+        worker_b = AdvancedCacheManager(MagicMock())
+        worker_b.redis_client = fake_redis
+        assert await worker_b._get_or_load(CacheType.TREND_ANALYSIS, "k", loader) == {"trend_direction": "up"}
+
+        assert loader.await_count == 1
+        tiers = worker_b._get_tier_statistics()["trend_analysis"]
+        assert tiers["misses"] == 1
+        assert tiers["l1_hits"] == 1
+        assert tiers["l2_hits"] == 1
+        assert tiers["l1_hit_ratio"] == pytest.approx(1 / 3, abs=1e-3)
+        assert tiers["l1"]["entries"] == 1
+
+        stats = await worker_a.get_cache_statistics()
+        assert stats["cache_stats"]["trend_analysis"]["l1_hit_count"] == 1
+        assert stats["tiers"]["trend_analysis"]["l2_hit_ratio"] == pytest.approx(1 / 3, abs=1e-3)
+
+    @pytest.mark.asyncio
+    async def test_works_without_redis_and_invalidates_l1(self):
+        manager = AdvancedCacheManager(MagicMock())
+        loader = AsyncMock(return_value=[1, 2, 3])
+
+        await manager._get_or_load(CacheType.BENCHMARK_RESULTS, "benchmark:x", loader)
+        await manager._get_or_load(CacheType.BENCHMARK_RESULTS, "benchmark:x", loader)
+        assert loader.await_count == 1
+
+        await manager.invalidate_cache(CacheType.BENCHMARK_RESULTS, "benchmark:*")
+        await manager._get_or_load(CacheType.BENCHMARK_RESULTS, "benchmark:x", loader)
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_early_refresh_serves_cached_value(self):
+        manager = AdvancedCacheManager(MagicMock())
+        await manager._get_or_load(CacheType.SENTIMENT_TRENDS, "k", AsyncMock(return_value=["cached"]))
+
+        failing = AsyncMock(side_effect=RuntimeError("db down"))
+        with patch("app.services.advanced_cache_manager.should_refresh_early", return_value=True):
+            result = await manager._get_or_load(CacheType.SENTIMENT_TRENDS, "k", failing)
+
+        assert result == ["cached"]
+        failing.assert_awaited_once()
+        assert acm.PROCESS_TIER_COUNTERS[CacheType.SENTIMENT_TRENDS]["early_refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_l1_hits_return_private_copies(self):
+        manager = AdvancedCacheManager(MagicMock())
+        loaded = {"scores": [1, 2]}
+        loader = AsyncMock(return_value=loaded)
+
+        first = await manager._get_or_load(CacheType.BENCHMARK_RESULTS, "k", loader)
+        first["scores"].append(3)
+        loaded["scores"].append(4)
+        second = await manager._get_or_load(CacheType.BENCHMARK_RESULTS, "k", loader)
+        second["scores"].clear()
+        third = await manager._get_or_load(CacheType.BENCHMARK_RESULTS, "k", loader)
+
+        assert loader.await_count == 1
+        assert acm.PROCESS_TIER_COUNTERS[CacheType.BENCHMARK_RESULTS]["l1_hits"] == 2
+        assert third == {"scores": [1, 2]}
@@ -0,0 +1,97 @@
+"""
+Tests for the buffered, time-bucketed metric sample storage in Redis
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.performance_monitor import MetricsCollector
+
+
+@pytest.fixture
+async def redis_client():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.close()
+
+
+def make_collector(redis_client, worker_id="host-a:1"):
+    collector = MetricsCollector()
+    collector.redis_client = redis_client
+    collector.worker_id = worker_id
+    return collector
+
+
+class TestMetricSeriesStorage:
+    """Test buffered writes, bounded range reads and trimming."""
+
+    @pytest.mark.asyncio
+    async def test_samples_are_buffered_until_one_pipelined_flush(self, redis_client):
+        collector = make_collector(redis_client)
+        for value in range(50):
+            await collector.record_metric("api_latency_news", float(value), {"api": "news"})
+
+        series_key = collector._series_key("api_latency_news")
+        assert await redis_client.exists(series_key) == 0
+
+        # ZADD + 2 trims + EXPIRE for the series, HSET + EXPIRE for the sketch window
+        assert await collector.flush() == 6
+        # Samples recorded within the same second no longer overwrite each other
+        assert await redis_client.zcard(series_key) == 50
+        assert await redis_client.ttl(series_key) > 0
+        assert collector.flush_stats["samples_written"] == 50
+        assert await collector.flush() == 0
+
+    @pytest.mark.asyncio
+    async def test_get_metrics_reads_a_bounded_range_from_redis(self, redis_client):
+        writer = make_collector(redis_client)
+        await writer.record_metric("route_latency_fast", 1.0)
+        await writer.record_metric("route_latency_fast", 2.0, {"complexity": "low"})
+        # An old sample outside the requested window
+        await redis_client.zadd(
+            writer._series_key("route_latency_fast"),
+            {'{"value": 99.0, "timestamp": "2020-01-01T00:00:00", "metadata": {}, "id": "old"}': time.time() - 1800}
+        )
+        await writer.flush()
+
+        # A fresh worker has nothing in memory and falls back to Redis
+        reader = make_collector(redis_client, "host-b:2")
+        metrics = await reader.get_metrics("route_latency_fast", duration_minutes=10)
+
+        assert [metric.value for metric in metrics] == [1.0, 2.0]
+        assert metrics[1].metadata == {"complexity": "low"}
+        assert len(await reader.get_metrics("route_latency_fast", duration_minutes=60)) == 3
+
+    @pytest.mark.asyncio
+    async def test_series_is_trimmed_to_max_samples(self, redis_client):
+        collector = make_collector(redis_client)
+        collector.series_max_samples = 10
+        for value in range(25):
+            await collector.record_metric("cache_hit_rate", value / 25)
+        await collector.flush()
+
+        members = await redis_client.zrange(collector._series_key("cache_hit_rate"), 0, -1)
+        assert len(members) == 10
+        assert '"value": 0.96' in members[-1]
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_samples_for_the_next_attempt(self, redis_client):
+        collector = make_collector(redis_client)
+        await collector.record_metric("impact_card_generation_time", 12.0)
+
+        broken = MagicMock()
+        broken.pipeline.return_value.execute.side_effect = RedisConnectionError("down")
+        collector.redis_client = broken
+        assert await collector.flush() == 0
+        assert collector.flush_stats["failures"] == 1
+
+        await collector.record_metric("impact_card_generation_time", 13.0)
+        collector.redis_client = redis_client
+        await collector.flush()
+
+        series_key = collector._series_key("impact_card_generation_time")
+        assert await redis_client.zcard(series_key) == 2
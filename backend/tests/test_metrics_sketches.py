@@ -0,0 +1,102 @@
+"""
+Tests for per-window latency sketches in the performance monitor
+"""
+
+import time
+
+import pytest
+
+from app.services.performance_monitor import MetricsCollector
+
+
+@pytest.fixture
+def redis_server():
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeServer()
+
+
+def make_collector(redis_server, worker_id):
+    import fakeredis
+
+    collector = MetricsCollector()
+    collector.redis_client = fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=True)
+    collector.worker_id = worker_id
+    return collector
+
+
+class TestMetricSketches:
+    """Test streaming aggregation, Redis persistence and cross-worker merging."""
+
+    @pytest.mark.asyncio
+    async def test_aggregates_come_from_the_sketch(self):
+        collector = MetricsCollector()
+        collector.redis_client = None
+        for value in range(1, 1001):
+            await collector.record_metric("api_latency_news", float(value))
+
+        aggregated = await collector.get_aggregated_metrics("api_latency_news", 60)
+
+        assert aggregated["count"] == 1000
+        assert aggregated["avg"] == pytest.approx(500.5)
+        assert (aggregated["min"], aggregated["max"]) == (1.0, 1000.0)
+        assert aggregated["p95"] == pytest.approx(950, rel=0.02)
+        assert aggregated["p99"] == pytest.approx(990, rel=0.02)
+
+    @pytest.mark.asyncio
+    async def test_empty_metric_returns_zeros(self):
+        collector = MetricsCollector()
+        collector.redis_client = None
+        assert (await collector.get_aggregated_metrics("missing"))["count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_sketches_merge_across_workers_through_redis(self, redis_server):
+        first = make_collector(redis_server, "host-a:1")
+        second = make_collector(redis_server, "host-b:2")
+        try:
+            now = time.time()
+            for value in range(1, 501):
+                first._add_to_sketch("route_latency_fast", float(value), now)
+            for value in range(501, 1001):
+                second._add_to_sketch("route_latency_fast", float(value), now)
+
+            assert await first.flush() == 2
+            assert await second.flush() == 2
+            # Re-flushing overwrites this worker's field instead of double counting
+            first._dirty_windows.add(("route_latency_fast", first._window_start(now)))
+            assert await first.flush() == 2
+
+            window_key = first._sketch_key("route_latency_fast", first._window_start(now))
+            assert set(await first.redis_client.hkeys(window_key)) == {"host-a:1", "host-b:2"}
+
+            aggregated = await first.get_aggregated_metrics("route_latency_fast", 5)
+            assert aggregated["count"] == 1000
+            assert aggregated["p95"] == pytest.approx(950, rel=0.02)
+            assert aggregated["max"] == 1000.0
+        finally:
+            await first.redis_client.close()
+            await second.redis_client.close()
+
+    @pytest.mark.asyncio
+    async def test_own_unflushed_samples_are_not_double_counted(self, redis_server):
+        collector = make_collector(redis_server, "host-a:1")
+        try:
+            now = time.time()
+            collector._add_to_sketch("cache_hit_rate", 0.5, now)
+            await collector.flush()
+            collector._add_to_sketch("cache_hit_rate", 0.7, now)
+
+            assert (await collector.get_aggregated_metrics("cache_hit_rate", 5))["count"] == 2
+        finally:
+            await collector.redis_client.close()
+
+    def test_windows_past_retention_are_dropped(self):
+        collector = MetricsCollector()
+        collector.sketch_window_seconds = 60
+        collector.sketch_retention_seconds = 600
+        now = time.time()
+
+        collector._add_to_sketch("impact_card_generation_time", 1.0, now - 3600)
+        collector._add_to_sketch("impact_card_generation_time", 2.0, now)
+
+        assert list(collector.sketches["impact_card_generation_time"]) == [collector._window_start(now)]
+        assert len(collector._dirty_windows) == 1
@@ -0,0 +1,320 @@
+"""
+Tests for vectorized batch inference
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.models.ml_training import TrainingJob
+from app.services import ml_batch_inference
+from app.services.ml_batch_inference import (
+    BatchInferenceEngine,
+    InferenceItem,
+    ModelBundleCache,
+    NoModelAvailable,
+    UnencodableFeature,
+    build_feature_matrix,
+    load_model_bundle,
+)
+from app.services import ml_performance_optimizer
+from app.services.ml_performance_optimizer import BatchRequest, MLBatchProcessor, MLPerformanceOptimizer
+from app.services.ml_prediction_service import PredictionRequest, PredictionResult, PredictionType
+from app.services.ml_training_service import feature_encoders_path, preprocess_features
+
+FEATURES = ["score", "sources", "age_hours"]
+
+
+@pytest.fixture
+def model_files(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((200, 3)), columns=FEATURES)
+    y = (X["score"] > 0.5).astype(int)
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(scaler.transform(X), y)
+
+    model_path, scaler_path = tmp_path / "impact_v1.joblib", tmp_path / "impact_v1_scaler.joblib"
+    joblib.dump(model, model_path)
+    joblib.dump(scaler, scaler_path)
+    return str(model_path), str(scaler_path)
+
+
+@pytest.fixture
+async def session_factory(model_files, tmp_path, monkeypatch, sqlite_engine):
+    """Sessions on a database whose latest impact classifier is the `model_files` model"""
+    monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+    (tmp_path / "ml_models").mkdir()
+    (tmp_path / "ml_scalers").mkdir()
+    (tmp_path / "impact_v1.joblib").rename(tmp_path / "ml_models" / "impact_v1.joblib")
+    (tmp_path / "impact_v1_scaler.joblib").rename(tmp_path / "ml_scalers" / "impact_v1_scaler.joblib")
+
+    engine = await sqlite_engine(TrainingJob)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        db.add(TrainingJob(
+            job_id="job-1", model_type="impact_classifier", trigger_type="manual", status="completed",
+            new_model_version="impact_v1", completed_at=datetime.now(timezone.utc)
+        ))
+        await db.commit()
+    return factory
+
+
+@pytest.fixture
+async def optimizer(session_factory):
+    async with session_factory() as db:
+        optimizer = MLPerformanceOptimizer(db)
+        optimizer.inference_engine = BatchInferenceEngine(ModelBundleCache())
+        yield optimizer
+
+
+def make_items(rows):
+    loop = asyncio.get_running_loop()
+    return [
+        InferenceItem(SimpleNamespace(entity_id=f"card-{i}", features=row), loop.create_future())
+        for i, row in enumerate(rows)
+    ]
+
+
+class TestFeatureMatrix:
+    """Test stacking feature dicts into a matrix."""
+
+    def test_columns_follow_scaler_order_and_fill_missing_with_zero(self):
+        matrix = build_feature_matrix(
+            [{"sources": 3, "score": 0.5, "unknown": 9}, {"age_hours": "12"}, None, {"score": None}],
+            FEATURES,
+        )
+
+        assert matrix.shape == (4, 3)
+        np.testing.assert_array_equal(matrix[0], [0.5, 3.0, 0.0])
+        np.testing.assert_array_equal(matrix[1], [0.0, 0.0, 12.0])
+        np.testing.assert_array_equal(matrix[2], [0.0, 0.0, 0.0])
+        np.testing.assert_array_equal(matrix[3], [0.0, 0.0, 0.0])
+
+    def test_categorical_values_use_the_training_encoders(self, tmp_path):
+        X = pd.DataFrame({"score": [0.1, 0.9, 0.5], "category": ["pricing", "product", "funding"]})
+        encoders = {}
+        encoded = preprocess_features(X, encoders)
+        scaler = StandardScaler().fit(encoded)
+        model = RandomForestClassifier(n_estimators=2, random_state=0).fit(scaler.transform(encoded), [0, 1, 0])
+        scaler_path = str(tmp_path / "cat_v1_scaler.joblib")
+        joblib.dump(model, tmp_path / "cat_v1.joblib")
+        joblib.dump(scaler, scaler_path)
+        joblib.dump(encoders, feature_encoders_path(scaler_path))
+
+        bundle = load_model_bundle("cat_v1", str(tmp_path / "cat_v1.joblib"), scaler_path)
+        matrix = build_feature_matrix(
+            [{"score": 0.9, "category": "product"}, {"category": "funding"}], bundle.feature_names, bundle.encoders
+        )
+
+        np.testing.assert_array_equal(matrix, encoded.iloc[[1, 2]].assign(score=[0.9, 0.0]).to_numpy())
+        with pytest.raises(UnencodableFeature):
+            build_feature_matrix([{"category": "partnership"}], bundle.feature_names, bundle.encoders)
+
+    def test_non_numeric_values_are_not_silently_zeroed(self):
+        with pytest.raises(UnencodableFeature):
+            build_feature_matrix([{"score": "pricing"}], FEATURES)
+
+
+class TestBatchInferenceEngine:
+    """Test one inference call per batch and fan-out to futures."""
+
+    @pytest.mark.asyncio
+    async def test_one_predict_call_serves_the_whole_batch(self, model_files):
+        engine = BatchInferenceEngine(ModelBundleCache(max_bundles=2))
+        bundle = await engine.bundles.get("impact_v1", *model_files)
+        rows = [{"score": s, "sources": 2, "age_hours": 1.0} for s in np.linspace(0, 1, 40)]
+        items = make_items(rows)
+
+        with patch.object(bundle.model, "predict_proba", wraps=bundle.model.predict_proba) as predict_proba:
+            latency_ms = await engine.run(bundle, "impact_classification", items)
+
+        assert predict_proba.call_count == 1
+        assert predict_proba.call_args.args[0].shape == (40, 3)
+        assert latency_ms is not None
+
+        expected = bundle.model.predict(bundle.scaler.transform(pd.DataFrame(rows, columns=FEATURES)))
+        results = [item.future.result() for item in items]
+        assert [r.predicted_value for r in results] == expected.tolist()
+        assert all(0.5 <= r.confidence_score <= 1.0 for r in results)
+        assert {r.batch_size for r in results} == {40}
+        assert results[7].entity_id == "card-7"
+        assert engine.get_stats()["rows"] == 40
+
+    @pytest.mark.asyncio
+    async def test_regressors_report_no_confidence(self, tmp_path):
+        X = pd.DataFrame(np.random.default_rng(1).random((50, 3)), columns=FEATURES)
+        scaler = StandardScaler().fit(X)
+        model = GradientBoostingRegressor(n_estimators=5).fit(scaler.transform(X), X["score"])
+        joblib.dump(model, tmp_path / "risk.joblib")
+        joblib.dump(scaler, tmp_path / "risk_scaler.joblib")
+
+        engine = BatchInferenceEngine(ModelBundleCache())
+        bundle = await engine.bundles.get("risk_v1", str(tmp_path / "risk.joblib"), str(tmp_path / "risk_scaler.joblib"))
+        items = make_items([{"score": 0.9}, {"score": 0.1}])
+        await engine.run(bundle, "risk_scoring", items)
+
+        results = [item.future.result() for item in items]
+        assert all(r.confidence_score is None for r in results)
+        assert results[0].predicted_value > results[1].predicted_value
+
+    @pytest.mark.asyncio
+    async def test_inference_errors_fail_every_future(self, model_files):
+        engine = BatchInferenceEngine(ModelBundleCache())
+        bundle = await engine.bundles.get("impact_v1", *model_files)
+        items = make_items([{"score": 1.0}, {"score": 0.0}])
+
+        with patch.object(bundle.model, "predict_proba", side_effect=RuntimeError("boom")):
+            assert await engine.run(bundle, "impact_classification", items) is None
+
+        for item in items:
+            with pytest.raises(RuntimeError, match="boom"):
+                item.future.result()
+        assert engine.get_stats()["failed_batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_version_lookup_is_cached_for_the_ttl(self):
+        engine = BatchInferenceEngine(ModelBundleCache(), version_ttl_seconds=60)
+        lookup = AsyncMock(return_value="impact_v1")
+
+        assert await engine.resolve_version("impact_classifier", lookup) == "impact_v1"
+        assert await engine.resolve_version("impact_classifier", lookup) == "impact_v1"
+        lookup.assert_awaited_once()
+
+
+class TestModelBundleCache:
+    """Test resident models keyed by version."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_cold_loads_share_one_load(self, model_files):
+        cache = ModelBundleCache(max_bundles=2)
+
+        with patch.object(ml_batch_inference, "load_model_bundle", wraps=load_model_bundle) as loader:
+            bundles = await asyncio.gather(*(cache.get("impact_v1", *model_files) for _ in range(5)))
+            await cache.get("impact_v1", *model_files)
+
+        assert loader.call_count == 1
+        assert all(bundle is bundles[0] for bundle in bundles)
+        assert bundles[0].feature_names == FEATURES
+        assert cache.get_stats()["loads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_version_is_evicted(self, model_files):
+        cache = ModelBundleCache(max_bundles=2)
+        for version in ("v1", "v2", "v1", "v3"):
+            await cache.get(version, *model_files)
+
+        assert cache.get_stats()["resident"] == ["v1", "v3"]
+        assert cache.get_stats()["evictions"] == 1
+
+
+class TestOptimizerBatchPath:
+    """Test MLPerformanceOptimizer._process_batch end to end against a trained model on disk."""
+
+    @staticmethod
+    def make_batch(rows):
+        loop = asyncio.get_running_loop()
+        requests = [
+            PredictionRequest(f"card-{i}", "impact_card", PredictionType.IMPACT_CLASSIFICATION, features=row)
+            for i, row in enumerate(rows)
+        ]
+        return BatchRequest(
+            requests=requests, batch_id="b", priority=1, submitted_at=datetime.now(timezone.utc),
+            futures=[loop.create_future() for _ in requests]
+        )
+
+    @pytest.mark.asyncio
+    async def test_batched_requests_resolve_to_prediction_results(self, optimizer):
+        batches = [
+            self.make_batch([{"score": 0.9, "sources": 2, "age_hours": 1.0}] * 3),
+            self.make_batch([{"score": 0.1, "sources": 2, "age_hours": 1.0}] * 2),
+        ]
+
+        await optimizer._process_batch(batches)
+
+        results = [result for batch in batches for result in await batch]
+        assert all(isinstance(result, PredictionResult) for result in results)
+        assert [result.predicted_value for result in results] == [1, 1, 1, 0, 0]
+        assert {result.model_version for result in results} == {"impact_v1"}
+        assert results[0].prediction_type == PredictionType.IMPACT_CLASSIFICATION
+        assert results[4].metadata["batch_size"] == 5
+        assert optimizer.inference_engine.get_stats()["batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_single_optimized_prediction_matches_the_batched_type(self, optimizer):
+        request = PredictionRequest("card-1", "impact_card", PredictionType.IMPACT_CLASSIFICATION,
+                                    features={"score": 0.9, "sources": 2, "age_hours": 1.0})
+
+        result = await optimizer.predict_optimized(request)
+
+        assert isinstance(result, PredictionResult)
+        assert result.predicted_value == 1 and result.entity_id == "card-1"
+
+    @pytest.mark.asyncio
+    async def test_requests_the_model_cannot_encode_fail_with_no_model_available(self, optimizer):
+        batch = self.make_batch([
+            {"score": 0.9, "sources": 2, "age_hours": 1.0},
+            {"score": "high", "sources": 2, "age_hours": 1.0},
+        ])
+
+        await optimizer._process_batch([batch])
+
+        results = await batch
+        assert isinstance(results[0], PredictionResult)
+        assert isinstance(results[1], NoModelAvailable)
+        assert "card-1" in str(results[1])
+        with pytest.raises(NoModelAvailable, match="impact_v1"):
+            await optimizer.predict_optimized(batch.requests[1])
+
+    @pytest.mark.asyncio
+    async def test_prediction_types_without_a_model_fail_with_no_model_available(self, optimizer):
+        request = PredictionRequest("card-1", "impact_card", PredictionType.RISK_SCORING, features={"score": 0.9})
+        batch = BatchRequest(
+            requests=[request], batch_id="b", priority=1, submitted_at=datetime.now(timezone.utc),
+            futures=[asyncio.get_running_loop().create_future()]
+        )
+
+        await optimizer._process_batch([batch])
+
+        assert isinstance((await batch)[0], NoModelAvailable)
+        with pytest.raises(NoModelAvailable, match="risk_scoring"):
+            await optimizer.predict_optimized(request)
+
+    @pytest.mark.asyncio
+    async def test_submitted_batches_run_on_the_process_wide_processor_with_their_own_session(
+        self, session_factory, monkeypatch
+    ):
+        sessions = []
+
+        def tracking_factory():
+            session = session_factory()
+            sessions.append(session)
+            return session
+
+        processor = MLBatchProcessor(session_factory=tracking_factory, max_wait_ms=10)
+        monkeypatch.setattr(ml_performance_optimizer, "ml_batch_processor", processor)
+        monkeypatch.setattr(ml_performance_optimizer, "batch_inference_engine", BatchInferenceEngine(ModelBundleCache()))
+        await processor.start()
+
+        async with session_factory() as request_db:
+            batches = [
+                await MLPerformanceOptimizer(request_db).submit_batch_request(batch.requests)
+                for batch in (self.make_batch([{"score": 0.9}] * 2), self.make_batch([{"score": 0.1}]))
+            ]
+        # The request sessions are closed; the processor opens its own
+        results = [result for batch in batches for result in await batch]
+        await processor.stop()
+
+        assert all(isinstance(result, PredictionResult) for result in results)
+        assert len(sessions) == 1 and request_db not in sessions
+        assert processor.get_stats()["batches"] == 1
+        assert not processor.running
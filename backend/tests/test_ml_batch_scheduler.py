@@ -0,0 +1,121 @@
+"""
+Tests for the asyncio priority batching scheduler
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.ml_batch_scheduler import PriorityBatchScheduler
+
+
+class Recorder:
+    """process_batch stand-in that records every batch it receives"""
+
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.delay = delay
+
+    async def __call__(self, batch):
+        self.batches.append(list(batch))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+
+@pytest.fixture
+async def recorder_scheduler():
+    recorder = Recorder()
+    scheduler = PriorityBatchScheduler(recorder, max_batch_size=4, max_wait_ms=50, name="test")
+    yield recorder, scheduler
+    await scheduler.stop(drain=False)
+
+
+class TestPriorityBatchScheduler:
+    """Test flushing, fairness and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting_for_deadline(self, recorder_scheduler):
+        recorder, scheduler = recorder_scheduler
+        scheduler.max_wait_ms = 10_000
+        scheduler.start()
+
+        started = time.monotonic()
+        for i in range(4):
+            scheduler.submit(i)
+        while not recorder.batches:
+            await asyncio.sleep(0.001)
+
+        assert time.monotonic() - started < 1
+        assert recorder.batches == [[0, 1, 2, 3]]
+        assert scheduler.get_stats()["flush_reasons"]["full"] == 1
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushes_at_deadline(self, recorder_scheduler):
+        recorder, scheduler = recorder_scheduler
+        scheduler.start()
+
+        started = time.monotonic()
+        scheduler.submit("a")
+        scheduler.submit("b")
+        while not recorder.batches:
+            await asyncio.sleep(0.005)
+
+        assert time.monotonic() - started >= 0.045
+        assert recorder.batches == [["a", "b"]]
+        stats = scheduler.get_stats()
+        assert stats["flush_reasons"]["deadline"] == 1
+        assert stats["avg_batch_fill"] == pytest.approx(0.5)
+        assert stats["queue_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_event_loop_is_not_blocked_while_idle(self, recorder_scheduler):
+        _, scheduler = recorder_scheduler
+        scheduler.start()
+
+        ticks = 0
+        deadline = time.monotonic() + 0.2
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+        # The old loop blocked for up to batch_timeout_ms per iteration
+        assert ticks > 20
+
+    def test_weighted_round_robin_does_not_starve_low_priority(self):
+        scheduler = PriorityBatchScheduler(Recorder(), max_batch_size=8, fairness_base=4)
+        for i in range(20):
+            scheduler.submit(f"high-{i}", priority=0)
+        for i in range(5):
+            scheduler.submit(f"low-{i}", priority=5)
+
+        batch = [entry.item for entry in scheduler._take_batch()]
+
+        # Round 1: 4 high + 2 low, round 2 fills the remaining slots with high
+        assert batch == ["high-0", "high-1", "high-2", "high-3", "low-0", "low-1", "high-4", "high-5"]
+
+    def test_batch_size_counts_rows_and_oversized_entries_go_alone(self):
+        scheduler = PriorityBatchScheduler(Recorder(), max_batch_size=4, size_of=len)
+        scheduler.submit(["a"] * 6)
+        scheduler.submit(["b"] * 2)
+        scheduler.submit(["c"] * 2)
+
+        assert [len(entry.item) for entry in scheduler._take_batch()] == [6]
+        assert [len(entry.item) for entry in scheduler._take_batch()] == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_queued_items(self):
+        recorder = Recorder()
+        scheduler = PriorityBatchScheduler(recorder, max_batch_size=2, max_wait_ms=10_000)
+        scheduler.start()
+        for i in range(3):
+            scheduler.submit(i)
+        await asyncio.sleep(0.01)
+
+        await scheduler.stop()
+
+        assert [item for batch in recorder.batches for item in batch] == [0, 1, 2]
+        stats = scheduler.get_stats()
+        assert stats["running"] is False
+        assert stats["flush_reasons"]["shutdown"] == 1
+        assert stats["max_queue_depth"] == 3
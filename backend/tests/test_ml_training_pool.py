@@ -0,0 +1,159 @@
+"""
+Tests for running model training in a process pool
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.ml_training_pool import TrainingCancelled, TrainingProcessPool
+from app.services.ml_training_service import MLTrainingService, ModelType
+
+
+def busy_job(context, seconds):
+    """CPU-bound stand-in for model.fit that checks for cancellation."""
+    context.report(0.5, "fitting")
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        context.check_cancelled()
+        sum(range(10000))
+    context.report(0.9, "saving")
+    return {"done": True}
+
+
+def failing_job(context):
+    raise ValueError("bad hyperparameters")
+
+
+@pytest.fixture
+async def pool():
+    training_pool = TrainingProcessPool(max_workers=1, start_method="fork", poll_interval=0.05)
+    yield training_pool
+    await training_pool.shutdown()
+
+
+class TestTrainingProcessPool:
+    """Test progress, cancellation and the concurrency limit."""
+
+    @pytest.mark.asyncio
+    async def test_runs_job_off_the_event_loop_and_forwards_progress(self, pool):
+        progress = []
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        async def on_progress(value, stage):
+            progress.append((value, stage))
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            result = await pool.run("job-1", busy_job, 0.5, on_progress=on_progress)
+        finally:
+            ticker_task.cancel()
+
+        assert result == {"done": True}
+        assert progress[-1] == (0.9, "saving")
+        # The loop kept serving other work while the job was busy
+        assert ticks >= 10
+        assert pool.get_stats()["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancel_request_stops_running_job(self, pool):
+        started = time.monotonic()
+        should_cancel = AsyncMock(side_effect=lambda: time.monotonic() - started > 0.2)
+
+        with pytest.raises(TrainingCancelled):
+            await pool.run("job-2", busy_job, 30, should_cancel=should_cancel)
+
+        assert time.monotonic() - started < 10
+        assert pool.get_stats()["cancelled"] == 1
+        assert pool.get_stats()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_stops_the_worker(self, pool):
+        task = asyncio.create_task(pool.run("job-c", busy_job, 30))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # The slot is held until the worker stops, then the next job gets the worker
+        assert pool.get_stats()["running"] == 1
+        assert await asyncio.wait_for(pool.run("job-d", busy_job, 0.1), timeout=10) == {"done": True}
+        stats = pool.get_stats()
+        assert stats["cancelled"] == 1
+        assert stats["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_queues_extra_jobs(self, pool):
+        first = asyncio.create_task(pool.run("job-a", busy_job, 0.3))
+        second = asyncio.create_task(pool.run("job-b", busy_job, 0.1))
+        await asyncio.sleep(0.1)
+
+        stats = pool.get_stats()
+        assert stats["running"] == 1
+        assert stats["queued"] == 1
+
+        # Queued jobs have no worker to signal yet; should_cancel is checked when they start
+        assert pool.cancel("job-b") is False
+        assert await first == {"done": True}
+        assert await second == {"done": True}
+
+    @pytest.mark.asyncio
+    async def test_worker_errors_propagate(self, pool):
+        with pytest.raises(ValueError, match="bad hyperparameters"):
+            await pool.run("job-3", failing_job)
+        assert pool.get_stats()["failed"] == 1
+
+
+class TestTrainingServiceUsesPool:
+    """Test that MLTrainingService trains through the process pool."""
+
+    @pytest.mark.asyncio
+    async def test_train_model_fits_in_worker_and_saves_artifacts(self, pool, tmp_path):
+        service = MLTrainingService(MagicMock())
+        service.model_storage_path = str(tmp_path)
+        service.scalers_storage_path = str(tmp_path)
+        service.training_configs[ModelType.IMPACT_CLASSIFIER].hyperparameters["n_estimators"] = 5
+
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame({
+            "score": rng.random(120),
+            "sources": rng.integers(0, 10, 120),
+            "category": rng.choice(["pricing", "product"], 120),
+        })
+        data["target"] = (data["score"] > 0.5).astype(float)
+
+        with patch("app.services.ml_training_service.training_process_pool", pool), \
+                patch.object(service, "_store_performance_metrics", new=AsyncMock()) as store, \
+                patch.object(service, "_update_job_progress", new=AsyncMock()) as update_progress, \
+                patch.object(service, "_is_cancel_requested", new=AsyncMock(return_value=False)):
+            result = await service._train_model(ModelType.IMPACT_CLASSIFIER, data, "impact_v_test", job_id="job-x")
+
+        assert result.success, result.error_message
+        assert result.performance_metrics["accuracy"] > 0.5
+        assert (tmp_path / "impact_v_test.joblib").exists()
+        assert (tmp_path / "impact_v_test_scaler.joblib").exists()
+        store.assert_awaited_once()
+        assert update_progress.await_args_list[-1].args[1:] == (0.9, "saving")
+
+    @pytest.mark.asyncio
+    async def test_cancelled_training_is_reported_as_cancelled(self, pool, tmp_path):
+        service = MLTrainingService(MagicMock())
+
+        with patch("app.services.ml_training_service.training_process_pool", pool), \
+                patch.object(service, "_is_cancel_requested", new=AsyncMock(return_value=True)):
+            result = await service._train_model(
+                ModelType.IMPACT_CLASSIFIER, pd.DataFrame({"x": [1], "target": [1]}), "v", job_id="job-y"
+            )
+
+        assert result.cancelled is True
+        assert result.success is False
@@ -79,7 +79,9 @@ class TestImpactCardModel:
         )
         db_session.add(impact_card)
         await db_session.commit()
-        await db_session.refresh(impact_card)
+        # Detail columns are deferred and raw_data lives in impact_card_payloads
+        await db_session.refresh(impact_card, ["impact_areas", "key_insights", "recommended_actions",
+                                               "total_sources", "source_breakdown", "api_usage", "payload"])
 
         assert impact_card.impact_areas == []
         assert impact_card.key_insights == []
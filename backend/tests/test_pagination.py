@@ -0,0 +1,206 @@
+"""
+Tests for keyset pagination, counts and field projection on list endpoints
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.impact import get_impact_cards, get_impact_cards_for_watch
+from app.api.research import get_company_research
+from app.api.watch import get_watch_items
+from app.models.company_research import CompanyResearch
+from app.models.impact_card import ImpactCard, ImpactCardPayload
+from app.models.watch import WatchItem
+from app.pagination import _Explain, count_rows, decode_cursor, encode_cursor
+
+BASE = datetime(2025, 11, 4, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def engine(sqlite_engine):
+    return await sqlite_engine(WatchItem, ImpactCard, ImpactCardPayload, CompanyResearch)
+
+
+@pytest.fixture
+async def session(engine):
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        yield session
+
+
+async def seed_cards(session, count=7, watch_item_id=None):
+    # Pairs of cards share a timestamp so the id tie-breaker is exercised
+    session.add_all([
+        ImpactCard(
+            watch_item_id=watch_item_id,
+            competitor_name=f"Competitor {i}",
+            risk_score=i,
+            risk_level="high" if i % 2 else "low",
+            confidence_score=80,
+            explainability={"reasoning": "because", "key_insights": ["x"]},
+            source_quality={"score": 0.8, "total": 3},
+            raw_data={"payload": "x" * 1000},
+            created_at=BASE + timedelta(minutes=i // 2),
+        )
+        for i in range(count)
+    ])
+    await session.commit()
+
+
+class TestCursor:
+    """Test cursor encoding."""
+
+    def test_round_trip(self):
+        cursor = encode_cursor(BASE, 42)
+        assert decode_cursor(cursor) == (BASE, 42)
+        assert "=" not in cursor
+
+    def test_invalid_cursor_is_a_bad_request(self):
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor("not-a-cursor")
+        assert exc.value.status_code == 400
+
+
+class TestImpactCardPages:
+    """Test cursor walks, counts and projection on impact card lists."""
+
+    @pytest.mark.asyncio
+    async def test_cursor_walk_visits_every_card_once_newest_first(self, session):
+        await seed_cards(session)
+
+        seen, cursor = [], None
+        while True:
+            page = await get_impact_cards(limit=3, cursor=cursor, db=session)
+            assert page.total == 7
+            seen.extend(card.risk_score for card in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == [6, 5, 4, 3, 2, 1, 0]
+
+    @pytest.mark.asyncio
+    async def test_offset_paging_still_works(self, session):
+        await seed_cards(session)
+        page = await get_impact_cards(skip=5, limit=3, db=session)
+        assert [card.risk_score for card in page.items] == [1, 0]
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_total_is_a_count_not_a_full_load(self, engine, session):
+        await seed_cards(session)
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        page = await get_impact_cards(risk_level="high", limit=2, estimate_total=True, db=session)
+
+        assert (page.total, page.total_is_estimate) == (3, False)
+        assert any("count(*)" in statement for statement in statements)
+        # raw_data is not part of the card schema and is never selected for a list
+        assert not any("raw_data" in statement for statement in statements)
+
+    @pytest.mark.asyncio
+    async def test_fields_projection_skips_heavy_columns(self, engine, session):
+        await seed_cards(session)
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        response = await get_impact_cards(limit=2, fields="competitor_name,risk_score", db=session)
+
+        assert isinstance(response, JSONResponse)
+        body = json.loads(response.body)
+        assert body["total"] == 7
+        assert body["items"][0].keys() == {"id", "created_at", "competitor_name", "risk_score"}
+        assert body["items"][0]["risk_score"] == 6
+        page_query = next(statement for statement in statements if "LIMIT" in statement)
+        assert "explainability" not in page_query
+
+        follow_up = json.loads((await get_impact_cards(
+            limit=10, cursor=body["next_cursor"], fields="risk_score", db=session
+        )).body)
+        assert [item["risk_score"] for item in follow_up["items"]] == [4, 3, 2, 1, 0]
+
+    @pytest.mark.asyncio
+    async def test_unknown_fields_are_rejected(self, session):
+        with pytest.raises(HTTPException) as exc:
+            await get_impact_cards(fields="raw_data", db=session)
+        assert exc.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_cards_for_watch_item(self, session):
+        watch = WatchItem(competitor_name="Acme", keywords=[])
+        session.add(watch)
+        await session.commit()
+        await seed_cards(session, count=4, watch_item_id=watch.id)
+        await seed_cards(session, count=2)
+
+        page = await get_impact_cards_for_watch(watch.id, limit=3, db=session)
+        assert page.total == 4
+        rest = await get_impact_cards_for_watch(watch.id, limit=3, cursor=page.next_cursor, db=session)
+        assert [card.risk_score for card in rest.items] == [0]
+
+        with pytest.raises(HTTPException) as exc:
+            await get_impact_cards_for_watch(999, db=session)
+        assert exc.value.status_code == 404
+
+
+class TestOtherLists:
+    """Test watch item and research lists."""
+
+    @pytest.mark.asyncio
+    async def test_watch_items_page_with_cursor(self, session):
+        session.add_all([
+            WatchItem(competitor_name=f"W{i}", keywords=[], is_active=i != 0,
+                      created_at=BASE + timedelta(minutes=i))
+            for i in range(5)
+        ])
+        await session.commit()
+
+        page = await get_watch_items(limit=2, db=session)
+        assert (page.total, [item.competitor_name for item in page.items]) == (4, ["W4", "W3"])
+        rest = await get_watch_items(limit=2, cursor=page.next_cursor, db=session)
+        assert [item.competitor_name for item in rest.items] == ["W2", "W1"]
+        assert rest.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_research_cursor_is_returned_in_a_header(self, session):
+        session.add_all([
+            CompanyResearch(company_name=f"R{i}", search_results={"results": ["x"] * 50},
+                            research_report={"report": "y" * 1000}, total_sources=i,
+                            api_usage={}, created_at=BASE + timedelta(minutes=i))
+            for i in range(3)
+        ])
+        await session.commit()
+
+        response = Response()
+        items = await get_company_research(response, limit=2, db=session)
+        assert [item.company_name for item in items] == ["R2", "R1"]
+
+        projected = await get_company_research(
+            Response(), limit=2, cursor=response.headers["X-Next-Cursor"], fields="company_name", db=session
+        )
+        assert json.loads(projected.body)[0]["company_name"] == "R0"
+        assert "X-Next-Cursor" not in projected.headers
+
+    @pytest.mark.asyncio
+    async def test_estimate_falls_back_to_exact_count_off_postgres(self, session):
+        await seed_cards(session, count=3)
+        assert await count_rows(session, ImpactCard, estimate=True) == (3, False)
+
+    def test_estimate_explain_keeps_search_terms_as_bound_parameters(self):
+        term = "%acme :name' OR 1=1 --%"
+        query = select(CompanyResearch.id).where(CompanyResearch.company_name.ilike(term))
+        compiled = _Explain(query).compile(dialect=postgresql.asyncpg.dialect())
+
+        assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert ":name" not in str(compiled)
+        assert term in compiled.params.values()
@@ -0,0 +1,103 @@
+"""
+Tests for off-loop PDF rendering and the content-addressed report cache
+"""
+
+import asyncio
+import os
+from datetime import datetime
+
+import pytest
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api import research
+from app.models.company_research import CompanyResearch
+from app.services.pdf_render_pool import PDFRenderPool, report_cache_key
+
+RESEARCH = {
+    "company_name": "Acme",
+    "search_results": {"company_profile": {"name": "Acme", "industry": "Widgets"}, "context": []},
+    "research_report": {"executive_summary": "Acme makes widgets.", "key_findings": ["Growing"]},
+    "total_sources": 3,
+    "api_usage": {"search_calls": 1, "ari_calls": 1},
+    "created_at": datetime(2025, 11, 1, 12, 0),
+}
+
+
+@pytest.fixture
+async def pool(tmp_path):
+    render_pool = PDFRenderPool(max_workers=1, cache_dir=str(tmp_path), start_method="fork")
+    yield render_pool
+    await render_pool.shutdown()
+
+
+class TestPDFRenderPool:
+    """Test cache keys, cache hits, coalescing, eviction and the export endpoint."""
+
+    def test_cache_key_depends_on_content_and_template_version(self):
+        reordered = dict(reversed(list(RESEARCH.items())))
+        changed = {**RESEARCH, "total_sources": 4}
+
+        key = report_cache_key("research", RESEARCH, "1")
+        assert key == report_cache_key("research", reordered, "1")
+        assert key != report_cache_key("research", changed, "1")
+        assert key != report_cache_key("research", RESEARCH, "2")
+        assert key != report_cache_key("impact_card", RESEARCH, "1")
+
+    @pytest.mark.asyncio
+    async def test_repeated_exports_are_served_from_cache(self, pool):
+        first = await pool.render("research", RESEARCH)
+        second = await pool.render("research", dict(RESEARCH))
+
+        assert first == second
+        assert first.read_bytes().startswith(b"%PDF")
+        assert (await pool.render_bytes("research", RESEARCH)) == first.read_bytes()
+        assert pool.stats["renders"] == 1 and pool.stats["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_render(self, pool):
+        paths = await asyncio.gather(*[pool.render("impact_card", {"competitor_name": "Acme"}) for _ in range(5)])
+
+        assert len(set(paths)) == 1
+        assert pool.stats["renders"] == 1 and pool.stats["coalesced"] == 4
+        assert pool.get_stats()["rendering"] == 0
+
+    def test_eviction_removes_least_recently_served_reports(self, tmp_path):
+        render_pool = PDFRenderPool(cache_dir=str(tmp_path), max_cache_bytes=250)
+        for age, name in enumerate(["newest", "middle", "oldest"]):
+            path = tmp_path / f"{name}.pdf"
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (1_700_000_000 - age, 1_700_000_000 - age))
+
+        render_pool._evict(keep=tmp_path / "oldest.pdf")
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["newest.pdf", "oldest.pdf"]
+        assert render_pool.stats["evicted"] == 1
+
+    def test_eviction_skips_recently_served_reports(self, tmp_path):
+        render_pool = PDFRenderPool(cache_dir=str(tmp_path), max_cache_bytes=50)
+        for name in ["old", "served"]:
+            (tmp_path / f"{name}.pdf").write_bytes(b"x" * 100)
+        os.utime(tmp_path / "old.pdf", (1_700_000_000, 1_700_000_000))
+
+        render_pool._evict()
+
+        # Over budget, but the file just served may be streaming right now
+        assert [p.name for p in tmp_path.iterdir()] == ["served.pdf"]
+        assert render_pool.stats["evicted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_export_streams_the_cached_file(self, pool, monkeypatch, sqlite_engine):
+        engine = await sqlite_engine(CompanyResearch)
+        monkeypatch.setattr(research, "pdf_render_pool", pool)
+
+        async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as db:
+            db.add(CompanyResearch(**RESEARCH))
+            await db.commit()
+
+            responses = [await research.export_research_pdf(1, db=db) for _ in range(2)]
+
+        assert all(isinstance(response, FileResponse) for response in responses)
+        assert responses[0].path == responses[1].path
+        assert responses[0].headers["content-disposition"] == "attachment; filename=Acme_research_report.pdf"
+        assert pool.stats["renders"] == 1 and pool.stats["hits"] == 1
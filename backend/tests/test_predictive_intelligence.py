@@ -20,7 +20,7 @@ from sqlalchemy import create_engine
 def sync_db_session():
     """Create a synchronous test database session."""
     from app.models.predictive_intelligence import CompetitorPattern, PredictedEvent, PatternEvent
-    from app.models.impact_card import ImpactCard
+    from app.models.impact_card import ImpactCard, ImpactCardPayload
     from app.models.watch import WatchItem
     from sqlalchemy import MetaData
     
@@ -32,6 +32,7 @@ def sync_db_session():
     
     # Create tables manually to avoid UUID issues
     ImpactCard.__table__.create(sync_engine, checkfirst=True)
+    ImpactCardPayload.__table__.create(sync_engine, checkfirst=True)
     WatchItem.__table__.create(sync_engine, checkfirst=True)
     CompetitorPattern.__table__.create(sync_engine, checkfirst=True)
     PredictedEvent.__table__.create(sync_engine, checkfirst=True)
@@ -0,0 +1,153 @@
+"""
+Tests for the authenticated principal cache and write-behind last-seen tracking
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.user import User, UserRole
+from app.services import auth_service
+from app.services.auth_service import AuthService, get_current_user
+from app.services.principal_cache import LastSeenTracker, PrincipalCache
+
+
+@pytest.fixture
+async def engine(sqlite_engine):
+    return await sqlite_engine(User)
+
+
+@pytest.fixture
+async def session_factory(engine):
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+async def user_id(session_factory):
+    async with session_factory() as session:
+        user = User(email="analyst@example.com", username="analyst", hashed_password="x", role=UserRole.ANALYST)
+        session.add(user)
+        await session.commit()
+        return user.id
+
+
+@pytest.fixture
+def principals(monkeypatch, session_factory):
+    cache = PrincipalCache(ttl_seconds=30, max_entries=100)
+    tracker = LastSeenTracker(session_factory, flush_interval=60)
+    monkeypatch.setattr(auth_service, "principal_cache", cache)
+    monkeypatch.setattr(auth_service, "last_seen_tracker", tracker)
+    # ORM updates invalidate the global cache; route them to this one
+    monkeypatch.setattr("app.services.principal_cache.principal_cache", cache)
+    return cache, tracker
+
+
+def bearer(user_id) -> HTTPAuthorizationCredentials:
+    token = AuthService.create_access_token({"sub": str(user_id)})
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+class TestPrincipalCache:
+    """Test cache hits, invalidation and write-behind last-seen updates."""
+
+    @pytest.mark.asyncio
+    async def test_cached_principal_costs_no_queries(self, engine, session_factory, user_id, principals):
+        cache, tracker = principals
+        async with session_factory() as session:
+            await get_current_user(bearer(user_id), db=session)
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        async with session_factory() as session:
+            user = await get_current_user(bearer(user_id), db=session)
+
+            assert statements == []
+            assert user in session
+            assert user.email == "analyst@example.com"
+            assert user.role == UserRole.ANALYST
+        assert cache.stats == {"hits": 1, "misses": 1, "invalidations": 0}
+        assert tracker.get_stats()["pending"] == 1
+
+    @pytest.mark.asyncio
+    async def test_deactivation_and_role_changes_invalidate(self, session_factory, user_id, principals):
+        cache, _ = principals
+        async with session_factory() as session:
+            user = await get_current_user(bearer(user_id), db=session)
+            # Changes made through the cached principal are persisted normally
+            user.role = UserRole.ADMIN
+            await session.commit()
+
+        async with session_factory() as session:
+            assert (await get_current_user(bearer(user_id), db=session)).role == UserRole.ADMIN
+
+            user = (await session.execute(select(User).where(User.id == user_id))).scalar_one()
+            user.is_active = False
+            await session.commit()
+
+        assert cache.stats["invalidations"] == 2
+        async with session_factory() as session:
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user(bearer(user_id), db=session)
+            assert exc_info.value.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_read_between_flush_and_commit_cannot_recache_the_old_row(self, tmp_path, principals):
+        cache, _ = principals
+        # Separate connections, so a reader sees only committed rows
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(User.__table__.create)
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            async with factory() as session:
+                session.add(User(email="lead@example.com", username="lead", hashed_password="x"))
+                await session.commit()
+            async with factory() as session:
+                user_id = (await session.execute(select(User.id))).scalar_one()
+                await cache.get_user(user_id, session)
+
+            async with factory() as writer:
+                user = await writer.get(User, user_id)
+                user.is_active = False
+                await writer.flush()
+
+                # Another request authenticates before the deactivation commits
+                async with factory() as reader:
+                    assert (await cache.get_user(user_id, reader)).is_active is True
+                await writer.commit()
+
+            async with factory() as session:
+                assert (await cache.get_user(user_id, session)).is_active is False
+        finally:
+            await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_reloaded(self, session_factory, user_id, principals, monkeypatch):
+        cache, _ = principals
+        cache.ttl_seconds = 0.01
+        async with session_factory() as session:
+            await cache.get_user(user_id, session)
+        monkeypatch.setattr("app.services.principal_cache.time.monotonic", lambda: float("inf"))
+        async with session_factory() as session:
+            await cache.get_user(user_id, session)
+        assert cache.stats["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_last_seen_is_coalesced_and_written_in_one_batch(self, session_factory, user_id):
+        tracker = LastSeenTracker(session_factory, flush_interval=60)
+        first = datetime(2025, 11, 1, 12, 0, tzinfo=timezone.utc)
+        for minutes in range(5):
+            tracker.touch(user_id, first + timedelta(minutes=minutes))
+        tracker.touch(999, first)
+
+        assert await tracker.flush() == 2
+        assert await tracker.flush() == 0
+        async with session_factory() as session:
+            user = await session.get(User, user_id)
+            assert user.last_login_at.replace(tzinfo=timezone.utc) == first + timedelta(minutes=4)
+        assert tracker.stats["touched"] == 6
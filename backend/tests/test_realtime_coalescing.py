@@ -0,0 +1,95 @@
+"""
+Tests for Socket.IO progress event coalescing and per-room emit counters
+"""
+
+import asyncio
+
+import pytest
+import socketio
+
+from app import realtime
+from app.config import settings
+from app.realtime import ProgressCoalescer, get_realtime_stats
+
+
+class RecordingEmitter:
+    def __init__(self):
+        self.events = []
+
+    async def __call__(self, event, payload, room):
+        self.events.append((event, dict(payload), room))
+
+
+@pytest.fixture
+def emitted():
+    return RecordingEmitter()
+
+
+class TestProgressCoalescer:
+    """Test leading-edge sends, merging, ordering and counters."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_sent_first_and_last(self, emitted):
+        coalescer = ProgressCoalescer(emitted, window_seconds=0.05)
+
+        for step in ("news", "search", "chat", "ari"):
+            await coalescer.submit("impact_generation_step", {"competitor": "Acme", "step": step}, "impact_cards")
+        assert [payload["step"] for _, payload, _ in emitted.events] == ["news"]
+
+        await asyncio.sleep(0.12)
+        assert [payload["step"] for _, payload, _ in emitted.events] == ["news", "ari"]
+        assert emitted.events[1][1]["coalesced_events"] == 3
+        assert coalescer.room_stats["impact_cards"] == {"emitted": 2, "coalesced": 3}
+        assert coalescer.get_stats()["open_windows"] == 0
+
+    @pytest.mark.asyncio
+    async def test_streams_and_rooms_are_coalesced_separately(self, emitted):
+        coalescer = ProgressCoalescer(emitted, window_seconds=0.05)
+
+        await coalescer.submit("impact_generation_step", {"competitor": "Acme", "step": "news"}, "impact_cards")
+        await coalescer.submit("impact_generation_step", {"competitor": "Globex", "step": "news"}, "impact_cards")
+        await coalescer.submit("impact_generation_step", {"competitor": "Acme", "step": "news"}, "other_room")
+
+        assert len(emitted.events) == 3
+        await coalescer.flush_all()
+
+    @pytest.mark.asyncio
+    async def test_direct_emit_flushes_merged_events_first(self, emitted):
+        coalescer = ProgressCoalescer(emitted, window_seconds=10)
+
+        await coalescer.submit("impact_generation_step", {"competitor": "Acme", "step": "news"}, "impact_cards")
+        await coalescer.submit("impact_generation_step", {"competitor": "Acme", "step": "analysis"}, "impact_cards")
+        await coalescer.emit("impact_generation_completed", {"competitor": "Acme"}, "impact_cards")
+
+        assert [event for event, _, _ in emitted.events] == [
+            "impact_generation_step", "impact_generation_step", "impact_generation_completed"
+        ]
+        assert emitted.events[1][1]["step"] == "analysis"
+        await coalescer.flush_all()
+
+    @pytest.mark.asyncio
+    async def test_flush_all_sends_pending_events(self, emitted):
+        coalescer = ProgressCoalescer(emitted, window_seconds=10)
+
+        await coalescer.submit("system_health", {"score": 90}, None)
+        await coalescer.submit("system_health", {"score": 80}, None)
+        await coalescer.flush_all()
+
+        assert [payload["score"] for _, payload, _ in emitted.events] == [90, 80]
+        assert coalescer.get_stats()["rooms"]["*"] == {"emitted": 2, "coalesced": 1}
+
+
+class TestRealtimeStats:
+    """Test that stats report the client manager in use, not the one configured."""
+
+    def test_configured_queue_without_redis_manager_reports_memory(self, monkeypatch):
+        monkeypatch.setattr(settings, "socketio_message_queue", "redis://unreachable:6379")
+
+        assert not isinstance(realtime.sio.manager, socketio.AsyncRedisManager)
+        assert get_realtime_stats()["client_manager"] == "memory"
+
+    def test_redis_manager_reports_redis(self, monkeypatch):
+        manager = socketio.AsyncRedisManager("redis://localhost:6379", write_only=True)
+        monkeypatch.setattr(realtime.sio, "manager", manager)
+
+        assert get_realtime_stats()["client_manager"] == "redis"
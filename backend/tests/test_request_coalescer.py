@@ -0,0 +1,195 @@
+"""
+Tests for single-flight coalescing of identical in-flight You.com queries
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.request_coalescer import RequestCoalescer
+from app.services.you_client import YouComOrchestrator
+
+
+@pytest.fixture
+async def fake_redis():
+    """Lua-capable in-memory Redis; skipped when fakeredis is not installed."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.flushall()
+    await client.close()
+
+
+def slow_fetch(result, delay=0.05):
+    async def fetch():
+        await asyncio.sleep(delay)
+        return result
+    return AsyncMock(side_effect=fetch)
+
+
+class TestRequestCoalescer:
+    """Test local and cross-worker coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_upstream_call(self):
+        coalescer = RequestCoalescer(enabled=True)
+        fetch = slow_fetch({"articles": ["a"]})
+
+        results = await asyncio.gather(
+            *[coalescer.run("youcom:news:acme:10", "news", fetch) for _ in range(5)]
+        )
+
+        assert fetch.await_count == 1
+        assert all(result == {"articles": ["a"]} for result in results)
+        stats = coalescer.get_stats()
+        assert stats["upstream"] == 1
+        assert stats["coalesced_local"] == 4
+        assert stats["upstream_calls_saved"] == 4
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_is_shared_and_not_remembered(self):
+        coalescer = RequestCoalescer(enabled=True)
+        failing = AsyncMock(side_effect=RuntimeError("upstream down"))
+
+        results = await asyncio.gather(
+            coalescer.run("youcom:ari:acme", "ari", failing),
+            coalescer.run("youcom:ari:acme", "ari", failing),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert failing.await_count == 1
+
+        # A later call is a fresh upstream request
+        assert await coalescer.run("youcom:ari:acme", "ari", AsyncMock(return_value={"ok": 1})) == {"ok": 1}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_the_shared_call(self):
+        coalescer = RequestCoalescer(enabled=True)
+        fetch = slow_fetch({"results": []}, delay=0.1)
+
+        first = asyncio.create_task(coalescer.run("youcom:search:acme:5", "search", fetch))
+        second = asyncio.create_task(coalescer.run("youcom:search:acme:5", "search", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == {"results": []}
+        assert fetch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_other_worker_waits_for_lock_holder_and_reads_cache(self, fake_redis):
+        worker_a = RequestCoalescer(enabled=True, wait_timeout=5)
+        worker_b = RequestCoalescer(enabled=True, wait_timeout=5)
+        key = "youcom:news:acme:10"
+
+        async def fetch_and_cache():
+            await asyncio.sleep(0.1)
+            payload = {"articles": ["a"]}
+            await fake_redis.set(key, json.dumps(payload))
+            return payload
+
+        async def load():
+            cached = await fake_redis.get(key)
+            return json.loads(cached) if cached else None
+
+        holder_fetch = AsyncMock(side_effect=fetch_and_cache)
+        waiter_fetch = AsyncMock()
+
+        holder = asyncio.create_task(
+            worker_a.run(key, "news", holder_fetch, load=load, redis=fake_redis)
+        )
+        await asyncio.sleep(0.02)
+        waited = await worker_b.run(key, "news", waiter_fetch, load=load, redis=fake_redis)
+
+        assert waited == {"articles": ["a"]}
+        assert await holder == {"articles": ["a"]}
+        waiter_fetch.assert_not_called()
+        assert worker_b.get_stats()["coalesced_remote"] == 1
+        assert not await fake_redis.exists(worker_a.lock_key(key))
+
+    @pytest.mark.asyncio
+    async def test_waiter_falls_back_when_lock_holder_fails(self, fake_redis):
+        worker_a = RequestCoalescer(enabled=True, wait_timeout=5)
+        worker_b = RequestCoalescer(enabled=True, wait_timeout=5)
+        key = "youcom:search:acme:10"
+        load = AsyncMock(return_value=None)
+
+        async def fail():
+            await asyncio.sleep(0.1)
+            raise RuntimeError("upstream down")
+
+        holder = asyncio.create_task(
+            worker_a.run(key, "search", AsyncMock(side_effect=fail), load=load, redis=fake_redis)
+        )
+        await asyncio.sleep(0.02)
+        result = await worker_b.run(
+            key, "search", AsyncMock(return_value={"results": [1]}), load=load, redis=fake_redis
+        )
+
+        assert result == {"results": [1]}
+        assert worker_b.get_stats()["fallbacks"] == 1
+        with pytest.raises(RuntimeError):
+            await holder
+
+
+class TestOrchestratorCoalescing:
+    """Test that the You.com client routes cache misses through the coalescer."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_fetch_news_makes_one_upstream_request(self, mock_you_api_key):
+        client = YouComOrchestrator(api_key=mock_you_api_key)
+        client.cache = None
+
+        async def respond(**kwargs):
+            await asyncio.sleep(0.05)
+            return MagicMock(json=MagicMock(return_value={"news": [{"title": "Launch"}]}))
+
+        with patch("app.services.you_client.request_coalescer", RequestCoalescer(enabled=True)) as coalescer, \
+                patch.object(client, "_perform_request", new=AsyncMock(side_effect=respond)) as perform:
+            results = await asyncio.gather(*[client.fetch_news("Acme") for _ in range(3)])
+
+        assert perform.await_count == 1
+        assert client.api_usage["news_calls"] == 1
+        assert all(result["articles"] == [{"title": "Launch"}] for result in results)
+        assert coalescer.get_stats()["by_api"]["news"]["coalesced_local"] == 2
+
+    @pytest.mark.asyncio
+    async def test_leader_closing_mid_flight_does_not_fail_followers(self, mock_you_api_key):
+        leader = YouComOrchestrator(api_key=mock_you_api_key)
+        follower = YouComOrchestrator(api_key=mock_you_api_key)
+        leader.cache = follower.cache = None
+
+        async def respond(request):
+            await asyncio.sleep(0.05)
+            if leader.search_client.is_closed:
+                raise httpx.RemoteProtocolError("connection closed", request=request)
+            return httpx.Response(200, json={"news": [{"title": "Launch"}]})
+
+        await leader.search_client.aclose()
+        leader.search_client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+
+        async def lead():
+            async with leader:
+                return await leader.fetch_news("Acme")
+
+        with patch("app.services.you_client.request_coalescer", RequestCoalescer(enabled=True)), \
+                patch.object(YouComOrchestrator, "_log_api_call", new=AsyncMock()):
+            leader_task = asyncio.create_task(lead())
+            await asyncio.sleep(0.01)
+            follower_task = asyncio.create_task(follower.fetch_news("Acme"))
+            await asyncio.sleep(0.01)
+            leader_task.cancel()  # the leader's request goes away and exits its context
+            with pytest.raises(asyncio.CancelledError):
+                await leader_task
+            assert not leader.search_client.is_closed
+
+            result = await follower_task
+            await asyncio.sleep(0.01)
+
+        assert result["articles"] == [{"title": "Launch"}]
+        assert leader.search_client.is_closed  # closed once the shared call finished
+        await follower.__aexit__(None, None, None)
@@ -0,0 +1,104 @@
+"""
+Tests for the fused request context middleware
+"""
+
+import logging
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient
+
+from app.exceptions import EnterpriseBaseException
+from app.middleware import RequestContextMiddleware
+
+
+def build_app(environment: str = "development") -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware, environment=environment)
+
+    @app.get("/ok")
+    async def ok(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.get("/missing")
+    async def missing():
+        raise HTTPException(status_code=404, detail="Not here")
+
+    @app.get("/enterprise")
+    async def enterprise():
+        raise EnterpriseBaseException("Quota exceeded", status_code=429, details={"limit": 10})
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("secret detail")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for n in range(3):
+                yield f"chunk-{n};".encode()
+        return StreamingResponse(chunks(), media_type="application/pdf")
+
+    return app
+
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(app=build_app(), base_url="http://test") as client:
+        yield client
+
+
+class TestRequestContextMiddleware:
+    """Test request IDs, timing, security headers and error mapping."""
+
+    @pytest.mark.asyncio
+    async def test_request_id_is_propagated_and_generated(self, client):
+        response = await client.get("/ok", headers={"X-Request-ID": "req-123"})
+        assert response.headers["X-Request-ID"] == "req-123"
+        assert response.json() == {"request_id": "req-123"}
+
+        generated = await client.get("/ok")
+        assert generated.headers["X-Request-ID"] == generated.json()["request_id"]
+        assert generated.headers["X-Request-ID"] != "req-123"
+
+    @pytest.mark.asyncio
+    async def test_timing_and_security_headers_on_every_response(self, client):
+        for path in ("/ok", "/missing", "/boom"):
+            response = await client.get(path)
+            assert response.headers["X-Response-Time"].endswith("ms")
+            assert response.headers["X-Content-Type-Options"] == "nosniff"
+            assert response.headers["X-Frame-Options"] == "DENY"
+            assert "Strict-Transport-Security" not in response.headers
+
+        async with AsyncClient(app=build_app("production"), base_url="http://test") as production:
+            response = await production.get("/ok")
+            assert "preload" in response.headers["Strict-Transport-Security"]
+            assert "frame-ancestors 'none'" in response.headers["Content-Security-Policy"]
+
+    @pytest.mark.asyncio
+    async def test_exceptions_become_structured_errors(self, client):
+        assert (await client.get("/missing")).json() == {"detail": "Not here"}
+
+        response = await client.get("/enterprise", headers={"X-Request-ID": "req-9"})
+        assert response.status_code == 429
+        assert response.json()["message"] == "Quota exceeded"
+        assert response.json()["details"] == {"limit": 10}
+        assert response.json()["request_id"] == "req-9"
+
+        response = await client.get("/boom")
+        assert response.status_code == 500
+        assert response.json()["error"] == "InternalServerError"
+        assert response.json()["details"] == {"type": "RuntimeError", "message": "Internal error"}
+        assert response.json()["request_id"] == response.headers["X-Request-ID"]
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_passes_through(self, client, caplog):
+        with caplog.at_level(logging.INFO, logger="app.middleware"):
+            response = await client.get("/stream")
+
+        assert response.content == b"chunk-0;chunk-1;chunk-2;"
+        assert response.headers["content-type"] == "application/pdf"
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        record = next(record for record in caplog.records if record.getMessage() == "GET /stream - 200")
+        assert record.status_code == 200
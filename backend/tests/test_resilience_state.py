@@ -0,0 +1,183 @@
+"""
+Tests for cluster-wide circuit breaker and rate-limit state
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.resilience_state import RedisResilienceState
+from app.services.resilient_you_client import (
+    CircuitState,
+    PROCESS_CIRCUIT_BREAKERS,
+    PROCESS_LAST_REQUEST_TIME,
+    ResilientYouComOrchestrator,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_process_state():
+    """Process-wide breakers are shared, so isolate each test."""
+    for breaker in PROCESS_CIRCUIT_BREAKERS.values():
+        breaker.reset()
+        breaker.state.last_failure_time = None
+    PROCESS_LAST_REQUEST_TIME.clear()
+    yield
+    for breaker in PROCESS_CIRCUIT_BREAKERS.values():
+        breaker.reset()
+    PROCESS_LAST_REQUEST_TIME.clear()
+
+
+@pytest.fixture
+async def fake_redis():
+    """Lua-capable in-memory Redis; skipped when fakeredis is not installed."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.flushall()
+    await client.close()
+
+
+class TestRedisResilienceState:
+    """Test the server-side admission and outcome scripts."""
+
+    @pytest.mark.asyncio
+    async def test_breaker_opens_for_every_client_after_threshold(self, fake_redis):
+        worker_a = RedisResilienceState(fake_redis)
+        worker_b = RedisResilienceState(fake_redis)
+
+        for _ in range(2):
+            snapshot = await worker_a.record("chat", False, failure_threshold=2, success_threshold=2)
+        assert snapshot.state == "open"
+
+        decision = await worker_b.admit("chat", recovery_timeout=120, min_interval=0.001)
+        assert decision.allowed is False
+        assert decision.breaker.state == "open"
+        assert decision.breaker.failure_count == 2
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_goes_half_open_after_recovery_then_closes(self, fake_redis):
+        state = RedisResilienceState(fake_redis)
+        await state.record("news", False, failure_threshold=1, success_threshold=2)
+
+        decision = await state.admit("news", recovery_timeout=0, min_interval=0.001)
+        assert decision.allowed is True
+        assert decision.breaker.state == "half_open"
+
+        await state.record("news", True, failure_threshold=1, success_threshold=2)
+        snapshot = await state.record("news", True, failure_threshold=1, success_threshold=2)
+        assert snapshot.state == "closed"
+        assert snapshot.failure_count == 0
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_is_shared_and_reserves_slots(self, fake_redis):
+        worker_a = RedisResilienceState(fake_redis)
+        worker_b = RedisResilienceState(fake_redis)
+
+        first = await worker_a.admit("ari", recovery_timeout=180, min_interval=10.0)
+        second = await worker_b.admit("ari", recovery_timeout=180, min_interval=10.0)
+        third = await worker_a.admit("ari", recovery_timeout=180, min_interval=10.0)
+
+        assert first.wait_seconds == 0
+        assert 9.0 < second.wait_seconds <= 10.0
+        assert 19.0 < third.wait_seconds <= 20.0
+
+    @pytest.mark.asyncio
+    async def test_snapshot_and_reset(self, fake_redis):
+        state = RedisResilienceState(fake_redis)
+        await state.record("search", False, failure_threshold=1, success_threshold=2)
+
+        snapshots = await state.snapshot(["search", "news"])
+        assert snapshots["search"].state == "open"
+        assert snapshots["news"].state == "closed"
+
+        assert await state.reset("search") is True
+        snapshots = await state.snapshot(["search"])
+        assert snapshots["search"].state == "closed"
+
+
+class TestResilientOrchestratorSharedState:
+    """Test how the orchestrator uses shared state and its in-process fallback."""
+
+    @pytest.mark.asyncio
+    async def test_outage_seen_by_one_client_sheds_load_in_another(self, mock_you_api_key):
+        failing = AsyncMock(side_effect=RuntimeError("upstream down"))
+
+        first = ResilientYouComOrchestrator(api_key=mock_you_api_key)
+        first.shared_state = RedisResilienceState(None)
+        first.min_request_interval = {api: 0.001 for api in first.min_request_interval}
+        for _ in range(PROCESS_CIRCUIT_BREAKERS["chat"].config.failure_threshold):
+            await first._execute_with_circuit_breaker("chat", failing, {}, {}, "Acme")
+
+        second = ResilientYouComOrchestrator(api_key=mock_you_api_key)
+        second.shared_state = RedisResilienceState(None)
+        upstream = AsyncMock()
+        result = await second._execute_with_circuit_breaker("chat", upstream, {}, {}, "Acme")
+
+        upstream.assert_not_called()
+        assert second.circuit_breakers["chat"].state.state == CircuitState.OPEN
+        assert result["api_type"] == "chat"  # fallback data
+
+    @pytest.mark.asyncio
+    async def test_local_rate_limit_reserves_slots_for_concurrent_callers(self, mock_you_api_key):
+        client = ResilientYouComOrchestrator(api_key=mock_you_api_key)
+        client.shared_state = RedisResilienceState(None)
+
+        with patch("app.services.resilient_you_client.asyncio.sleep", new=AsyncMock()) as sleep:
+            await client._wait_for_rate_limit("ari")
+            await client._wait_for_rate_limit("ari")
+            await client._wait_for_rate_limit("ari")
+
+        waits = [call.args[0] for call in sleep.await_args_list]
+        assert len(waits) == 2
+        assert 9.0 < waits[0] <= 10.0
+        assert 19.0 < waits[1] <= 20.0
+
+    @pytest.mark.asyncio
+    async def test_admission_uses_single_shared_state_call(self, mock_you_api_key, fake_redis):
+        client = ResilientYouComOrchestrator(api_key=mock_you_api_key)
+        client.shared_state = RedisResilienceState(fake_redis)
+
+        with patch.object(client.shared_state, "admit", wraps=client.shared_state.admit) as admit:
+            upstream = AsyncMock(return_value={"articles": [1]})
+            result = await client._execute_with_circuit_breaker("news", upstream, "Acme", 5)
+
+        assert result == {"articles": [1]}
+        admit.assert_awaited_once()
+        assert (await fake_redis.hget("resilience:breaker:news", "state")) == "closed"
+
+    @pytest.mark.asyncio
+    async def test_impact_card_runs_independent_stages_concurrently(self, mock_you_api_key, mock_you_api_responses):
+        client = ResilientYouComOrchestrator(api_key=mock_you_api_key)
+        client.shared_state = RedisResilienceState(None)
+        events = []
+
+        def stage(name, payload):
+            async def run(*args, **kwargs):
+                events.append(("start", name))
+                await asyncio.sleep(0.05)
+                events.append(("end", name))
+                return payload
+            return run
+
+        analysis = {
+            "analysis": client._parse_analysis_response(
+                {"response": mock_you_api_responses["chat"]["response"]}, "Test Competitor"
+            ),
+            "citations": [],
+        }
+        with patch.object(client, "fetch_news", new=stage("news", mock_you_api_responses["news"])), \
+             patch.object(client, "search_context", new=stage("search", mock_you_api_responses["search"])), \
+             patch.object(client, "analyze_impact", new=stage("chat", analysis)), \
+             patch.object(client, "generate_research_report", new=stage("ari", mock_you_api_responses["ari"])):
+            result = await client.generate_impact_card("Test Competitor", concurrent_stages=True)
+
+        first_end = next(index for index, event in enumerate(events) if event[0] == "end")
+        assert {api for kind, api in events[:first_end]} == {"news", "search", "ari"}
+        assert events.index(("start", "chat")) > events.index(("end", "news"))
+        assert events.index(("start", "chat")) > events.index(("end", "search"))
+        assert result["api_status"] == {"news": "success", "search": "success", "chat": "success", "ari": "success"}
+        assert result["processing_time_breakdown"]["mode"] == "concurrent"
+        assert "error" not in result
@@ -0,0 +1,121 @@
+"""
+Tests for the aggregated shared watchlist listing
+"""
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.api.shared_watchlists import get_shared_watchlist, list_workspace_watchlists
+from app.models.comment import Comment
+from app.models.shared_watchlist import SharedWatchlist, watchlist_assignments
+from app.models.user import User
+from app.models.watch import WatchItem
+from app.models.workspace import Workspace, WorkspaceMember, WorkspaceRole
+
+
+@pytest.fixture
+def engine(sync_sqlite_engine):
+    return sync_sqlite_engine(User, Workspace, WorkspaceMember, WatchItem, SharedWatchlist, watchlist_assignments,
+                              Comment)
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def workspace(db):
+    """Owner, member and guest users; 12 watchlists by the owner, 3 of them public"""
+    users = {
+        role: User(email=f"{role.value}@example.com", username=role.value, full_name=role.value.title(),
+                   hashed_password="x")
+        for role in (WorkspaceRole.OWNER, WorkspaceRole.MEMBER, WorkspaceRole.GUEST)
+    }
+    workspace = Workspace(name="Team", slug="team")
+    watch_item = WatchItem(competitor_name="Acme", keywords=["pricing", "launch"])
+    db.add_all([*users.values(), workspace, watch_item])
+    db.flush()
+    db.add_all([
+        WorkspaceMember(workspace_id=workspace.id, user_id=user.id, role=role)
+        for role, user in users.items()
+    ])
+
+    owner, member = users[WorkspaceRole.OWNER], users[WorkspaceRole.MEMBER]
+    watchlists = [
+        SharedWatchlist(workspace_id=workspace.id, name=f"List {n}", watch_item_id=watch_item.id,
+                        created_by=owner.id, is_public=n < 3, is_active=n != 11)
+        for n in range(12)
+    ]
+    db.add_all(watchlists)
+    db.flush()
+    for watchlist in watchlists:
+        db.execute(watchlist_assignments.insert().values(shared_watchlist_id=watchlist.id, user_id=owner.id))
+    db.execute(watchlist_assignments.insert().values(shared_watchlist_id=watchlists[5].id, user_id=member.id))
+    db.add_all([
+        Comment(user_id=member.id, shared_watchlist_id=watchlists[5].id, content=f"Note {n}")
+        for n in range(4)
+    ])
+    db.commit()
+    return workspace, users, watchlists
+
+
+async def list_names(db, workspace, user, **kwargs):
+    kwargs.setdefault("include_inactive", False)
+    kwargs.setdefault("only_assigned", False)
+    result = await list_workspace_watchlists(workspace.id, db=db, current_user=user, **kwargs)
+    return sorted(watchlist.name for watchlist in result), result
+
+
+class TestSharedWatchlistListing:
+    """Test visibility, counts and round trips of the workspace listing."""
+
+    @pytest.mark.asyncio
+    async def test_listing_uses_constant_number_of_queries(self, engine, db, workspace):
+        workspace, users, _ = workspace
+        statements = []
+        event.listen(engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        names, result = await list_names(db, workspace, users[WorkspaceRole.OWNER])
+
+        assert len(names) == 11
+        assert len(statements) == 2  # membership check + aggregated listing
+        details = {watchlist.name: watchlist for watchlist in result}
+        assert details["List 5"].assigned_users_count == 2
+        assert details["List 5"].comments_count == 4
+        assert details["List 4"].comments_count == 0
+        assert details["List 4"].creator_name == "Owner"
+        assert details["List 4"].watch_item_name == "Acme"
+        assert details["List 4"].watch_item_query == "pricing, launch"
+
+    @pytest.mark.asyncio
+    async def test_visibility_follows_role_and_assignment(self, db, workspace):
+        workspace, users, _ = workspace
+
+        names, _ = await list_names(db, workspace, users[WorkspaceRole.MEMBER])
+        assert names == ["List 0", "List 1", "List 2", "List 5"]
+
+        names, _ = await list_names(db, workspace, users[WorkspaceRole.MEMBER], only_assigned=True)
+        assert names == ["List 5"]
+
+        names, _ = await list_names(db, workspace, users[WorkspaceRole.GUEST])
+        assert names == ["List 0", "List 1", "List 2"]
+
+        names, _ = await list_names(db, workspace, users[WorkspaceRole.OWNER], include_inactive=True)
+        assert len(names) == 12
+
+    @pytest.mark.asyncio
+    async def test_get_shared_watchlist_checks_visibility(self, db, workspace):
+        workspace, users, watchlists = workspace
+
+        detail = await get_shared_watchlist(watchlists[5].id, db=db, current_user=users[WorkspaceRole.MEMBER])
+        assert detail.comments_count == 4
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_shared_watchlist(watchlists[6].id, db=db, current_user=users[WorkspaceRole.GUEST])
+        assert exc_info.value.status_code == 403
@@ -0,0 +1,135 @@
+"""
+Tests for the atomic sliding-window rate limiter and endpoint rule trie
+"""
+
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.sliding_window_limiter import (
+    EndpointRuleTrie, LocalSlidingWindow, RateLimitWindow, SlidingWindowLimiter
+)
+
+WINDOWS = (
+    RateLimitWindow("minute", 60, 5),
+    RateLimitWindow("hour", 3600, 8),
+    RateLimitWindow("day", 86400, 100),
+)
+
+# Start of a minute, so "now + n" stays in the same minute bucket
+NOW = 1_700_000_040.0
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+class TestEndpointRuleTrie:
+    """Test exact, prefix and most-specific matching."""
+
+    def test_matches_most_specific_pattern(self):
+        trie = EndpointRuleTrie([
+            ("/api/ml/predict", "predict"),
+            ("/api/sentiment/*", "sentiment"),
+            ("/api/sentiment/admin/*", "sentiment-admin"),
+            ("/api/*", "api"),
+        ])
+
+        assert trie.match("/api/ml/predict") == "predict"
+        assert trie.match("/api/ml/predict/batch") == "api"
+        assert trie.match("/api/sentiment/trends") == "sentiment"
+        assert trie.match("/api/sentiment/admin/reset") == "sentiment-admin"
+        assert trie.match("/api/sentiment") == "api"
+        assert trie.match("/health") is None
+
+    def test_literal_wildcard_and_dollar_characters_in_paths(self):
+        trie = EndpointRuleTrie([("/api/sentiment/*", "sentiment"), ("/api/ml/predict", "predict")])
+
+        assert trie.match("/api/sentiment/*x") == "sentiment"
+        assert trie.match("/api/sentiment/$") == "sentiment"
+        assert trie.match("/api/ml/predict$") is None
+        assert trie.match("/api/ml/predict*") is None
+
+
+class TestLocalSlidingWindow:
+    """Test the in-process algorithm used while Redis is down."""
+
+    def test_rejects_at_limit_and_slides_previous_bucket_out(self):
+        local = LocalSlidingWindow()
+        decisions = [local.hit("user:1", WINDOWS, now=NOW + n) for n in range(6)]
+
+        assert [decision.allowed for decision in decisions] == [True] * 5 + [False]
+        assert decisions[-1].window.name == "minute"
+        assert decisions[-1].retry_after == pytest.approx(55)
+
+        # Halfway through the next minute, half of the previous 5 still count
+        later = [local.hit("user:1", WINDOWS, now=NOW + 90) for _ in range(4)]
+        assert [decision.allowed for decision in later] == [True] * 3 + [False]
+        assert later[-1].window.name == "minute"
+        assert later[-1].count == 5
+
+        # The hour window is now full (5 + 3 of 8)
+        rejected = local.hit("user:1", WINDOWS, now=NOW + 200)
+        assert rejected.window.name == "hour"
+
+    def test_rejected_requests_are_not_counted(self):
+        local = LocalSlidingWindow()
+        for n in range(20):
+            local.hit("user:1", WINDOWS, now=NOW + n)
+        # Only the 5 admitted requests count against the hour
+        assert local.hit("user:1", WINDOWS, now=NOW + 61).allowed
+
+
+class TestSlidingWindowLimiter:
+    """Test the scripted Redis limiter and its fallback."""
+
+    @pytest.mark.asyncio
+    async def test_one_atomic_call_per_request(self, redis_client):
+        limiter = SlidingWindowLimiter(redis_client)
+        calls = []
+        original = redis_client.evalsha
+        redis_client.evalsha = lambda *args, **kwargs: calls.append(args[0]) or original(*args, **kwargs)
+
+        decisions = [await limiter.hit("/api/ml/predict:7", WINDOWS, now=NOW + n) for n in range(6)]
+
+        assert [decision.allowed for decision in decisions] == [True] * 5 + [False]
+        assert decisions[-1].window.name == "minute"
+        assert decisions[-1].backend == "redis"
+        # The first EVALSHA gets NOSCRIPT and is retried after loading the script
+        assert len(calls) == 7
+        keys = sorted(await redis_client.keys("rate_limit:*"))
+        assert keys == [
+            "rate_limit:day:{/api/ml/predict:7}",
+            "rate_limit:hour:{/api/ml/predict:7}",
+            "rate_limit:minute:{/api/ml/predict:7}",
+        ]
+        assert 0 < await redis_client.pttl(keys[2]) <= 120_000
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_do_not_overshoot(self, redis_client):
+        limiter = SlidingWindowLimiter(redis_client)
+
+        decisions = await asyncio.gather(*[limiter.hit("burst", WINDOWS, now=NOW) for _ in range(50)])
+
+        assert sum(decision.allowed for decision in decisions) == 5
+        assert limiter.stats["rejected"] == 45
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_local_counters_when_redis_fails(self, redis_client):
+        local = LocalSlidingWindow()
+        limiter = SlidingWindowLimiter(redis_client, local=local)
+
+        async def unavailable(*args, **kwargs):
+            raise RedisConnectionError("connection refused")
+
+        limiter._script = unavailable
+        decisions = [await limiter.hit("user:1", WINDOWS, now=NOW + n) for n in range(6)]
+
+        assert [decision.backend for decision in decisions] == ["local"] * 6
+        assert not decisions[-1].allowed
+        assert limiter.stats["fallbacks"] == 6
+        assert SlidingWindowLimiter(None, local=local).get_stats()["backend"] == "local"
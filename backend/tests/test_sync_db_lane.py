@@ -0,0 +1,136 @@
+"""
+Tests for the sync-ORM thread pool lane and event loop lag monitor
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api import comments, community
+from app.models.comment import Comment
+from app.models.comment_notification import CommentNotification, ConflictDetection
+from app.models.company_research import CompanyResearch
+from app.models.user import User
+from app.services import sync_db_lane as lane_module
+from app.services.sync_db_lane import LoopLagMonitor, SyncDBLane, sync_db_endpoint, to_sync_database_url
+
+
+@pytest.fixture
+def engine(sync_sqlite_engine):
+    return sync_sqlite_engine(User, CompanyResearch, Comment, CommentNotification, ConflictDetection)
+
+
+@pytest.fixture
+def lane(engine, monkeypatch):
+    lane = SyncDBLane(max_workers=2, session_factory=sessionmaker(bind=engine, expire_on_commit=False))
+    monkeypatch.setattr(lane_module, "sync_db_lane", lane)
+    yield lane
+    if lane._executor is not None:
+        lane._executor.shutdown(wait=True)
+
+
+class TestSyncDBLane:
+    """Test off-loop execution, bounded concurrency and the endpoint adapter."""
+
+    def test_maps_async_drivers_to_sync_drivers(self):
+        assert to_sync_database_url("postgresql+asyncpg://u:p@db/app") == "postgresql+psycopg2://u:p@db/app"
+        assert to_sync_database_url("sqlite+aiosqlite:///./app.db") == "sqlite:///./app.db"
+
+    @pytest.mark.asyncio
+    async def test_runs_functions_and_coroutines_in_worker_threads(self, lane):
+        def query(db: Session, value: int):
+            return threading.current_thread().name, db.execute(text("SELECT :v"), {"v": value}).scalar()
+
+        async def service_method(db: Session):
+            await asyncio.sleep(0)
+            return threading.current_thread().name
+
+        thread, value = await lane.run(query, 42)
+        assert thread.startswith("sync-db") and value == 42
+        assert (await lane.run(service_method)).startswith("sync-db")
+        assert lane.get_stats()["completed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded_by_max_workers(self, lane):
+        running, peak = 0, 0
+        lock = threading.Lock()
+
+        def slow(db: Session):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+
+        await asyncio.gather(*[lane.run(slow) for _ in range(6)])
+
+        stats = lane.get_stats()
+        assert peak == 2
+        assert stats["max_queued"] >= 4
+        assert stats["completed"] == 6 and stats["running"] == 0 and stats["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_blocking_work_in_the_lane_does_not_stall_the_loop(self, lane):
+        monitor = LoopLagMonitor(interval=0.005, threshold_ms=20)
+        await monitor.start()
+        await asyncio.sleep(0.01)
+        for _ in range(3):
+            time.sleep(0.05)  # a sync query on the event loop
+            await asyncio.sleep(0.01)
+        inline = dict(monitor.stats)
+
+        monitor.reset()
+        await asyncio.gather(*[lane.run(lambda db: time.sleep(0.05)) for _ in range(6)])
+        await monitor.stop()
+
+        assert inline["stalls"] >= 3 and inline["blocked_seconds"] >= 0.1
+        assert monitor.stats["samples"] > 0
+        assert monitor.stats["blocked_seconds"] < inline["blocked_seconds"] / 2
+
+    def test_endpoints_get_a_lane_session_instead_of_the_async_one(self, engine, lane):
+        assert "db" not in inspect.signature(comments.get_comment_threads).parameters
+
+        with sessionmaker(bind=engine)() as db:
+            db.add_all([
+                User(email="analyst@example.com", username="analyst", hashed_password="x"),
+                CompanyResearch(company_name="Acme"),
+            ])
+            db.commit()
+
+        app = FastAPI()
+        app.include_router(comments.router)
+        with TestClient(app) as client:
+            created = client.post("/comments/", params={"company_research_id": 1}, json={"content": "Root"})
+            threads = client.get("/comments/threads", params={"company_research_id": 1})
+
+        assert created.status_code == 201, created.text
+        assert [thread["content"] for thread in threads.json()] == ["Root"]
+        # Both endpoints and the get_current_user dependency ran in the lane
+        assert lane.get_stats()["completed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_callers_holding_a_session_run_directly(self, engine, lane):
+        @sync_db_endpoint
+        async def endpoint(value: int, db: Session):
+            return threading.current_thread().name, db.execute(text("SELECT :v"), {"v": value}).scalar()
+
+        with sessionmaker(bind=engine)() as db:
+            thread, value = await endpoint(7, db=db)
+
+        assert thread == threading.current_thread().name and value == 7
+        assert lane.get_stats()["submitted"] == 0
+
+    @pytest.mark.asyncio
+    async def test_community_service_borrows_no_loop_bound_client_in_the_lane(self, lane):
+        service = await lane.run(community.get_community_service)
+
+        assert service.you_client is None
@@ -0,0 +1,205 @@
+"""
+Tests for the WebSocket fan-out broadcast engine
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.services.websocket_broadcast import BroadcastHub
+
+
+class FakeWebSocket:
+    """Records frames; `delay` simulates a slow client"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.frames = []
+        self.accepted = False
+        self.close_code = None
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_text(self, frame):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(json.loads(frame))
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+async def drain(hub):
+    for _ in range(20):
+        if all(connection.queue.empty() for connection in hub.connections.values()):
+            break
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.01)
+
+
+def make_hub(**kwargs):
+    kwargs.setdefault("relay_enabled", False)
+    return BroadcastHub(channel="test:broadcast", **kwargs)
+
+
+class TestBroadcastHub:
+    """Test fan-out, topics and slow-consumer handling."""
+
+    @pytest.mark.asyncio
+    async def test_message_is_serialized_once_and_fanned_out(self, monkeypatch):
+        hub = make_hub()
+        sockets = [FakeWebSocket() for _ in range(3)]
+        for websocket in sockets:
+            await hub.connect(websocket)
+
+        dumps_calls = []
+        original_dumps = json.dumps
+        monkeypatch.setattr(
+            "app.services.websocket_broadcast.json.dumps",
+            lambda *args, **kwargs: dumps_calls.append(1) or original_dumps(*args, **kwargs),
+        )
+        assert await hub.publish({"type": "sentiment_update", "n": 1}) == 3
+        await drain(hub)
+
+        assert len(dumps_calls) == 1
+        assert all(websocket.frames == [{"type": "sentiment_update", "n": 1}] for websocket in sockets)
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_delay_others(self):
+        hub = make_hub()
+        slow, fast = FakeWebSocket(delay=0.5), FakeWebSocket()
+        await hub.connect(slow)
+        await hub.connect(fast)
+
+        started = asyncio.get_running_loop().time()
+        for n in range(5):
+            await hub.publish({"n": n})
+        await drain(hub)
+
+        assert asyncio.get_running_loop().time() - started < 0.4
+        assert [frame["n"] for frame in fast.frames] == [0, 1, 2, 3, 4]
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_topic_subscriptions(self):
+        hub = make_hub()
+        everyone, acme = FakeWebSocket(), FakeWebSocket()
+        await hub.connect(everyone)
+        await hub.connect(acme, topics=["entity:acme"])
+
+        await hub.publish({"entity": "acme"}, topic="entity:acme")
+        await hub.publish({"entity": "globex"}, topic="entity:globex")
+        await hub.publish({"type": "announcement"})
+        await drain(hub)
+
+        assert len(everyone.frames) == 3
+        assert acme.frames == [{"entity": "acme"}, {"type": "announcement"}]
+
+        assert hub.subscribe(everyone, ["entity:globex"]) == {"entity:globex"}
+        assert hub.unsubscribe(acme, ["entity:acme"]) == set()
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_newest_frames_then_disconnects(self):
+        hub = make_hub(queue_size=2, policy="drop_oldest", max_dropped_frames=3)
+        stuck = FakeWebSocket(delay=10)
+        connection = await hub.connect(stuck)
+        hub.deliver(json.dumps({"n": 0}))
+        await asyncio.sleep(0.01)  # the sender takes the first frame and blocks on the socket
+
+        for n in range(1, 4):
+            hub.deliver(json.dumps({"n": n}))
+        assert [json.loads(frame)["n"] for frame in list(connection.queue._queue)] == [2, 3]
+        assert connection.dropped_frames == 1
+
+        hub.deliver(json.dumps({"n": 4}))
+        hub.deliver(json.dumps({"n": 5}))
+        await asyncio.sleep(0.01)
+        assert stuck not in hub.connections
+        assert stuck.close_code == 1013
+        assert hub.stats["slow_consumer_disconnects"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_closes_on_first_overflow(self):
+        hub = make_hub(queue_size=1, policy="disconnect")
+        stuck = FakeWebSocket(delay=10)
+        await hub.connect(stuck)
+        assert hub.deliver("{}") == 1
+        await asyncio.sleep(0.01)
+
+        assert hub.deliver("{}") == 1
+        assert hub.deliver("{}") == 0
+        await asyncio.sleep(0.01)
+        assert stuck not in hub.connections
+        assert stuck.close_code == 1013
+
+    @pytest.mark.asyncio
+    async def test_timed_out_sender_closes_the_socket(self):
+        hub = make_hub(send_timeout=0.05)
+        stuck = FakeWebSocket(delay=10)
+        await hub.connect(stuck)
+        hub.deliver("{}")
+        await asyncio.sleep(0.15)
+
+        assert stuck not in hub.connections
+        assert stuck.close_code == 1013
+        assert hub.stats["send_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_relay_reaches_clients_on_other_workers(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        first, second = make_hub(relay_enabled=True), make_hub(relay_enabled=True)
+        await first.start(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+        await second.start(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+        local, remote = FakeWebSocket(), FakeWebSocket()
+        await first.connect(local)
+        await second.connect(remote, topics=["entity:acme"])
+
+        await first.publish({"entity": "acme"}, topic="entity:acme")
+        await first.publish({"entity": "globex"}, topic="entity:globex")
+        for _ in range(50):
+            if remote.frames:
+                break
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.1)
+
+        # The publishing worker delivers locally once and ignores its own relay
+        assert local.frames == [{"entity": "acme"}, {"entity": "globex"}]
+        assert remote.frames == [{"entity": "acme"}]
+        assert second.stats["relayed_in"] == 2
+        await first.stop()
+        await second.stop()
+
+
+class TestSentimentStreamEndpoint:
+    """Test subscription messages on the sentiment WebSocket endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_non_list_entities_are_rejected(self, monkeypatch):
+        from fastapi import WebSocketDisconnect
+        from app.api import sentiment
+
+        hub = make_hub()
+        monkeypatch.setattr(sentiment, "websocket_manager", hub)
+        websocket = FakeWebSocket()
+        messages = iter([
+            json.dumps({"action": "subscribe", "entities": "Acme"}),
+            json.dumps({"action": "subscribe", "entities": ["Acme"]}),
+        ])
+
+        async def receive_text():
+            await drain(hub)
+            try:
+                return next(messages)
+            except StopIteration:
+                raise WebSocketDisconnect()
+
+        websocket.receive_text = receive_text
+        await sentiment.sentiment_websocket_endpoint(websocket)
+
+        assert websocket.frames[0]["type"] == "error"
+        assert websocket.frames[1] == {"type": "subscriptions", "topics": ["entity:acme"]}
@@ -2,10 +2,12 @@
 Tests for You.com API client integration
 """
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 import httpx
 from app.services.you_client import YouComOrchestrator, YouComAPIError
+from app.services.you_client_pool import YouClientPool
 
 class TestYouComOrchestrator:
     """Test the You.com API orchestration client."""
@@ -145,12 +147,18 @@ class TestYouComOrchestrator:
         }
         ari_response.raise_for_status.return_value = None
 
-        with patch.object(you_client, '_perform_request', new=AsyncMock(side_effect=[
-            news_response,
-            search_response,
-            chat_response,
-            ari_response,
-        ])) as mock_request:
+        # Independent stages run concurrently, so answer by API type rather than call order
+        responses = {
+            "news": news_response,
+            "search": search_response,
+            "chat": chat_response,
+            "ari": ari_response,
+        }
+
+        async def respond(**kwargs):
+            return responses[kwargs["api_type"]]
+
+        with patch.object(you_client, '_perform_request', new=AsyncMock(side_effect=respond)) as mock_request:
 
             result = await you_client.generate_impact_card("Test Competitor", ["AI", "ML"])
             
@@ -175,6 +183,46 @@ class TestYouComOrchestrator:
             # Verify API calls were made
             assert mock_request.await_count == 4
 
+    @pytest.mark.asyncio
+    async def test_generate_impact_card_runs_independent_stages_concurrently(self, you_client, mock_you_api_responses):
+        """News, Search and ARI overlap; Chat waits for News and Search."""
+        payloads = {
+            "news": {"news": mock_you_api_responses["news"]["articles"]},
+            "search": {"results": {"web": mock_you_api_responses["search"]["results"]}},
+            "chat": {"response": mock_you_api_responses["chat"]["response"], "citations": []},
+            "ari": {
+                "response": mock_you_api_responses["ari"]["report"],
+                "citations": mock_you_api_responses["ari"]["citations"],
+            },
+        }
+        events = []
+
+        async def respond(**kwargs):
+            api_type = kwargs["api_type"]
+            events.append(("start", api_type))
+            await asyncio.sleep(0.05)
+            events.append(("end", api_type))
+            response = MagicMock()
+            response.json.return_value = payloads[api_type]
+            return response
+
+        with patch.object(you_client, '_perform_request', new=AsyncMock(side_effect=respond)):
+            result = await you_client.generate_impact_card("Test Competitor", concurrent_stages=True)
+
+        starts = [api for kind, api in events if kind == "start"]
+        first_end = next(index for index, event in enumerate(events) if event[0] == "end")
+        assert set(starts[:3]) == {"news", "search", "ari"}
+        assert first_end == 3  # all three independent calls were in flight together
+        assert events.index(("start", "chat")) > events.index(("end", "news"))
+        assert events.index(("start", "chat")) > events.index(("end", "search"))
+
+        breakdown = result["processing_time_breakdown"]
+        assert breakdown["mode"] == "concurrent"
+        assert set(breakdown["stages_ms"]) >= {"news", "search", "analysis", "research"}
+        assert breakdown["total_ms"] < breakdown["sequential_estimate_ms"]
+        assert result["raw_data"]["processing_time_breakdown"] == breakdown
+        assert result["processing_time"].endswith("s")
+
     @pytest.mark.asyncio
     async def test_quick_company_research(self, you_client, mock_you_api_responses):
         """Test quick company research for individual users."""
@@ -282,3 +330,63 @@ class TestYouComOrchestrator:
         
         # Client should be closed after context exit
         # Note: In real implementation, we'd check if client is closed
+
+
+class TestYouClientPool:
+    """Test the application-lifetime You.com connection pool registry."""
+
+    @pytest.fixture
+    async def started_pool(self, mock_you_api_key):
+        """Start a dedicated pool instance and swap it in for the global one."""
+        pool = YouClientPool()
+        with patch('app.services.you_client_pool.settings.demo_mode', True):
+            await pool.start(api_key=mock_you_api_key)
+        with patch('app.services.you_client.you_client_pool', pool):
+            yield pool
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_orchestrators_share_pooled_clients(self, started_pool, mock_you_api_key):
+        """Orchestrators built while the pool runs reuse its HTTP clients."""
+        async with YouComOrchestrator(api_key=mock_you_api_key) as first:
+            pass
+        async with YouComOrchestrator(api_key=mock_you_api_key) as second:
+            assert second.search_client is first.search_client
+            assert second.agent_client is started_pool.agent_client
+
+        # Leaving the context must not close the shared clients
+        assert not started_pool.search_client.is_closed
+        assert started_pool.orchestrators_served == 2
+
+    @pytest.mark.asyncio
+    async def test_other_api_key_gets_private_clients(self, started_pool):
+        """A different API key never borrows the pooled credentials."""
+        async with YouComOrchestrator(api_key="another_key_123456789012") as client:
+            assert client.search_client is not started_pool.search_client
+        assert client.search_client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_request_uses_per_api_timeout_and_tracks_stats(self, started_pool, mock_you_api_key):
+        """Pooled requests carry the per-API timeout and feed utilisation stats."""
+        client = YouComOrchestrator(api_key=mock_you_api_key)
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.status_code = 200
+
+        with patch.object(client.search_client, 'request', new=AsyncMock(return_value=mock_response)) as mock_request, \
+                patch.object(client, '_log_api_call', new=AsyncMock()):
+            await client._perform_request(
+                client=client.search_client,
+                method="GET",
+                url="https://example.com/news",
+                api_type="news",
+            )
+
+        timeout = mock_request.call_args.kwargs["timeout"]
+        assert timeout.read == started_pool.timeout_for("news").read
+
+        stats = started_pool.get_stats()
+        assert stats["started"] is True
+        assert stats["requests_total"]["news"] == 1
+        assert stats["in_flight_requests"]["news"] == 0
+        assert stats["search_client"]["max_connections"] > 0